@@ -30,9 +30,24 @@ def initialize_extensions(app, db):
     db.init_app(app=app)
     migrate.init_app(app=app, db=db)
 
+def initialize_strict_loading():
+    if configuration.DAO_STRICT_LOADING:
+        from apps.user.strict_loading import enable_strict_loading
+        enable_strict_loading()
+
 def initialize_error_handlers():
     from apps.user import errors
 
+def initialize_email_templates():
+    from apps.user.email_renderer import email_renderer
+    email_renderer.precompile()
+
+def initialize_registration_jobs(app):
+    # Jobs accepted by workers which were killed before completing them
+    from apps.user.registration_jobs import registration_job_runner
+    with app.app_context():
+        registration_job_runner.complete_stale_jobs()
+
 def register_blueprints(app):
     from apps.user.routes import user_blueprint
     app.register_blueprint(user_blueprint)
@@ -55,12 +70,21 @@ def create_app() -> Flask:
     print("Initializing Flask extentions.")
     initialize_extensions(app=app, db = db)
 
+    print("Initializing strict loading.")
+    initialize_strict_loading()
+
     print("Initializing Error handlers.")
     initialize_error_handlers()
 
+    print("Compiling email templates.")
+    initialize_email_templates()
+
     print("Registering blueprints.")
     register_blueprints(app=app)
 
+    print("Completing stale sign up jobs.")
+    initialize_registration_jobs(app=app)
+
     return app
 
 
@@ -68,6 +68,11 @@ class DevelopmentConfig:
     SECURITY_PASSWORD_SALT = os.getenv('SECURITY_PASSWORD_SALT_DEV')
 
     EMAIL_TOKEN_EXPIRATION = ast.literal_eval(os.getenv('EMAIL_TOKEN_EXPIRATION_DEV'))
+    SECRET_KEY_FALLBACKS = ast.literal_eval(os.getenv('SECRET_KEY_FALLBACKS_DEV', default='[]'))  # previous keys, newest first
+    TOKEN_MAX_ACTIVE_KEYS = ast.literal_eval(os.getenv('TOKEN_MAX_ACTIVE_KEYS_DEV', default='3'))
+    ACCESS_TOKEN_EXPIRATION = ast.literal_eval(os.getenv('ACCESS_TOKEN_EXPIRATION_DEV', default='900'))  # seconds
+    REFRESH_TOKEN_EXPIRATION = ast.literal_eval(os.getenv('REFRESH_TOKEN_EXPIRATION_DEV', default='1209600'))  # seconds
+    TOKEN_REVOCATION_SYNC_INTERVAL = ast.literal_eval(os.getenv('TOKEN_REVOCATION_SYNC_INTERVAL_DEV', default='30'))  # seconds, 0 to load only on first use
 
     MAIL_DEFAULT_SENDER = os.getenv('MAIL_DEFAULT_SENDER_DEV')
     
@@ -111,6 +116,93 @@ class DevelopmentConfig:
     MAIL_USERNAME = os.getenv('MAIL_USERNAME_DEV')
     MAIL_PASSWORD = os.getenv('MAIL_PASSWORD_DEV')
 
+    # Bloom filter for blacklisted emails, kept by every worker
+    BLACKLIST_FILTER_ENABLED = ast.literal_eval(os.getenv('BLACKLIST_FILTER_ENABLED_DEV', default='True'))
+    BLACKLIST_FILTER_FALSE_POSITIVE_RATE = ast.literal_eval(os.getenv('BLACKLIST_FILTER_FALSE_POSITIVE_RATE_DEV', default='0.01'))
+    BLACKLIST_FILTER_MIN_CAPACITY = ast.literal_eval(os.getenv('BLACKLIST_FILTER_MIN_CAPACITY_DEV', default='10000'))
+    BLACKLIST_FILTER_REBUILD_INTERVAL = ast.literal_eval(os.getenv('BLACKLIST_FILTER_REBUILD_INTERVAL_DEV', default='300'))  # seconds
+
+    # Number of rows inserted together by bulk registration
+    BULK_REGISTRATION_CHUNK_SIZE = ast.literal_eval(os.getenv('BULK_REGISTRATION_CHUNK_SIZE_DEV', default='500'))
+    BULK_ACTIVATION_CHUNK_SIZE = ast.literal_eval(os.getenv('BULK_ACTIVATION_CHUNK_SIZE_DEV', default='500'))
+    ADMIN_API_KEY = os.getenv('ADMIN_API_KEY_DEV')  # admin endpoints are disabled if not set
+    UNACTIVATED_PURGE_BATCH_SIZE = ast.literal_eval(os.getenv('UNACTIVATED_PURGE_BATCH_SIZE_DEV', default='200'))
+    UNACTIVATED_PURGE_PAUSE = ast.literal_eval(os.getenv('UNACTIVATED_PURGE_PAUSE_DEV', default='0.2'))  # seconds between batches
+    UNACTIVATED_PURGE_GRACE = ast.literal_eval(os.getenv('UNACTIVATED_PURGE_GRACE_DEV', default='3600'))  # seconds after link expiry
+    DAO_STRICT_LOADING = ast.literal_eval(os.getenv('DAO_STRICT_LOADING_DEV', default='False'))  # raise on lazy loads of ORM objects
+
+    # Password hashing, done by a pool of worker processes in every gunicorn worker
+    PASSWORD_HASH_ALGORITHM = os.getenv('PASSWORD_HASH_ALGORITHM_DEV') or 'pbkdf2:sha256'
+    PASSWORD_HASH_COST = os.getenv('PASSWORD_HASH_COST_DEV') or '600000'
+    PASSWORD_HASH_WORKERS = ast.literal_eval(os.getenv('PASSWORD_HASH_WORKERS_DEV', default='2'))
+    PASSWORD_HASH_MAX_PENDING = ast.literal_eval(os.getenv('PASSWORD_HASH_MAX_PENDING_DEV', default='32'))
+    PASSWORD_HASH_QUEUE_TIMEOUT = ast.literal_eval(os.getenv('PASSWORD_HASH_QUEUE_TIMEOUT_DEV', default='5'))  # seconds
+
+    # Bytecode cache of email templates, shared by all workers
+    EMAIL_TEMPLATE_CACHE_DIR = os.getenv('EMAIL_TEMPLATE_CACHE_DIR_DEV') or '/tmp/insurance_template_cache'
+
+    # Copy of every sent email kept for debugging, one of 'none', 'memory' or 'file'
+    EMAIL_SINK_MODE = os.getenv('EMAIL_SINK_MODE_DEV') or 'file'
+    EMAIL_SINK_DIR = os.getenv('EMAIL_SINK_DIR_DEV') or '/tmp/insurance_emails'
+    EMAIL_SINK_CAPACITY = ast.literal_eval(os.getenv('EMAIL_SINK_CAPACITY_DEV', default='1000'))
+    EMAIL_SINK_MAX_BYTES = ast.literal_eval(os.getenv('EMAIL_SINK_MAX_BYTES_DEV', default='10485760'))
+    EMAIL_SINK_BACKUP_COUNT = ast.literal_eval(os.getenv('EMAIL_SINK_BACKUP_COUNT_DEV', default='5'))
+    EMAIL_SINK_BATCH_SIZE = ast.literal_eval(os.getenv('EMAIL_SINK_BATCH_SIZE_DEV', default='100'))
+    EMAIL_SINK_FLUSH_INTERVAL = ast.literal_eval(os.getenv('EMAIL_SINK_FLUSH_INTERVAL_DEV', default='1.0'))  # seconds
+
+    # Asynchronous sign up, requested by client with 'Prefer: respond-async' header
+    SIGN_UP_ASYNC_ENABLED = ast.literal_eval(os.getenv('SIGN_UP_ASYNC_ENABLED_DEV', default='True'))
+    SIGN_UP_JOB_WORKERS = ast.literal_eval(os.getenv('SIGN_UP_JOB_WORKERS_DEV', default='4'))
+    SIGN_UP_JOB_MAX_PENDING = ast.literal_eval(os.getenv('SIGN_UP_JOB_MAX_PENDING_DEV', default='1000'))
+    SIGN_UP_JOB_EVENTS_TIMEOUT = ast.literal_eval(os.getenv('SIGN_UP_JOB_EVENTS_TIMEOUT_DEV', default='30'))  # seconds
+    SIGN_UP_JOB_EVENTS_POLL_INTERVAL = ast.literal_eval(os.getenv('SIGN_UP_JOB_EVENTS_POLL_INTERVAL_DEV', default='0.5'))  # seconds
+    SIGN_UP_JOB_MAX_EVENT_STREAMS = ast.literal_eval(os.getenv('SIGN_UP_JOB_MAX_EVENT_STREAMS_DEV', default='2'))  # per worker, each holds a request thread
+    SIGN_UP_JOB_STALE_AFTER = ast.literal_eval(os.getenv('SIGN_UP_JOB_STALE_AFTER_DEV', default='600'))  # seconds, unfinished jobs older than it were lost
+
+    # Responses of requests with Idempotency-Key header, backend is 'memory' or 'sql'
+    IDEMPOTENCY_BACKEND = os.getenv('IDEMPOTENCY_BACKEND_DEV') or 'sql'
+    IDEMPOTENCY_CAPACITY = ast.literal_eval(os.getenv('IDEMPOTENCY_CAPACITY_DEV', default='10000'))
+    IDEMPOTENCY_TTL = ast.literal_eval(os.getenv('IDEMPOTENCY_TTL_DEV', default='86400'))  # seconds
+    IDEMPOTENCY_LOCK_TIMEOUT = ast.literal_eval(os.getenv('IDEMPOTENCY_LOCK_TIMEOUT_DEV', default='60'))  # seconds
+    IDEMPOTENCY_WAIT_TIMEOUT = ast.literal_eval(os.getenv('IDEMPOTENCY_WAIT_TIMEOUT_DEV', default='10'))  # seconds
+    IDEMPOTENCY_POLL_INTERVAL = ast.literal_eval(os.getenv('IDEMPOTENCY_POLL_INTERVAL_DEV', default='0.1'))  # seconds
+
+    # Admission control of api requests, limits are per namespace and per gunicorn worker
+    ADMISSION_ENABLED = ast.literal_eval(os.getenv('ADMISSION_ENABLED_DEV', default='True'))
+    ADMISSION_LIMITS = ast.literal_eval(os.getenv('ADMISSION_LIMITS_DEV', default="{'register': {'ip_rate': 5, 'ip_burst': 50, 'email_rate': 0.2, 'email_burst': 10, 'max_in_flight': 32, 'shed_when_saturated': True}, 'register/status': {'ip_rate': 20, 'ip_burst': 100}, 'register/bulk': {'ip_rate': 0.1, 'ip_burst': 3, 'max_in_flight': 2, 'shed_when_saturated': True}, 'blacklist': {'ip_rate': 5, 'ip_burst': 50}, 'verify': {'ip_rate': 2, 'ip_burst': 20, 'max_in_flight': 32}, 'login': {'ip_rate': 2, 'ip_burst': 20, 'email_rate': 0.1, 'email_burst': 10, 'max_in_flight': 16, 'shed_when_saturated': True}, 'login/refresh': {'ip_rate': 2, 'ip_burst': 20}, 'login/logout': {'ip_rate': 2, 'ip_burst': 20}, 'login/me': {'ip_rate': 20, 'ip_burst': 100}, 'admin/accounts': {'ip_rate': 0.1, 'ip_burst': 3, 'max_in_flight': 2}, 'admin/accounts/purge': {'ip_rate': 1, 'ip_burst': 10}}"))
+    ADMISSION_MAX_TRACKED_KEYS = ast.literal_eval(os.getenv('ADMISSION_MAX_TRACKED_KEYS_DEV', default='100000'))
+    ADMISSION_TRUSTED_PROXIES = ast.literal_eval(os.getenv('ADMISSION_TRUSTED_PROXIES_DEV', default='0'))  # proxies appending to X-Forwarded-For, 0 to ignore it
+    ADMISSION_RETRY_AFTER = ast.literal_eval(os.getenv('ADMISSION_RETRY_AFTER_DEV', default='1'))  # seconds
+    ADMISSION_HASH_QUEUE_SATURATION = ast.literal_eval(os.getenv('ADMISSION_HASH_QUEUE_SATURATION_DEV', default='0.9'))  # fraction of queue
+    ADMISSION_DB_POOL_SATURATION = ast.literal_eval(os.getenv('ADMISSION_DB_POOL_SATURATION_DEV', default='0.9'))  # fraction of pool
+
+    # Email deliverability check, mode is 'syntax', 'cached' or 'dns' and resolver is 'dns' or 'local'
+    EMAIL_DELIVERABILITY_MODE = os.getenv('EMAIL_DELIVERABILITY_MODE_DEV') or 'cached'
+    EMAIL_DELIVERABILITY_RESOLVER = os.getenv('EMAIL_DELIVERABILITY_RESOLVER_DEV') or 'dns'
+    EMAIL_DELIVERABILITY_LOCAL_MX = ast.literal_eval(os.getenv('EMAIL_DELIVERABILITY_LOCAL_MX_DEV', default='{}'))
+    EMAIL_DELIVERABILITY_TIMEOUT = ast.literal_eval(os.getenv('EMAIL_DELIVERABILITY_TIMEOUT_DEV', default='5'))  # seconds
+    EMAIL_DOMAIN_CACHE_CAPACITY = ast.literal_eval(os.getenv('EMAIL_DOMAIN_CACHE_CAPACITY_DEV', default='10000'))
+    EMAIL_DOMAIN_CACHE_POSITIVE_TTL = ast.literal_eval(os.getenv('EMAIL_DOMAIN_CACHE_POSITIVE_TTL_DEV', default='86400'))  # seconds
+    EMAIL_DOMAIN_CACHE_NEGATIVE_TTL = ast.literal_eval(os.getenv('EMAIL_DOMAIN_CACHE_NEGATIVE_TTL_DEV', default='300'))  # seconds
+    EMAIL_DOMAIN_REFRESH_INTERVAL = ast.literal_eval(os.getenv('EMAIL_DOMAIN_REFRESH_INTERVAL_DEV', default='3600'))  # seconds, 0 to disable
+    REGISTRATION_BATCH_WINDOW = ast.literal_eval(os.getenv('REGISTRATION_BATCH_WINDOW_DEV', default='0'))  # seconds, 0 to disable group commit
+    REGISTRATION_BATCH_MAX_SIZE = ast.literal_eval(os.getenv('REGISTRATION_BATCH_MAX_SIZE_DEV', default='100'))
+    REGISTRATION_BATCH_TIMEOUT = ast.literal_eval(os.getenv('REGISTRATION_BATCH_TIMEOUT_DEV', default='30'))  # seconds a sign up waits for its batch
+    ACTIVATION_CACHE_ENABLED = ast.literal_eval(os.getenv('ACTIVATION_CACHE_ENABLED_DEV', default='True'))
+    ACTIVATION_CACHE_CAPACITY = ast.literal_eval(os.getenv('ACTIVATION_CACHE_CAPACITY_DEV', default='100000'))
+    ACTIVATION_CACHE_TTL = ast.literal_eval(os.getenv('ACTIVATION_CACHE_TTL_DEV', default='86400'))  # seconds
+    ACTIVATION_CACHE_REDIS_URL = os.getenv('ACTIVATION_CACHE_REDIS_URL_DEV')  # shared by workers if set
+    SINGLE_FLIGHT_MODE = os.getenv('SINGLE_FLIGHT_MODE_DEV') or 'worker'  # none, worker or shared
+    SINGLE_FLIGHT_RESULT_TTL = ast.literal_eval(os.getenv('SINGLE_FLIGHT_RESULT_TTL_DEV', default='5'))  # seconds
+    SINGLE_FLIGHT_WAIT_TIMEOUT = ast.literal_eval(os.getenv('SINGLE_FLIGHT_WAIT_TIMEOUT_DEV', default='10'))  # seconds
+    SINGLE_FLIGHT_POLL_INTERVAL = ast.literal_eval(os.getenv('SINGLE_FLIGHT_POLL_INTERVAL_DEV', default='0.05'))  # seconds
+    LOGIN_THROTTLE_ENABLED = ast.literal_eval(os.getenv('LOGIN_THROTTLE_ENABLED_DEV', default='True'))
+    LOGIN_THROTTLE_EMAIL_LIMIT = ast.literal_eval(os.getenv('LOGIN_THROTTLE_EMAIL_LIMIT_DEV', default='10'))  # attempts per window
+    LOGIN_THROTTLE_IP_LIMIT = ast.literal_eval(os.getenv('LOGIN_THROTTLE_IP_LIMIT_DEV', default='100'))  # attempts per window
+    LOGIN_THROTTLE_WINDOW = ast.literal_eval(os.getenv('LOGIN_THROTTLE_WINDOW_DEV', default='300'))  # seconds
+    LOGIN_THROTTLE_MAX_KEYS = ast.literal_eval(os.getenv('LOGIN_THROTTLE_MAX_KEYS_DEV', default='100000'))
+    LOGIN_THROTTLE_REDIS_URL = os.getenv('LOGIN_THROTTLE_REDIS_URL_DEV')  # shared by workers if set
+
 
 class AutomatedTestingConfig:
     # Flaks CLI configurations
@@ -128,6 +220,11 @@ class AutomatedTestingConfig:
     SECURITY_PASSWORD_SALT = os.getenv('SECURITY_PASSWORD_SALT_AUT_TESTING')
 
     EMAIL_TOKEN_EXPIRATION = ast.literal_eval(os.getenv('EMAIL_TOKEN_EXPIRATION_AUT_TESTING'))
+    SECRET_KEY_FALLBACKS = ast.literal_eval(os.getenv('SECRET_KEY_FALLBACKS_AUT_TESTING', default='[]'))  # previous keys, newest first
+    TOKEN_MAX_ACTIVE_KEYS = ast.literal_eval(os.getenv('TOKEN_MAX_ACTIVE_KEYS_AUT_TESTING', default='3'))
+    ACCESS_TOKEN_EXPIRATION = ast.literal_eval(os.getenv('ACCESS_TOKEN_EXPIRATION_AUT_TESTING', default='900'))  # seconds
+    REFRESH_TOKEN_EXPIRATION = ast.literal_eval(os.getenv('REFRESH_TOKEN_EXPIRATION_AUT_TESTING', default='1209600'))  # seconds
+    TOKEN_REVOCATION_SYNC_INTERVAL = ast.literal_eval(os.getenv('TOKEN_REVOCATION_SYNC_INTERVAL_AUT_TESTING', default='0'))  # seconds, 0 to load only on first use
 
     MAIL_DEFAULT_SENDER = os.getenv('MAIL_DEFAULT_SENDER_AUT_TESTING')
     
@@ -171,6 +268,93 @@ class AutomatedTestingConfig:
     MAIL_USERNAME = os.getenv('MAIL_USERNAME_AUT_TESTING')
     MAIL_PASSWORD = os.getenv('MAIL_PASSWORD_AUT_TESTING')
 
+    # Bloom filter for blacklisted emails, kept by every worker
+    BLACKLIST_FILTER_ENABLED = ast.literal_eval(os.getenv('BLACKLIST_FILTER_ENABLED_AUT_TESTING', default='True'))
+    BLACKLIST_FILTER_FALSE_POSITIVE_RATE = ast.literal_eval(os.getenv('BLACKLIST_FILTER_FALSE_POSITIVE_RATE_AUT_TESTING', default='0.01'))
+    BLACKLIST_FILTER_MIN_CAPACITY = ast.literal_eval(os.getenv('BLACKLIST_FILTER_MIN_CAPACITY_AUT_TESTING', default='10000'))
+    BLACKLIST_FILTER_REBUILD_INTERVAL = ast.literal_eval(os.getenv('BLACKLIST_FILTER_REBUILD_INTERVAL_AUT_TESTING', default='300'))  # seconds
+
+    # Number of rows inserted together by bulk registration
+    BULK_REGISTRATION_CHUNK_SIZE = ast.literal_eval(os.getenv('BULK_REGISTRATION_CHUNK_SIZE_AUT_TESTING', default='500'))
+    BULK_ACTIVATION_CHUNK_SIZE = ast.literal_eval(os.getenv('BULK_ACTIVATION_CHUNK_SIZE_AUT_TESTING', default='500'))
+    ADMIN_API_KEY = os.getenv('ADMIN_API_KEY_AUT_TESTING')  # admin endpoints are disabled if not set
+    UNACTIVATED_PURGE_BATCH_SIZE = ast.literal_eval(os.getenv('UNACTIVATED_PURGE_BATCH_SIZE_AUT_TESTING', default='200'))
+    UNACTIVATED_PURGE_PAUSE = ast.literal_eval(os.getenv('UNACTIVATED_PURGE_PAUSE_AUT_TESTING', default='0.2'))  # seconds between batches
+    UNACTIVATED_PURGE_GRACE = ast.literal_eval(os.getenv('UNACTIVATED_PURGE_GRACE_AUT_TESTING', default='3600'))  # seconds after link expiry
+    DAO_STRICT_LOADING = ast.literal_eval(os.getenv('DAO_STRICT_LOADING_AUT_TESTING', default='True'))  # raise on lazy loads of ORM objects
+
+    # Password hashing, done by a pool of worker processes in every gunicorn worker
+    PASSWORD_HASH_ALGORITHM = os.getenv('PASSWORD_HASH_ALGORITHM_AUT_TESTING') or 'pbkdf2:sha256'
+    PASSWORD_HASH_COST = os.getenv('PASSWORD_HASH_COST_AUT_TESTING') or '600000'
+    PASSWORD_HASH_WORKERS = ast.literal_eval(os.getenv('PASSWORD_HASH_WORKERS_AUT_TESTING', default='2'))
+    PASSWORD_HASH_MAX_PENDING = ast.literal_eval(os.getenv('PASSWORD_HASH_MAX_PENDING_AUT_TESTING', default='32'))
+    PASSWORD_HASH_QUEUE_TIMEOUT = ast.literal_eval(os.getenv('PASSWORD_HASH_QUEUE_TIMEOUT_AUT_TESTING', default='5'))  # seconds
+
+    # Bytecode cache of email templates, shared by all workers
+    EMAIL_TEMPLATE_CACHE_DIR = os.getenv('EMAIL_TEMPLATE_CACHE_DIR_AUT_TESTING') or '/tmp/insurance_template_cache'
+
+    # Copy of every sent email kept for debugging, one of 'none', 'memory' or 'file'
+    EMAIL_SINK_MODE = os.getenv('EMAIL_SINK_MODE_AUT_TESTING') or 'memory'
+    EMAIL_SINK_DIR = os.getenv('EMAIL_SINK_DIR_AUT_TESTING') or '/tmp/insurance_emails'
+    EMAIL_SINK_CAPACITY = ast.literal_eval(os.getenv('EMAIL_SINK_CAPACITY_AUT_TESTING', default='1000'))
+    EMAIL_SINK_MAX_BYTES = ast.literal_eval(os.getenv('EMAIL_SINK_MAX_BYTES_AUT_TESTING', default='10485760'))
+    EMAIL_SINK_BACKUP_COUNT = ast.literal_eval(os.getenv('EMAIL_SINK_BACKUP_COUNT_AUT_TESTING', default='5'))
+    EMAIL_SINK_BATCH_SIZE = ast.literal_eval(os.getenv('EMAIL_SINK_BATCH_SIZE_AUT_TESTING', default='100'))
+    EMAIL_SINK_FLUSH_INTERVAL = ast.literal_eval(os.getenv('EMAIL_SINK_FLUSH_INTERVAL_AUT_TESTING', default='1.0'))  # seconds
+
+    # Asynchronous sign up, requested by client with 'Prefer: respond-async' header
+    SIGN_UP_ASYNC_ENABLED = ast.literal_eval(os.getenv('SIGN_UP_ASYNC_ENABLED_AUT_TESTING', default='True'))
+    SIGN_UP_JOB_WORKERS = ast.literal_eval(os.getenv('SIGN_UP_JOB_WORKERS_AUT_TESTING', default='4'))
+    SIGN_UP_JOB_MAX_PENDING = ast.literal_eval(os.getenv('SIGN_UP_JOB_MAX_PENDING_AUT_TESTING', default='1000'))
+    SIGN_UP_JOB_EVENTS_TIMEOUT = ast.literal_eval(os.getenv('SIGN_UP_JOB_EVENTS_TIMEOUT_AUT_TESTING', default='30'))  # seconds
+    SIGN_UP_JOB_EVENTS_POLL_INTERVAL = ast.literal_eval(os.getenv('SIGN_UP_JOB_EVENTS_POLL_INTERVAL_AUT_TESTING', default='0.5'))  # seconds
+    SIGN_UP_JOB_MAX_EVENT_STREAMS = ast.literal_eval(os.getenv('SIGN_UP_JOB_MAX_EVENT_STREAMS_AUT_TESTING', default='2'))  # per worker, each holds a request thread
+    SIGN_UP_JOB_STALE_AFTER = ast.literal_eval(os.getenv('SIGN_UP_JOB_STALE_AFTER_AUT_TESTING', default='600'))  # seconds, unfinished jobs older than it were lost
+
+    # Responses of requests with Idempotency-Key header, backend is 'memory' or 'sql'
+    IDEMPOTENCY_BACKEND = os.getenv('IDEMPOTENCY_BACKEND_AUT_TESTING') or 'sql'
+    IDEMPOTENCY_CAPACITY = ast.literal_eval(os.getenv('IDEMPOTENCY_CAPACITY_AUT_TESTING', default='10000'))
+    IDEMPOTENCY_TTL = ast.literal_eval(os.getenv('IDEMPOTENCY_TTL_AUT_TESTING', default='86400'))  # seconds
+    IDEMPOTENCY_LOCK_TIMEOUT = ast.literal_eval(os.getenv('IDEMPOTENCY_LOCK_TIMEOUT_AUT_TESTING', default='60'))  # seconds
+    IDEMPOTENCY_WAIT_TIMEOUT = ast.literal_eval(os.getenv('IDEMPOTENCY_WAIT_TIMEOUT_AUT_TESTING', default='10'))  # seconds
+    IDEMPOTENCY_POLL_INTERVAL = ast.literal_eval(os.getenv('IDEMPOTENCY_POLL_INTERVAL_AUT_TESTING', default='0.1'))  # seconds
+
+    # Admission control of api requests, limits are per namespace and per gunicorn worker
+    ADMISSION_ENABLED = ast.literal_eval(os.getenv('ADMISSION_ENABLED_AUT_TESTING', default='True'))
+    ADMISSION_LIMITS = ast.literal_eval(os.getenv('ADMISSION_LIMITS_AUT_TESTING', default="{'register': {'ip_rate': 5, 'ip_burst': 50, 'email_rate': 0.2, 'email_burst': 10, 'max_in_flight': 32, 'shed_when_saturated': True}, 'register/status': {'ip_rate': 20, 'ip_burst': 100}, 'register/bulk': {'ip_rate': 0.1, 'ip_burst': 3, 'max_in_flight': 2, 'shed_when_saturated': True}, 'blacklist': {'ip_rate': 5, 'ip_burst': 50}, 'verify': {'ip_rate': 2, 'ip_burst': 20, 'max_in_flight': 32}, 'login': {'ip_rate': 2, 'ip_burst': 20, 'email_rate': 0.1, 'email_burst': 10, 'max_in_flight': 16, 'shed_when_saturated': True}, 'login/refresh': {'ip_rate': 2, 'ip_burst': 20}, 'login/logout': {'ip_rate': 2, 'ip_burst': 20}, 'login/me': {'ip_rate': 20, 'ip_burst': 100}, 'admin/accounts': {'ip_rate': 0.1, 'ip_burst': 3, 'max_in_flight': 2}, 'admin/accounts/purge': {'ip_rate': 1, 'ip_burst': 10}}"))
+    ADMISSION_MAX_TRACKED_KEYS = ast.literal_eval(os.getenv('ADMISSION_MAX_TRACKED_KEYS_AUT_TESTING', default='100000'))
+    ADMISSION_TRUSTED_PROXIES = ast.literal_eval(os.getenv('ADMISSION_TRUSTED_PROXIES_AUT_TESTING', default='0'))  # proxies appending to X-Forwarded-For, 0 to ignore it
+    ADMISSION_RETRY_AFTER = ast.literal_eval(os.getenv('ADMISSION_RETRY_AFTER_AUT_TESTING', default='1'))  # seconds
+    ADMISSION_HASH_QUEUE_SATURATION = ast.literal_eval(os.getenv('ADMISSION_HASH_QUEUE_SATURATION_AUT_TESTING', default='0.9'))  # fraction of queue
+    ADMISSION_DB_POOL_SATURATION = ast.literal_eval(os.getenv('ADMISSION_DB_POOL_SATURATION_AUT_TESTING', default='0.9'))  # fraction of pool
+
+    # Email deliverability check, mode is 'syntax', 'cached' or 'dns' and resolver is 'dns' or 'local'
+    EMAIL_DELIVERABILITY_MODE = os.getenv('EMAIL_DELIVERABILITY_MODE_AUT_TESTING') or 'cached'
+    EMAIL_DELIVERABILITY_RESOLVER = os.getenv('EMAIL_DELIVERABILITY_RESOLVER_AUT_TESTING') or 'dns'
+    EMAIL_DELIVERABILITY_LOCAL_MX = ast.literal_eval(os.getenv('EMAIL_DELIVERABILITY_LOCAL_MX_AUT_TESTING', default='{}'))
+    EMAIL_DELIVERABILITY_TIMEOUT = ast.literal_eval(os.getenv('EMAIL_DELIVERABILITY_TIMEOUT_AUT_TESTING', default='5'))  # seconds
+    EMAIL_DOMAIN_CACHE_CAPACITY = ast.literal_eval(os.getenv('EMAIL_DOMAIN_CACHE_CAPACITY_AUT_TESTING', default='10000'))
+    EMAIL_DOMAIN_CACHE_POSITIVE_TTL = ast.literal_eval(os.getenv('EMAIL_DOMAIN_CACHE_POSITIVE_TTL_AUT_TESTING', default='86400'))  # seconds
+    EMAIL_DOMAIN_CACHE_NEGATIVE_TTL = ast.literal_eval(os.getenv('EMAIL_DOMAIN_CACHE_NEGATIVE_TTL_AUT_TESTING', default='300'))  # seconds
+    EMAIL_DOMAIN_REFRESH_INTERVAL = ast.literal_eval(os.getenv('EMAIL_DOMAIN_REFRESH_INTERVAL_AUT_TESTING', default='0'))  # seconds, 0 to disable
+    REGISTRATION_BATCH_WINDOW = ast.literal_eval(os.getenv('REGISTRATION_BATCH_WINDOW_AUT_TESTING', default='0'))  # seconds, 0 to disable group commit
+    REGISTRATION_BATCH_MAX_SIZE = ast.literal_eval(os.getenv('REGISTRATION_BATCH_MAX_SIZE_AUT_TESTING', default='100'))
+    REGISTRATION_BATCH_TIMEOUT = ast.literal_eval(os.getenv('REGISTRATION_BATCH_TIMEOUT_AUT_TESTING', default='30'))  # seconds a sign up waits for its batch
+    ACTIVATION_CACHE_ENABLED = ast.literal_eval(os.getenv('ACTIVATION_CACHE_ENABLED_AUT_TESTING', default='True'))
+    ACTIVATION_CACHE_CAPACITY = ast.literal_eval(os.getenv('ACTIVATION_CACHE_CAPACITY_AUT_TESTING', default='100000'))
+    ACTIVATION_CACHE_TTL = ast.literal_eval(os.getenv('ACTIVATION_CACHE_TTL_AUT_TESTING', default='86400'))  # seconds
+    ACTIVATION_CACHE_REDIS_URL = os.getenv('ACTIVATION_CACHE_REDIS_URL_AUT_TESTING')  # shared by workers if set
+    SINGLE_FLIGHT_MODE = os.getenv('SINGLE_FLIGHT_MODE_AUT_TESTING') or 'worker'  # none, worker or shared
+    SINGLE_FLIGHT_RESULT_TTL = ast.literal_eval(os.getenv('SINGLE_FLIGHT_RESULT_TTL_AUT_TESTING', default='5'))  # seconds
+    SINGLE_FLIGHT_WAIT_TIMEOUT = ast.literal_eval(os.getenv('SINGLE_FLIGHT_WAIT_TIMEOUT_AUT_TESTING', default='10'))  # seconds
+    SINGLE_FLIGHT_POLL_INTERVAL = ast.literal_eval(os.getenv('SINGLE_FLIGHT_POLL_INTERVAL_AUT_TESTING', default='0.05'))  # seconds
+    LOGIN_THROTTLE_ENABLED = ast.literal_eval(os.getenv('LOGIN_THROTTLE_ENABLED_AUT_TESTING', default='True'))
+    LOGIN_THROTTLE_EMAIL_LIMIT = ast.literal_eval(os.getenv('LOGIN_THROTTLE_EMAIL_LIMIT_AUT_TESTING', default='10'))  # attempts per window
+    LOGIN_THROTTLE_IP_LIMIT = ast.literal_eval(os.getenv('LOGIN_THROTTLE_IP_LIMIT_AUT_TESTING', default='100'))  # attempts per window
+    LOGIN_THROTTLE_WINDOW = ast.literal_eval(os.getenv('LOGIN_THROTTLE_WINDOW_AUT_TESTING', default='300'))  # seconds
+    LOGIN_THROTTLE_MAX_KEYS = ast.literal_eval(os.getenv('LOGIN_THROTTLE_MAX_KEYS_AUT_TESTING', default='100000'))
+    LOGIN_THROTTLE_REDIS_URL = os.getenv('LOGIN_THROTTLE_REDIS_URL_AUT_TESTING')  # shared by workers if set
+
 
 config_by_name = dict(
     development=DevelopmentConfig(),
@@ -35,6 +35,10 @@ bind = '0.0.0.0:5000'
 
 workers = multiprocessing.cpu_count()
 
+# Requests of a worker are served by threads, admission control caps requests in flight
+worker_class = 'gthread'
+threads = 8
+
 timeout = 3 * 60  # 3 minutes
 keepalive = 24 * 60 * 60  # 1 day
 
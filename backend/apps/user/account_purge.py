@@ -0,0 +1,193 @@
+"""Purge of never activated accounts.
+
+SENECA GLOBAL CONFIDENTIAL & PROPRIETARY
+
+@file account_purge.py
+@author Dilip Kumar Sharma
+@copyright Seneca Global
+@date 18th Oct 2026
+
+About; -
+--------
+    Deletes accounts whose confirmation link has expired without being clicked, so they
+    do not bloat unique indexes of user table which every sign up looks up.
+
+Working; -
+----------
+    Never activated users created more than EMAIL_TOKEN_EXPIRATION + UNACTIVATED_PURGE_GRACE
+    seconds before the purge started are deleted with their profiles and insurances.
+    Users deactivated by support staff keep their activation time and are never purged.
+    Insurance plans are a shared catalog and are kept.
+
+    Users are deleted in batches of UNACTIVATED_PURGE_BATCH_SIZE, found in order of
+    creation time by its index, each batch in a short transaction of its own which locks
+    only the rows it deletes. The purge sleeps UNACTIVATED_PURGE_PAUSE seconds between
+    batches, so sign ups and verification are never blocked for long.
+
+    Dry run finds the same batches without deleting anything, to tell how many accounts
+    would be purged.
+
+    A purge runs in a background thread of the gunicorn worker which started it, at most
+    one at a time per worker. Its progress is kept with counters of the worker.
+
+Uses; -
+-------
+    This module is used by admin endpoint.
+
+Reference; -
+------------
+    https://dev.mysql.com/doc/refman/8.0/en/innodb-locking-reads.html#innodb-locking-reads-nowait-skip-locked
+"""
+
+import time
+import threading
+from datetime import datetime, timedelta
+from flask import current_app
+from apps import db, configuration
+from apps.user.dao import UserDao
+from utils.insurance_logger import InsuranceLogger
+
+
+class UnactivatedAccountPurge:
+    """Deletes unactivated accounts in throttled batches.
+
+    Args:
+        batch_size (int): Maximum users deleted in a transaction
+        pause (float): Seconds slept between batches
+        grace (int): Seconds an account is kept after its confirmation link expires
+    """
+    def __init__(self, batch_size: int, pause: float, grace: int) -> None:
+        self._batch_size = batch_size
+        self._pause = pause
+        self._grace = grace
+
+        self._lock = threading.Lock()
+        self._running = False
+
+        self._runs = 0
+        self._failures = 0
+        self._progress = dict()
+
+    def cutoff(self) -> datetime:
+        """Users created before this UTC time are purged."""
+        return datetime.utcnow() - timedelta(seconds=configuration.EMAIL_TOKEN_EXPIRATION + self._grace)
+
+    def start(self, dry_run: bool = False) -> bool:
+        """Run a purge in background.
+
+        Args:
+            dry_run (bool, optional): Only count accounts which would be purged. Defaults to False.
+
+        Returns:
+            bool: False if a purge is already running in this worker
+        """
+        with self._lock:
+            if self._running:
+                return False
+
+            self._running = True
+
+        threading.Thread(target=self._run_in_app, args=(current_app._get_current_object(), dry_run),
+                         name='account-purge', daemon=True).start()
+
+        return True
+
+    def _run_in_app(self, app, dry_run: bool) -> None:
+        with app.app_context():
+            try:
+                self.run(dry_run=dry_run, started=True)
+            finally:
+                db.session.remove()
+
+    def run(self, dry_run: bool = False, started: bool = False) -> tuple:
+        """Purge all accounts found now, batch by batch.
+
+        Args:
+            dry_run (bool, optional): Only count accounts which would be purged. Defaults to False.
+            started (bool, optional): Purge is already marked running by start(). Defaults to False.
+
+        Returns:
+            tuple: status, message, result
+                    status is boolean value indicating success (True) or Failure(False),
+                    message is a string about the error occurred if any, otherwise None,
+                    result is number of purged accounts, or which would be purged on dry run, or None otherwise.
+        """
+        if not started:
+            with self._lock:
+                if self._running:
+                    return False, "Purge is already running.", None
+
+                self._running = True
+
+        cutoff = self.cutoff()
+        progress = self._progress = dict(
+                        dry_run = dry_run,
+                        cutoff = cutoff.isoformat(),
+                        started_at = datetime.utcnow().isoformat(),
+                        finished_at = None,
+                        batches = 0,
+                        accounts = 0,
+                        last_batch_ms = None,
+                        error = None,
+                    )
+
+        InsuranceLogger.log_info(f"{'Dry run of purge' if dry_run else 'Purge'} of unactivated accounts created before {cutoff.isoformat()} started.")
+
+        try:
+            after = None
+
+            while True:
+                start = time.perf_counter()
+
+                is_success, message, rows = UserDao.purge_unactivated_users(
+                                                created_before=cutoff,
+                                                after=after,
+                                                limit=self._batch_size,
+                                                dry_run=dry_run
+                                            )
+
+                if not is_success:
+                    progress['error'] = message
+                    self._failures += 1
+                    return False, message, None
+
+                if not rows:
+                    break
+
+                progress['batches'] += 1
+                progress['accounts'] += len(rows)
+                progress['last_batch_ms'] = round((time.perf_counter() - start) * 1e3, 3)
+                after = rows[-1]
+
+                if len(rows) < self._batch_size:
+                    break
+
+                time.sleep(self._pause)
+        finally:
+            progress['finished_at'] = datetime.utcnow().isoformat()
+
+            with self._lock:
+                self._running = False
+                self._runs += 1
+
+        InsuranceLogger.log_info(f"{'Dry run of purge' if dry_run else 'Purge'} of unactivated accounts is done, "
+                                 f"{progress['accounts']} accounts in {progress['batches']} batches.")
+
+        return True, None, progress['accounts']
+
+    def stats(self) -> dict:
+        return {
+            'running': self._running,
+            'batch_size': self._batch_size,
+            'pause': self._pause,
+            'runs': self._runs,
+            'failures': self._failures,
+            'last_run': dict(self._progress) or None,
+        }
+
+
+account_purge = UnactivatedAccountPurge(
+                    batch_size=configuration.UNACTIVATED_PURGE_BATCH_SIZE,
+                    pause=configuration.UNACTIVATED_PURGE_PAUSE,
+                    grace=configuration.UNACTIVATED_PURGE_GRACE
+                )
@@ -0,0 +1,241 @@
+"""Cache of activated accounts.
+
+SENECA GLOBAL CONFIDENTIAL & PROPRIETARY
+
+@file activation_cache.py
+@author Dilip Kumar Sharma
+@copyright Seneca Global
+@date 18th Oct 2026
+
+About; -
+--------
+    Answers repeated clicks on confirmation link without going to database.
+
+Working; -
+----------
+    Customers click the confirmation link more than once and email scanners prefetch
+    it, but an account is activated only once. Once verify endpoint has activated an
+    account, or found it activated, the email is kept in memory of the gunicorn worker
+    for ACTIVATION_CACHE_TTL seconds, at most ACTIVATION_CACHE_CAPACITY emails with
+    least recently used ones evicted first. Repeated clicks are answered with
+    ALREADY-ACTIVATED right after the token is validated.
+
+    With ACTIVATION_CACHE_REDIS_URL, emails are also kept in redis and shared by all
+    workers. Redis is asked only when the email is not in memory of the worker, and an
+    unavailable redis is treated as a miss.
+
+    Emails are kept as sha256 digest of lower cased email, never in clear. They are
+    added only after activation is committed.
+
+    Support staff may deactivate accounts in bulk. Deactivated emails are removed from
+    memory of the worker and from redis. Other workers remove them when they sync token
+    revocations, within TOKEN_REVOCATION_SYNC_INTERVAL seconds.
+
+Uses; -
+-------
+    This module is used by verify endpoint.
+
+Reference; -
+------------
+    https://redis.io/commands/set/
+"""
+
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from apps import configuration
+from utils.insurance_logger import InsuranceLogger
+
+
+class MemoryActivationStore:
+    """Activated account digests in memory of the worker.
+
+    Args:
+        capacity (int): Maximum digests kept
+    """
+    mode = 'memory'
+
+    def __init__(self, capacity: int) -> None:
+        self._capacity = capacity
+        self._expires_at = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, key: str, ttl: int) -> None:
+        with self._lock:
+            self._expires_at[key] = time.monotonic() + ttl
+            self._expires_at.move_to_end(key)
+
+            while len(self._expires_at) > self._capacity:
+                self._expires_at.popitem(last=False)
+
+    def contains(self, key: str) -> bool:
+        with self._lock:
+            expires_at = self._expires_at.get(key)
+
+            if expires_at is None:
+                return False
+            elif expires_at < time.monotonic():
+                del self._expires_at[key]
+                return False
+
+            self._expires_at.move_to_end(key)
+            return True
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._expires_at.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._expires_at.clear()
+
+    def __len__(self) -> int:
+        return len(self._expires_at)
+
+
+class RedisActivationStore:
+    """Activated account digests in redis, shared by all workers.
+
+    Args:
+        url (str): Redis url, e.g. redis://redis:6379/1
+        prefix (str, optional): Prefix of redis keys. Defaults to 'activated:'.
+    """
+    mode = 'redis'
+
+    def __init__(self, url: str, prefix: str = 'activated:') -> None:
+        import redis
+
+        self._client = redis.Redis.from_url(url, socket_timeout=0.1, socket_connect_timeout=0.1)
+        self._prefix = prefix
+
+    def add(self, key: str, ttl: int) -> None:
+        self._client.set(self._prefix + key, 1, ex=ttl)
+
+    def contains(self, key: str) -> bool:
+        return bool(self._client.exists(self._prefix + key))
+
+    def discard(self, key: str) -> None:
+        self._client.delete(self._prefix + key)
+
+
+class ActivationCache:
+    """Activated accounts with hit ratio counters.
+
+    Args:
+        enabled (bool): When disabled every lookup is a miss
+        capacity (int): Maximum emails kept in memory of the worker
+        ttl (int): Seconds an email is kept
+        shared_store (RedisActivationStore, optional): Store shared by workers. Defaults to None.
+    """
+    def __init__(self, enabled: bool, capacity: int, ttl: int, shared_store: RedisActivationStore = None) -> None:
+        self._enabled = enabled
+        self._ttl = ttl
+        self._local_store = MemoryActivationStore(capacity=capacity)
+        self._shared_store = shared_store
+
+        self._hits = 0
+        self._shared_hits = 0
+        self._misses = 0
+        self._shared_errors = 0
+
+    @staticmethod
+    def _key(email_address: str) -> str:
+        return hashlib.sha256(email_address.strip().lower().encode()).hexdigest()
+
+    def is_activated(self, email_address: str) -> bool:
+        """Whether account of given email is known to be activated.
+
+        Args:
+            email_address (str): Email address of the customer
+
+        Returns:
+            bool: True if activated, False if not known
+        """
+        if not self._enabled:
+            return False
+
+        key = self._key(email_address)
+
+        if self._local_store.contains(key):
+            self._hits += 1
+            return True
+
+        if self._shared_store is not None:
+            try:
+                if self._shared_store.contains(key):
+                    self._local_store.add(key, self._ttl)
+                    self._hits += 1
+                    self._shared_hits += 1
+                    return True
+            except Exception as err:
+                self._shared_errors += 1
+                InsuranceLogger.log_warning(f"Failed to read activation cache from {self._shared_store.mode}. {str(err)}")
+
+        self._misses += 1
+        return False
+
+    def add(self, email_address: str) -> None:
+        """Remember that account of given email is activated.
+
+        Args:
+            email_address (str): Email address of the customer
+        """
+        if not self._enabled:
+            return
+
+        key = self._key(email_address)
+        self._local_store.add(key, self._ttl)
+
+        if self._shared_store is not None:
+            try:
+                self._shared_store.add(key, self._ttl)
+            except Exception as err:
+                self._shared_errors += 1
+                InsuranceLogger.log_warning(f"Failed to write activation cache to {self._shared_store.mode}. {str(err)}")
+
+    def discard(self, email_address: str) -> None:
+        """Forget account of given email, which is deactivated.
+
+        Args:
+            email_address (str): Email address of the customer
+        """
+        if not self._enabled:
+            return
+
+        key = self._key(email_address)
+        self._local_store.discard(key)
+
+        if self._shared_store is not None:
+            try:
+                self._shared_store.discard(key)
+            except Exception as err:
+                self._shared_errors += 1
+                InsuranceLogger.log_warning(f"Failed to write activation cache to {self._shared_store.mode}. {str(err)}")
+
+    def clear(self) -> None:
+        """Forget accounts kept in memory of this worker."""
+        self._local_store.clear()
+
+    def stats(self) -> dict:
+        lookups = self._hits + self._misses
+
+        return {
+            'enabled': self._enabled,
+            'shared_store': self._shared_store.mode if self._shared_store is not None else None,
+            'size': len(self._local_store),
+            'hits': self._hits,
+            'shared_hits': self._shared_hits,
+            'misses': self._misses,
+            'hit_ratio': round(self._hits / lookups, 4) if lookups else 0,
+            'shared_errors': self._shared_errors,
+        }
+
+
+activation_cache = ActivationCache(
+                        enabled=configuration.ACTIVATION_CACHE_ENABLED,
+                        capacity=configuration.ACTIVATION_CACHE_CAPACITY,
+                        ttl=configuration.ACTIVATION_CACHE_TTL,
+                        shared_store=RedisActivationStore(url=configuration.ACTIVATION_CACHE_REDIS_URL)
+                                        if configuration.ACTIVATION_CACHE_REDIS_URL else None
+                    )
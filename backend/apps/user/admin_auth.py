@@ -0,0 +1,55 @@
+"""Admin key check of support staff endpoints.
+
+SENECA GLOBAL CONFIDENTIAL & PROPRIETARY
+
+@file admin_auth.py
+@author Dilip Kumar Sharma
+@copyright Seneca Global
+@date 18th Oct 2026
+
+About; -
+--------
+    Keeps endpoints which change many accounts at once, such as bulk sign up, bulk
+    activation and purge, away from customers.
+
+Working; -
+----------
+    A request must carry 'X-Admin-Key' header matching ADMIN_API_KEY, compared in
+    constant time. When ADMIN_API_KEY is not configured, these endpoints are disabled
+    and every request is rejected.
+
+Uses; -
+-------
+    This module is used by bulk sign up and bulk activation endpoints.
+"""
+
+import hmac
+from functools import wraps
+from flask import request
+from apps import configuration
+from utils.http_status import HttpStatus
+from utils.insurance_logger import InsuranceLogger
+
+
+def admin_key_required(func):
+    """Reject requests without X-Admin-Key header matching ADMIN_API_KEY, and all requests when it is not configured."""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        admin_api_key = configuration.ADMIN_API_KEY
+
+        if not admin_api_key:
+            InsuranceLogger.log_warning("Rejected admin request as ADMIN_API_KEY is not configured.")
+
+            return {
+                        "status": "FORBIDDEN",
+                        "reason": "Admin api is disabled."
+                    }, HttpStatus.HTTP_403_FORBIDDEN
+
+        if not hmac.compare_digest(request.headers.get('X-Admin-Key', '').encode(), admin_api_key.encode()):
+            return {
+                        "status": "FORBIDDEN",
+                        "reason": "Admin key is missing or invalid."
+                    }, HttpStatus.HTTP_403_FORBIDDEN
+
+        return func(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,309 @@
+"""Admission control of api requests.
+
+SENECA GLOBAL CONFIDENTIAL & PROPRIETARY
+
+@file admission.py
+@author Dilip Kumar Sharma
+@copyright Seneca Global
+@date 18th Oct 2026
+
+About; -
+--------
+    Sheds load before a request reaches the endpoint, so a burst of sign ups is
+    rejected in microseconds instead of queueing behind slow password hashing.
+
+Working; -
+----------
+    Limits are configured per namespace in ADMISSION_LIMITS, a request is matched with
+    the longest namespace its path starts with. Every limit of a namespace is optional.
+
+    shed_when_saturated : '503 Service Unavailable' when password hashing queue or
+                          database connection pool is filled beyond
+                          ADMISSION_HASH_QUEUE_SATURATION / ADMISSION_DB_POOL_SATURATION.
+    max_in_flight       : '503 Service Unavailable' when these many requests of the
+                          namespace are already being served by the worker.
+    ip_rate, ip_burst   : '429 Too Many Requests' from token bucket of client ip.
+    email_rate,
+    email_burst         : '429 Too Many Requests' from token bucket of email_address of
+                          json body.
+
+    Client ip is the address of the connection. Behind ADMISSION_TRUSTED_PROXIES proxies
+    it is the X-Forwarded-For entry appended by the outermost of them; entries left of it
+    come from the client and are never used.
+
+    Every rejection has a Retry-After header. Checks are done in the above order, so a
+    request rejected for load does not take tokens of the client.
+
+    Limits and counters are per gunicorn worker. Counters are exposed by metrics endpoint.
+
+Uses; -
+-------
+    This module is used by user blueprint.
+
+Reference; -
+------------
+    https://www.rfc-editor.org/rfc/rfc6585#section-4
+    https://www.rfc-editor.org/rfc/rfc9110#section-10.2.3
+"""
+
+import math
+import threading
+from flask import g, request
+from apps import db, configuration
+from apps.user.request_payload import load_request_payload
+from utils.rate_limiter import TokenBucketLimiter
+from utils.security import get_password_hasher
+from utils.http_status import HttpStatus
+from utils.insurance_logger import InsuranceLogger
+
+
+LIMIT_KEYS = ('ip_rate', 'ip_burst', 'email_rate', 'email_burst', 'max_in_flight', 'shed_when_saturated')
+
+
+class NamespaceAdmission:
+    """Limits and counters of a namespace.
+
+    Args:
+        name (str): Name of the namespace
+        limits (dict): Limits of the namespace, keys are LIMIT_KEYS
+        max_tracked_keys (int): Maximum token buckets kept per limiter
+    """
+    def __init__(self, name: str, limits: dict, max_tracked_keys: int) -> None:
+        unknown = set(limits) - set(LIMIT_KEYS)
+
+        if unknown:
+            raise ValueError(f"Invalid admission limits {sorted(unknown)} for namespace '{name}'.")
+
+        self.name = name
+        self.max_in_flight = limits.get('max_in_flight')
+        self.shed_when_saturated = limits.get('shed_when_saturated', False)
+        self.ip_limiter = None
+        self.email_limiter = None
+
+        if 'ip_rate' in limits:
+            self.ip_limiter = TokenBucketLimiter(limits['ip_rate'], limits.get('ip_burst', 1), max_tracked_keys)
+
+        if 'email_rate' in limits:
+            self.email_limiter = TokenBucketLimiter(limits['email_rate'], limits.get('email_burst', 1), max_tracked_keys)
+
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.counters = {
+            'admitted': 0,
+            'rejected_saturated': 0,
+            'rejected_in_flight': 0,
+            'rejected_ip': 0,
+            'rejected_email': 0,
+        }
+
+    def stats(self) -> dict:
+        return {
+            **self.counters,
+            'in_flight': self.in_flight,
+            'peak_in_flight': self.peak_in_flight,
+            'max_in_flight': self.max_in_flight,
+            'tracked_ips': len(self.ip_limiter) if self.ip_limiter is not None else 0,
+            'tracked_emails': len(self.email_limiter) if self.email_limiter is not None else 0,
+        }
+
+
+class AdmissionController:
+    """Admits or rejects requests of a blueprint.
+
+    Args:
+        enabled (bool): Whether requests are checked at all
+        limits (dict): Limits per namespace
+        max_tracked_keys (int): Maximum token buckets kept per limiter
+        trusted_proxies (int): Number of proxies in front of the app appending to X-Forwarded-For, 0 to ignore it
+        retry_after (int): Retry-After seconds of '503 Service Unavailable' responses
+        hash_queue_saturation (float): Fraction of password hashing queue considered saturated
+        db_pool_saturation (float): Fraction of database connection pool considered saturated
+    """
+    def __init__(self, enabled: bool, limits: dict, max_tracked_keys: int, trusted_proxies: int,
+                 retry_after: int, hash_queue_saturation: float, db_pool_saturation: float) -> None:
+        self._enabled = enabled
+        self._trusted_proxies = trusted_proxies
+        self._retry_after = retry_after
+        self._hash_queue_saturation = hash_queue_saturation
+        self._db_pool_saturation = db_pool_saturation
+        self._url_prefix = ''
+
+        # Longest namespace is matched first, 'register/bulk' before 'register'
+        self._namespaces = [
+            NamespaceAdmission(name=name.strip('/'), limits=namespace_limits, max_tracked_keys=max_tracked_keys)
+            for name, namespace_limits in sorted(limits.items(), key=lambda item: len(item[0].strip('/')), reverse=True)
+        ]
+
+        self._lock = threading.Lock()
+
+    def init_blueprint(self, blueprint) -> None:
+        """Check every request of the blueprint.
+
+        Args:
+            blueprint (Blueprint): Blueprint whose namespaces are limited
+        """
+        self._url_prefix = blueprint.url_prefix or ''
+        blueprint.before_request(self.admit)
+        blueprint.teardown_request(self.release)
+
+    def _match(self, path: str) -> NamespaceAdmission:
+        if not path.startswith(self._url_prefix):
+            return None
+
+        path = path[len(self._url_prefix):].strip('/')
+
+        for namespace in self._namespaces:
+            if path == namespace.name or path.startswith(namespace.name + '/'):
+                return namespace
+
+        return None
+
+    def client_ip(self) -> str:
+        """Ip of the client of current request."""
+        if self._trusted_proxies:
+            # Entries left of those appended by our proxies are sent by the client, who may forge them
+            forwarded_for = [ip.strip() for ip in request.headers.get('X-Forwarded-For', '').split(',') if ip.strip()]
+
+            if len(forwarded_for) >= self._trusted_proxies:
+                return forwarded_for[-self._trusted_proxies]
+
+        return request.remote_addr or ''
+
+    @staticmethod
+    def _email_address() -> str:
+        if not request.is_json:
+            return None
+
+        # Decoded once, endpoint reuses the same payload
+        is_success, _, payload = load_request_payload()
+
+        if not is_success or not isinstance(payload.data, dict):
+            return None
+
+        email_address = payload.data.get('email_address')
+
+        return email_address.strip().lower() if isinstance(email_address, str) else None
+
+    def _saturation(self) -> str:
+        """Resource which is saturated, None otherwise."""
+        password_hasher = get_password_hasher()
+
+        if password_hasher.max_pending and password_hasher.queue_depth >= password_hasher.max_pending * self._hash_queue_saturation:
+            return "password hashing queue"
+
+        pool = db.engine.pool
+        max_overflow = getattr(pool, '_max_overflow', 0)
+
+        # Only QueuePool has a fixed capacity, negative overflow means unlimited
+        if hasattr(pool, 'checkedout') and max_overflow >= 0:
+            capacity = pool.size() + max_overflow
+
+            if capacity and pool.checkedout() >= capacity * self._db_pool_saturation:
+                return "database connection pool"
+
+        return None
+
+    def _reject(self, namespace: NamespaceAdmission, counter: str, http_status: int, reason: str, retry_after: float) -> tuple:
+        with self._lock:
+            namespace.counters[counter] += 1
+
+        InsuranceLogger.log_debug(f"Request to '{namespace.name}' is rejected. {reason}")
+
+        return {
+                    "status": "TOO-MANY-REQUESTS" if http_status == HttpStatus.HTTP_429_TOO_MANY_REQUESTS else "SERVICE-UNAVAILABLE",
+                    "reason": reason
+                }, http_status, {'Retry-After': str(max(1, math.ceil(retry_after)))}
+
+    def admit(self):
+        """Reject request if a limit of its namespace is exceeded.
+
+        Returns:
+            tuple: Response, http status code and headers if rejected, otherwise None
+        """
+        if not self._enabled:
+            return None
+
+        namespace = self._match(request.path)
+
+        if namespace is None:
+            return None
+
+        if namespace.shed_when_saturated:
+            resource = self._saturation()
+
+            if resource is not None:
+                return self._reject(namespace, 'rejected_saturated', HttpStatus.HTTP_503_SERVICE_UNAVAILABLE,
+                                    f"Server is busy ({resource}). Please try again later.", self._retry_after)
+
+        with self._lock:
+            rejected = namespace.max_in_flight is not None and namespace.in_flight >= namespace.max_in_flight
+
+            if not rejected:
+                namespace.in_flight += 1
+                namespace.peak_in_flight = max(namespace.peak_in_flight, namespace.in_flight)
+
+        if rejected:
+            return self._reject(namespace, 'rejected_in_flight', HttpStatus.HTTP_503_SERVICE_UNAVAILABLE,
+                                "Server is busy. Please try again later.", self._retry_after)
+
+        # Released by teardown even if a bucket rejects the request below
+        g.admission_namespace = namespace
+
+        if namespace.ip_limiter is not None:
+            allowed, retry_after = namespace.ip_limiter.acquire(self.client_ip())
+
+            if not allowed:
+                return self._reject(namespace, 'rejected_ip', HttpStatus.HTTP_429_TOO_MANY_REQUESTS,
+                                    "Too many requests. Please try again later.", retry_after)
+
+        if namespace.email_limiter is not None:
+            email_address = self._email_address()
+
+            if email_address is not None:
+                allowed, retry_after = namespace.email_limiter.acquire(email_address)
+
+                if not allowed:
+                    return self._reject(namespace, 'rejected_email', HttpStatus.HTTP_429_TOO_MANY_REQUESTS,
+                                        "Too many requests for this email. Please try again later.", retry_after)
+
+        with self._lock:
+            namespace.counters['admitted'] += 1
+
+        return None
+
+    def release(self, exc=None) -> None:
+        """Request admitted by admit() is no more in flight."""
+        namespace = g.pop('admission_namespace', None)
+
+        if namespace is not None:
+            with self._lock:
+                namespace.in_flight -= 1
+
+    def clear(self) -> None:
+        """Forget token buckets of all clients."""
+        for namespace in self._namespaces:
+            for limiter in (namespace.ip_limiter, namespace.email_limiter):
+                if limiter is not None:
+                    limiter.clear()
+
+    def stats(self) -> dict:
+        """Counters of every namespace.
+
+        Returns:
+            dict: Admission statistics
+        """
+        return {
+            'enabled': self._enabled,
+            'namespaces': {namespace.name: namespace.stats() for namespace in self._namespaces},
+        }
+
+
+admission_controller = AdmissionController(
+                            enabled=configuration.ADMISSION_ENABLED,
+                            limits=configuration.ADMISSION_LIMITS,
+                            max_tracked_keys=configuration.ADMISSION_MAX_TRACKED_KEYS,
+                            trusted_proxies=configuration.ADMISSION_TRUSTED_PROXIES,
+                            retry_after=configuration.ADMISSION_RETRY_AFTER,
+                            hash_queue_saturation=configuration.ADMISSION_HASH_QUEUE_SATURATION,
+                            db_pool_saturation=configuration.ADMISSION_DB_POOL_SATURATION
+                        )
@@ -1,7 +1,11 @@
 from flask import render_template
 from flask_restx import Resource, fields, Namespace
 from apps.user.forms import UserBlacklistForm
-from apps.user.dao import BlacklistDao
+from apps.user.dao import BlacklistDao, ALREADY_BLACKLISTED
+from apps.user.schema_validation import validate_schema
+from apps.user.validator_compiler import compile_model
+from apps.user.idempotency import idempotent
+from apps.user.unit_of_work import unit_of_work
 from utils.insurance_logger import InsuranceLogger
 from utils.http_status import HttpStatus
 
@@ -28,6 +32,10 @@ blacklist_api_request_model = blacklist_ns.model(
     },
 )
 
+# Compiled once, validates every blacklist request instead of flask-restx.
+# Form posts its csrf_token too, restx allowed attributes not in the model
+blacklist_payload_validator = compile_model(blacklist_api_request_model, allow_unexpected=True)
+
 blacklist_post_response_model_400 = blacklist_ns.model(
     "BlacklistPostResponseModel400",
     {
@@ -39,6 +47,12 @@ blacklist_post_response_model_400 = blacklist_ns.model(
     },
 )
 
+def already_blacklisted(email_address: str) -> tuple:
+    return {
+                "status": "Success",
+                "reason": "Email '{}' is already blacklisted.".format(email_address)
+            }, HttpStatus.HTTP_200_OK
+
 @blacklist_ns.route('/')
 class Blacklist(Resource):
     """
@@ -49,7 +63,10 @@ class Blacklist(Resource):
         response: Status code and message in Json format
     """
     # POST
-    @blacklist_ns.expect(blacklist_api_request_model, validate=True)
+    @blacklist_ns.expect(blacklist_api_request_model)
+    @blacklist_ns.doc(
+        params={'Idempotency-Key': {'in': 'header', 'description': 'Unique key of the request, retries with same key get the first response'}}
+    )
     @blacklist_ns.response(
         code=HttpStatus.HTTP_200_OK,
         description="Blacklisting is successful",
@@ -59,6 +76,9 @@ class Blacklist(Resource):
         description="Validation Error",
         model=blacklist_post_response_model_400,
     )
+    @idempotent('blacklist')
+    @validate_schema(blacklist_payload_validator)
+    @unit_of_work()
     def post(self):
         """
         This is the blacklisting.
@@ -84,15 +104,15 @@ class Blacklist(Resource):
                             "reason": message
                         }, HttpStatus.HTTP_500_INTERNAL_SERVER_ERROR
             elif result is not None:
-                return {
-                            "status": "Success",
-                            "reason": "Email '{}' is already blacklisted.".format(email_address)
-                        }, HttpStatus.HTTP_200_OK
+                return already_blacklisted(email_address)
             else:   # black list email
                 is_success, message, result = BlacklistDao.add_blacklist(
                                                             email_address = email_address
                 )
-                if not is_success:
+                if not is_success and message == ALREADY_BLACKLISTED:
+                    # Blacklisted by a concurrent request after the check
+                    return already_blacklisted(email_address)
+                elif not is_success:
                     return {
                                 "status": "INTERNAL-SERVER-ERROR",
                                 "reason": message
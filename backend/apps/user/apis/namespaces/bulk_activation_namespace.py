@@ -0,0 +1,220 @@
+import codecs
+from flask import request, Response, stream_with_context, url_for
+from flask_restx import Resource, Namespace, fields
+from apps import configuration
+from apps.user.request_payload import load_request_payload
+from apps.user.bulk_activation import BulkActivation, read_email_rows, read_json_rows, JSON_CONTENT_TYPE
+from apps.user.bulk_registration import NDJSON_CONTENT_TYPE
+from apps.user.account_purge import account_purge
+from apps.user.admin_auth import admin_key_required
+from utils.http_status import HttpStatus
+from utils.insurance_logger import InsuranceLogger
+
+
+bulk_activation_ns = Namespace('admin/accounts', description='Account operations of support staff')
+
+bulk_activation_response_model_400 = bulk_activation_ns.model(
+    "BulkActivationResponseModel400",
+    {
+        "status": fields.String(
+            required=True,
+            description="Status of the request",
+            example="VALIDATION-ERROR",
+        ),
+        "reason": fields.String(
+            required=True,
+            description="Response message from API for invalid request",
+            example="content-type application/xml is not supported.",
+        )
+    },
+)
+
+def change_activations(activated: bool):
+    """Stream outcome of every email of the request body as NDJSON.
+
+    Args:
+        activated (bool): True to activate, False to deactivate
+
+    Returns:
+        response: Outcome of every email in NDJSON format, or validation error in Json format
+    """
+    if request.mimetype == JSON_CONTENT_TYPE:
+        is_success, message, payload = load_request_payload()
+
+        if is_success:
+            is_success, message, rows = read_json_rows(payload.data)
+    else:
+        lines = codecs.iterdecode(request.stream, request.mimetype_params.get('charset', 'utf-8'))
+
+        is_success, message, rows = read_email_rows(request.mimetype, lines)
+
+    if not is_success:
+        InsuranceLogger.log_error(message)
+
+        return {
+                    "status": "VALIDATION-ERROR",
+                    "reason": message
+                }, HttpStatus.HTTP_400_BAD_REQUEST
+
+    InsuranceLogger.log_info(f"Received bulk {'activation' if activated else 'deactivation'} of content type {request.mimetype}.")
+
+    bulk_activation = BulkActivation(activated=activated, chunk_size=configuration.BULK_ACTIVATION_CHUNK_SIZE)
+
+    return Response(
+                stream_with_context(bulk_activation.change_as_ndjson(rows)),
+                status=HttpStatus.HTTP_200_OK,
+                mimetype=NDJSON_CONTENT_TYPE
+            )
+
+BODY_DESCRIPTION = "Body is either Json ('application/json') {\"email_addresses\": [...]}, NDJSON ('application/x-ndjson') " \
+                   "with one email or {\"email_address\": ...} per line, CSV ('text/csv') with 'email_address' column, " \
+                   "or plain text ('text/plain') with one email per line."
+
+@bulk_activation_ns.route('/activate')
+class BulkActivate(Resource):
+    """
+    This is the bulk activation api endpoint.
+    This lets support staff activate many accounts at once, e.g. after a mail outage.
+
+    Returns:
+        response: Outcome of every email in NDJSON format
+    """
+    # POST
+    @bulk_activation_ns.doc(
+        description=BODY_DESCRIPTION,
+        params={'X-Admin-Key': {'in': 'header', 'description': 'Admin key, admin api is disabled when ADMIN_API_KEY is not configured'}}
+    )
+    @bulk_activation_ns.response(
+        code=HttpStatus.HTTP_200_OK,
+        description="Outcome of every email followed by a summary line, streamed as NDJSON",
+    )
+    @bulk_activation_ns.response(
+        code=HttpStatus.HTTP_400_BAD_REQUEST,
+        description="Validation Error",
+        model=bulk_activation_response_model_400,
+    )
+    @bulk_activation_ns.response(
+        code=HttpStatus.HTTP_403_FORBIDDEN,
+        description="Admin key is missing or invalid, or admin api is disabled",
+    )
+    @admin_key_required
+    def post(self):
+        """
+        This is the bulk activation api endpoint.
+        Activated customers get a welcome email.
+
+        Returns:
+            response: Outcome of every email in NDJSON format
+        """
+        return change_activations(activated=True)
+
+
+@bulk_activation_ns.route('/deactivate')
+class BulkDeactivate(Resource):
+    """
+    This is the bulk deactivation api endpoint.
+    This lets support staff deactivate many accounts at once.
+
+    Returns:
+        response: Outcome of every email in NDJSON format
+    """
+    # POST
+    @bulk_activation_ns.doc(
+        description=BODY_DESCRIPTION,
+        params={'X-Admin-Key': {'in': 'header', 'description': 'Admin key, admin api is disabled when ADMIN_API_KEY is not configured'}}
+    )
+    @bulk_activation_ns.response(
+        code=HttpStatus.HTTP_200_OK,
+        description="Outcome of every email followed by a summary line, streamed as NDJSON",
+    )
+    @bulk_activation_ns.response(
+        code=HttpStatus.HTTP_400_BAD_REQUEST,
+        description="Validation Error",
+        model=bulk_activation_response_model_400,
+    )
+    @bulk_activation_ns.response(
+        code=HttpStatus.HTTP_403_FORBIDDEN,
+        description="Admin key is missing or invalid, or admin api is disabled",
+    )
+    @admin_key_required
+    def post(self):
+        """
+        This is the bulk deactivation api endpoint.
+
+        Returns:
+            response: Outcome of every email in NDJSON format
+        """
+        return change_activations(activated=False)
+
+
+@bulk_activation_ns.route('/purge')
+class Purge(Resource):
+    """
+    This is the purge api endpoint.
+    This deletes accounts whose confirmation link expired without being clicked.
+
+    Returns:
+        response: Status code and message in Json format
+    """
+    # POST
+    @bulk_activation_ns.doc(
+        params={
+            'dry_run': {'in': 'query', 'description': "'true' to only count accounts which would be purged"},
+            'X-Admin-Key': {'in': 'header', 'description': 'Admin key, admin api is disabled when ADMIN_API_KEY is not configured'}
+        }
+    )
+    @bulk_activation_ns.response(
+        code=HttpStatus.HTTP_202_ACCEPTED,
+        description="Purge is started in background",
+    )
+    @bulk_activation_ns.response(
+        code=HttpStatus.HTTP_403_FORBIDDEN,
+        description="Admin key is missing or invalid, or admin api is disabled",
+    )
+    @bulk_activation_ns.response(
+        code=HttpStatus.HTTP_409_CONFLICT,
+        description="Purge is already running in this worker",
+    )
+    @admin_key_required
+    def post(self):
+        """
+        This starts purge of unactivated accounts in background.
+
+        Returns:
+            response: Status code and message in Json format
+        """
+        dry_run = request.args.get('dry_run', '').lower() in ('1', 'true', 'yes')
+
+        if not account_purge.start(dry_run=dry_run):
+            return {
+                        "status": "CONFLICT",
+                        "reason": "Purge is already running."
+                    }, HttpStatus.HTTP_409_CONFLICT
+
+        InsuranceLogger.log_info(f"Started {'dry run of ' if dry_run else ''}purge of unactivated accounts.")
+
+        status_url = url_for('api.admin/accounts_purge')
+
+        return {
+                    "status": "ACCEPTED",
+                    "reason": "Purge is started.",
+                    "status_url": status_url
+                }, HttpStatus.HTTP_202_ACCEPTED, {'Location': status_url}
+
+    # GET
+    @bulk_activation_ns.doc(
+        params={'X-Admin-Key': {'in': 'header', 'description': 'Admin key, admin api is disabled when ADMIN_API_KEY is not configured'}}
+    )
+    @bulk_activation_ns.response(
+        code=HttpStatus.HTTP_200_OK,
+        description="Progress of last purge of this worker",
+    )
+    @admin_key_required
+    def get(self):
+        """
+        This tells progress of last purge of this worker.
+
+        Returns:
+            response: Progress in Json format
+        """
+        return account_purge.stats(), HttpStatus.HTTP_200_OK
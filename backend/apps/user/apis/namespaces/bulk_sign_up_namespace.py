@@ -0,0 +1,87 @@
+import codecs
+from flask import request, Response, stream_with_context
+from flask_restx import Resource, Namespace, fields
+from apps import configuration
+from apps.user.admin_auth import admin_key_required
+from apps.user.bulk_registration import BulkRegistration, read_rows, NDJSON_CONTENT_TYPE
+from utils.http_status import HttpStatus
+from utils.insurance_logger import InsuranceLogger
+
+
+bulk_sign_up_ns = Namespace('register/bulk', description='Bulk Sign Up related operations')
+
+bulk_sign_up_post_response_model_400 = bulk_sign_up_ns.model(
+    "BulkSignUpPostResponseModel400",
+    {
+        "status": fields.String(
+            required=True,
+            description="Status of the request",
+            example="VALIDATION-ERROR",
+        ),
+        "reason": fields.String(
+            required=True,
+            description="Response message from API for invalid request",
+            example="content-type application/json is not supported.",
+        )
+    },
+)
+
+@bulk_sign_up_ns.route('/')
+class BulkUser(Resource):
+    """
+    This is the bulk user registration api endpoint.
+    This lets support staff sign up many users at once.
+
+    Returns:
+        response: Result of every row in NDJSON format
+    """
+    # POST
+
+    @bulk_sign_up_ns.doc(
+        description="Body is either NDJSON ('application/x-ndjson') with one sign up payload per line, "
+                    "or CSV ('text/csv') with header 'customer_name,email_address,insurance_plan_name,insured_amount'.",
+        params={'X-Admin-Key': {'in': 'header', 'description': 'Admin key, admin api is disabled when ADMIN_API_KEY is not configured'}}
+    )
+    @bulk_sign_up_ns.response(
+        code=HttpStatus.HTTP_200_OK,
+        description="Result of every row followed by a summary line, streamed as NDJSON",
+    )
+    @bulk_sign_up_ns.response(
+        code=HttpStatus.HTTP_400_BAD_REQUEST,
+        description="Validation Error",
+        model=bulk_sign_up_post_response_model_400,
+    )
+    @bulk_sign_up_ns.response(
+        code=HttpStatus.HTTP_403_FORBIDDEN,
+        description="Admin key is missing or invalid, or admin api is disabled",
+    )
+    @admin_key_required
+    def post(self):
+        """
+        This is the bulk user registration api endpoint.
+        Rows are registered in chunks while the body is being read.
+
+        Returns:
+            response: Result of every row in NDJSON format
+        """
+        lines = codecs.iterdecode(request.stream, request.mimetype_params.get('charset', 'utf-8'))
+
+        is_success, message, rows = read_rows(request.mimetype, lines)
+
+        if not is_success:
+            InsuranceLogger.log_error(message)
+
+            return {
+                        "status": "VALIDATION-ERROR",
+                        "reason": message
+                    }, HttpStatus.HTTP_400_BAD_REQUEST
+
+        InsuranceLogger.log_info(f"Received bulk registration of content type {request.mimetype}.")
+
+        bulk_registration = BulkRegistration(chunk_size=configuration.BULK_REGISTRATION_CHUNK_SIZE)
+
+        return Response(
+                    stream_with_context(bulk_registration.register_as_ndjson(rows)),
+                    status=HttpStatus.HTTP_200_OK,
+                    mimetype=NDJSON_CONTENT_TYPE
+                )
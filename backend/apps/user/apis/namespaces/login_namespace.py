@@ -0,0 +1,294 @@
+import math
+from flask import g
+from flask_restx import Resource, Namespace, fields
+from apps import configuration
+from apps.user.schema_validation import validate_schema
+from apps.user.request_payload import get_request_payload
+from apps.user.validator_compiler import compile_model
+from apps.user.unit_of_work import unit_of_work
+from apps.user.admission import admission_controller
+from apps.user.login import authenticate, LoginStatus
+from apps.user.auth_tokens import issue_tokens, refresh_tokens, revoke_tokens, bearer_token, token_required, INVALID_REFRESH_TOKEN
+from utils.http_status import HttpStatus
+from utils.insurance_logger import InsuranceLogger
+
+
+login_ns = Namespace('login', description='Login related operations')
+
+login_api_request_model = login_ns.model(
+    'Login',
+    {
+        'email_address': fields.String(
+                required=True,
+                description='Email of Customer',
+                example="user@senecaglobal.com",
+                min_length=10,
+                max_length=40,
+        ),
+        'password': fields.String(
+                required=True,
+                description='Password received in verification email',
+                example="Kx8#pLm2Qw9z",
+                min_length=1,
+                max_length=100,
+        ),
+    },
+)
+
+# Compiled once, validates every login request instead of flask-restx
+login_payload_validator = compile_model(login_api_request_model)
+
+refresh_api_request_model = login_ns.model(
+    'Refresh',
+    {
+        'refresh_token': fields.String(
+                required=True,
+                description='Refresh token received at login or last refresh',
+                min_length=1,
+                max_length=500,
+        ),
+    },
+)
+
+refresh_payload_validator = compile_model(refresh_api_request_model)
+
+login_post_response_model_400 = login_ns.model(
+    "LoginPostResponseModel400",
+    {
+        "message": fields.String(
+            required=True,
+            description="Response message from API for invalid request",
+            example="Input payload validation failed",
+        )
+    },
+)
+
+@login_ns.route('/')
+class Login(Resource):
+    """
+    This is the customer login api endpoint.
+    This lets a customer log in with email and the password received in verification email.
+
+    Returns:
+        response: Status code and message in Json format
+    """
+    # POST
+    @login_ns.expect(login_api_request_model)
+    @login_ns.response(
+        code=HttpStatus.HTTP_200_OK,
+        description="Login is successful",
+    )
+    @login_ns.response(
+        code=HttpStatus.HTTP_400_BAD_REQUEST,
+        description="Validation Error",
+        model=login_post_response_model_400,
+    )
+    @login_ns.response(
+        code=HttpStatus.HTTP_401_UNAUTHORIZED,
+        description="Email or password is incorrect",
+    )
+    @login_ns.response(
+        code=HttpStatus.HTTP_403_FORBIDDEN,
+        description="Account is not activated yet",
+    )
+    @login_ns.response(
+        code=HttpStatus.HTTP_429_TOO_MANY_REQUESTS,
+        description="Too many login attempts of the email or client",
+    )
+    @login_ns.response(
+        code=HttpStatus.HTTP_503_SERVICE_UNAVAILABLE,
+        description="Password checks are queued to their limit",
+    )
+    @validate_schema(login_payload_validator)
+    @unit_of_work()
+    def post(self):
+        """
+        This is the customer login api endpoint.
+
+        Returns:
+            response: Status code and message in Json format
+        """
+        input_data = get_request_payload()
+        email_address = input_data['email_address']
+
+        InsuranceLogger.log_info(f"Received login of user with email {email_address}.")
+
+        is_success, message, login = authenticate(
+                                            email_address=email_address,
+                                            password=input_data['password'],
+                                            client_ip=admission_controller.client_ip()
+                                        )
+
+        if not is_success:
+            return {
+                        "status": "INTERNAL-SERVER-ERROR",
+                        "reason": message
+                    }, HttpStatus.HTTP_500_INTERNAL_SERVER_ERROR
+        elif login.status == LoginStatus.BUSY:
+            return {
+                        "status": "SERVICE-UNAVAILABLE",
+                        "reason": "Server is busy. Please try again later."
+                    }, HttpStatus.HTTP_503_SERVICE_UNAVAILABLE, {'Retry-After': str(configuration.ADMISSION_RETRY_AFTER)}
+        elif login.status == LoginStatus.THROTTLED:
+            return {
+                        "status": "TOO-MANY-REQUESTS",
+                        "reason": "Too many login attempts. Please try again later."
+                    }, HttpStatus.HTTP_429_TOO_MANY_REQUESTS, {'Retry-After': str(max(1, math.ceil(login.retry_after)))}
+        elif login.status == LoginStatus.INVALID_CREDENTIALS:
+            return {
+                        "status": "INVALID-CREDENTIALS",
+                        "reason": "Email or password is incorrect."
+                    }, HttpStatus.HTTP_401_UNAUTHORIZED
+        elif login.status == LoginStatus.NOT_ACTIVATED:
+            return {
+                        "status": "NOT-ACTIVATED",
+                        "reason": "Please verify your email '{}' before logging in.".format(email_address)
+                    }, HttpStatus.HTTP_403_FORBIDDEN
+
+        is_success, message, tokens = issue_tokens(user_id=login.user_id, email_address=email_address)
+
+        if not is_success:
+            return {
+                        "status": "INTERNAL-SERVER-ERROR",
+                        "reason": message
+                    }, HttpStatus.HTTP_500_INTERNAL_SERVER_ERROR
+
+        return {
+                    "status": "Success",
+                    "reason": "Welcome {}.".format(login.customer_name),
+                    **tokens
+                }, HttpStatus.HTTP_200_OK
+
+
+def _refresh_failure(message: str) -> tuple:
+    if message == INVALID_REFRESH_TOKEN:
+        return {
+                    "status": "INVALID-TOKEN",
+                    "reason": message
+                }, HttpStatus.HTTP_401_UNAUTHORIZED
+
+    return {
+                "status": "INTERNAL-SERVER-ERROR",
+                "reason": message
+            }, HttpStatus.HTTP_500_INTERNAL_SERVER_ERROR
+
+
+@login_ns.route('/refresh')
+class Refresh(Resource):
+    """
+    This exchanges a refresh token for new access and refresh tokens.
+    A refresh token can be used only once.
+
+    Returns:
+        response: Status code and message in Json format
+    """
+    # POST
+    @login_ns.expect(refresh_api_request_model)
+    @login_ns.response(
+        code=HttpStatus.HTTP_200_OK,
+        description="New tokens are issued",
+    )
+    @login_ns.response(
+        code=HttpStatus.HTTP_400_BAD_REQUEST,
+        description="Validation Error",
+        model=login_post_response_model_400,
+    )
+    @login_ns.response(
+        code=HttpStatus.HTTP_401_UNAUTHORIZED,
+        description="Refresh token is invalid, expired or already used",
+    )
+    @validate_schema(refresh_payload_validator)
+    def post(self):
+        """
+        This exchanges a refresh token for new access and refresh tokens.
+
+        Returns:
+            response: Status code and message in Json format
+        """
+        is_success, message, tokens = refresh_tokens(get_request_payload()['refresh_token'])
+
+        if not is_success:
+            return _refresh_failure(message)
+
+        return {
+                    "status": "Success",
+                    **tokens
+                }, HttpStatus.HTTP_200_OK
+
+
+@login_ns.route('/logout')
+class Logout(Resource):
+    """
+    This revokes the refresh token and the access token given in Authorization header.
+
+    Returns:
+        response: Status code and message in Json format
+    """
+    # POST
+    @login_ns.expect(refresh_api_request_model)
+    @login_ns.response(
+        code=HttpStatus.HTTP_200_OK,
+        description="Tokens are revoked",
+    )
+    @login_ns.response(
+        code=HttpStatus.HTTP_400_BAD_REQUEST,
+        description="Validation Error",
+        model=login_post_response_model_400,
+    )
+    @login_ns.response(
+        code=HttpStatus.HTTP_401_UNAUTHORIZED,
+        description="Refresh token is invalid, expired or already used",
+    )
+    @validate_schema(refresh_payload_validator)
+    def post(self):
+        """
+        This revokes the refresh token and the access token given in Authorization header.
+
+        Returns:
+            response: Status code and message in Json format
+        """
+        is_success, message, _ = revoke_tokens(
+                                    refresh_token=get_request_payload()['refresh_token'],
+                                    access_token=bearer_token()
+                                )
+
+        if not is_success:
+            return _refresh_failure(message)
+
+        return {
+                    "status": "Success",
+                    "reason": "Logged out."
+                }, HttpStatus.HTTP_200_OK
+
+
+@login_ns.route('/me')
+class Me(Resource):
+    """
+    This tells who is logged in with the access token given in Authorization header.
+    The token is checked without database.
+
+    Returns:
+        response: Status code and message in Json format
+    """
+    # GET
+    @login_ns.response(
+        code=HttpStatus.HTTP_200_OK,
+        description="Customer of the access token",
+    )
+    @login_ns.response(
+        code=HttpStatus.HTTP_401_UNAUTHORIZED,
+        description="Access token is missing, invalid or expired",
+    )
+    @token_required
+    def get(self):
+        """
+        This tells who is logged in with the access token given in Authorization header.
+
+        Returns:
+            response: Status code and message in Json format
+        """
+        return {
+                    "status": "Success",
+                    "user_id": g.identity.user_id,
+                    "email_address": g.identity.email_address
+                }, HttpStatus.HTTP_200_OK
@@ -0,0 +1,61 @@
+from flask_restx import Resource, Namespace
+from apps import db
+from apps.user.admission import admission_controller
+from apps.user.blacklist_filter import blacklist_filter
+from apps.user.insurance_plan_catalog import insurance_plan_catalog
+from apps.user.activation_cache import activation_cache
+from apps.user.single_flight import single_flight_group
+from apps.user.login import login_latencies
+from apps.user.login_throttle import login_throttle
+import apps.user.auth_tokens as auth_tokens
+from apps.user.registration_jobs import registration_job_runner
+from apps.user.group_commit import registration_writer
+from apps.user.account_purge import account_purge
+import apps.user.idempotency as idempotency
+from utils.security import get_password_hasher
+from utils.email_sink import get_email_sink
+from utils.email_deliverability import get_email_deliverability_checker
+from utils.http_status import HttpStatus
+
+
+metrics_ns = Namespace('metrics', description='Counters of this gunicorn worker')
+
+@metrics_ns.route('/')
+class Metrics(Resource):
+    """
+    Counters of admission control, worker pools and caches.
+    Every gunicorn worker keeps its own counters.
+
+    Returns:
+        response: Counters in Json format
+    """
+    # GET
+    @metrics_ns.response(
+        code=HttpStatus.HTTP_200_OK,
+        description="Counters of this worker",
+    )
+    def get(self):
+        pool = db.engine.pool
+
+        return {
+                    "admission": admission_controller.stats(),
+                    "database_pool": {
+                        "class": type(pool).__name__,
+                        "status": pool.status(),
+                        "checked_out": pool.checkedout() if hasattr(pool, 'checkedout') else None,
+                    },
+                    "password_hasher": get_password_hasher().stats(),
+                    "sign_up_jobs": registration_job_runner.stats(),
+                    "group_commit": registration_writer.stats(),
+                    "idempotency": idempotency.stats(),
+                    "blacklist_filter": blacklist_filter.stats(),
+                    "insurance_plans": insurance_plan_catalog.stats(),
+                    "activation_cache": activation_cache.stats(),
+                    "single_flight": single_flight_group.stats(),
+                    "login": login_latencies.stats(),
+                    "login_throttle": login_throttle.stats(),
+                    "auth_tokens": auth_tokens.stats(),
+                    "account_purge": account_purge.stats(),
+                    "email_sink": get_email_sink().stats(),
+                    "email_deliverability": get_email_deliverability_checker().stats(),
+                }, HttpStatus.HTTP_200_OK
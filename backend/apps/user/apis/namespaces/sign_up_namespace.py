@@ -1,16 +1,18 @@
-import json
-import os
-from celery.result import AsyncResult
-from flask import render_template, request, jsonify, url_for
+from flask import url_for, Response, stream_with_context
 from flask_restx import Resource, Namespace, fields
-from apps.user.dao import UserInsuranceDao
+from apps.user.dao import ALREADY_REGISTERED
 from apps import configuration
 from apps.user.schema_validation import validate_schema
-from apps.user.data_validation import validate_data, check_blacklisting, is_already_registered
-from apps import celery
+from apps.user.request_payload import get_request_payload
+from apps.user.validator_compiler import compile_model
+from apps.user.data_validation import validate_data, check_registration_status, already_registered
+from apps.user.data_validation import validate_registration_data, registration_status_error
+from apps.user.registration_jobs import accept_async, job_status_response, job_events, registration_job_runner
+from apps.user.idempotency import idempotent
+from apps.user.unit_of_work import unit_of_work
+from apps.user.group_commit import registration_writer
+from apps.user.emails import send_verification_email
 from utils.password_helper import PasswordGenerator
-from utils.token import TokenHelper
-from utils.email import send_email
 from utils.http_status import HttpStatus
 from utils.insurance_logger import InsuranceLogger
 
@@ -52,6 +54,9 @@ sign_up_api_request_model = sign_up_ns.model(
     },
 )
 
+# Compiled once, validates every sign up request instead of flask-restx
+sign_up_payload_validator = compile_model(sign_up_api_request_model)
+
 sign_up_post_response_model_400 = sign_up_ns.model(
     "SignUpPostResponseModel400",
     {
@@ -63,6 +68,105 @@ sign_up_post_response_model_400 = sign_up_ns.model(
     },
 )
 
+def add_customer(input_data) -> tuple:
+    """Register customer whose data and registration status are already validated.
+
+    Args:
+        input_data: Registration attributes received in request
+
+    Returns:
+        tuple: response and http status code
+    """
+    customer_name = input_data['customer_name']
+    email_address = input_data['email_address']
+    insurance_plan_name = input_data['insurance_plan_name']
+    insured_amount = input_data['insured_amount']
+
+    InsuranceLogger.log_debug(
+        f"Received user registration with Customer Name {customer_name}, Email Address {email_address}, Insurance Plan Name {insurance_plan_name}, Insured Amount {insured_amount}."
+    )
+
+    # Customer has passed all validations, now proceed with customer
+    InsuranceLogger.log_info(f"Generating random password.")
+
+    password_generator = PasswordGenerator(configuration.PASSWORD_LENGTH)
+    is_success, message, password = password_generator.generate_password()
+
+    if not is_success:
+        return {
+                    "status": "INTERNAL-SERVER-ERROR",
+                    "reason": message
+                }, HttpStatus.HTTP_500_INTERNAL_SERVER_ERROR
+    
+    # Written together with concurrent sign ups when group commit is enabled
+    is_success, message, _ = registration_writer.add_user_insurance(
+        customer_name = customer_name,
+        email_address = email_address,
+        password = password,
+        insurance_plan_name = insurance_plan_name,
+        insured_amount = insured_amount
+    )
+
+    if not is_success and message == ALREADY_REGISTERED:
+        # Registered by a concurrent request after the registration status check
+        return already_registered(email_address)
+    elif not is_success:
+        return {
+                    "status": "INTERNAL-SERVER-ERROR",
+                    "reason": message
+                }, HttpStatus.HTTP_500_INTERNAL_SERVER_ERROR
+    
+    # User is created, verification email with password is sent once the unit of work commits
+    is_success, message, _ = send_verification_email(
+        customer_name = customer_name,
+        email_address = email_address,
+        password = password
+    )
+
+    if not is_success:
+        return {
+                    "status": "INTERNAL-SERVER-ERROR",
+                    "reason": message
+                }, HttpStatus.HTTP_500_INTERNAL_SERVER_ERROR
+
+    new_user = dict()
+
+    new_user['Customer Name'] = customer_name
+    new_user['Email Address'] = email_address
+    new_user['Insurance Plan'] = insurance_plan_name
+    new_user['Insurance Amount'] = insured_amount
+
+    InsuranceLogger.log_debug(
+        f"Returning response for newly registered user. {new_user}"
+    )
+
+    return new_user, HttpStatus.HTTP_201_CREATED
+
+@unit_of_work()
+def sign_up(input_data) -> tuple:
+    """Sign up pipeline after schema validation. Runs as background job for asynchronous sign up.
+
+    Args:
+        input_data: Registration attributes received in request
+
+    Returns:
+        tuple: response and http status code
+    """
+    valid, reason = validate_registration_data(input_data)
+
+    if not valid:
+        return {
+                    "status": "VALIDATION-ERROR",
+                    "reason": reason
+                }, HttpStatus.HTTP_400_BAD_REQUEST
+
+    error = registration_status_error(input_data['email_address'])
+
+    if error is not None:
+        return error
+
+    return add_customer(input_data)
+
 @sign_up_ns.route('/')
 class User(Resource):
     """
@@ -74,20 +178,30 @@ class User(Resource):
     """
     # POST
     
-    @sign_up_ns.expect(sign_up_api_request_model, validate=True)
+    @sign_up_ns.expect(sign_up_api_request_model)
+    @sign_up_ns.doc(
+        description="Send 'Prefer: respond-async' header to get '202 Accepted' with a status url instead of waiting for the registration.",
+        params={'Idempotency-Key': {'in': 'header', 'description': 'Unique key of the request, retries with same key get the first response'}}
+    )
     @sign_up_ns.response(
         code=HttpStatus.HTTP_201_CREATED,
         description="Sign Up is successful",
     )
+    @sign_up_ns.response(
+        code=HttpStatus.HTTP_202_ACCEPTED,
+        description="Sign Up is accepted and runs in background",
+    )
     @sign_up_ns.response(
         code=HttpStatus.HTTP_400_BAD_REQUEST,
         description="Validation Error",
         model=sign_up_post_response_model_400,
     )
-    @validate_schema
+    @idempotent('sign-up')
+    @validate_schema(sign_up_payload_validator)
+    @accept_async(sign_up)
+    @unit_of_work()
     @validate_data
-    @check_blacklisting
-    @is_already_registered
+    @check_registration_status
     def post(self):
         """
         This is the user registration api endpoint.
@@ -96,91 +210,72 @@ class User(Resource):
         Returns:
             response: Status code and message in Json format
         """
-        input_data = json.loads(request.data.decode('utf-8'))
-        
-        customer_name = input_data['customer_name']
-        email_address = input_data['email_address']
-        insurance_plan_name = input_data['insurance_plan_name']
-        insured_amount = input_data['insured_amount']
-
-        InsuranceLogger.log_debug(
-            f"Received user registration with Customer Name {customer_name}, Email Address {email_address}, Insurance Plan Name {insurance_plan_name}, Insured Amount {insured_amount}."
-        )
-
-        InsuranceLogger.log_info(f"Verifying if customer with email id {email_address} is already registered.")
+        return add_customer(get_request_payload())
 
-        # Customer has passed all validations, now proceed with customer
-        InsuranceLogger.log_info(f"Generating random password.")
+@sign_up_ns.route('/status/<string:job_id>', endpoint='sign_up_status')
+class SignUpStatus(Resource):
+    """
+    Status of asynchronous sign up.
 
-        password_generator = PasswordGenerator(configuration.PASSWORD_LENGTH)
-        is_success, message, password = password_generator.generate_password()
+    Returns:
+        response: Status of the job and response of sign up once completed
+    """
+    # GET
+    @sign_up_ns.response(
+        code=HttpStatus.HTTP_200_OK,
+        description="Status of sign up job",
+    )
+    @sign_up_ns.response(
+        code=HttpStatus.HTTP_404_NOT_FOUND,
+        description="Sign up job is not found",
+    )
+    def get(self, job_id):
+        is_success, message, job = registration_job_runner.get_job(job_id=job_id)
 
         if not is_success:
             return {
                         "status": "INTERNAL-SERVER-ERROR",
                         "reason": message
                     }, HttpStatus.HTTP_500_INTERNAL_SERVER_ERROR
-        
-        is_success, message, user_insurance = UserInsuranceDao.add_user_insurance(
-            customer_name = customer_name,
-            email_address = email_address,
-            password = password,
-            insurance_plan_name = insurance_plan_name,
-            insured_amount = insured_amount
-        )
-
-        if not is_success:
+        elif job is None:
             return {
-                        "status": "INTERNAL-SERVER-ERROR",
-                        "reason": message
-                    }, HttpStatus.HTTP_500_INTERNAL_SERVER_ERROR
-        
-        # User is created, now generate email token for the user
-        token_helper = TokenHelper()
+                        "status": "NOT-FOUND",
+                        "reason": "Sign up job '{}' is not found.".format(job_id)
+                    }, HttpStatus.HTTP_404_NOT_FOUND
 
-        InsuranceLogger.log_info(f"Generating confirmation token.")
-        is_success, message, token = token_helper.generate_confirmation_token(email=email_address)
+        return job_status_response(job), HttpStatus.HTTP_200_OK
 
-        if not is_success:
-            return {
-                        "status": "INTERNAL-SERVER-ERROR",
-                        "reason": message
-                    }, HttpStatus.HTTP_500_INTERNAL_SERVER_ERROR
-        
-        confirm_url = url_for('user.verify', token=token, _external=True)
-
-        html_template = render_template(
-                'verification.html', 
-                customer_name = customer_name, 
-                email_address = email_address,
-                password = password,
-                confirm_url=confirm_url
-            )
-
-        subject = "Please verify your email"
-
-        InsuranceLogger.log_info(f"Sending email to {email_address}.")
-
-        celery.send_task('email.send', (configuration.MAIL_DEFAULT_SENDER, email_address, subject, html_template))
-
-        # Also write mail template to text file temporarily, this should be removed later
-        file_path = os.path.abspath(os.path.dirname(__name__))
-        file_name = os.path.join(file_path, 'verification_email.txt')
-
-        InsuranceLogger.log_debug(f"Writing verification email template to file {file_name}.")
-
-        with open(file=file_name, mode='w') as f:
-            f.write(html_template)
-
-        new_user = dict()
+@sign_up_ns.route('/status/<string:job_id>/events', endpoint='sign_up_events')
+class SignUpEvents(Resource):
+    """
+    Status of asynchronous sign up as server-sent events.
 
-        new_user['Customer Name'] = user_insurance.user.customer_name
-        new_user['Email Address'] = email_address
-        new_user['Insurance Plan'] = user_insurance.insurance_plan.insurance_plan_name
-        new_user['Insurance Amount'] = user_insurance.insured_amount
+    Returns:
+        response: 'text/event-stream' with a 'status' event for every status change
+    """
+    # GET
+    @sign_up_ns.response(
+        code=HttpStatus.HTTP_200_OK,
+        description="Stream of status events, ends once job is completed",
+    )
+    @sign_up_ns.response(
+        code=HttpStatus.HTTP_503_SERVICE_UNAVAILABLE,
+        description="Too many event streams are open, poll status url instead",
+    )
+    def get(self, job_id):
+        if not registration_job_runner.open_event_stream():
+            return {
+                        "status": "SERVICE-UNAVAILABLE",
+                        "reason": "Too many event streams are open. Please poll status url instead."
+                    }, HttpStatus.HTTP_503_SERVICE_UNAVAILABLE, {'Location': url_for('api.sign_up_status', job_id=job_id)}
 
-        InsuranceLogger.log_debug(
-            f"Returning response for newly registered user. {new_user}"
-        )
+        response = Response(
+                        stream_with_context(job_events(job_id)),
+                        status=HttpStatus.HTTP_200_OK,
+                        mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache'}
+                    )
+        # Called even when client goes away before the stream starts
+        response.call_on_close(registration_job_runner.close_event_stream)
 
-        return jsonify(new_user), HttpStatus.HTTP_201_CREATED
+        return response
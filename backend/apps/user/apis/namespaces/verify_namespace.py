@@ -1,16 +1,11 @@
-import json
-import os
-from celery.result import AsyncResult
-from flask import render_template, request, jsonify, url_for
 from flask_restx import Resource, Namespace, fields
-from apps.user.dao import UserInsuranceDao, UserDao
-from apps import configuration
-from apps.user.schema_validation import validate_schema
-from apps.user.data_validation import validate_data
-from apps import celery
-from utils.password_helper import PasswordGenerator
-from utils.token import TokenHelper
-from utils.email import send_email
+from apps.user.dao import UserDao, ActivationStatus
+from apps.user.emails import send_welcome_email
+from apps.user.unit_of_work import unit_of_work, after_commit
+from apps.user.activation_cache import activation_cache
+from apps.user.auth_tokens import revocation_list
+from apps.user.single_flight import single_flight
+from utils.token import get_token_service
 from utils.http_status import HttpStatus
 from utils.insurance_logger import InsuranceLogger
 
@@ -72,7 +67,7 @@ verify_post_response_model_400 = verify_ns.model(
     },
 )
 
-@verify_ns.route('/')
+@verify_ns.route('/<string:token>')
 class Verify(Resource):
     """
     This is the user registration api endpoint.
@@ -91,14 +86,18 @@ class Verify(Resource):
         description="Validation Error",
         model=verify_post_response_model_400,
     )
+    @verify_ns.response(
+        code=HttpStatus.HTTP_403_FORBIDDEN,
+        description="User is deactivated by support staff",
+    )
+    @single_flight('verify', key_arg='token')
+    @unit_of_work()
     def get(self, token):
-        token_helper = TokenHelper()
-
         InsuranceLogger.log_info(
             f"validating the confirmation token."
         )
 
-        is_success, message, email = token_helper.validate_token(token)
+        is_success, message, email = get_token_service().validate(token)
 
         if not is_success:
             return {
@@ -113,70 +112,59 @@ class Verify(Resource):
         """
         Token is valid and not expired. And we have retreived the decoded email
         """
-        # Find the user using his email id from User DB table
+        # Deactivations of other workers are learnt by sync of revocations, which forgets them in the cache
+        revocation_list.ensure_loaded()
+
+        if activation_cache.is_activated(email):
+            # Repeated click or prefetch by email scanner, answered without database
+            InsuranceLogger.log_info(f"User with email id {email} is already activated.")
+            return {
+                        "status": "ALREADY-ACTIVATED",
+                        "reason": "User with Email '{}' is already activated.".format(email)
+                    }, HttpStatus.HTTP_200_OK
+
+        # Activate the user with one conditional update, it tells whether user was already activated or not found
 
-        InsuranceLogger.log_info(f"Searching user with email id {email} in User DB table.")
-        is_success, message, user = UserDao.get_user_by_email(email_address=email)
+        InsuranceLogger.log_info(f"Activating user with email id {email}.")
+        is_success, message, activation = UserDao.activate_user(email_address=email)
 
         if not is_success:
+            InsuranceLogger.log_error(f"Failed to update activation status for user with {email}.")
             return {
                         "status": "INTERNAL-SERVER-ERROR",
-                        "reason": message
+                        "reason": "Activation for email id '{}' failed due to server error.".format(email)
                     }, HttpStatus.HTTP_500_INTERNAL_SERVER_ERROR
-        elif user is None:
+        elif activation.status == ActivationStatus.NOT_FOUND:
             InsuranceLogger.log_error(f"User with Email {email} is not found.")
             return {
                         "status": "INVALID-USER",
                         "reason": "User with Email '{}' is not found.".format(email)
                     }, HttpStatus.HTTP_404_NOT_FOUND
-        
-        InsuranceLogger.log_info(f"User with email {email} is found in User DB table, now update user activation status.")
-        # User is found in User DB table, now update user activation status
-        
-        InsuranceLogger.log_info(f"Checking if User with email {email} is already activated.")
-
-        if user.userprofiles.activated:
-            # As user is already activated, so no need to update database, just return the status to user
+        elif activation.status == ActivationStatus.DEACTIVATED:
+            # Old confirmation link does not undo deactivation by support staff
+            InsuranceLogger.log_info(f"User with email id {email} is deactivated.")
+            return {
+                        "status": "DEACTIVATED",
+                        "reason": "User with Email '{}' is deactivated. Please contact support.".format(email)
+                    }, HttpStatus.HTTP_403_FORBIDDEN
+        elif activation.status == ActivationStatus.ALREADY_ACTIVATED:
+            # Activated by an earlier or a concurrent click, welcome email is sent by that request
+            activation_cache.add(email)
             InsuranceLogger.log_info(f"User with email id {email} is already activated.")
             return {
                         "status": "ALREADY-ACTIVATED",
                         "reason": "User with Email '{}' is already activated.".format(email)
                     }, HttpStatus.HTTP_200_OK
 
-        # Now we need to update activation status of given user in database
-        is_success, message, result = UserDao.update_profile_by_activation(
-            user=user, 
-            activated=True
-        )
-
-        if not is_success:
-            InsuranceLogger.log_error(f"Failed to update activation status for user with {email}.")
-            return {
-                        "status": "INTERNAL-SERVER-ERROR",
-                        "reason": "Activation for email id '{}' failed due to server error.".format(email)
-                    }, HttpStatus.HTTP_500_INTERNAL_SERVER_ERROR
-        
         InsuranceLogger.log_info(f"Activation status for user with {email} is successfully done.")
+        after_commit(lambda: activation_cache.add(email))
 
         # Now we need to send Welcome email post successful registration
 
-        html_template = render_template('welcome.html', customer_name=user.customer_name)
-
-        subject = "Welcome to Indian Insurance"
-
-        celery.send_task('email.send', (configuration.MAIL_DEFAULT_SENDER, email, subject, html_template))
+        send_welcome_email(customer_name=activation.customer_name, email_address=email)
         
         InsuranceLogger.log_info(f"Registration for user with {email} is successfully done. Welcome email is sent to user.")
 
-        # Also write mail template to text file temporarily, this should be removed later
-        file_path = os.path.abspath(os.path.dirname(__name__))
-        file_name = os.path.join(file_path, 'welcome_email.txt')
-
-        InsuranceLogger.log_debug(f"Writing welcome email template to file {file_name}.")
-
-        with open(file=file_name, mode='w') as f:
-            f.write(html_template)
-
         return {
                     "status": "Success",
                     "reason": "Thanks for the registration. You will soon receive a welcome email on your email '{}'.".format(email)
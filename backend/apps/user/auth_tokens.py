@@ -0,0 +1,490 @@
+"""Access and refresh tokens of logged in customers.
+
+SENECA GLOBAL CONFIDENTIAL & PROPRIETARY
+
+@file auth_tokens.py
+@author Dilip Kumar Sharma
+@copyright Seneca Global
+@date 18th Oct 2026
+
+About; -
+--------
+    Signed tokens identify logged in customers, so authenticated requests need no
+    database lookup.
+
+Working; -
+----------
+    Login issues an access token valid for ACCESS_TOKEN_EXPIRATION seconds and a refresh
+    token valid for REFRESH_TOKEN_EXPIRATION seconds. Both carry user id, email and a
+    random token id (jti) and are signed by token services of utils.token, each purpose
+    with its own salt, so one can not be used as the other.
+
+    An access token is checked with CPU only: signature, age and the revocation list
+    kept in memory of the gunicorn worker.
+
+    A refresh token is exchanged for a new pair of tokens and is revoked by the exchange,
+    so it can be used only once. Logout revokes the refresh token and the access token.
+
+    Revoked token ids are written to revokedtoken table till the token would expire and
+    added to the revocation list of the worker at once. Other workers load revocations
+    every TOKEN_REVOCATION_SYNC_INTERVAL seconds from a background thread, so a revoked
+    access token may be accepted by another worker for that long. The list is loaded
+    fully on first use in every worker.
+
+    Deactivating a customer revokes all tokens of the customer issued till then: a row
+    'user:<user id>:<unix time>' is written to revokedtoken table till the longest lived
+    token would expire, and tokens of that user issued at or before that second are
+    rejected. Workers learning it by sync also forget the email in activation cache, so
+    verify endpoint of every worker stops answering ALREADY-ACTIVATED within
+    TOKEN_REVOCATION_SYNC_INTERVAL seconds. Refresh also reads activation of the
+    customer from database, so a deactivated customer can not refresh on any worker.
+
+Uses; -
+-------
+    This module is used by login endpoints.
+
+Reference; -
+------------
+    https://datatracker.ietf.org/doc/html/rfc6749#section-1.5
+    https://datatracker.ietf.org/doc/html/rfc6750#section-2.1
+"""
+
+import os
+import time
+import secrets
+import threading
+from typing import NamedTuple
+from datetime import datetime, timedelta
+from functools import wraps
+from flask import request, g, current_app
+from apps import configuration
+from apps.user.dao import RevokedTokenDao, UserDao
+from apps.user.activation_cache import activation_cache
+from utils.token import get_token_service, TokenStatus
+from utils.http_status import HttpStatus
+from utils.insurance_logger import InsuranceLogger
+
+
+INVALID_ACCESS_TOKEN = "Access token is invalid or has expired."
+INVALID_REFRESH_TOKEN = "Refresh token is invalid or has expired."
+
+# Revocations of other workers committed during a sync are read again by next sync
+SYNC_OVERLAP = timedelta(seconds=5)
+
+# Prefix of revocations of all tokens of a user, token ids never have ':'
+USER_REVOCATION_PREFIX = 'user:'
+
+
+class Identity(NamedTuple):
+    user_id: int
+    email_address: str
+    jti: str
+    expires_at: float
+
+
+class RevocationList:
+    """Ids of revoked tokens, kept in memory and synced from database.
+
+    Args:
+        sync_interval (int): Seconds between syncs from database, 0 to sync only on first use
+    """
+    def __init__(self, sync_interval: int) -> None:
+        self._sync_interval = sync_interval
+
+        self._revoked = dict()
+        # user id: (unix time of revocation, expiry of revocation)
+        self._revoked_users = dict()
+        self._lock = threading.Lock()
+        self._synced_at = None
+        self._pid = None
+        self._thread = None
+
+        self._syncs = 0
+        self._sync_failures = 0
+
+    def ensure_loaded(self) -> None:
+        """Load the list on first use in this process and start syncing it."""
+        if self._pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+
+            # List of the master process is stale after gunicorn forks workers
+            self._pid = os.getpid()
+            self._revoked.clear()
+            self._revoked_users.clear()
+            self._synced_at = None
+
+        self.sync()
+
+        # Threads do not survive fork, thread of this process runs till the process exits
+        if self._sync_interval > 0 and (self._thread is None or not self._thread.is_alive()):
+            self._thread = threading.Thread(target=self._run, args=(current_app._get_current_object(),),
+                                            name='token-revocation-sync', daemon=True)
+            self._thread.start()
+
+    def _run(self, app) -> None:
+        while True:
+            time.sleep(self._sync_interval)
+
+            with app.app_context():
+                self.sync()
+
+    def sync(self) -> bool:
+        """Load revocations made since last sync and forget expired ones.
+
+        Returns:
+            bool: Success/failure
+        """
+        now = datetime.utcnow()
+        revoked_since = self._synced_at - SYNC_OVERLAP if self._synced_at is not None else None
+
+        is_success, message, revoked_tokens = RevokedTokenDao.get_revoked_tokens(now=now, revoked_since=revoked_since)
+
+        if not is_success:
+            self._sync_failures += 1
+            return False
+
+        with self._lock:
+            user_ids = [user_id for user_id in (self._add(jti, expires_at) for jti, expires_at in revoked_tokens) if user_id is not None]
+
+            for jti in [jti for jti, expires_at in self._revoked.items() if expires_at <= now]:
+                del self._revoked[jti]
+
+            for user_id in [user_id for user_id, (_, expires_at) in self._revoked_users.items() if expires_at <= now]:
+                del self._revoked_users[user_id]
+
+            self._synced_at = now
+            self._syncs += 1
+
+        if user_ids:
+            _forget_activations(user_ids)
+
+        if revoked_since is None:
+            # Once per worker is enough to keep the table small
+            RevokedTokenDao.delete_expired_revoked_tokens(now=now)
+
+        return True
+
+    def _add(self, jti: str, expires_at: datetime) -> int:
+        """Add a revocation, id of the user if it revokes all tokens of a user not known yet."""
+        known = jti in self._revoked
+        self._revoked[jti] = expires_at
+
+        if known or not jti.startswith(USER_REVOCATION_PREFIX):
+            return None
+
+        user_id, revoked_at = (int(value) for value in jti[len(USER_REVOCATION_PREFIX):].split(':'))
+        previous = self._revoked_users.get(user_id)
+
+        if previous is None or previous[0] < revoked_at:
+            self._revoked_users[user_id] = (revoked_at, expires_at)
+
+        return user_id
+
+    def revoke_users(self, user_ids: list) -> tuple:
+        """Revoke all tokens issued till now to given users.
+
+        Args:
+            user_ids (list): Ids of the users
+
+        Returns:
+            tuple: status, message, result
+                    status is boolean value indicating success (True) or Failure(False),
+                    message is a string about the error occurred if any, otherwise None,
+                    result is number of users whose tokens are revoked now or None otherwise.
+        """
+        revoked_at = int(time.time())
+        # Longest lived token issued till now expires by then
+        expires_at = datetime.utcfromtimestamp(revoked_at + max(configuration.ACCESS_TOKEN_EXPIRATION, configuration.REFRESH_TOKEN_EXPIRATION) + 1)
+        jtis = [f"{USER_REVOCATION_PREFIX}{user_id}:{revoked_at}" for user_id in dict.fromkeys(user_ids)]
+
+        is_success, message, added = RevokedTokenDao.add_revoked_tokens(
+                                            revoked_tokens=[(jti, expires_at) for jti in jtis],
+                                            revoked_at=datetime.utcfromtimestamp(revoked_at)
+                                        )
+
+        if not is_success:
+            return False, message, None
+
+        with self._lock:
+            for jti in jtis:
+                self._add(jti, expires_at)
+
+        return True, None, added
+
+    def is_user_revoked(self, user_id: int, issued_at: int) -> bool:
+        """Whether tokens of given user issued at given unix time are revoked."""
+        revocation = self._revoked_users.get(user_id)
+
+        return revocation is not None and issued_at <= revocation[0]
+
+    def revoke(self, jti: str, expires_at: float) -> tuple:
+        """Revoke a token till it expires.
+
+        Args:
+            jti (str): Id of the token
+            expires_at (float): Unix time when the token expires
+
+        Returns:
+            tuple: status, message, result
+                    status is boolean value indicating success (True) or Failure(False),
+                    message is a string about the error occurred if any, otherwise None,
+                    result is True if token is revoked now, False if it was already revoked or None otherwise.
+        """
+        # MySQL DATETIME keeps whole seconds
+        expires_at = datetime.utcfromtimestamp(int(expires_at) + 1)
+
+        is_success, message, added = RevokedTokenDao.add_revoked_token(
+                                            jti=jti,
+                                            revoked_at=datetime.utcnow().replace(microsecond=0),
+                                            expires_at=expires_at
+                                        )
+
+        if not is_success:
+            return False, message, None
+
+        with self._lock:
+            self._revoked[jti] = expires_at
+
+        return True, None, added
+
+    def is_revoked(self, jti: str) -> bool:
+        return jti in self._revoked
+
+    def clear(self) -> None:
+        with self._lock:
+            self._revoked.clear()
+            self._revoked_users.clear()
+            self._synced_at = None
+            self._pid = None
+
+    def stats(self) -> dict:
+        return {
+            'revoked': len(self._revoked),
+            'revoked_users': len(self._revoked_users),
+            'sync_interval': self._sync_interval,
+            'syncs': self._syncs,
+            'sync_failures': self._sync_failures,
+        }
+
+
+def _forget_activations(user_ids: list) -> None:
+    """Forget deactivated users in activation cache of this worker."""
+    is_success, message, email_addresses = UserDao.get_email_addresses(user_ids=user_ids)
+
+    if not is_success:
+        InsuranceLogger.log_warning(f"Failed to forget activations of {len(user_ids)} deactivated users. {message}")
+        return
+
+    for email_address in email_addresses:
+        activation_cache.discard(email_address)
+
+
+revocation_list = RevocationList(sync_interval=configuration.TOKEN_REVOCATION_SYNC_INTERVAL)
+
+_counters = dict(issued=0, verified=0, rejected=0, refreshed=0, revoked=0, revoked_users=0)
+
+
+def issue_tokens(user_id: int, email_address: str) -> tuple:
+    """
+    Issue a new pair of access and refresh tokens.
+
+    Args:
+        user_id (int): Id of the user
+        email_address (str): Email address of the customer
+
+    Returns:
+        tuple: status, message, result
+                status is boolean value indicating success (True) or Failure(False),
+                message is a string about the error occurred if any, otherwise None,
+                result is dict with access_token, refresh_token, token_type and expires_in or None otherwise.
+    """
+    try:
+        access_token = get_token_service('access').sign(
+                            {"sub": user_id, "email": email_address, "jti": secrets.token_urlsafe(12)}
+                        )
+        refresh_token = get_token_service('refresh').sign(
+                            {"sub": user_id, "email": email_address, "jti": secrets.token_urlsafe(12)}
+                        )
+    except Exception as err:
+        InsuranceLogger.log_error(f"Failed to issue tokens. {str(err)}")
+        return False, "Failed to issue tokens.", None
+
+    _counters['issued'] += 1
+
+    return True, None, dict(
+                            access_token = access_token,
+                            refresh_token = refresh_token,
+                            token_type = "Bearer",
+                            expires_in = configuration.ACCESS_TOKEN_EXPIRATION
+                        )
+
+def _identity(purpose: str, token: str) -> Identity:
+    """Identity of a valid token which is not revoked, None otherwise."""
+    status, payload, issued_at = get_token_service(purpose).unsign(token)
+
+    if status != TokenStatus.VALID or not isinstance(payload, dict):
+        return None
+
+    revocation_list.ensure_loaded()
+
+    if revocation_list.is_revoked(payload.get('jti')) or revocation_list.is_user_revoked(payload.get('sub'), issued_at):
+        return None
+
+    max_age = configuration.ACCESS_TOKEN_EXPIRATION if purpose == 'access' else configuration.REFRESH_TOKEN_EXPIRATION
+
+    return Identity(payload.get('sub'), payload.get('email'), payload.get('jti'), issued_at + max_age)
+
+def authenticate_access_token(access_token: str) -> tuple:
+    """
+    Identify customer of an access token, without database.
+
+    Args:
+        access_token (str): Access token given in Authorization header
+
+    Returns:
+        tuple: status, message, result
+                status is boolean value indicating success (True) or Failure(False),
+                message is a string about the error occurred if any, otherwise None,
+                result is Identity or None otherwise.
+    """
+    identity = _identity('access', access_token)
+
+    if identity is None:
+        _counters['rejected'] += 1
+        return False, INVALID_ACCESS_TOKEN, None
+
+    _counters['verified'] += 1
+
+    return True, None, identity
+
+def refresh_tokens(refresh_token: str) -> tuple:
+    """
+    Exchange a refresh token for a new pair of tokens, the refresh token is revoked.
+
+    Refresh tokens of customers who are deactivated or not found anymore are rejected.
+
+    Args:
+        refresh_token (str): Refresh token issued at login or last refresh
+
+    Returns:
+        tuple: status, message, result
+                status is boolean value indicating success (True) or Failure(False),
+                message is INVALID_REFRESH_TOKEN or a string about the error occurred if any, otherwise None,
+                result is dict of issue_tokens or None otherwise.
+    """
+    identity = _identity('refresh', refresh_token)
+
+    if identity is None:
+        return False, INVALID_REFRESH_TOKEN, None
+
+    # Customer may have been deactivated, which other workers learn only by next sync
+    is_success, message, user = UserDao.get_user_summary(email_address=identity.email_address)
+
+    if not is_success:
+        return False, message, None
+    elif user is None or user.user_id != identity.user_id or not user.activated:
+        return False, INVALID_REFRESH_TOKEN, None
+
+    is_success, message, revoked_now = revocation_list.revoke(identity.jti, identity.expires_at)
+
+    if not is_success:
+        return False, message, None
+    elif not revoked_now:
+        # Used by a concurrent refresh or by another worker
+        return False, INVALID_REFRESH_TOKEN, None
+
+    _counters['refreshed'] += 1
+
+    return issue_tokens(identity.user_id, identity.email_address)
+
+def revoke_user_tokens(user_ids: list) -> tuple:
+    """
+    Revoke all tokens of deactivated customers.
+
+    Args:
+        user_ids (list): Ids of deactivated users
+
+    Returns:
+        tuple: status, message, result
+                status is boolean value indicating success (True) or Failure(False),
+                message is a string about the error occurred if any, otherwise None,
+                result is number of users whose tokens are revoked now or None otherwise.
+    """
+    is_success, message, revoked = revocation_list.revoke_users(user_ids)
+
+    if is_success:
+        _counters['revoked_users'] += revoked
+
+    return is_success, message, revoked
+
+def revoke_tokens(refresh_token: str, access_token: str = None) -> tuple:
+    """
+    Revoke tokens at logout.
+
+    Args:
+        refresh_token (str): Refresh token of the session
+        access_token (str, optional): Access token of the session. Defaults to None.
+
+    Returns:
+        tuple: status, message, result
+                status is boolean value indicating success (True) or Failure(False),
+                message is INVALID_REFRESH_TOKEN or a string about the error occurred if any, otherwise None,
+                result is number of revoked tokens or None otherwise.
+    """
+    identities = [_identity('refresh', refresh_token)]
+
+    if identities[0] is None:
+        return False, INVALID_REFRESH_TOKEN, None
+
+    if access_token is not None:
+        identities.append(_identity('access', access_token))
+
+    revoked = 0
+
+    for identity in identities:
+        if identity is not None:
+            is_success, message, _ = revocation_list.revoke(identity.jti, identity.expires_at)
+
+            if not is_success:
+                return False, message, None
+
+            revoked += 1
+
+    _counters['revoked'] += revoked
+
+    return True, None, revoked
+
+def bearer_token() -> str:
+    """Token of 'Authorization: Bearer <token>' header of current request, None if there is none."""
+    scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+
+    return token.strip() or None if scheme.lower() == 'bearer' else None
+
+def token_required(func):
+    """Reject requests without valid access token, identity of the customer is kept in g.identity."""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        is_success, message, identity = authenticate_access_token(bearer_token() or '')
+
+        if not is_success:
+            return {
+                        "status": "UNAUTHORIZED",
+                        "reason": message
+                    }, HttpStatus.HTTP_401_UNAUTHORIZED, {'WWW-Authenticate': 'Bearer'}
+
+        g.identity = identity
+
+        return func(*args, **kwargs)
+    return wrapper
+
+def stats() -> dict:
+    """Counters of tokens of this worker.
+
+    Returns:
+        dict: Token statistics
+    """
+    return {**_counters, 'revocation_list': revocation_list.stats()}
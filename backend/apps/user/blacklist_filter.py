@@ -0,0 +1,221 @@
+"""Negative cache for blacklisted emails.
+
+SENECA GLOBAL CONFIDENTIAL & PROPRIETARY
+
+@file blacklist_filter.py
+@author Dilip Kumar Sharma
+@copyright Seneca Global
+@date 18th Oct 2026
+
+About; -
+--------
+    Bloom filter of blacklisted emails kept in memory of every gunicorn worker.
+
+Working; -
+----------
+    Almost no email received during sign up is blacklisted. The filter is built from
+    the blacklist table on first use in the worker and tells for sure when an email
+    is not blacklisted, so that the blacklist table is queried only for possible hits.
+
+    Emails blacklisted through this worker are added to the filter immediately.
+    Emails blacklisted through other workers are picked up when the filter is rebuilt,
+    which happens on first use after every BLACKLIST_FILTER_REBUILD_INTERVAL seconds.
+    Only one request thread rebuilds it; the others go on with the old filter, or wait
+    for the first build of the worker. Emails added while the table is read are added
+    to the new filter too.
+
+    Emails are lower cased before use, because MySQL compares email addresses
+    case insensitively.
+
+    If the filter can not be built, every email is treated as possible hit.
+
+Uses; -
+-------
+    This module is used by data validation during sign up and by blacklist dao.
+
+Reference; -
+------------
+    https://en.wikipedia.org/wiki/Bloom_filter
+"""
+
+import time
+import threading
+from apps import configuration
+from utils.bloom_filter import BloomFilter
+from utils.insurance_logger import InsuranceLogger
+
+
+class BlacklistFilter:
+    """Bloom filter of blacklisted emails with hit rate counters.
+
+    Args:
+        enabled (bool): When disabled every email is treated as possible hit
+        false_positive_rate (float): Accepted false positive rate of the filter
+        min_capacity (int): Minimum number of emails the filter is sized for
+        rebuild_interval (int): Seconds after which filter is built again from database
+    """
+    def __init__(self, enabled: bool, false_positive_rate: float, min_capacity: int, rebuild_interval: int) -> None:
+        self._enabled = enabled
+        self._false_positive_rate = false_positive_rate
+        self._min_capacity = min_capacity
+        self._rebuild_interval = rebuild_interval
+
+        self._filter = None
+        self._built_at = None
+        self._lock = threading.Lock()
+        # Held while the blacklist table is read
+        self._rebuild_lock = threading.Lock()
+        self._added_during_rebuild = None
+
+        self._lookups = 0
+        self._negatives = 0
+        self._false_positives = 0
+        self._rebuilds = 0
+
+    @staticmethod
+    def _key(email_address: str) -> str:
+        return email_address.strip().lower()
+
+    def _is_stale(self) -> bool:
+        return self._built_at is None or time.monotonic() - self._built_at > self._rebuild_interval
+
+    def rebuild(self) -> bool:
+        """Build the filter again from blacklist table.
+
+        Returns:
+            bool: Success/failure
+        """
+        with self._rebuild_lock:
+            return self._build()
+
+    def _rebuild_if_stale(self) -> None:
+        # Old filter serves other requests meanwhile, without a filter they wait for the first build
+        if not self._rebuild_lock.acquire(blocking=self._filter is None):
+            return
+
+        try:
+            # Rebuilt by the thread this one waited for
+            if self._is_stale():
+                self._build()
+        finally:
+            self._rebuild_lock.release()
+
+    def _build(self) -> bool:
+        from apps.user.dao import BlacklistDao
+
+        with self._lock:
+            self._added_during_rebuild = []
+
+        is_success, message, emails = BlacklistDao.get_blacklisted_emails()
+
+        with self._lock:
+            added_during_rebuild, self._added_during_rebuild = self._added_during_rebuild, None
+
+            # Retry only after the interval, not on every request
+            self._built_at = time.monotonic()
+
+            if not is_success:
+                InsuranceLogger.log_error(f"Failed to build blacklist filter. {message}")
+                self._filter = None
+                return False
+
+            bloom_filter = BloomFilter(
+                                capacity=max(self._min_capacity, 2 * (len(emails) + len(added_during_rebuild))),
+                                false_positive_rate=self._false_positive_rate
+                            )
+
+            for email_address in emails:
+                bloom_filter.add(self._key(email_address))
+
+            # Committed after the table was read
+            for key in added_during_rebuild:
+                bloom_filter.add(key)
+
+            self._filter = bloom_filter
+            self._rebuilds += 1
+
+        InsuranceLogger.log_info(f"Blacklist filter is built. {self.stats()}")
+
+        return True
+
+    def might_be_blacklisted(self, email_address: str) -> bool:
+        """Check whether email could be blacklisted.
+
+        Args:
+            email_address (str): Email address of the customer
+
+        Returns:
+            bool: False when email is surely not blacklisted, True when database needs to be checked
+        """
+        if not self._enabled:
+            return True
+
+        if self._is_stale():
+            self._rebuild_if_stale()
+
+        self._lookups += 1
+
+        if self._filter is not None and self._key(email_address) not in self._filter:
+            self._negatives += 1
+            return False
+
+        return True
+
+    def add(self, email_address: str) -> None:
+        """Add newly blacklisted email to the filter.
+
+        Args:
+            email_address (str): Blacklisted email address
+        """
+        with self._lock:
+            if self._added_during_rebuild is not None:
+                self._added_during_rebuild.append(self._key(email_address))
+
+            if self._filter is None:
+                return
+
+            self._filter.add(self._key(email_address))
+
+            # Filter is built again with bigger capacity once it is over filled
+            if len(self._filter) > self._filter.capacity:
+                self._built_at = None
+
+    def record_false_positive(self) -> None:
+        """Record an email which was possibly blacklisted as per filter but not as per database."""
+        if self._filter is not None:
+            self._false_positives += 1
+
+    def stats(self) -> dict:
+        """Size and hit rate of the filter.
+
+        Returns:
+            dict: Filter statistics
+        """
+        bloom_filter = self._filter
+        positives = self._lookups - self._negatives
+
+        return {
+            'enabled': self._enabled,
+            'built': bloom_filter is not None,
+            'items': len(bloom_filter) if bloom_filter is not None else 0,
+            'capacity': bloom_filter.capacity if bloom_filter is not None else 0,
+            'bits': bloom_filter.bit_count if bloom_filter is not None else 0,
+            'hash_count': bloom_filter.hash_count if bloom_filter is not None else 0,
+            'memory_bytes': bloom_filter.memory_bytes if bloom_filter is not None else 0,
+            'estimated_false_positive_rate': bloom_filter.estimated_false_positive_rate() if bloom_filter is not None else None,
+            'lookups': self._lookups,
+            'database_lookups_skipped': self._negatives,
+            'false_positives': self._false_positives,
+            'hit_rate': self._negatives / self._lookups if self._lookups else None,
+            'observed_false_positive_rate': self._false_positives / positives if positives else None,
+            'rebuilds': self._rebuilds,
+        }
+
+
+# Every gunicorn worker has its own filter
+blacklist_filter = BlacklistFilter(
+                        enabled=configuration.BLACKLIST_FILTER_ENABLED,
+                        false_positive_rate=configuration.BLACKLIST_FILTER_FALSE_POSITIVE_RATE,
+                        min_capacity=configuration.BLACKLIST_FILTER_MIN_CAPACITY,
+                        rebuild_interval=configuration.BLACKLIST_FILTER_REBUILD_INTERVAL
+                    )
@@ -0,0 +1,293 @@
+"""Bulk activation and deactivation of customers.
+
+SENECA GLOBAL CONFIDENTIAL & PROPRIETARY
+
+@file bulk_activation.py
+@author Dilip Kumar Sharma
+@copyright Seneca Global
+@date 18th Oct 2026
+
+About; -
+--------
+    Lets support staff activate or deactivate many accounts at once, e.g. after a
+    mail outage, instead of one confirmation link or manual SQL per customer.
+
+Working; -
+----------
+    Emails are given as a Json list or streamed as NDJSON, CSV or plain text rows, and
+    are read one by one from the request stream. They are collected in chunks of at
+    most BULK_ACTIVATION_CHUNK_SIZE rows, valid or not, so memory is bounded however
+    long the stream is. Profiles of a chunk are changed with one
+    'UPDATE ... WHERE ... IN (...)' statement in a transaction of their own, so a
+    failed chunk does not undo chunks before it.
+
+    Outcome of every email is yielded as soon as its chunk is done, so the response
+    can be streamed back. Welcome emails of a chunk are queued together once the
+    chunk is committed. Activation cache of verify endpoint is updated the same way,
+    and all tokens of deactivated customers are revoked together.
+
+Uses; -
+-------
+    This module is used by bulk activation endpoint.
+
+Reference; -
+------------
+    https://jsonlines.org/
+"""
+
+import csv
+import json
+import time
+from apps.user.dao import UserDao, ActivationStatus
+from apps.user.emails import send_welcome_emails
+from apps.user.activation_cache import activation_cache
+from apps.user.auth_tokens import revoke_user_tokens
+from apps.user.bulk_registration import NDJSON_CONTENT_TYPE, CSV_CONTENT_TYPE, chunk_rows
+from utils.insurance_logger import InsuranceLogger
+
+
+JSON_CONTENT_TYPE = 'application/json'
+TEXT_CONTENT_TYPE = 'text/plain'
+
+CSV_HEADER = 'email_address'
+
+MAX_EMAIL_LENGTH = 50
+
+# Outcome of an email which was already in wanted state, when it is given again
+UNCHANGED = {
+    ActivationStatus.ACTIVATED: ActivationStatus.ALREADY_ACTIVATED,
+    ActivationStatus.DEACTIVATED: ActivationStatus.ALREADY_DEACTIVATED,
+}
+
+
+def read_email_rows(content_type: str, lines) -> tuple:
+    """Read emails of given content type.
+
+    NDJSON lines are an email string or an object with 'email_address', CSV must have
+    'email_address' column in its header and plain text has one email per line.
+
+    Args:
+        content_type (str): NDJSON_CONTENT_TYPE, CSV_CONTENT_TYPE or TEXT_CONTENT_TYPE
+        lines: Iterable of text lines
+
+    Returns:
+        tuple: bool for success/failure, error message if any, generator of row number, email, error message
+    """
+    if content_type == NDJSON_CONTENT_TYPE:
+        def rows():
+            for row_number, line in enumerate(lines, start=1):
+                if not line.strip():
+                    continue
+
+                try:
+                    value = json.loads(line)
+                except ValueError:
+                    yield row_number, None, "Invalid Json Format"
+                    continue
+
+                yield row_number, value.get('email_address') if isinstance(value, dict) else value, None
+
+        return True, None, rows()
+    elif content_type == CSV_CONTENT_TYPE:
+        reader = csv.reader(lines)
+        header = [column.strip() for column in next(reader, None) or []]
+
+        if CSV_HEADER not in header:
+            return False, f"CSV header should have '{CSV_HEADER}' column.", None
+
+        column = header.index(CSV_HEADER)
+
+        def rows():
+            for row_number, values in enumerate(reader, start=1):
+                if not values:
+                    continue
+                elif len(values) != len(header):
+                    yield row_number, None, "Expected {} columns, found {}.".format(len(header), len(values))
+                else:
+                    yield row_number, values[column], None
+
+        return True, None, rows()
+    elif content_type == TEXT_CONTENT_TYPE:
+        return True, None, ((row_number, line.strip(), None) for row_number, line in enumerate(lines, start=1) if line.strip())
+
+    return False, "content-type {} is not supported. Expected content type is '{}', '{}', '{}' or '{}'".format(
+                    content_type, JSON_CONTENT_TYPE, NDJSON_CONTENT_TYPE, CSV_CONTENT_TYPE, TEXT_CONTENT_TYPE
+                ), None
+
+def read_json_rows(payload) -> tuple:
+    """Read emails of a Json payload {"email_addresses": [...]}.
+
+    Args:
+        payload: Decoded Json payload
+
+    Returns:
+        tuple: bool for success/failure, error message if any, generator of row number, email, error message
+    """
+    if not isinstance(payload, dict) or not isinstance(payload.get('email_addresses'), list):
+        return False, "Json payload should be an object with 'email_addresses' list.", None
+
+    return True, None, ((row_number, email_address, None) for row_number, email_address in enumerate(payload['email_addresses'], start=1))
+
+def validate_email_row(email_address) -> str:
+    """Error message of an invalid email, None when valid.
+
+    Unknown emails are told apart by the database, so only the form is checked.
+    """
+    if not isinstance(email_address, str) or not email_address.strip():
+        return "'email_address' should be a non empty string."
+    elif len(email_address.strip()) > MAX_EMAIL_LENGTH:
+        return "Email too long with '{}' characters. Max '{}' characters are allowed.".format(len(email_address.strip()), MAX_EMAIL_LENGTH)
+
+    return None
+
+
+class BulkActivation:
+    """Activates or deactivates customers chunk by chunk.
+
+    Args:
+        activated (bool): True to activate, False to deactivate
+        chunk_size (int): Number of emails changed together
+        send_emails (bool, optional): Whether welcome emails are sent to activated customers. Defaults to True.
+    """
+    def __init__(self, activated: bool, chunk_size: int, send_emails: bool = True) -> None:
+        self._activated = activated
+        self._chunk_size = chunk_size
+        self._send_emails = send_emails
+        self._changed = ActivationStatus.ACTIVATED if activated else ActivationStatus.DEACTIVATED
+
+        self.rows = 0
+        self.counters = {status: 0 for status in (
+                            ActivationStatus.ACTIVATED, ActivationStatus.ALREADY_ACTIVATED,
+                            ActivationStatus.DEACTIVATED, ActivationStatus.ALREADY_DEACTIVATED,
+                            ActivationStatus.NOT_FOUND
+                        )}
+
+    def change(self, rows):
+        """Activate or deactivate emails of all rows.
+
+        Args:
+            rows: Iterable of row number, email, error message
+
+        Yields:
+            dict: Outcome of every row in order of rows
+        """
+        for chunk in chunk_rows(self._validate(rows), self._chunk_size):
+            yield from self._change_chunk(chunk)
+
+    def _validate(self, rows):
+        """Row number, email and its validation error result, None if valid."""
+        for row_number, email_address, error in rows:
+            self.rows += 1
+            error = error or validate_email_row(email_address)
+
+            if error is not None:
+                yield row_number, email_address, dict(row=row_number, email_address=email_address,
+                                                      status="VALIDATION-ERROR", reason=error)
+            else:
+                yield row_number, email_address.strip(), None
+
+    def _change_chunk(self, chunk: list):
+        # First spelling of every email
+        unique = dict()
+
+        for _, email_address, result in chunk:
+            if result is None:
+                unique.setdefault(email_address.lower(), email_address)
+
+        email_addresses = list(unique.values())
+
+        activations = dict()
+        error = None
+        after_commit_error = None
+
+        if email_addresses:
+            is_success, message, activations = UserDao.set_activations(email_addresses=email_addresses, activated=self._activated)
+
+            if not is_success:
+                error = message
+            else:
+                after_commit_error = self._after_commit(activations)
+
+        seen = set()
+
+        for row_number, email_address, result in chunk:
+            if result is not None:
+                yield result
+                continue
+            elif error is not None:
+                yield dict(row=row_number, email_address=email_address, status="INTERNAL-SERVER-ERROR", reason=error)
+                continue
+
+            activation = activations[email_address.lower()]
+            status = activation.status
+
+            # Only the first row of an email changes it
+            if email_address.lower() in seen:
+                status = UNCHANGED.get(status, status)
+
+            seen.add(email_address.lower())
+            self.counters[status] += 1
+
+            if after_commit_error is not None and status == self._changed:
+                yield dict(row=row_number, email_address=email_address, status="INTERNAL-SERVER-ERROR", reason=after_commit_error)
+            else:
+                yield dict(row=row_number, email_address=email_address, status=status)
+
+    def _after_commit(self, activations: dict) -> str:
+        """Update activation cache, queue welcome emails and revoke tokens of deactivated
+        customers, error message of welcome emails or revocation if any."""
+        welcome = []
+        deactivated = []
+
+        for email_address, activation in activations.items():
+            if activation.status in (ActivationStatus.ACTIVATED, ActivationStatus.ALREADY_ACTIVATED):
+                activation_cache.add(email_address)
+            elif activation.status == ActivationStatus.DEACTIVATED:
+                activation_cache.discard(email_address)
+                deactivated.append(activation.user_id)
+
+            if activation.status == ActivationStatus.ACTIVATED:
+                welcome.append((activation.customer_name, email_address))
+
+        if self._send_emails and welcome:
+            is_success, message, _ = send_welcome_emails(welcome)
+
+            if not is_success:
+                return "User is activated but welcome email is not sent. {}".format(message)
+
+        if deactivated:
+            is_success, message, _ = revoke_user_tokens(deactivated)
+
+            if not is_success:
+                return "User is deactivated but tokens are not revoked. {}".format(message)
+
+        return None
+
+    def change_as_ndjson(self, rows):
+        """Change all rows and yield outcomes as NDJSON lines, followed by a summary line.
+
+        Args:
+            rows: Iterable of row number, email, error message
+
+        Yields:
+            str: NDJSON line
+        """
+        start = time.perf_counter()
+
+        for result in self.change(rows):
+            yield json.dumps(result) + "\n"
+
+        seconds = time.perf_counter() - start
+        changed = self.counters[ActivationStatus.ACTIVATED if self._activated else ActivationStatus.DEACTIVATED]
+
+        InsuranceLogger.log_info(f"Bulk {'activation' if self._activated else 'deactivation'} of {self.rows} rows is done, "
+                                 f"{changed} users changed in {seconds:.2f} seconds.")
+
+        yield json.dumps({
+                    "summary": {
+                        "rows": self.rows,
+                        **{status.lower().replace('-', '_'): count for status, count in self.counters.items()},
+                        "failed": self.rows - sum(self.counters.values()),
+                        "seconds": round(seconds, 3)
+                    }
+                }) + "\n"
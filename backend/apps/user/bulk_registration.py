@@ -0,0 +1,389 @@
+"""Bulk registration of customers.
+
+SENECA GLOBAL CONFIDENTIAL & PROPRIETARY
+
+@file bulk_registration.py
+@author Dilip Kumar Sharma
+@copyright Seneca Global
+@date 18th Oct 2026
+
+About; -
+--------
+    Registers many customers received as NDJSON or CSV rows.
+
+Working; -
+----------
+    Rows are read one by one from the request stream and validated with the same
+    rules as sign up. Rows are collected in chunks of at most chunk size rows, valid
+    or not, so memory is bounded however long the stream is. For every chunk
+    blacklisted and registered emails are found with one query and the remaining
+    users, profiles, insurance plans and insurances are added with bulk insert
+    statements in one transaction. Result of every row is yielded as soon as its
+    chunk is done, so the response can be streamed back.
+
+Uses; -
+-------
+    This module is used by bulk sign up endpoint.
+
+Reference; -
+------------
+    https://jsonlines.org/
+"""
+
+import csv
+import json
+import time
+from apps import configuration
+from apps.user.dao import UserInsuranceDao, RegistrationDao, RegistrationStatus, ALREADY_REGISTERED
+from apps.user.data_validation import validate_registration_data
+from apps.user.emails import send_verification_email
+from apps.user.apis.namespaces.sign_up_namespace import sign_up_payload_validator
+from utils.password_helper import PasswordGenerator
+from utils.security import get_password_hasher
+from utils.insurance_logger import InsuranceLogger
+
+
+NDJSON_CONTENT_TYPE = 'application/x-ndjson'
+CSV_CONTENT_TYPE = 'text/csv'
+
+CSV_HEADER = ['customer_name', 'email_address', 'insurance_plan_name', 'insured_amount']
+
+
+def chunk_rows(rows, chunk_size: int):
+    """Group rows of a stream in lists of at most chunk_size rows.
+
+    Args:
+        rows: Iterable of rows
+        chunk_size (int): Maximum rows in a chunk
+
+    Yields:
+        list: Rows of the chunk, in order
+    """
+    chunk = []
+
+    for row in rows:
+        chunk.append(row)
+
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+def read_ndjson_rows(lines):
+    """Read registrations from NDJSON lines.
+
+    Args:
+        lines: Iterable of text lines
+
+    Yields:
+        tuple: row number, decoded registration or None, error message or None
+    """
+    for row_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+
+        try:
+            yield row_number, json.loads(line), None
+        except ValueError:
+            yield row_number, None, "Invalid Json Format"
+
+def read_csv_rows(lines) -> tuple:
+    """Read registrations from CSV lines. First line must be the header.
+
+    Args:
+        lines: Iterable of text lines
+
+    Returns:
+        tuple: bool for success/failure, error message if any, generator of rows
+    """
+    reader = csv.reader(lines)
+    header = next(reader, None)
+
+    if header is None or [column.strip() for column in header] != CSV_HEADER:
+        return False, "CSV header should be '{}'.".format(",".join(CSV_HEADER)), None
+
+    def rows():
+        for row_number, values in enumerate(reader, start=1):
+            if not values:
+                continue
+
+            if len(values) != len(CSV_HEADER):
+                yield row_number, None, "Expected {} columns, found {}.".format(len(CSV_HEADER), len(values))
+                continue
+
+            registration = dict(zip(CSV_HEADER, values))
+            insured_amount = registration['insured_amount'].strip()
+
+            if insured_amount.isdigit():
+                registration['insured_amount'] = int(insured_amount)
+
+            yield row_number, registration, None
+
+    return True, None, rows()
+
+def read_rows(content_type: str, lines) -> tuple:
+    """Read registrations of given content type.
+
+    Args:
+        content_type (str): NDJSON_CONTENT_TYPE or CSV_CONTENT_TYPE
+        lines: Iterable of text lines
+
+    Returns:
+        tuple: bool for success/failure, error message if any, generator of rows
+    """
+    if content_type == NDJSON_CONTENT_TYPE:
+        return True, None, read_ndjson_rows(lines)
+    elif content_type == CSV_CONTENT_TYPE:
+        return read_csv_rows(lines)
+
+    return False, "content-type {} is not supported. Expected content type is '{}' or '{}'".format(
+                    content_type, NDJSON_CONTENT_TYPE, CSV_CONTENT_TYPE
+                ), None
+
+def validate_row(registration) -> dict:
+    """Validate schema and data of a registration.
+
+    Args:
+        registration: Decoded registration
+
+    Returns:
+        dict: None when valid, otherwise error attributes of row result
+    """
+    errors = sign_up_payload_validator.validate(registration)
+
+    if errors is not None:
+        if 'errors' in errors:
+            return {"reason": errors['message'], "errors": errors['errors']}
+        return {"reason": errors['reason']}
+
+    valid, reason = validate_registration_data(registration)
+
+    if not valid:
+        return {"reason": reason}
+
+    return None
+
+def hash_passwords(passwords: list) -> tuple:
+    """Hash passwords with the worker process pool.
+
+    Args:
+        passwords (list): Passwords to be hashed
+
+    Returns:
+        tuple: bool for success/failure, error message if any, hashed passwords in same order
+    """
+    return get_password_hasher().hash_passwords(passwords)
+
+
+class BulkRegistration:
+    """Registers customers chunk by chunk.
+
+    Args:
+        chunk_size (int): Number of rows inserted together
+        password_hasher (optional): Function hashing list of passwords, returning status, message, hashes.
+                                    Defaults to hash_passwords.
+        send_emails (bool, optional): Whether verification emails are sent. Defaults to True.
+    """
+    def __init__(self, chunk_size: int, password_hasher=hash_passwords, send_emails: bool = True) -> None:
+        self._chunk_size = chunk_size
+        self._password_hasher = password_hasher
+        self._send_emails = send_emails
+        self._password_generator = PasswordGenerator(configuration.PASSWORD_LENGTH)
+
+        self.rows = 0
+        self.registered = 0
+
+    @staticmethod
+    def _result(row_number: int, registration, status: str, **attributes) -> dict:
+        email_address = registration.get('email_address') if isinstance(registration, dict) else None
+        return dict(row=row_number, email_address=email_address, status=status, **attributes)
+
+    def register(self, rows):
+        """Register all rows.
+
+        Args:
+            rows: Iterable of row number, registration, error message
+
+        Yields:
+            dict: Result of every row in order of rows
+        """
+        for chunk in chunk_rows(self._validate(rows), self._chunk_size):
+            yield from self._register_chunk(chunk)
+
+    def _validate(self, rows):
+        """Row number, registration and its validation error result, None if valid."""
+        for row_number, registration, error in rows:
+            self.rows += 1
+
+            if error is None:
+                invalid = validate_row(registration)
+            else:
+                invalid = {"reason": error}
+
+            if invalid is not None:
+                yield row_number, registration, self._result(row_number, registration, "VALIDATION-ERROR", **invalid)
+            else:
+                yield row_number, registration, None
+
+    def _register_chunk(self, chunk: list):
+        results = dict()
+        pending = []
+        seen = set()
+
+        for row_number, registration, result in chunk:
+            if result is not None:
+                results[row_number] = result
+            elif registration['email_address'].lower() in seen:
+                results[row_number] = self._already_registered(row_number, registration)
+            else:
+                seen.add(registration['email_address'].lower())
+                pending.append((row_number, registration))
+
+        if pending:
+            results.update(self._add_registrations(pending))
+
+        for row_number in sorted(results):
+            yield results[row_number]
+
+    def _already_registered(self, row_number: int, registration: dict) -> dict:
+        return self._result(
+                    row_number, registration, "VALIDATION-ERROR",
+                    reason="User with Email '{}' is already registered.".format(registration['email_address'])
+                )
+
+    def _internal_error(self, row_number: int, registration: dict, message: str) -> dict:
+        return self._result(row_number, registration, "INTERNAL-SERVER-ERROR", reason=message)
+
+    def _add_registrations(self, pending: list) -> dict:
+        results = dict()
+
+        is_success, message, statuses = RegistrationDao.get_registration_statuses(
+                                            email_addresses=[registration['email_address'] for _, registration in pending]
+                                        )
+
+        if not is_success:
+            return {row_number: self._internal_error(row_number, registration, message) for row_number, registration in pending}
+
+        available = []
+
+        for row_number, registration in pending:
+            status = statuses.get(registration['email_address'].lower(), RegistrationStatus.AVAILABLE)
+
+            if status == RegistrationStatus.BLACKLISTED:
+                results[row_number] = self._result(
+                                        row_number, registration, "VALIDATION-ERROR",
+                                        reason="Email Validation Failed. You are not allowed to create an account with us."
+                                    )
+            elif status == RegistrationStatus.REGISTERED:
+                results[row_number] = self._already_registered(row_number, registration)
+            else:
+                available.append((row_number, registration))
+
+        if not available:
+            return results
+
+        passwords = []
+
+        for row_number, registration in available:
+            is_success, message, password = self._password_generator.generate_password()
+            passwords.append(password)
+
+        is_success, message, password_hashes = self._password_hasher(passwords)
+
+        if not is_success:
+            for row_number, registration in available:
+                results[row_number] = self._internal_error(row_number, registration, message)
+            return results
+
+        registrations = [
+            dict(registration, password_hash=password_hash)
+            for (_, registration), password_hash in zip(available, password_hashes)
+        ]
+
+        is_success, message, _ = UserInsuranceDao.add_user_insurances(registrations=registrations)
+
+        if not is_success and message == ALREADY_REGISTERED:
+            # Registered by a concurrent request, so fall back to one transaction per row
+            added = self._add_one_by_one(available, passwords, results)
+        elif not is_success:
+            for row_number, registration in available:
+                results[row_number] = self._internal_error(row_number, registration, message)
+            return results
+        else:
+            added = list(zip(available, passwords))
+
+        for (row_number, registration), password in added:
+            results[row_number] = self._registered(row_number, registration, password)
+
+        return results
+
+    def _add_one_by_one(self, available: list, passwords: list, results: dict) -> list:
+        added = []
+
+        for (row_number, registration), password in zip(available, passwords):
+            is_success, message, _ = UserInsuranceDao.add_user_insurance(
+                customer_name = registration['customer_name'],
+                email_address = registration['email_address'],
+                password = password,
+                insurance_plan_name = registration['insurance_plan_name'],
+                insured_amount = registration['insured_amount']
+            )
+
+            if is_success:
+                added.append(((row_number, registration), password))
+            elif message == ALREADY_REGISTERED:
+                results[row_number] = self._already_registered(row_number, registration)
+            else:
+                results[row_number] = self._internal_error(row_number, registration, message)
+
+        return added
+
+    def _registered(self, row_number: int, registration: dict, password: str) -> dict:
+        self.registered += 1
+
+        if self._send_emails:
+            is_success, message, _ = send_verification_email(
+                customer_name = registration['customer_name'],
+                email_address = registration['email_address'],
+                password = password
+            )
+
+            if not is_success:
+                return self._internal_error(
+                            row_number, registration,
+                            "User is registered but verification email is not sent. {}".format(message)
+                        )
+
+        return self._result(
+                    row_number, registration, "Success",
+                    reason="User with Email '{}' is registered successfully.".format(registration['email_address'])
+                )
+
+    def register_as_ndjson(self, rows):
+        """Register all rows and yield results as NDJSON lines, followed by a summary line.
+
+        Args:
+            rows: Iterable of row number, registration, error message
+
+        Yields:
+            str: NDJSON line
+        """
+        start = time.perf_counter()
+
+        for result in self.register(rows):
+            yield json.dumps(result) + "\n"
+
+        seconds = time.perf_counter() - start
+
+        InsuranceLogger.log_info(f"Bulk registration of {self.rows} rows is done, {self.registered} users registered in {seconds:.2f} seconds.")
+
+        yield json.dumps({
+                    "summary": {
+                        "rows": self.rows,
+                        "registered": self.registered,
+                        "failed": self.rows - self.registered,
+                        "seconds": round(seconds, 3)
+                    }
+                }) + "\n"
@@ -18,6 +18,15 @@ Design Pattern; -
 Working; -
 ----------
     This class uses flask sqlalchemy transaction as context manager to connect to database.
+    Transactions are opened with unit_of_work.transaction(), so inside a unit of work all
+    dao methods of a request share one transaction.
+
+    Insurance plans, sign up jobs, idempotency records and revoked tokens are written on
+    connections of their own. They are shared with other requests and workers, so they are committed
+    at once and never rolled back with the request.
+
+    Read methods return projections, named tuples of only the columns callers need, instead
+    of ORM objects whose relationships and expired attributes would be loaded lazily.
 
 Uses; -
 -------
@@ -29,14 +38,171 @@ Reference; -
     TBD
 """
 
-from typing import Any
-from sqlalchemy.exc import SQLAlchemyError
+import json
+from datetime import datetime
+from typing import Any, NamedTuple
+from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from apps import db
-from apps.user.models import User, UserProfile, InsurancePlan, Insurance, Blacklist
-from utils.security  import generate_password_hash
+from apps.user.models import User, UserProfile, InsurancePlan, Insurance, Blacklist, RegistrationJob, IdempotencyRecord, RevokedToken
+from apps.user.blacklist_filter import blacklist_filter
+from apps.user.insurance_plan_catalog import insurance_plan_catalog
+from apps.user.unit_of_work import transaction, set_rollback_only
+from utils.security import get_password_hasher
 from utils.insurance_logger import InsuranceLogger
 
 
+# Message returned by dao when unique index on user email rejects the insert
+ALREADY_REGISTERED = "ALREADY-REGISTERED"
+
+# Message returned by dao when unique index on blacklist email rejects the insert
+ALREADY_BLACKLISTED = "ALREADY-BLACKLISTED"
+
+
+class RegistrationStatus:
+    AVAILABLE = "AVAILABLE"
+    REGISTERED = "REGISTERED"
+    BLACKLISTED = "BLACKLISTED"
+
+
+class ActivationStatus:
+    ACTIVATED = "ACTIVATED"
+    ALREADY_ACTIVATED = "ALREADY-ACTIVATED"
+    DEACTIVATED = "DEACTIVATED"
+    ALREADY_DEACTIVATED = "ALREADY-DEACTIVATED"
+    NOT_FOUND = "NOT-FOUND"
+
+
+class Activation(NamedTuple):
+    status: str
+    customer_name: str
+    user_id: int = None
+
+
+class Credentials(NamedTuple):
+    user_id: int
+    customer_name: str
+    password_hash: str
+    activated: bool
+
+
+# Projections of read dao methods, only the columns callers need, read with one statement
+class UserInsurance(NamedTuple):
+    user_id: int
+    customer_name: str
+    email_address: str
+    insurance_plan_name: str
+    insured_amount: int
+
+
+class UserSummary(NamedTuple):
+    user_id: int
+    customer_name: str
+    email_address: str
+    activated: bool
+    created_at: datetime
+
+
+class InsuranceSummary(NamedTuple):
+    insurance_id: int
+    insurance_plan_name: str
+    insured_amount: int
+
+
+class RegistrationDao:
+    @staticmethod
+    def get_registration_status(
+            email_address: str,
+            check_blacklist: bool = True
+            ) -> tuple:
+        """
+        Find whether given email is blacklisted, already registered or available for sign up.
+
+        Both tables are checked with a single query.
+
+        Args:
+            email_address (str): Email address of the customer
+            check_blacklist (bool, optional): False when email is known not to be blacklisted. Defaults to True.
+
+        Returns:
+            tuple: status, message, result
+                    status is boolean value indicating success (True) or Failure(False),
+                    message is a string about the error occurred if any, otherwise None,
+                    result is one of RegistrationStatus values or None otherwise.
+        """
+        if check_blacklist:
+            blacklisted = db.exists().where(Blacklist.email_address == email_address)
+        else:
+            blacklisted = db.false()
+
+        query = db.select(
+                    blacklisted.label('blacklisted'),
+                    db.exists().where(User.email_address == email_address).label('registered')
+                )
+
+        InsuranceLogger.log_info(f"Getting registration status for {email_address} from database.")
+
+        try:
+            with transaction():
+                blacklisted, registered = db.session.execute(query).one()
+        except SQLAlchemyError as err:
+            InsuranceLogger.log_error(f"Failed to get registration status from database. {str(err)}.")
+            return False, "Failed to update database.", None
+
+        if blacklisted:
+            return True, None, RegistrationStatus.BLACKLISTED
+        elif registered:
+            return True, None, RegistrationStatus.REGISTERED
+
+        return True, None, RegistrationStatus.AVAILABLE
+
+    @staticmethod
+    def get_registration_statuses(
+            email_addresses: list
+            ) -> tuple:
+        """
+        Find blacklisted and already registered emails among given emails.
+
+        Both tables are checked with a single query.
+
+        Args:
+            email_addresses (list): Email addresses of the customers
+
+        Returns:
+            tuple: status, message, result
+                    status is boolean value indicating success (True) or Failure(False),
+                    message is a string about the error occurred if any, otherwise None,
+                    result is dict of lower cased email address and RegistrationStatus value
+                    for emails which are not available, or None otherwise.
+        """
+        blacklisted = db.select(
+                        Blacklist.email_address,
+                        db.literal(RegistrationStatus.BLACKLISTED)
+                    ).where(Blacklist.email_address.in_(email_addresses))
+
+        registered = db.select(
+                        User.email_address,
+                        db.literal(RegistrationStatus.REGISTERED)
+                    ).where(User.email_address.in_(email_addresses))
+
+        InsuranceLogger.log_info(f"Getting registration status for {len(email_addresses)} emails from database.")
+
+        try:
+            with transaction():
+                rows = db.session.execute(db.union_all(blacklisted, registered)).all()
+        except SQLAlchemyError as err:
+            InsuranceLogger.log_error(f"Failed to get registration status from database. {str(err)}.")
+            return False, "Failed to update database.", None
+
+        result = dict()
+
+        for email_address, status in rows:
+            # Blacklisting takes precedence over registration
+            if result.get(email_address.lower()) != RegistrationStatus.BLACKLISTED:
+                result[email_address.lower()] = status
+
+        return True, None, result
+
+
 class UserInsuranceDao():
     @staticmethod
     def add_user_insurance(
@@ -49,6 +215,8 @@ class UserInsuranceDao():
         """
         Create new record in DB when user signs up.
 
+        If the email is already registered, message is ALREADY_REGISTERED.
+
         Args:
             customer_name (str): Name of the customer
             email_address (str): Email address of the customer
@@ -60,43 +228,187 @@ class UserInsuranceDao():
             tuple: status, message, result
                     status is boolean value indicating success (True) or Failure(False),
                     message is a string about the error occurred if any, otherwise None,
-                    result is the actual response generated from DB Query or None otherwise.
+                    result is UserInsurance of the new customer or None otherwise.
         """
         
-        # Hash the password before making an entry into database
+        # Hash the password before making an entry into database, outside of the transaction
+        is_success, message, password_hash = get_password_hasher().hash_password(password)
+
+        if not is_success:
+            InsuranceLogger.log_error(message)
+            return False, message, None
+
+        is_success, message, insurance_plan_id = insurance_plan_catalog.get_plan_id(insurance_plan_name)
+
+        if not is_success:
+            return False, message, None
+
         user = User(
                     customer_name = customer_name,
                     email_address = email_address,
-                    password = generate_password_hash(password)
+                    password = password_hash
                 )
         
         user_profile = UserProfile(
                     customerprofile = user
                 )
 
-        insurance_plan = InsurancePlan(
-                    insurance_plan_name = insurance_plan_name             
-                )
-
         insurance = Insurance(
                     insured_amount = insured_amount,
                     user = user,
-                    insurance_plan = insurance_plan             
+                    insurance_plan_id = insurance_plan_id
                 )
 
         InsuranceLogger.log_info(f"Adding user information for customer {user.customer_name}.")
 
-        with db.session.begin():
-            try:
+        # Unique index on email address rejects duplicate registrations, so
+        # no separate lookup is needed before the insert.
+        try:
+            with transaction(savepoint=True):
                 db.session.add(user)
                 db.session.add(user_profile)
-                db.session.add(insurance_plan)
                 db.session.add(insurance)
-            except SQLAlchemyError as err:
-                InsuranceLogger.log_error(f"Failed to add insurance data into database. {str(err)}.")
-                return False, "Failed to update database.", None
+                # Id is read before commit expires the user
+                db.session.flush()
+
+                result = UserInsurance(user.id, customer_name, email_address, insurance_plan_name, insured_amount)
+        except IntegrityError as err:
+            if 'email_address' in str(err.orig):
+                InsuranceLogger.log_info(f"User with Email {email_address} is already registered.")
+                return False, ALREADY_REGISTERED, None
+
+            if 'insurance_plan' in str(err.orig):
+                # Cached plan id does not exist anymore
+                insurance_plan_catalog.clear()
+
+            InsuranceLogger.log_error(f"Failed to add insurance data into database. {str(err)}.")
+            set_rollback_only()
+            return False, "Failed to update database.", None
+        except SQLAlchemyError as err:
+            InsuranceLogger.log_error(f"Failed to add insurance data into database. {str(err)}.")
+            set_rollback_only()
+            return False, "Failed to update database.", None
    
-        return True, None, insurance
+        return True, None, result
+
+    @staticmethod
+    def add_user_insurances(
+            registrations: list
+    ) -> tuple:
+        """
+        Create records of many users in DB with bulk insert statements in one transaction.
+
+        Insurance plans are taken from insurance plan catalog.
+        If any of the emails is already registered, nothing is added and message is ALREADY_REGISTERED.
+
+        Args:
+            registrations (list): dict for every user with customer_name, email_address,
+                                  password_hash, insurance_plan_name and insured_amount
+
+        Returns:
+            tuple: status, message, result
+                    status is boolean value indicating success (True) or Failure(False),
+                    message is a string about the error occurred if any, otherwise None,
+                    result is the number of users added or None otherwise.
+        """
+        email_addresses = [registration['email_address'] for registration in registrations]
+
+        is_success, message, insurance_plan_ids = insurance_plan_catalog.get_plan_ids(
+                                                        registration['insurance_plan_name'] for registration in registrations
+                                                    )
+
+        if not is_success:
+            return False, message, None
+
+        InsuranceLogger.log_info(f"Adding user information for {len(registrations)} customers.")
+
+        try:
+            with transaction(savepoint=True):
+                db.session.execute(
+                    db.insert(User),
+                    [
+                        dict(
+                            customer_name = registration['customer_name'],
+                            email_address = registration['email_address'],
+                            password = registration['password_hash']
+                        ) for registration in registrations
+                    ]
+                )
+
+                user_ids = dict(
+                    db.session.execute(
+                        db.select(User.email_address, User.id).where(User.email_address.in_(email_addresses))
+                    ).all()
+                )
+
+                db.session.execute(
+                    db.insert(UserProfile),
+                    [dict(customerprofile_id = user_ids[email_address], activated = False) for email_address in email_addresses]
+                )
+
+                db.session.execute(
+                    db.insert(Insurance),
+                    [
+                        dict(
+                            insured_amount = registration['insured_amount'],
+                            user_id = user_ids[registration['email_address']],
+                            insurance_plan_id = insurance_plan_ids[registration['insurance_plan_name']]
+                        ) for registration in registrations
+                    ]
+                )
+        except IntegrityError as err:
+            if 'email_address' in str(err.orig):
+                InsuranceLogger.log_info(f"One of {len(registrations)} emails is already registered.")
+                return False, ALREADY_REGISTERED, None
+
+            if 'insurance_plan' in str(err.orig):
+                # Cached plan id does not exist anymore
+                insurance_plan_catalog.clear()
+
+            InsuranceLogger.log_error(f"Failed to add insurance data into database. {str(err)}.")
+            set_rollback_only()
+            return False, "Failed to update database.", None
+        except SQLAlchemyError as err:
+            InsuranceLogger.log_error(f"Failed to add insurance data into database. {str(err)}.")
+            set_rollback_only()
+            return False, "Failed to update database.", None
+
+        return True, None, len(registrations)
+
+    @staticmethod
+    def get_insurances(
+            email_address: str
+            ) -> tuple:
+        """
+        Get insurances of user having given email with names of their plans.
+
+        Only the needed columns of insurances and plans are read, with one query.
+
+        Args:
+            email_address (str): Email address of the customer
+
+        Returns:
+            tuple: status, message, result
+                    status is boolean value indicating success (True) or Failure(False),
+                    message is a string about the error occurred if any, otherwise None,
+                    result is list of InsuranceSummary in order of creation, empty if user is not found.
+        """
+        query = db.select(Insurance.id, InsurancePlan.insurance_plan_name, Insurance.insured_amount) \
+                  .join(InsurancePlan, InsurancePlan.id == Insurance.insurance_plan_id) \
+                  .join(User, User.id == Insurance.user_id) \
+                  .where(User.email_address == email_address) \
+                  .order_by(Insurance.id)
+
+        InsuranceLogger.log_info(f"Getting insurances of user with email {email_address} from database.")
+
+        try:
+            with transaction():
+                rows = db.session.execute(query).all()
+        except SQLAlchemyError as err:
+            InsuranceLogger.log_error(f"Failed to get insurances of user from database. {str(err)}.")
+            return False, "Failed to update database.", None
+
+        return True, None, [InsuranceSummary(*row) for row in rows]
     
 class UserDao:
     @staticmethod
@@ -126,12 +438,12 @@ class UserDao:
                 )
         InsuranceLogger.log_info(f"Adding customer {user.customer_name} in database.")
 
-        with db.session.begin():
-            try:
+        try:
+            with transaction():
                 db.session.add(user)
-            except SQLAlchemyError as err:
-                InsuranceLogger.log_error(f"Failed to add user data into database. {str(err)}.")
-                return False, "Failed to update database.", None
+        except SQLAlchemyError as err:
+            InsuranceLogger.log_error(f"Failed to add user data into database. {str(err)}.")
+            return False, "Failed to update database.", None
                   
         return True, None, user
 
@@ -142,6 +454,9 @@ class UserDao:
         """
         Get user from database by passing email id.
 
+        User is expired once the transaction commits, so reading its attributes queries again.
+        Use get_user_summary when only its columns are needed.
+
         Args:
             email_address (str): Email address of the customer
 
@@ -155,168 +470,458 @@ class UserDao:
 
         InsuranceLogger.log_info(f"Getting user with email {email_address} from database.")
 
-        with db.session.begin():
-            try:
+        try:
+            with transaction():
                 result = User.query.filter_by(email_address=email_address).first()
                 
-            except SQLAlchemyError as err:
-                InsuranceLogger.log_error(f"Failed to search user by email in database. {str(err)}.")
-                return False, "Failed to update database.", None
+        except SQLAlchemyError as err:
+            InsuranceLogger.log_error(f"Failed to search user by email in database. {str(err)}.")
+            return False, "Failed to update database.", None
             
         return True, None, result
             
     @staticmethod
-    def update_profile_by_activation(
-            user: User,
-            activated: bool
+    def get_user_summary(
+            email_address: str
             ) -> tuple:
         """
-        Update activation status of given user.
+        Get user having given email with its activation, instead of the ORM objects of user and profile.
+
+        Only the needed columns of user and its profile are read, with one query.
 
         Args:
-            user (User): User whose activation status needs to be updated.
-            activated (bool): Activation status, whether or not activated.
+            email_address (str): Email address of the customer
 
         Returns:
             tuple: status, message, result
                     status is boolean value indicating success (True) or Failure(False),
                     message is a string about the error occurred if any, otherwise None,
-                    result is the actual response generated from DB Query or None otherwise.
+                    result is UserSummary or None if user is not found.
         """
-        InsuranceLogger.log_info(f"Updating profile for user {user.customer_name} with activation to {activated}.")
+        query = db.select(User.id, User.customer_name, User.email_address, UserProfile.activated, User.created_at) \
+                  .outerjoin(UserProfile, UserProfile.customerprofile_id == User.id) \
+                  .where(User.email_address == email_address)
+
+        InsuranceLogger.log_info(f"Getting summary of user with email {email_address} from database.")
 
         try:
-            user.userprofiles.activated = activated
-            db.session.add(user)
-            db.session.commit()
+            with transaction():
+                row = db.session.execute(query).first()
         except SQLAlchemyError as err:
-            InsuranceLogger.log_error(f"Failed to update user activation in database. {str(err)}.")
+            InsuranceLogger.log_error(f"Failed to get user summary from database. {str(err)}.")
             return False, "Failed to update database.", None
-        
-        return True, None, user.userprofiles.activated
 
-class UserProfileDao:
+        if row is None:
+            return True, None, None
+
+        return True, None, UserSummary(row.id, row.customer_name, row.email_address, bool(row.activated), row.created_at)
+
     @staticmethod
-    def add_profile(
-            activation_status: str,
-            customerprofile: User,
-            activated: bool = False            
+    def get_email_addresses(
+            user_ids: list
             ) -> tuple:
         """
-        Add new profile in database.
+        Get email addresses of users having given ids.
 
         Args:
-            activation_status (str): Activation status of customer.
-            customerprofile (User): The customer whose profile is added.
-            activated (bool, optional): If user has clicked on confirmation email then he is activated. Defaults to False.
+            user_ids (list): Ids of the users
 
         Returns:
             tuple: status, message, result
                     status is boolean value indicating success (True) or Failure(False),
                     message is a string about the error occurred if any, otherwise None,
-                    result is the actual response generated from DB Query or None otherwise.
+                    result is list of email addresses of users found or None otherwise.
         """
-        user_profile = UserProfile(
-                    activation_status = activation_status,
-                    customerprofile = customerprofile,
-                    activated = activated
-                )
+        try:
+            with transaction():
+                result = db.session.execute(db.select(User.email_address).where(User.id.in_(user_ids))).scalars().all()
+        except SQLAlchemyError as err:
+            InsuranceLogger.log_error(f"Failed to get emails of users from database. {str(err)}.")
+            return False, "Failed to update database.", None
 
-        InsuranceLogger.log_info(f"Add User profile for user {customerprofile.customer_name} in database.")
+        return True, None, result
 
-        with db.session.begin():
-            try:
-                db.session.add(user_profile)
-            except SQLAlchemyError as err:
-                InsuranceLogger.log_error(f"Failed to add user profile data into database. {str(err)}.")
-                return False, "Failed to update database.", None
-                   
-        return True, None, user_profile
-    
     @staticmethod
-    def update_profile_by_activation(
-            user_profile: UserProfile,
-            activated: bool
+    def get_credentials(
+            email_address: str
             ) -> tuple:
         """
-        Update activation status of given user profile.
+        Get password hash and activation status of user having given email.
+
+        Only the needed columns of user and its profile are read, with one query.
 
         Args:
-            user_profile (int): User profile which needs to be updated.
-            activated (bool): Activation status, whether or not activated.
+            email_address (str): Email address of the customer
 
         Returns:
             tuple: status, message, result
                     status is boolean value indicating success (True) or Failure(False),
                     message is a string about the error occurred if any, otherwise None,
-                    result is the actual response generated from DB Query or None otherwise.
+                    result is Credentials or None if user is not found.
         """
-        InsuranceLogger.log_info(f"Updating profile for user {user_profile.user.customer_name} with activation to {activated}.")
-        
+        query = db.select(User.id, User.customer_name, User.password, UserProfile.activated) \
+                  .outerjoin(UserProfile, UserProfile.customerprofile_id == User.id) \
+                  .where(User.email_address == email_address)
+
+        InsuranceLogger.log_info(f"Getting credentials of user with email {email_address} from database.")
+
         try:
-            user_profile.activated = activated
-            db.session.add(user_profile)
-            db.session.commit()
+            with transaction():
+                row = db.session.execute(query).first()
         except SQLAlchemyError as err:
-            InsuranceLogger.log_error(f"Failed to update profile by activation in database. {str(err)}.")
+            InsuranceLogger.log_error(f"Failed to get user credentials from database. {str(err)}.")
             return False, "Failed to update database.", None
-        
-        return True, None, None
 
-class InsurancePlanDao:
+        if row is None:
+            return True, None, None
+
+        return True, None, Credentials(row.id, row.customer_name, row.password, bool(row.activated))
+
     @staticmethod
-    def add_insurance_plan(
-            insurance_plan_name: str
+    def activate_user(
+            email_address: str
             ) -> tuple:
         """
-        Create new insurance plan in database.
+        Activate user having given email.
+
+        Profile is activated by one conditional update, only if it was never activated,
+        so of two concurrent clicks on the confirmation link only one activates the user
+        and a user deactivated by support staff is not activated again by an old link.
+        Name of the customer is read afterwards, for welcome email.
 
         Args:
-            insurance_plan_name (str): Insurance plan name chosen by customer
+            email_address (str): Email address of the customer
 
         Returns:
             tuple: status, message, result
                     status is boolean value indicating success (True) or Failure(False),
                     message is a string about the error occurred if any, otherwise None,
-                    result is the actual response generated from DB Query or None otherwise.
+                    result is Activation with ACTIVATED, ALREADY_ACTIVATED, DEACTIVATED if the user was
+                    deactivated by support staff or NOT_FOUND, customer name and user id, or None otherwise.
         """
-        insurance_plan = InsurancePlan(
-                    insurance_plan_name = insurance_plan_name             
-                )
+        user_id = db.select(User.id).where(User.email_address == email_address).scalar_subquery()
 
-        InsuranceLogger.log_info(f"Adding Insurance Plan {insurance_plan_name} in database.")
+        query = db.update(UserProfile) \
+                  .where(UserProfile.customerprofile_id == user_id, UserProfile.activated == db.false(), UserProfile.activated_at.is_(None)) \
+                  .values(activated=True, activated_at=datetime.utcnow()) \
+                  .execution_options(synchronize_session=False)
+
+        InsuranceLogger.log_info(f"Activating user with email {email_address}.")
+
+        try:
+            with transaction():
+                activated = db.session.execute(query).rowcount
+                row = db.session.execute(
+                            db.select(User.id, User.customer_name, UserProfile.activated)
+                              .outerjoin(UserProfile, UserProfile.customerprofile_id == User.id)
+                              .where(User.email_address == email_address)
+                        ).first()
+        except SQLAlchemyError as err:
+            InsuranceLogger.log_error(f"Failed to update user activation in database. {str(err)}.")
+            return False, "Failed to update database.", None
+
+        if row is None:
+            return True, None, Activation(ActivationStatus.NOT_FOUND, None)
+        elif activated:
+            return True, None, Activation(ActivationStatus.ACTIVATED, row.customer_name, row.id)
+        elif not row.activated:
+            # Deactivated by support staff
+            return True, None, Activation(ActivationStatus.DEACTIVATED, row.customer_name, row.id)
+
+        return True, None, Activation(ActivationStatus.ALREADY_ACTIVATED, row.customer_name, row.id)
 
-        with db.session.begin():
-            try:
-                db.session.add(insurance_plan)
-            except SQLAlchemyError as err:
-                InsuranceLogger.log_error(f"Failed to add insurance plan in database. {str(err)}.")
-                return False, "Failed to update database.", None
-            
-        return True, None, insurance_plan
-    
-class InsuranceDao:
     @staticmethod
-    def add_insurance(
-            insured_amount: int,
-            user: User,
-            insurance_plan: InsurancePlan
+    def set_activations(
+            email_addresses: list,
+            activated: bool
             ) -> tuple:
         """
-        Create new insurance in database.
+        Activate or deactivate users having given emails.
+
+        Profiles are read with one query, locked till commit, and changed with one
+        update of those not in the wanted state yet, so a chunk of emails costs two
+        statements however many emails it has.
 
         Args:
-            insured_amount (int): Insured amount chosen by customer
-            user (User): The customer who is creating insurance
-            insurance_plan (InsurancePlan): The insurance plan chosen by customer
+            email_addresses (list): Email addresses of the customers
+            activated (bool): True to activate, False to deactivate
 
         Returns:
             tuple: status, message, result
                     status is boolean value indicating success (True) or Failure(False),
                     message is a string about the error occurred if any, otherwise None,
-                    result is the actual response generated from DB Query or None otherwise.
+                    result is dict of lower cased email address and Activation for every
+                    given email, or None otherwise.
         """
-        insurance = Insurance(
+        user_ids = db.select(User.id).where(User.email_address.in_(email_addresses))
+
+        select_query = db.select(User.id, User.email_address, User.customer_name, UserProfile.activated) \
+                         .join(UserProfile, UserProfile.customerprofile_id == User.id) \
+                         .where(User.email_address.in_(email_addresses)) \
+                         .with_for_update(of=UserProfile)
+
+        values = dict(activated=activated)
+
+        if activated:
+            values['activated_at'] = db.func.coalesce(UserProfile.activated_at, datetime.utcnow())
+
+        update_query = db.update(UserProfile) \
+                         .where(UserProfile.customerprofile_id.in_(user_ids), UserProfile.activated == (not activated)) \
+                         .values(**values) \
+                         .execution_options(synchronize_session=False)
+
+        InsuranceLogger.log_info(f"{'Activating' if activated else 'Deactivating'} {len(email_addresses)} users.")
+
+        try:
+            with transaction():
+                rows = db.session.execute(select_query).all()
+                db.session.execute(update_query)
+        except SQLAlchemyError as err:
+            InsuranceLogger.log_error(f"Failed to update user activations in database. {str(err)}.")
+            return False, "Failed to update database.", None
+
+        if activated:
+            changed, unchanged = ActivationStatus.ACTIVATED, ActivationStatus.ALREADY_ACTIVATED
+        else:
+            changed, unchanged = ActivationStatus.DEACTIVATED, ActivationStatus.ALREADY_DEACTIVATED
+
+        result = {email_address.lower(): Activation(ActivationStatus.NOT_FOUND, None) for email_address in email_addresses}
+
+        for row in rows:
+            result[row.email_address.lower()] = Activation(unchanged if bool(row.activated) == activated else changed, row.customer_name, row.id)
+
+        return True, None, result
+
+    @staticmethod
+    def purge_unactivated_users(
+            created_before: datetime,
+            after: tuple,
+            limit: int,
+            dry_run: bool = False
+            ) -> tuple:
+        """
+        Delete a batch of never activated users created before given time, with their profiles and insurances.
+
+        Users deactivated after being activated keep their activation time and are never purged.
+
+        Users are found in order of creation time by its index, starting after the last
+        user of previous batch. Their profiles are locked till the batch is committed and
+        profiles locked by others, e.g. being activated, are skipped, so a batch holds
+        only its own rows for the time of a few short statements.
+
+        Args:
+            created_before (datetime): Users created before this UTC time are purged
+            after (tuple): Creation time and id of last user of previous batch, None for the first batch
+            limit (int): Maximum users in the batch
+            dry_run (bool, optional): Only find users of the batch, without deleting them. Defaults to False.
+
+        Returns:
+            tuple: status, message, result
+                    status is boolean value indicating success (True) or Failure(False),
+                    message is a string about the error occurred if any, otherwise None,
+                    result is list of creation time and id of purged users or None otherwise.
+        """
+        query = db.select(User.created_at, User.id) \
+                  .join(UserProfile, UserProfile.customerprofile_id == User.id) \
+                  .where(User.created_at < created_before, UserProfile.activated == db.false(), UserProfile.activated_at.is_(None)) \
+                  .order_by(User.created_at, User.id) \
+                  .limit(limit)
+
+        if after is not None:
+            query = query.where(db.tuple_(User.created_at, User.id) > db.tuple_(*after))
+
+        if not dry_run:
+            query = query.with_for_update(of=UserProfile, skip_locked=True)
+
+        try:
+            with transaction():
+                rows = [tuple(row) for row in db.session.execute(query).all()]
+                user_ids = [user_id for _, user_id in rows]
+
+                if user_ids and not dry_run:
+                    db.session.execute(db.delete(Insurance).where(Insurance.user_id.in_(user_ids)).execution_options(synchronize_session=False))
+                    db.session.execute(db.delete(UserProfile).where(UserProfile.customerprofile_id.in_(user_ids)).execution_options(synchronize_session=False))
+                    db.session.execute(db.delete(User).where(User.id.in_(user_ids)).execution_options(synchronize_session=False))
+        except SQLAlchemyError as err:
+            InsuranceLogger.log_error(f"Failed to purge unactivated users from database. {str(err)}.")
+            return False, "Failed to update database.", None
+
+        return True, None, rows
+
+class UserProfileDao:
+    @staticmethod
+    def add_profile(
+            activation_status: str,
+            customerprofile: User,
+            activated: bool = False            
+            ) -> tuple:
+        """
+        Add new profile in database.
+
+        Args:
+            activation_status (str): Activation status of customer.
+            customerprofile (User): The customer whose profile is added.
+            activated (bool, optional): If user has clicked on confirmation email then he is activated. Defaults to False.
+
+        Returns:
+            tuple: status, message, result
+                    status is boolean value indicating success (True) or Failure(False),
+                    message is a string about the error occurred if any, otherwise None,
+                    result is the actual response generated from DB Query or None otherwise.
+        """
+        user_profile = UserProfile(
+                    activation_status = activation_status,
+                    customerprofile = customerprofile,
+                    activated = activated
+                )
+
+        InsuranceLogger.log_info(f"Add User profile for user {customerprofile.customer_name} in database.")
+
+        try:
+            with transaction():
+                db.session.add(user_profile)
+        except SQLAlchemyError as err:
+            InsuranceLogger.log_error(f"Failed to add user profile data into database. {str(err)}.")
+            return False, "Failed to update database.", None
+                   
+        return True, None, user_profile
+    
+    @staticmethod
+    def update_profile_by_activation(
+            user_profile: UserProfile,
+            activated: bool
+            ) -> tuple:
+        """
+        Update activation status of given user profile.
+
+        Args:
+            user_profile (int): User profile which needs to be updated.
+            activated (bool): Activation status, whether or not activated.
+
+        Returns:
+            tuple: status, message, result
+                    status is boolean value indicating success (True) or Failure(False),
+                    message is a string about the error occurred if any, otherwise None,
+                    result is the actual response generated from DB Query or None otherwise.
+        """
+        InsuranceLogger.log_info(f"Updating profile for user {user_profile.customerprofile_id} with activation to {activated}.")
+        
+        try:
+            with transaction():
+                user_profile.activated = activated
+        except SQLAlchemyError as err:
+            InsuranceLogger.log_error(f"Failed to update profile by activation in database. {str(err)}.")
+            return False, "Failed to update database.", None
+        
+        return True, None, None
+
+class InsurancePlanDao:
+    @staticmethod
+    def get_or_add_insurance_plans(
+            insurance_plan_names: list
+            ) -> tuple:
+        """
+        Find insurance plans by name, plans which do not exist are added.
+
+        Names are compared case insensitively. If a concurrent request adds the same
+        plan, unique index on plan name rejects the insert and plans are read again.
+
+        Args:
+            insurance_plan_names (list): Insurance plan names chosen by customers
+
+        Returns:
+            tuple: status, message, result
+                    status is boolean value indicating success (True) or Failure(False),
+                    message is a string about the error occurred if any, otherwise None,
+                    result is dict of lower case insurance plan name and its id or None otherwise.
+        """
+        keys = {insurance_plan_name.lower(): insurance_plan_name for insurance_plan_name in insurance_plan_names}
+
+        for attempt in range(2):
+            try:
+                # Plans are cached by every request of the worker, so they are committed at once
+                with db.engine.begin() as connection:
+                    rows = connection.execute(
+                        db.select(InsurancePlan.insurance_plan_name, InsurancePlan.id)
+                            .where(db.func.lower(InsurancePlan.insurance_plan_name).in_(list(keys)))
+                    ).all()
+
+                    plan_ids = {insurance_plan_name.lower(): plan_id for insurance_plan_name, plan_id in rows}
+
+                    for key, insurance_plan_name in keys.items():
+                        if key not in plan_ids:
+                            InsuranceLogger.log_info(f"Adding Insurance Plan {insurance_plan_name} in database.")
+
+                            result = connection.execute(
+                                db.insert(InsurancePlan.__table__).values(insurance_plan_name = insurance_plan_name)
+                            )
+                            plan_ids[key] = result.inserted_primary_key[0]
+
+                return True, None, plan_ids
+            except IntegrityError as err:
+                if attempt == 0:
+                    InsuranceLogger.log_info(f"Insurance plan is added by a concurrent request. {str(err)}.")
+                    continue
+
+                InsuranceLogger.log_error(f"Failed to add insurance plan in database. {str(err)}.")
+                return False, "Failed to update database.", None
+            except SQLAlchemyError as err:
+                InsuranceLogger.log_error(f"Failed to add insurance plan in database. {str(err)}.")
+                return False, "Failed to update database.", None
+
+    @staticmethod
+    def add_insurance_plan(
+            insurance_plan_name: str
+            ) -> tuple:
+        """
+        Create new insurance plan in database.
+
+        Args:
+            insurance_plan_name (str): Insurance plan name chosen by customer
+
+        Returns:
+            tuple: status, message, result
+                    status is boolean value indicating success (True) or Failure(False),
+                    message is a string about the error occurred if any, otherwise None,
+                    result is the actual response generated from DB Query or None otherwise.
+        """
+        insurance_plan = InsurancePlan(
+                    insurance_plan_name = insurance_plan_name             
+                )
+
+        InsuranceLogger.log_info(f"Adding Insurance Plan {insurance_plan_name} in database.")
+
+        try:
+            with transaction():
+                db.session.add(insurance_plan)
+        except SQLAlchemyError as err:
+            InsuranceLogger.log_error(f"Failed to add insurance plan in database. {str(err)}.")
+            return False, "Failed to update database.", None
+            
+        return True, None, insurance_plan
+    
+class InsuranceDao:
+    @staticmethod
+    def add_insurance(
+            insured_amount: int,
+            user: User,
+            insurance_plan: InsurancePlan
+            ) -> tuple:
+        """
+        Create new insurance in database.
+
+        Args:
+            insured_amount (int): Insured amount chosen by customer
+            user (User): The customer who is creating insurance
+            insurance_plan (InsurancePlan): The insurance plan chosen by customer
+
+        Returns:
+            tuple: status, message, result
+                    status is boolean value indicating success (True) or Failure(False),
+                    message is a string about the error occurred if any, otherwise None,
+                    result is the actual response generated from DB Query or None otherwise.
+        """
+        insurance = Insurance(
                     insured_amount = insured_amount,
                     user = user,
                     insurance_plan = insurance_plan             
@@ -324,12 +929,12 @@ class InsuranceDao:
 
         InsuranceLogger.log_info(f"Adding Insurance for user {user.customer_name} with insurance plan {insurance_plan.insurance_plan_name} and amount {insured_amount} in database.")
 
-        with db.session.begin():
-            try:
+        try:
+            with transaction():
                 db.session.add(insurance)
-            except SQLAlchemyError as err:
-                InsuranceLogger.log_error(f"Failed to add insurance in database. {str(err)}.")
-                return False, "Failed to update database.", None
+        except SQLAlchemyError as err:
+            InsuranceLogger.log_error(f"Failed to add insurance in database. {str(err)}.")
+            return False, "Failed to update database.", None
 
         return True, None, insurance
 
@@ -342,6 +947,9 @@ class BlacklistDao:
         """
         Create new blacklisted email in database.
 
+        If the email is already blacklisted, e.g. by a concurrent request, message is ALREADY_BLACKLISTED
+        and only the savepoint of this insert is rolled back.
+
         Args:
             email_address (str): Email address of the customer
             reason (str): Reason for blacklisting
@@ -359,14 +967,47 @@ class BlacklistDao:
         
         InsuranceLogger.log_info(f"Adding blacklist for {email_address} in database.")
 
-        with db.session.begin():
-            try:
+        try:
+            with transaction(savepoint=True):
                 db.session.add(blacklist)
-            except SQLAlchemyError as err:
-                InsuranceLogger.log_error(f"Failed to add blacklist in database. {str(err)}.")
-                return False, "Failed to update database.", None
+        except IntegrityError as err:
+            if 'email_address' in str(err.orig):
+                InsuranceLogger.log_info(f"Email {email_address} is already blacklisted.")
+                return False, ALREADY_BLACKLISTED, None
+
+            InsuranceLogger.log_error(f"Failed to add blacklist in database. {str(err)}.")
+            set_rollback_only()
+            return False, "Failed to update database.", None
+        except SQLAlchemyError as err:
+            InsuranceLogger.log_error(f"Failed to add blacklist in database. {str(err)}.")
+            set_rollback_only()
+            return False, "Failed to update database.", None
+
+        blacklist_filter.add(email_address)
             
         return True, None, blacklist
+
+    @staticmethod
+    def get_blacklisted_emails() -> tuple:
+        """
+        Get all blacklisted email addresses from database.
+
+        Returns:
+            tuple: status, message, result
+                    status is boolean value indicating success (True) or Failure(False),
+                    message is a string about the error occurred if any, otherwise None,
+                    result is list of blacklisted email addresses or None otherwise.
+        """
+        InsuranceLogger.log_info(f"Getting all blacklisted emails from database.")
+
+        try:
+            with transaction():
+                result = db.session.execute(db.select(Blacklist.email_address)).scalars().all()
+        except SQLAlchemyError as err:
+            InsuranceLogger.log_error(f"Failed to get blacklisted emails from database. {str(err)}.")
+            return False, "Failed to update database.", None
+
+        return True, None, result
     
     @staticmethod
     def get_blacklist_by_email(
@@ -388,11 +1029,520 @@ class BlacklistDao:
 
         InsuranceLogger.log_info(f"Getting blacklist detail for {email_address} from database.")
 
-        with db.session.begin():
-            try:
+        try:
+            with transaction():
                 result = db.session.query(Blacklist.id).filter_by(email_address=email_address).first()
-            except SQLAlchemyError as err:
-                InsuranceLogger.log_error(f"Failed to get blacklist by email from database. {str(err)}.")
-                return False, "Failed to update database.", None
+        except SQLAlchemyError as err:
+            InsuranceLogger.log_error(f"Failed to get blacklist by email from database. {str(err)}.")
+            return False, "Failed to update database.", None
         
         return True, None, result
+
+
+class RegistrationJobDao:
+    @staticmethod
+    def add_job(
+            job_id: str,
+            email_address: str,
+            status: str
+            ) -> tuple:
+        """
+        Add sign up job which is run in background.
+
+        Args:
+            job_id (str): Unique id of the job
+            email_address (str): Email address of the customer
+            status (str): Status of the job
+
+        Returns:
+            tuple: status, message, result
+                    status is boolean value indicating success (True) or Failure(False),
+                    message is a string about the error occurred if any, otherwise None,
+                    result is the job id or None otherwise.
+        """
+        now = datetime.utcnow()
+
+        InsuranceLogger.log_info(f"Adding sign up job {job_id} for email {email_address}.")
+
+        try:
+            with db.engine.begin() as connection:
+                connection.execute(
+                    db.insert(RegistrationJob).values(
+                        id = job_id,
+                        email_address = email_address,
+                        status = status,
+                        created_at = now,
+                        updated_at = now
+                    )
+                )
+        except SQLAlchemyError as err:
+            InsuranceLogger.log_error(f"Failed to add sign up job into database. {str(err)}.")
+            return False, "Failed to update database.", None
+
+        return True, None, job_id
+
+    @staticmethod
+    def update_job(
+            job_id: str,
+            status: str,
+            http_status: int = None,
+            response: dict = None,
+            expected_status: str = None
+            ) -> tuple:
+        """
+        Update status of sign up job and store its response once completed.
+
+        Args:
+            job_id (str): Unique id of the job
+            status (str): Status of the job
+            http_status (int, optional): Http status code of the response. Defaults to None.
+            response (dict, optional): Response of the job. Defaults to None.
+            expected_status (str, optional): Update only if job is still in this status. Defaults to None.
+
+        Returns:
+            tuple: status, message, result
+                    status is boolean value indicating success (True) or Failure(False),
+                    message is a string about the error occurred if any, otherwise None,
+                    result is the job id, None if job is not in expected status.
+        """
+        statement = db.update(RegistrationJob).where(RegistrationJob.id == job_id)
+
+        if expected_status is not None:
+            statement = statement.where(RegistrationJob.status == expected_status)
+
+        try:
+            with db.engine.begin() as connection:
+                rowcount = connection.execute(
+                    statement.values(
+                        status = status,
+                        http_status = http_status,
+                        response = json.dumps(response) if response is not None else None,
+                        updated_at = datetime.utcnow()
+                    )
+                ).rowcount
+        except SQLAlchemyError as err:
+            InsuranceLogger.log_error(f"Failed to update sign up job {job_id} in database. {str(err)}.")
+            return False, "Failed to update database.", None
+
+        return True, None, job_id if rowcount else None
+
+    @staticmethod
+    def complete_stale_jobs(
+            statuses: list,
+            updated_before: datetime,
+            status: str,
+            http_status: int,
+            response: dict,
+            job_id: str = None
+            ) -> tuple:
+        """
+        Complete sign up jobs which were not updated for long, e.g. as their worker was killed.
+
+        Args:
+            statuses (list): Statuses of unfinished jobs
+            updated_before (datetime): Jobs updated before it are stale
+            status (str): Status stale jobs are completed with
+            http_status (int): Http status code stored for stale jobs
+            response (dict): Response stored for stale jobs
+            job_id (str, optional): Only this job. Defaults to None for all jobs.
+
+        Returns:
+            tuple: status, message, result
+                    status is boolean value indicating success (True) or Failure(False),
+                    message is a string about the error occurred if any, otherwise None,
+                    result is the number of jobs completed or None otherwise.
+        """
+        statement = db.update(RegistrationJob).where(
+                        RegistrationJob.status.in_(statuses),
+                        RegistrationJob.updated_at < updated_before
+                    )
+
+        if job_id is not None:
+            statement = statement.where(RegistrationJob.id == job_id)
+
+        try:
+            with db.engine.begin() as connection:
+                rowcount = connection.execute(
+                    statement.values(
+                        status = status,
+                        http_status = http_status,
+                        response = json.dumps(response),
+                        updated_at = datetime.utcnow()
+                    )
+                ).rowcount
+        except SQLAlchemyError as err:
+            InsuranceLogger.log_error(f"Failed to complete stale sign up jobs in database. {str(err)}.")
+            return False, "Failed to update database.", None
+
+        return True, None, rowcount
+
+    @staticmethod
+    def get_job(
+            job_id: str
+            ) -> tuple:
+        """
+        Get sign up job by id.
+
+        Args:
+            job_id (str): Unique id of the job
+
+        Returns:
+            tuple: status, message, result
+                    status is boolean value indicating success (True) or Failure(False),
+                    message is a string about the error occurred if any, otherwise None,
+                    result is dict with job_id, email_address, status, http_status, response and
+                    updated_at, None if job is not found.
+        """
+        try:
+            with db.engine.begin() as connection:
+                row = connection.execute(
+                    db.select(
+                        RegistrationJob.email_address,
+                        RegistrationJob.status,
+                        RegistrationJob.http_status,
+                        RegistrationJob.response,
+                        RegistrationJob.updated_at
+                    ).where(RegistrationJob.id == job_id)
+                ).first()
+        except SQLAlchemyError as err:
+            InsuranceLogger.log_error(f"Failed to get sign up job {job_id} from database. {str(err)}.")
+            return False, "Failed to update database.", None
+
+        if row is None:
+            return True, None, None
+
+        return True, None, dict(
+                                job_id = job_id,
+                                email_address = row.email_address,
+                                status = row.status,
+                                http_status = row.http_status,
+                                response = json.loads(row.response) if row.response is not None else None,
+                                updated_at = row.updated_at
+                            )
+
+
+class IdempotencyDao:
+    """
+    Uses its own connection instead of the session, so records are committed
+    independently of the transaction of the request they belong to.
+    """
+    @staticmethod
+    def add_record(
+            key: str,
+            fingerprint: str,
+            created_at: datetime,
+            expires_at: datetime
+            ) -> tuple:
+        """
+        Add an in progress record for idempotency key, unless the key is already recorded.
+
+        Args:
+            key (str): Idempotency key with scope
+            fingerprint (str): Hash of the request
+            created_at (datetime): Time when request started
+            expires_at (datetime): Time after which record is not used anymore
+
+        Returns:
+            tuple: status, message, result
+                    status is boolean value indicating success (True) or Failure(False),
+                    message is a string about the error occurred if any, otherwise None,
+                    result is True if record is added, False if key is already recorded or None otherwise.
+        """
+        try:
+            with db.engine.begin() as connection:
+                connection.execute(
+                    db.insert(IdempotencyRecord).values(
+                        key = key,
+                        fingerprint = fingerprint,
+                        completed = False,
+                        created_at = created_at,
+                        expires_at = expires_at
+                    )
+                )
+        except IntegrityError:
+            return True, None, False
+        except SQLAlchemyError as err:
+            InsuranceLogger.log_error(f"Failed to add idempotency record into database. {str(err)}.")
+            return False, "Failed to update database.", None
+
+        return True, None, True
+
+    @staticmethod
+    def get_record(
+            key: str
+            ) -> tuple:
+        """
+        Get record of idempotency key.
+
+        Args:
+            key (str): Idempotency key with scope
+
+        Returns:
+            tuple: status, message, result
+                    status is boolean value indicating success (True) or Failure(False),
+                    message is a string about the error occurred if any, otherwise None,
+                    result is dict with fingerprint, completed, http_status, response, created_at
+                    and expires_at, None if key is not recorded.
+        """
+        try:
+            with db.engine.begin() as connection:
+                row = connection.execute(
+                    db.select(
+                        IdempotencyRecord.fingerprint,
+                        IdempotencyRecord.completed,
+                        IdempotencyRecord.http_status,
+                        IdempotencyRecord.response,
+                        IdempotencyRecord.created_at,
+                        IdempotencyRecord.expires_at
+                    ).where(IdempotencyRecord.key == key)
+                ).first()
+        except SQLAlchemyError as err:
+            InsuranceLogger.log_error(f"Failed to get idempotency record from database. {str(err)}.")
+            return False, "Failed to update database.", None
+
+        if row is None:
+            return True, None, None
+
+        return True, None, dict(
+                                fingerprint = row.fingerprint,
+                                completed = row.completed,
+                                http_status = row.http_status,
+                                response = json.loads(row.response) if row.response is not None else None,
+                                created_at = row.created_at,
+                                expires_at = row.expires_at
+                            )
+
+    @staticmethod
+    def complete_record(
+            key: str,
+            http_status: int,
+            response: dict
+            ) -> tuple:
+        """
+        Store response of the request made with idempotency key.
+
+        Args:
+            key (str): Idempotency key with scope
+            http_status (int): Http status code of the response
+            response (dict): Response body and headers
+
+        Returns:
+            tuple: status, message, result
+                    status is boolean value indicating success (True) or Failure(False),
+                    message is a string about the error occurred if any, otherwise None,
+                    result is the key or None otherwise.
+        """
+        try:
+            with db.engine.begin() as connection:
+                connection.execute(
+                    db.update(IdempotencyRecord).where(IdempotencyRecord.key == key).values(
+                        completed = True,
+                        http_status = http_status,
+                        response = json.dumps(response)
+                    )
+                )
+        except SQLAlchemyError as err:
+            InsuranceLogger.log_error(f"Failed to update idempotency record in database. {str(err)}.")
+            return False, "Failed to update database.", None
+
+        return True, None, key
+
+    @staticmethod
+    def delete_record(
+            key: str,
+            created_at: datetime = None
+            ) -> tuple:
+        """
+        Delete record of idempotency key.
+
+        Args:
+            key (str): Idempotency key with scope
+            created_at (datetime, optional): Delete only if record was created at this time,
+                                             so that a newer record of same key is kept. Defaults to None.
+
+        Returns:
+            tuple: status, message, result
+                    status is boolean value indicating success (True) or Failure(False),
+                    message is a string about the error occurred if any, otherwise None,
+                    result is number of deleted records or None otherwise.
+        """
+        statement = db.delete(IdempotencyRecord).where(IdempotencyRecord.key == key)
+
+        if created_at is not None:
+            statement = statement.where(IdempotencyRecord.created_at == created_at)
+
+        try:
+            with db.engine.begin() as connection:
+                result = connection.execute(statement)
+        except SQLAlchemyError as err:
+            InsuranceLogger.log_error(f"Failed to delete idempotency record from database. {str(err)}.")
+            return False, "Failed to update database.", None
+
+        return True, None, result.rowcount
+
+    @staticmethod
+    def delete_expired_records(
+            now: datetime
+            ) -> tuple:
+        """
+        Delete expired records of all idempotency keys.
+
+        Args:
+            now (datetime): Current time
+
+        Returns:
+            tuple: status, message, result
+                    status is boolean value indicating success (True) or Failure(False),
+                    message is a string about the error occurred if any, otherwise None,
+                    result is number of deleted records or None otherwise.
+        """
+        try:
+            with db.engine.begin() as connection:
+                result = connection.execute(db.delete(IdempotencyRecord).where(IdempotencyRecord.expires_at < now))
+        except SQLAlchemyError as err:
+            InsuranceLogger.log_error(f"Failed to delete expired idempotency records from database. {str(err)}.")
+            return False, "Failed to update database.", None
+
+        return True, None, result.rowcount
+
+
+class RevokedTokenDao:
+    """
+    Uses its own connection instead of the session, so revocations are committed
+    independently of the transaction of the request they belong to.
+    """
+    @staticmethod
+    def add_revoked_token(
+            jti: str,
+            revoked_at: datetime,
+            expires_at: datetime
+            ) -> tuple:
+        """
+        Record a token as revoked till it expires.
+
+        Args:
+            jti (str): Id of the token
+            revoked_at (datetime): Time of revocation
+            expires_at (datetime): Time after which the token is invalid anyway
+
+        Returns:
+            tuple: status, message, result
+                    status is boolean value indicating success (True) or Failure(False),
+                    message is a string about the error occurred if any, otherwise None,
+                    result is True if token is recorded now, False if it was already revoked or None otherwise.
+        """
+        try:
+            with db.engine.begin() as connection:
+                connection.execute(
+                    db.insert(RevokedToken).values(jti = jti, revoked_at = revoked_at, expires_at = expires_at)
+                )
+        except IntegrityError:
+            return True, None, False
+        except SQLAlchemyError as err:
+            InsuranceLogger.log_error(f"Failed to add revoked token into database. {str(err)}.")
+            return False, "Failed to update database.", None
+
+        return True, None, True
+
+    @staticmethod
+    def add_revoked_tokens(
+            revoked_tokens: list,
+            revoked_at: datetime
+            ) -> tuple:
+        """
+        Record many tokens as revoked with one insert, those already revoked are skipped.
+
+        Args:
+            revoked_tokens (list): (jti, expires_at) of every token
+            revoked_at (datetime): Time of revocation
+
+        Returns:
+            tuple: status, message, result
+                    status is boolean value indicating success (True) or Failure(False),
+                    message is a string about the error occurred if any, otherwise None,
+                    result is number of tokens recorded now or None otherwise.
+        """
+        if not revoked_tokens:
+            return True, None, 0
+
+        try:
+            with db.engine.begin() as connection:
+                connection.execute(
+                    db.insert(RevokedToken),
+                    [dict(jti = jti, revoked_at = revoked_at, expires_at = expires_at) for jti, expires_at in revoked_tokens]
+                )
+        except IntegrityError:
+            # One of them is already revoked, rare enough to add one by one
+            added = 0
+
+            for jti, expires_at in revoked_tokens:
+                is_success, message, result = RevokedTokenDao.add_revoked_token(jti=jti, revoked_at=revoked_at, expires_at=expires_at)
+
+                if not is_success:
+                    return False, message, None
+
+                added += int(result)
+
+            return True, None, added
+        except SQLAlchemyError as err:
+            InsuranceLogger.log_error(f"Failed to add revoked tokens into database. {str(err)}.")
+            return False, "Failed to update database.", None
+
+        return True, None, len(revoked_tokens)
+
+    @staticmethod
+    def get_revoked_tokens(
+            now: datetime,
+            revoked_since: datetime = None
+            ) -> tuple:
+        """
+        Get tokens which are revoked and not expired yet.
+
+        Args:
+            now (datetime): Current time
+            revoked_since (datetime, optional): Only tokens revoked since this time. Defaults to all.
+
+        Returns:
+            tuple: status, message, result
+                    status is boolean value indicating success (True) or Failure(False),
+                    message is a string about the error occurred if any, otherwise None,
+                    result is list of (jti, expires_at) or None otherwise.
+        """
+        query = db.select(RevokedToken.jti, RevokedToken.expires_at).where(RevokedToken.expires_at > now)
+
+        if revoked_since is not None:
+            query = query.where(RevokedToken.revoked_at >= revoked_since)
+
+        try:
+            with db.engine.begin() as connection:
+                rows = connection.execute(query).all()
+        except SQLAlchemyError as err:
+            InsuranceLogger.log_error(f"Failed to get revoked tokens from database. {str(err)}.")
+            return False, "Failed to update database.", None
+
+        return True, None, [(row.jti, row.expires_at) for row in rows]
+
+    @staticmethod
+    def delete_expired_revoked_tokens(
+            now: datetime
+            ) -> tuple:
+        """
+        Delete revoked tokens which have expired anyway.
+
+        Args:
+            now (datetime): Current time
+
+        Returns:
+            tuple: status, message, result
+                    status is boolean value indicating success (True) or Failure(False),
+                    message is a string about the error occurred if any, otherwise None,
+                    result is number of deleted records or None otherwise.
+        """
+        try:
+            with db.engine.begin() as connection:
+                result = connection.execute(db.delete(RevokedToken).where(RevokedToken.expires_at <= now))
+        except SQLAlchemyError as err:
+            InsuranceLogger.log_error(f"Failed to delete expired revoked tokens from database. {str(err)}.")
+            return False, "Failed to update database.", None
+
+        return True, None, result.rowcount
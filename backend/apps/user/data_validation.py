@@ -25,10 +25,10 @@ Reference; -
     TBD
 """
 
-import json
 from functools import wraps
-from flask import request
-from apps.user.dao import UserDao, UserInsuranceDao, BlacklistDao
+from apps.user.dao import RegistrationDao, RegistrationStatus
+from apps.user.blacklist_filter import blacklist_filter
+from apps.user.request_payload import get_request_payload
 from utils.http_status import HttpStatus
 from utils.validation import check_valid_email
 from utils.insurance_logger import InsuranceLogger
@@ -93,6 +93,40 @@ def validate_insured_amount(insured_amount: int) -> tuple:
     
     return is_insured_amount_valid_inr(insured_amount)
 
+def validate_registration_data(input_data) -> tuple:
+    """Validate data of a customer registration.
+
+    Args:
+        input_data: Registration attributes received in request
+
+    Returns:
+        tuple: bool for success/failure and reason if any
+    """
+    valid, message = validate_customer_name(input_data['customer_name'])
+
+    if not valid:
+        return False, "Invalid Data in 'customer_name' attribute. {}".format(message)
+    
+    InsuranceLogger.log_info(f"Validating email {input_data['email_address']}")
+
+    valid, message = check_valid_email(input_data['email_address'])
+
+    if not valid:
+        InsuranceLogger.log_info(f"Invalid Email Address. {message}")
+        return False, "Invalid Email Address. {}".format(message)
+    
+    valid, message = validate_insurance_plan_name(input_data['insurance_plan_name'])
+
+    if not valid:
+        return False, "Invalid Data. {}".format(message)
+    
+    valid, message = validate_insured_amount(input_data['insured_amount'])
+
+    if not valid:
+        return False, "Invalid Data. {}".format(message)
+
+    return True, None
+
 def validate_data(func):
     """Validate data in api request.
 
@@ -101,93 +135,83 @@ def validate_data(func):
     """
     @wraps(func)
     def wrapper(*args, **kwargs):
-        input_data = json.loads(request.data.decode('utf-8'))
-        
-        valid, message = validate_customer_name(input_data['customer_name'])
+        valid, reason = validate_registration_data(get_request_payload())
 
         if not valid:
             return {
                         "status": "VALIDATION-ERROR",
-                        "reason": "Invalid Data in 'customer_name' attribute. {}".format(message)
+                        "reason": reason
                     }, HttpStatus.HTTP_400_BAD_REQUEST
-        
-        InsuranceLogger.log_info(f"Validating email {input_data['email_address']}")
 
-        valid, message = check_valid_email(input_data['email_address'])
-
-        if not valid:
-            InsuranceLogger.log_info(f"Invalid Email Address. {message}")
+        return func(*args, **kwargs)
+    return wrapper
 
-            return {
-                        "status": "VALIDATION-ERROR",
-                        "reason": "Invalid Email Address. {}".format(message)
-                    }, HttpStatus.HTTP_400_BAD_REQUEST
-        
-        valid, message = validate_insurance_plan_name(input_data['insurance_plan_name'])
 
-        if not valid:
-            return {
-                        "status": "VALIDATION-ERROR",
-                        "reason": "Invalid Data. {}".format(message)
-                    }, HttpStatus.HTTP_400_BAD_REQUEST
-        
-        valid, message = validate_insured_amount(input_data['insured_amount'])
+def already_registered(email_address: str) -> tuple:
+    """Response for sign up with an email which is already registered.
 
-        if not valid:
-            return {
-                        "status": "VALIDATION-ERROR",
-                        "reason": "Invalid Data. {}".format(message)
-                    }, HttpStatus.HTTP_400_BAD_REQUEST
+    Args:
+        email_address (str): Email address received in request
 
-        return func(*args, **kwargs)
-    return wrapper
+    Returns:
+        tuple: response and http status code
+    """
+    InsuranceLogger.log_info(f"User with Email {email_address} is already registered.")
+    return {
+                "status": "VALIDATION-ERROR",
+                "reason": "User with Email '{}' is already registered.".format(email_address)
+            }, HttpStatus.HTTP_400_BAD_REQUEST
 
+def registration_status_error(email_address: str) -> tuple:
+    """Check that email is neither blacklisted nor already registered.
 
-def check_blacklisting(func):
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        input_data = json.loads(request.data.decode('utf-8'))
+    Blacklist and user tables are checked with a single query. Blacklist table is
+    skipped when blacklist filter tells the email is surely not blacklisted.
 
-        InsuranceLogger.log_info(f"Checking blacklisting for user with email {input_data['email_address']}.")
+    Args:
+        email_address (str): Email address received in request
 
-        is_success, message, result = BlacklistDao.get_blacklist_by_email(
-                                                    email_address = input_data['email_address']
-                                                )
-        if not is_success:
-            return {
-                        "status": "INTERNAL-SERVER-ERROR",
-                        "reason": message
-                    }, HttpStatus.HTTP_500_INTERNAL_SERVER_ERROR
-        elif result is not None:
-            return {
-                        "status": "VALIDATION-ERROR",
-                        "reason": "Email Validation Failed. You are not allowed to create an account with us."
-                    }, HttpStatus.HTTP_422_UNPROCESSABLE_ENTITY
-        
-        return func(*args, **kwargs)
-    return wrapper
+    Returns:
+        tuple: response and http status code if email can not be registered, otherwise None
+    """
+    InsuranceLogger.log_info(f"Checking blacklisting and registration for user with email {email_address}.")
+
+    check_blacklist = blacklist_filter.might_be_blacklisted(email_address)
+
+    is_success, message, status = RegistrationDao.get_registration_status(
+                                                email_address = email_address,
+                                                check_blacklist = check_blacklist
+                                            )
+    if is_success and check_blacklist and status != RegistrationStatus.BLACKLISTED:
+        blacklist_filter.record_false_positive()
+
+    if not is_success:
+        return {
+                    "status": "INTERNAL-SERVER-ERROR",
+                    "reason": message
+                }, HttpStatus.HTTP_500_INTERNAL_SERVER_ERROR
+    elif status == RegistrationStatus.BLACKLISTED:
+        return {
+                    "status": "VALIDATION-ERROR",
+                    "reason": "Email Validation Failed. You are not allowed to create an account with us."
+                }, HttpStatus.HTTP_422_UNPROCESSABLE_ENTITY
+    elif status == RegistrationStatus.REGISTERED:
+        return already_registered(email_address)
+
+    return None
+
+def check_registration_status(func):
+    """Reject blacklisted and already registered emails.
 
-def is_already_registered(func):
+    Args:
+        func (_type_): A function object
+    """
     @wraps(func)
     def wrapper(*args, **kwargs):
-        input_data = json.loads(request.data.decode('utf-8'))
-        
-        email_address = input_data['email_address']
+        error = registration_status_error(get_request_payload()['email_address'])
 
-        is_success, message, user = UserDao.get_user_by_email(email_address=email_address)
-
-        if not is_success:
-            return {
-                        "status": "INTERNAL-SERVER-ERROR",
-                        "reason": message
-                    }, HttpStatus.HTTP_500_INTERNAL_SERVER_ERROR
-        elif user is not None:
-            InsuranceLogger.log_info(f"User with Email {email_address} is already registered.")
-            return {
-                        "status": "VALIDATION-ERROR",
-                        "reason": "User with Email '{}' is already registered.".format(email_address)
-                    }, HttpStatus.HTTP_400_BAD_REQUEST
+        if error is not None:
+            return error
 
         return func(*args, **kwargs)
-    
-    return wrapper
\ No newline at end of file
+    return wrapper
@@ -0,0 +1,174 @@
+"""Email template renderer.
+
+SENECA GLOBAL CONFIDENTIAL & PROPRIETARY
+
+@file email_renderer.py
+@author Dilip Kumar Sharma
+@copyright Seneca Global
+@date 18th Oct 2026
+
+About; -
+--------
+    Renders verification and welcome emails without going through jinja for every email.
+
+Working; -
+----------
+    Email templates are compiled once at boot by a dedicated jinja environment. Compiled
+    templates are kept in an on-disk bytecode cache (EMAIL_TEMPLATE_CACHE_DIR) shared by
+    all gunicorn workers, so only the first worker parses the templates.
+
+    Every email template is then rendered once with a unique marker in place of each
+    customer field. Output is split on these markers into static fragments. Sending an
+    email only joins the static fragments with html escaped customer fields.
+
+    A template is used this way only if rendering it from fragments gives the same
+    output as jinja for sample values, otherwise jinja renders it every time.
+
+Uses; -
+-------
+    This module is used by emails module.
+
+Reference; -
+------------
+    https://jinja.palletsprojects.com/en/3.1.x/api/#bytecode-cache
+"""
+
+import os
+import uuid
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache, select_autoescape
+from markupsafe import escape
+from apps import configuration
+from utils.insurance_logger import InsuranceLogger
+
+
+TEMPLATE_DIRS = [
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), 'templates'),
+    os.path.join(os.path.dirname(__file__), 'templates', 'user'),
+]
+
+# Customer fields of every email template
+EMAIL_TEMPLATES = {
+    'verification.html': ('customer_name', 'email_address', 'password', 'confirm_url'),
+    'welcome.html': ('customer_name',),
+}
+
+
+class CompiledEmailTemplate:
+    """Static fragments of a template with customer fields between them.
+
+    Args:
+        fragments (list): Static text, one more than fields
+        fields (list): Customer field names in order of appearance
+    """
+    __slots__ = ('fragments', 'fields')
+
+    def __init__(self, fragments: list, fields: list) -> None:
+        self.fragments = fragments
+        self.fields = fields
+
+    def render(self, context: dict) -> str:
+        parts = [self.fragments[0]]
+
+        for field, fragment in zip(self.fields, self.fragments[1:]):
+            parts.append(escape(context[field]))
+            parts.append(fragment)
+
+        return ''.join(parts)
+
+
+class EmailRenderer:
+    """Renders email templates from precompiled static fragments.
+
+    Args:
+        template_dirs (list): Directories to look for templates
+        cache_dir (str): Directory of bytecode cache shared by all workers
+    """
+    def __init__(self, template_dirs: list, cache_dir: str) -> None:
+        self._template_dirs = template_dirs
+        self._cache_dir = cache_dir
+        self._environment = None
+        self._templates = dict()
+
+    def _get_environment(self) -> Environment:
+        if self._environment is None:
+            bytecode_cache = None
+
+            try:
+                os.makedirs(self._cache_dir, exist_ok=True)
+                bytecode_cache = FileSystemBytecodeCache(directory=self._cache_dir)
+            except OSError as err:
+                InsuranceLogger.log_error(f"Email template cache directory is not usable. {str(err)}")
+
+            self._environment = Environment(
+                                    loader=FileSystemLoader(self._template_dirs),
+                                    autoescape=select_autoescape(),
+                                    bytecode_cache=bytecode_cache
+                                )
+
+        return self._environment
+
+    def _compile(self, template_name: str, fields: tuple) -> CompiledEmailTemplate:
+        template = self._get_environment().get_template(template_name)
+
+        prefix = uuid.uuid4().hex
+        markers = {field: f"{prefix}:{field}:" for field in fields}
+        marker_fields = {marker: field for field, marker in markers.items()}
+
+        # Split the output on markers, remembering which field each marker was
+        output = template.render(**markers)
+        fragments = []
+        found_fields = []
+        position = 0
+
+        while True:
+            start = output.find(prefix, position)
+
+            if start == -1:
+                fragments.append(output[position:])
+                break
+
+            end = output.index(':', output.index(':', start) + 1) + 1
+            fragments.append(output[position:start])
+            found_fields.append(marker_fields[output[start:end]])
+            position = end
+
+        compiled = CompiledEmailTemplate(fragments=fragments, fields=found_fields)
+
+        # Fields used in conditions or filters can not be replaced as text
+        sample = {field: f"<{field} & 'sample'>" for field in fields}
+
+        if compiled.render(sample) != template.render(**sample):
+            InsuranceLogger.log_info(f"Email template {template_name} is rendered by jinja every time.")
+            return None
+
+        return compiled
+
+    def precompile(self) -> None:
+        """Compile all email templates. Called once at boot."""
+        for template_name, fields in EMAIL_TEMPLATES.items():
+            self._templates[template_name] = self._compile(template_name, fields)
+
+        InsuranceLogger.log_info(f"Email templates are compiled. {list(self._templates)}")
+
+    def render(self, template_name: str, **context) -> str:
+        """Render email template with customer fields.
+
+        Args:
+            template_name (str): Name of email template
+            context: Customer fields of the template
+
+        Returns:
+            str: Rendered email
+        """
+        if template_name not in self._templates:
+            self._templates[template_name] = self._compile(template_name, EMAIL_TEMPLATES[template_name])
+
+        compiled = self._templates[template_name]
+
+        if compiled is None:
+            return self._get_environment().get_template(template_name).render(**context)
+
+        return compiled.render(context)
+
+
+email_renderer = EmailRenderer(template_dirs=TEMPLATE_DIRS, cache_dir=configuration.EMAIL_TEMPLATE_CACHE_DIR)
@@ -0,0 +1,140 @@
+"""Emails sent to customers.
+
+SENECA GLOBAL CONFIDENTIAL & PROPRIETARY
+
+@file emails.py
+@author Dilip Kumar Sharma
+@copyright Seneca Global
+@date 18th Oct 2026
+
+About; -
+--------
+    Verification and welcome emails sent to customers.
+
+Working; -
+----------
+    Email template is rendered from precompiled fragments and handed over to celery worker,
+    which sends the email. A copy is handed over to the configured email sink.
+
+    Welcome emails of many customers are published with one broker connection.
+
+    Verification and welcome emails are rendered at once, so failures are reported to the
+    caller, but handed over only once the unit of work of the request commits. A customer
+    never gets a password or a welcome for an account which is rolled back. Outside of a
+    unit of work they are handed over at once.
+
+Uses; -
+-------
+    This module is used by sign up, bulk sign up, verify and bulk activation endpoints.
+
+Reference; -
+------------
+    TBD
+"""
+
+from flask import url_for
+from apps import celery, configuration
+from apps.user.email_renderer import email_renderer
+from apps.user.unit_of_work import after_commit
+from utils.token import get_token_service
+from utils.email_sink import get_email_sink
+from utils.insurance_logger import InsuranceLogger
+
+
+def send_verification_email(customer_name: str, email_address: str, password: str) -> tuple:
+    """Send email with generated password and confirmation link to newly registered customer,
+    once the customer is committed.
+
+    Args:
+        customer_name (str): Name of the customer
+        email_address (str): Email address of the customer
+        password (str): Random generated password
+
+    Returns:
+        tuple: status, message, result
+                status is boolean value indicating success (True) or Failure(False),
+                message is a string about the error occurred if any, otherwise None,
+                result is the rendered email template or None otherwise.
+    """
+    InsuranceLogger.log_info(f"Generating confirmation token.")
+    is_success, message, token = get_token_service().generate(email=email_address)
+
+    if not is_success:
+        return False, message, None
+
+    confirm_url = url_for('api.verify_verify', token=token, _external=True)
+
+    html_template = email_renderer.render(
+            'verification.html',
+            customer_name = customer_name,
+            email_address = email_address,
+            password = password,
+            confirm_url=confirm_url
+        )
+
+    subject = "Please verify your email"
+
+    after_commit(lambda: _send_email(email_address, subject, html_template))
+
+    return True, None, html_template
+
+def _send_email(email_address: str, subject: str, html_template: str) -> None:
+    InsuranceLogger.log_info(f"Sending email to {email_address}.")
+
+    celery.send_task('email.send', (configuration.MAIL_DEFAULT_SENDER, email_address, subject, html_template))
+    get_email_sink().send(recipient=email_address, subject=subject, body=html_template)
+
+def send_welcome_email(customer_name: str, email_address: str) -> tuple:
+    """Send welcome email to customer whose account is activated, once activation is committed.
+
+    Args:
+        customer_name (str): Name of the customer
+        email_address (str): Email address of the customer
+
+    Returns:
+        tuple: status, message, result
+                status is boolean value indicating success (True) or Failure(False),
+                message is a string about the error occurred if any, otherwise None,
+                result is the rendered email template or None otherwise.
+    """
+    html_template = email_renderer.render('welcome.html', customer_name=customer_name)
+
+    subject = "Welcome to Indian Insurance"
+
+    after_commit(lambda: _send_email(email_address, subject, html_template))
+
+    return True, None, html_template
+
+def send_welcome_emails(customers: list) -> tuple:
+    """Send welcome emails to many customers whose accounts are activated.
+
+    Args:
+        customers (list): Customer name and email address of every customer
+
+    Returns:
+        tuple: status, message, result
+                status is boolean value indicating success (True) or Failure(False),
+                message is a string about the error occurred if any, otherwise None,
+                result is number of emails sent or None otherwise.
+    """
+    subject = "Welcome to Indian Insurance"
+    emails = [
+        (email_address, email_renderer.render('welcome.html', customer_name=customer_name))
+        for customer_name, email_address in customers
+    ]
+
+    InsuranceLogger.log_info(f"Sending {len(emails)} welcome emails.")
+
+    try:
+        with celery.producer_or_acquire() as producer:
+            for email_address, html_template in emails:
+                celery.send_task('email.send', (configuration.MAIL_DEFAULT_SENDER, email_address, subject, html_template),
+                                 producer=producer)
+    except Exception as err:
+        InsuranceLogger.log_error(f"Failed to queue welcome emails. {str(err)}")
+        return False, "Failed to queue welcome emails.", None
+
+    for email_address, html_template in emails:
+        get_email_sink().send(recipient=email_address, subject=subject, body=html_template)
+
+    return True, None, len(emails)
@@ -0,0 +1,274 @@
+"""Group commit of registrations.
+
+SENECA GLOBAL CONFIDENTIAL & PROPRIETARY
+
+@file group_commit.py
+@author Dilip Kumar Sharma
+@copyright Seneca Global
+@date 18th Oct 2026
+
+About; -
+--------
+    Writes registrations of concurrent sign ups together, with one transaction of
+    multi-row inserts instead of one small transaction per sign up.
+
+Working; -
+----------
+    Disabled when REGISTRATION_BATCH_WINDOW is 0, sign up then adds the registration
+    with its own transaction.
+
+    Otherwise password is hashed in the request thread and the registration is handed
+    over to a writer thread of the gunicorn worker. The writer waits at most
+    REGISTRATION_BATCH_WINDOW seconds after the first registration of a batch for more
+    registrations, up to REGISTRATION_BATCH_MAX_SIZE, and adds them with bulk inserts
+    in one transaction. Every request waits till its batch is written, at most
+    REGISTRATION_BATCH_TIMEOUT seconds. A request which gives up gets "Failed to update
+    database." and its registration is dropped if the writer has not taken it yet. A
+    writer thread which has died is started again by the next sign up.
+
+    If the batch fails, e.g. one of the emails is registered by a concurrent request,
+    its registrations are written one by one, so every request gets its own result:
+    ALREADY_REGISTERED for a duplicate email, error message for a failed insert.
+
+    Registrations are committed by the writer, independent of unit of work of the
+    request.
+
+Uses; -
+-------
+    This module is used by sign up endpoint.
+
+Reference; -
+------------
+    https://dev.mysql.com/doc/refman/8.0/en/binary-log.html#sysvar_binlog_group_commit_sync_delay
+"""
+
+import os
+import time
+import queue
+import threading
+from flask import current_app
+from apps import db, configuration
+from apps.user.dao import UserInsuranceDao, ALREADY_REGISTERED
+from utils.security import get_password_hasher
+from utils.insurance_logger import InsuranceLogger
+
+
+class PendingRegistration:
+    """Registration waiting for its batch to be written."""
+    __slots__ = ('registration', 'done', 'result', 'cancelled')
+
+    def __init__(self, registration: dict) -> None:
+        self.registration = registration
+        self.done = threading.Event()
+        self.result = None
+        # Request stopped waiting, writer drops it if not written yet
+        self.cancelled = False
+
+    def complete(self, is_success: bool, message: str) -> None:
+        self.result = (is_success, message, self.registration if is_success else None)
+        self.done.set()
+
+
+class RegistrationWriter:
+    """Writes registrations in batches from a background thread.
+
+    Args:
+        window (float): Seconds a batch waits for more registrations, 0 to disable batching
+        max_batch_size (int): Maximum registrations written together
+        timeout (float, optional): Seconds a request waits for its batch. Defaults to 30.
+    """
+    def __init__(self, window: float, max_batch_size: int, timeout: float = 30) -> None:
+        self._window = window
+        self._max_batch_size = max_batch_size
+        self._timeout = timeout
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+        self._registrations = 0
+        self._batches = 0
+        self._fallbacks = 0
+        self._largest_batch = 0
+        self._timeouts = 0
+        self._restarts = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._window > 0
+
+    def add_user_insurance(
+            self,
+            customer_name: str,
+            email_address: str,
+            password: str,
+            insurance_plan_name: str,
+            insured_amount: int
+    ) -> tuple:
+        """
+        Add registration of a customer, with other concurrent registrations if enabled.
+
+        Args:
+            customer_name (str): Name of the customer
+            email_address (str): Email address of the customer
+            password (str): Random generated password
+            insurance_plan_name (str): Insurance plan name chosen by customer
+            insured_amount (int): Insured amount chosen by customer
+
+        Returns:
+            tuple: status, message, result
+                    status is boolean value indicating success (True) or Failure(False),
+                    message is ALREADY_REGISTERED or a string about the error occurred if any, otherwise None,
+                    result is the added registration or None otherwise.
+        """
+        if not self.enabled:
+            return UserInsuranceDao.add_user_insurance(
+                        customer_name = customer_name,
+                        email_address = email_address,
+                        password = password,
+                        insurance_plan_name = insurance_plan_name,
+                        insured_amount = insured_amount
+                    )
+
+        # Hashing is slow, it is done by request threads in parallel, never by the writer
+        is_success, message, password_hash = get_password_hasher().hash_password(password)
+
+        if not is_success:
+            InsuranceLogger.log_error(message)
+            return False, message, None
+
+        pending = PendingRegistration(dict(
+                        customer_name = customer_name,
+                        email_address = email_address,
+                        password_hash = password_hash,
+                        insurance_plan_name = insurance_plan_name,
+                        insured_amount = insured_amount
+                    ))
+
+        if not self._is_running():
+            self._start(current_app._get_current_object())
+
+        self._queue.put(pending)
+
+        # Writer completes every registration it takes, even if the batch fails
+        if not pending.done.wait(self._timeout):
+            pending.cancelled = True
+
+            with self._lock:
+                self._timeouts += 1
+
+            InsuranceLogger.log_error(f"Registration of {email_address} was not written in {self._timeout} seconds.")
+
+            if not pending.done.is_set():
+                return False, "Failed to update database.", None
+
+        return pending.result
+
+    def _is_running(self) -> bool:
+        # Thread of the master process does not exist after gunicorn forks workers
+        return self._thread is not None and self._thread.is_alive() and self._pid == os.getpid()
+
+    def _start(self, app) -> None:
+        with self._lock:
+            if not self._is_running():
+                if self._thread is not None and self._pid == os.getpid():
+                    self._restarts += 1
+                    InsuranceLogger.log_error("Registration writer thread has stopped, starting it again.")
+
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, args=(app,), name='registration-writer', daemon=True)
+                self._thread.start()
+
+    def _run(self, app) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self._window
+
+            while len(batch) < self._max_batch_size:
+                timeout = deadline - time.monotonic()
+
+                try:
+                    batch.append(self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                # Session of its own, never joins a transaction of a request
+                with app.app_context():
+                    self._write(batch)
+                    db.session.remove()
+            except Exception as err:
+                InsuranceLogger.log_error(f"Failed to write batch of {len(batch)} registrations. {str(err)}")
+
+                for pending in batch:
+                    if not pending.done.is_set():
+                        pending.complete(False, "Failed to update database.")
+
+    def _write(self, batch: list) -> None:
+        unique = []
+        email_addresses = set()
+
+        for pending in batch:
+            if pending.cancelled:
+                # Its request has already failed, writing it now would surprise the customer
+                continue
+            elif pending.registration['email_address'] in email_addresses:
+                # Same email twice in one batch, only first one is registered
+                pending.complete(False, ALREADY_REGISTERED)
+            else:
+                email_addresses.add(pending.registration['email_address'])
+                unique.append(pending)
+
+        if not unique:
+            return
+
+        is_success, message, _ = UserInsuranceDao.add_user_insurances(
+                                        registrations=[pending.registration for pending in unique]
+                                    )
+
+        with self._lock:
+            self._registrations += len(batch)
+            self._batches += 1
+            self._largest_batch = max(self._largest_batch, len(batch))
+
+        if is_success:
+            for pending in unique:
+                pending.complete(True, None)
+            return
+
+        # One failing registration fails the batch, find which one
+        with self._lock:
+            self._fallbacks += 1
+
+        InsuranceLogger.log_info(f"Batch of {len(unique)} registrations failed. {message} Writing them one by one.")
+
+        for pending in unique:
+            is_success, message, _ = UserInsuranceDao.add_user_insurances(registrations=[pending.registration])
+            pending.complete(is_success, message)
+
+    def stats(self) -> dict:
+        """Counters of the writer.
+
+        Returns:
+            dict: Group commit statistics
+        """
+        return {
+            'enabled': self.enabled,
+            'window': self._window,
+            'queued': self._queue.qsize(),
+            'registrations': self._registrations,
+            'batches': self._batches,
+            'fallbacks': self._fallbacks,
+            'largest_batch': self._largest_batch,
+            'timeouts': self._timeouts,
+            'restarts': self._restarts,
+            'average_batch': round(self._registrations / self._batches, 2) if self._batches else 0,
+        }
+
+
+registration_writer = RegistrationWriter(
+                            window=configuration.REGISTRATION_BATCH_WINDOW,
+                            max_batch_size=configuration.REGISTRATION_BATCH_MAX_SIZE,
+                            timeout=configuration.REGISTRATION_BATCH_TIMEOUT
+                        )
@@ -0,0 +1,417 @@
+"""Idempotency-Key support.
+
+SENECA GLOBAL CONFIDENTIAL & PROPRIETARY
+
+@file idempotency.py
+@author Dilip Kumar Sharma
+@copyright Seneca Global
+@date 18th Oct 2026
+
+About; -
+--------
+    Lets clients retry POST requests safely by sending an 'Idempotency-Key' header.
+
+Working; -
+----------
+    First request with a key is recorded as in progress, executed and its response is
+    stored for IDEMPOTENCY_TTL seconds. Retries with the same key get the stored response
+    with 'Idempotent-Replayed: true' header, without executing the request again.
+
+    A retry which arrives while the first request is still running waits for it, up to
+    IDEMPOTENCY_WAIT_TIMEOUT seconds, and gets '409 Conflict' after that. A waiter in the
+    same gunicorn worker is woken up as soon as the first request completes, otherwise the
+    store is polled every IDEMPOTENCY_POLL_INTERVAL seconds.
+
+    Reusing a key with a different request body gets '422 Unprocessable Entity'. Responses
+    with server errors or without json body are not stored, so such requests can be retried.
+    In progress records older than IDEMPOTENCY_LOCK_TIMEOUT seconds are taken over, in case
+    the worker running the first request died.
+
+    IDEMPOTENCY_BACKEND selects where responses are stored.
+
+    memory : LRU of IDEMPOTENCY_CAPACITY keys in every gunicorn worker. Retries reaching
+             another worker are executed again, so it suits single worker setups and tests.
+    sql    : idempotencyrecord table, shared by all workers.
+
+    If the store is not reachable, requests are executed without idempotency.
+
+Uses; -
+-------
+    This module is used by sign up and blacklist endpoints.
+
+Reference; -
+------------
+    https://datatracker.ietf.org/doc/draft-ietf-httpapi-idempotency-key-header/
+"""
+
+import time
+import hashlib
+import threading
+from datetime import datetime, timedelta
+from collections import OrderedDict
+from functools import wraps
+from flask import request
+from apps import configuration
+from apps.user.dao import IdempotencyDao
+from utils.http_status import HttpStatus
+from utils.insurance_logger import InsuranceLogger
+
+
+IDEMPOTENCY_KEY_HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+# Response headers replayed along with the body
+REPLAYED_HEADERS = ('Location', 'Preference-Applied')
+
+
+class IdempotencyState:
+    NEW = "NEW"
+    IN_PROGRESS = "IN-PROGRESS"
+    COMPLETED = "COMPLETED"
+    MISMATCH = "MISMATCH"
+    UNAVAILABLE = "UNAVAILABLE"
+
+
+class MemoryIdempotencyStore:
+    """Stores responses in an LRU of the gunicorn worker.
+
+    Args:
+        capacity (int): Maximum number of keys
+        ttl (int): Seconds for which response is stored
+        lock_timeout (int): Seconds after which in progress key is taken over
+    """
+    def __init__(self, capacity: int, ttl: int, lock_timeout: int) -> None:
+        self._capacity = capacity
+        self._ttl = ttl
+        self._lock_timeout = lock_timeout
+
+        self._records = OrderedDict()
+        self._lock = threading.Lock()
+        self._evictions = 0
+
+    def begin(self, key: str, fingerprint: str) -> tuple:
+        """Record key as in progress unless it is already recorded.
+
+        Args:
+            key (str): Idempotency key with scope
+            fingerprint (str): Hash of the request
+
+        Returns:
+            tuple: IdempotencyState and stored record (dict with http_status and response) if completed
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            record = self._records.get(key)
+
+            if record is not None and (now > record['expires_at'] or
+                                       not record['completed'] and now - record['created_at'] > self._lock_timeout):
+                record = None
+
+            if record is None:
+                self._records[key] = dict(
+                                        fingerprint=fingerprint, completed=False, http_status=None, response=None,
+                                        created_at=now, expires_at=now + self._ttl
+                                    )
+                self._records.move_to_end(key)
+
+                while len(self._records) > self._capacity:
+                    self._records.popitem(last=False)
+                    self._evictions += 1
+
+                return IdempotencyState.NEW, None
+
+            self._records.move_to_end(key)
+
+        if record['fingerprint'] != fingerprint:
+            return IdempotencyState.MISMATCH, None
+        elif not record['completed']:
+            return IdempotencyState.IN_PROGRESS, None
+
+        return IdempotencyState.COMPLETED, record
+
+    def complete(self, key: str, http_status: int, response: dict) -> None:
+        """Store response of the request.
+
+        Args:
+            key (str): Idempotency key with scope
+            http_status (int): Http status code of the response
+            response (dict): Response body and headers
+        """
+        with self._lock:
+            record = self._records.get(key)
+
+            if record is not None:
+                record.update(completed=True, http_status=http_status, response=response)
+
+    def release(self, key: str) -> None:
+        """Forget key whose response is not stored, so that request can be retried.
+
+        Args:
+            key (str): Idempotency key with scope
+        """
+        with self._lock:
+            self._records.pop(key, None)
+
+    def stats(self) -> dict:
+        return {'backend': 'memory', 'keys': len(self._records), 'capacity': self._capacity, 'evictions': self._evictions}
+
+
+class SqlIdempotencyStore:
+    """Stores responses in idempotencyrecord table.
+
+    Args:
+        ttl (int): Seconds for which response is stored
+        lock_timeout (int): Seconds after which in progress key is taken over
+        purge_interval (int): Seconds between deletions of expired records
+    """
+    def __init__(self, ttl: int, lock_timeout: int, purge_interval: int) -> None:
+        self._ttl = ttl
+        self._lock_timeout = lock_timeout
+        self._purge_interval = purge_interval
+        self._purged_at = time.monotonic()
+        self._purged = 0
+
+    def _purge(self) -> None:
+        if time.monotonic() - self._purged_at < self._purge_interval:
+            return
+
+        self._purged_at = time.monotonic()
+
+        is_success, message, count = IdempotencyDao.delete_expired_records(now=datetime.utcnow())
+
+        if is_success:
+            self._purged += count
+
+    def begin(self, key: str, fingerprint: str) -> tuple:
+        """Record key as in progress unless it is already recorded.
+
+        Args:
+            key (str): Idempotency key with scope
+            fingerprint (str): Hash of the request
+
+        Returns:
+            tuple: IdempotencyState and stored record (dict with http_status and response) if completed
+        """
+        self._purge()
+
+        # Second attempt after deleting an expired or abandoned record
+        for _ in range(2):
+            # MySQL DATETIME keeps whole seconds
+            now = datetime.utcnow().replace(microsecond=0)
+
+            is_success, message, added = IdempotencyDao.add_record(
+                                                key=key,
+                                                fingerprint=fingerprint,
+                                                created_at=now,
+                                                expires_at=now + timedelta(seconds=self._ttl)
+                                            )
+            if not is_success:
+                return IdempotencyState.UNAVAILABLE, None
+            elif added:
+                return IdempotencyState.NEW, None
+
+            is_success, message, record = IdempotencyDao.get_record(key=key)
+
+            if not is_success:
+                return IdempotencyState.UNAVAILABLE, None
+            elif record is None:
+                # Released meanwhile
+                continue
+
+            if now > record['expires_at'] or \
+                    not record['completed'] and now - record['created_at'] > timedelta(seconds=self._lock_timeout):
+                IdempotencyDao.delete_record(key=key, created_at=record['created_at'])
+                continue
+
+            if record['fingerprint'] != fingerprint:
+                return IdempotencyState.MISMATCH, None
+            elif not record['completed']:
+                return IdempotencyState.IN_PROGRESS, None
+
+            return IdempotencyState.COMPLETED, record
+
+        return IdempotencyState.IN_PROGRESS, None
+
+    def complete(self, key: str, http_status: int, response: dict) -> None:
+        """Store response of the request.
+
+        Args:
+            key (str): Idempotency key with scope
+            http_status (int): Http status code of the response
+            response (dict): Response body and headers
+        """
+        IdempotencyDao.complete_record(key=key, http_status=http_status, response=response)
+
+    def release(self, key: str) -> None:
+        """Forget key whose response is not stored, so that request can be retried.
+
+        Args:
+            key (str): Idempotency key with scope
+        """
+        IdempotencyDao.delete_record(key=key)
+
+    def stats(self) -> dict:
+        return {'backend': 'sql', 'purged': self._purged}
+
+
+def create_idempotency_store(backend: str, capacity: int, ttl: int, lock_timeout: int):
+    """Create idempotency store of given backend.
+
+    Args:
+        backend (str): 'memory' or 'sql'
+        capacity (int): Maximum number of keys of memory store
+        ttl (int): Seconds for which response is stored
+        lock_timeout (int): Seconds after which in progress key is taken over
+
+    Returns:
+        MemoryIdempotencyStore or SqlIdempotencyStore
+    """
+    if backend == 'memory':
+        return MemoryIdempotencyStore(capacity=capacity, ttl=ttl, lock_timeout=lock_timeout)
+    elif backend == 'sql':
+        return SqlIdempotencyStore(ttl=ttl, lock_timeout=lock_timeout, purge_interval=min(ttl, 600))
+
+    raise ValueError(f"Invalid idempotency backend '{backend}'. Available backends ('memory', 'sql').")
+
+
+idempotency_store = create_idempotency_store(
+                        backend=configuration.IDEMPOTENCY_BACKEND,
+                        capacity=configuration.IDEMPOTENCY_CAPACITY,
+                        ttl=configuration.IDEMPOTENCY_TTL,
+                        lock_timeout=configuration.IDEMPOTENCY_LOCK_TIMEOUT
+                    )
+
+# Requests with idempotency key running in this worker, waiters are woken up when they complete
+_in_flight = dict()
+_in_flight_lock = threading.Lock()
+
+_counters = dict(executed=0, replayed=0, waited=0, conflicts=0, mismatches=0)
+
+
+def _fingerprint() -> str:
+    digest = hashlib.sha256()
+    digest.update(request.method.encode('utf-8'))
+    digest.update(request.path.encode('utf-8'))
+    digest.update(request.get_data(cache=True))
+    return digest.hexdigest()
+
+def _wait(key: str, timeout: float) -> None:
+    with _in_flight_lock:
+        event = _in_flight.get(key)
+
+    if event is None:
+        time.sleep(timeout)
+    else:
+        event.wait(timeout)
+
+def _storable(result) -> tuple:
+    # Only json responses returned as tuple by resources are stored
+    if not isinstance(result, tuple) or len(result) < 2 or not isinstance(result[0], dict):
+        return None
+
+    headers = dict(result[2]) if len(result) > 2 else dict()
+
+    return result[1], {
+                        "body": result[0],
+                        "headers": {name: value for name, value in headers.items() if name in REPLAYED_HEADERS}
+                    }
+
+def stats() -> dict:
+    """Counters of idempotent requests of this worker.
+
+    Returns:
+        dict: Idempotency statistics
+    """
+    return {**_counters, 'in_flight': len(_in_flight), 'store': idempotency_store.stats()}
+
+def idempotent(scope: str):
+    """Execute request with same Idempotency-Key header only once.
+
+    Args:
+        scope (str): Name of the endpoint, keys of different endpoints do not clash
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            idempotency_key = request.headers.get(IDEMPOTENCY_KEY_HEADER)
+
+            if idempotency_key is None:
+                return func(*args, **kwargs)
+
+            if not idempotency_key or len(idempotency_key) > MAX_KEY_LENGTH:
+                return {
+                            "status": "VALIDATION-ERROR",
+                            "reason": "{} header should have 1 to {} characters.".format(IDEMPOTENCY_KEY_HEADER, MAX_KEY_LENGTH)
+                        }, HttpStatus.HTTP_400_BAD_REQUEST
+
+            key = f"{scope}:{idempotency_key}"
+            fingerprint = _fingerprint()
+            deadline = time.monotonic() + configuration.IDEMPOTENCY_WAIT_TIMEOUT
+
+            while True:
+                state, record = idempotency_store.begin(key, fingerprint)
+
+                if state == IdempotencyState.NEW:
+                    break
+                elif state == IdempotencyState.UNAVAILABLE:
+                    InsuranceLogger.log_error(f"Idempotency store is not available, executing request with key {idempotency_key}.")
+                    return func(*args, **kwargs)
+                elif state == IdempotencyState.COMPLETED:
+                    InsuranceLogger.log_info(f"Replaying response of request with key {idempotency_key}.")
+                    _counters['replayed'] += 1
+
+                    return record['response']['body'], record['http_status'], {
+                                **record['response']['headers'],
+                                'Idempotent-Replayed': 'true'
+                            }
+                elif state == IdempotencyState.MISMATCH:
+                    _counters['mismatches'] += 1
+
+                    return {
+                                "status": "VALIDATION-ERROR",
+                                "reason": "{} '{}' is already used with a different request.".format(IDEMPOTENCY_KEY_HEADER, idempotency_key)
+                            }, HttpStatus.HTTP_422_UNPROCESSABLE_ENTITY
+
+                # Same request is in progress, wait for its response
+                remaining = deadline - time.monotonic()
+
+                if remaining <= 0:
+                    _counters['conflicts'] += 1
+
+                    return {
+                                "status": "CONFLICT",
+                                "reason": "Request with {} '{}' is still in progress. Please retry later.".format(IDEMPOTENCY_KEY_HEADER, idempotency_key)
+                            }, HttpStatus.HTTP_409_CONFLICT
+
+                _counters['waited'] += 1
+                _wait(key, min(remaining, configuration.IDEMPOTENCY_POLL_INTERVAL))
+
+            event = threading.Event()
+
+            with _in_flight_lock:
+                _in_flight[key] = event
+
+            storable = None
+
+            try:
+                result = func(*args, **kwargs)
+                _counters['executed'] += 1
+                storable = _storable(result)
+
+                if storable is not None and storable[0] < HttpStatus.HTTP_500_INTERNAL_SERVER_ERROR:
+                    idempotency_store.complete(key, *storable)
+                else:
+                    storable = None
+            finally:
+                if storable is None:
+                    idempotency_store.release(key)
+
+                with _in_flight_lock:
+                    _in_flight.pop(key, None)
+
+                event.set()
+
+            return result
+        return wrapper
+    return decorator
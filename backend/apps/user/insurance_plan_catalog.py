@@ -0,0 +1,123 @@
+"""Catalog of insurance plans.
+
+SENECA GLOBAL CONFIDENTIAL & PROPRIETARY
+
+@file insurance_plan_catalog.py
+@author Dilip Kumar Sharma
+@copyright Seneca Global
+@date 18th Oct 2026
+
+About; -
+--------
+    Ids of insurance plans kept in memory of every gunicorn worker.
+
+Working; -
+----------
+    Every insurance plan name has one row in insuranceplan table, names are compared
+    case insensitively. Customers choose from a handful of plans, so once a plan is
+    looked up its id is kept for the life of the worker and sign up only writes
+    insurance_plan_id of the insurance.
+
+    A plan which is not in the table yet is added on first use. When two workers add
+    the same plan at the same time, unique index on plan name rejects one of the inserts
+    and that worker reads the plan added by the other.
+
+    Plans are never deleted by the application. If a cached id does not exist anymore,
+    the dao clears the catalog when the insert of insurance fails.
+
+Uses; -
+-------
+    This module is used by user insurance dao.
+
+Reference; -
+------------
+    TBD
+"""
+
+import threading
+from utils.insurance_logger import InsuranceLogger
+
+
+class InsurancePlanCatalog:
+    """Insurance plan name to id cache with hit rate counters."""
+    def __init__(self) -> None:
+        self._plan_ids = dict()
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def _key(insurance_plan_name: str) -> str:
+        return insurance_plan_name.lower()
+
+    def get_plan_ids(self, insurance_plan_names) -> tuple:
+        """Ids of insurance plans, plans not in database are added.
+
+        Args:
+            insurance_plan_names: Iterable of insurance plan names
+
+        Returns:
+            tuple: status, message, result
+                    status is boolean value indicating success (True) or Failure(False),
+                    message is a string about the error occurred if any, otherwise None,
+                    result is dict of insurance plan name and its id or None otherwise.
+        """
+        insurance_plan_names = set(insurance_plan_names)
+        missing = [name for name in insurance_plan_names if self._key(name) not in self._plan_ids]
+
+        if missing:
+            from apps.user.dao import InsurancePlanDao
+
+            is_success, message, plan_ids = InsurancePlanDao.get_or_add_insurance_plans(insurance_plan_names=missing)
+
+            if not is_success:
+                return False, message, None
+
+            with self._lock:
+                self._misses += len(missing)
+                self._plan_ids.update(plan_ids)
+
+            InsuranceLogger.log_debug(f"Insurance plans {missing} are added to catalog.")
+
+        with self._lock:
+            self._hits += len(insurance_plan_names) - len(missing)
+
+        return True, None, {name: self._plan_ids[self._key(name)] for name in insurance_plan_names}
+
+    def get_plan_id(self, insurance_plan_name: str) -> tuple:
+        """Id of an insurance plan, the plan is added if it is not in database.
+
+        Args:
+            insurance_plan_name (str): Insurance plan name chosen by customer
+
+        Returns:
+            tuple: status, message, result
+                    status is boolean value indicating success (True) or Failure(False),
+                    message is a string about the error occurred if any, otherwise None,
+                    result is the id of insurance plan or None otherwise.
+        """
+        plan_id = self._plan_ids.get(self._key(insurance_plan_name))
+
+        if plan_id is not None:
+            with self._lock:
+                self._hits += 1
+            return True, None, plan_id
+
+        is_success, message, plan_ids = self.get_plan_ids([insurance_plan_name])
+
+        return is_success, message, plan_ids[insurance_plan_name] if is_success else None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._plan_ids.clear()
+
+    def stats(self) -> dict:
+        return {
+            'plans': len(self._plan_ids),
+            'hits': self._hits,
+            'misses': self._misses,
+        }
+
+
+insurance_plan_catalog = InsurancePlanCatalog()
@@ -0,0 +1,113 @@
+"""Customer login.
+
+SENECA GLOBAL CONFIDENTIAL & PROPRIETARY
+
+@file login.py
+@author Dilip Kumar Sharma
+@copyright Seneca Global
+@date 18th Oct 2026
+
+About; -
+--------
+    Checks email and the generated password sent to customer in verification email.
+
+Working; -
+----------
+    Password hash and activation status are read with one query. Password is checked
+    by the password hasher pool, never by the request thread, so a burst of logins
+    can not starve other endpoints of the gunicorn worker; when the pool is full the
+    login is rejected as busy.
+
+    Unknown emails are checked against a dummy hash and a wrong password of a known
+    email takes the same path, so response and its timing are same for both. Whether
+    the account is activated is told only after the password is found correct.
+
+    Attempts are throttled per email and per client ip before anything else, so
+    password checks of a credential stuffing burst are bounded.
+
+    Latency of lookup, password check and whole login are kept by stage.
+
+Uses; -
+-------
+    This module is used by login endpoint.
+
+Reference; -
+------------
+    https://cheatsheetseries.owasp.org/cheatsheets/Authentication_Cheat_Sheet.html#authentication-responses
+"""
+
+from typing import NamedTuple
+from apps.user.dao import UserDao
+from apps.user.login_throttle import login_throttle
+from utils.security import get_password_hasher, HASHER_BUSY
+from utils.latency import StageLatencies
+from utils.insurance_logger import InsuranceLogger
+
+
+class LoginStatus:
+    SUCCESS = "SUCCESS"
+    INVALID_CREDENTIALS = "INVALID-CREDENTIALS"
+    NOT_ACTIVATED = "NOT-ACTIVATED"
+    BUSY = "BUSY"
+    THROTTLED = "THROTTLED"
+
+
+class LoginResult(NamedTuple):
+    status: str
+    customer_name: str
+    user_id: int = None
+    retry_after: float = None
+
+
+login_latencies = StageLatencies()
+
+
+def authenticate(email_address: str, password: str, client_ip: str = None) -> tuple:
+    """
+    Check email and password of a customer.
+
+    Args:
+        email_address (str): Email address of the customer
+        password (str): Password given by the customer
+        client_ip (str, optional): Ip of the client, attempts are throttled per ip too. Defaults to None.
+
+    Returns:
+        tuple: status, message, result
+                status is boolean value indicating success (True) or Failure(False),
+                message is a string about the error occurred if any, otherwise None,
+                result is LoginResult with one of LoginStatus values or None otherwise.
+    """
+    allowed, retry_after = login_throttle.check(email_address=email_address, client_ip=client_ip)
+
+    if not allowed:
+        InsuranceLogger.log_info(f"Login of email {email_address} is throttled.")
+        return True, None, LoginResult(LoginStatus.THROTTLED, None, retry_after=retry_after)
+
+    with login_latencies.measure('total'):
+        with login_latencies.measure('lookup'):
+            is_success, message, credentials = UserDao.get_credentials(email_address=email_address)
+
+        if not is_success:
+            return False, message, None
+
+        with login_latencies.measure('password_check'):
+            is_success, message, matches = get_password_hasher().verify_password(
+                                                password=password,
+                                                password_hash=credentials.password_hash if credentials is not None else None
+                                            )
+
+        if not is_success and message == HASHER_BUSY:
+            return True, None, LoginResult(LoginStatus.BUSY, None)
+        elif not is_success:
+            InsuranceLogger.log_error(message)
+            return False, message, None
+
+        if not matches:
+            InsuranceLogger.log_info(f"Login with invalid credentials for email {email_address}.")
+            return True, None, LoginResult(LoginStatus.INVALID_CREDENTIALS, None)
+        elif not credentials.activated:
+            return True, None, LoginResult(LoginStatus.NOT_ACTIVATED, credentials.customer_name)
+
+        InsuranceLogger.log_info(f"User with email {email_address} is logged in.")
+
+        return True, None, LoginResult(LoginStatus.SUCCESS, credentials.customer_name, credentials.user_id)
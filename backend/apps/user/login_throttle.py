@@ -0,0 +1,147 @@
+"""Login throttling.
+
+SENECA GLOBAL CONFIDENTIAL & PROPRIETARY
+
+@file login_throttle.py
+@author Dilip Kumar Sharma
+@copyright Seneca Global
+@date 18th Oct 2026
+
+About; -
+--------
+    Bounds password checks per email and per client ip, so a credential stuffing burst
+    can not spend every core on password hashing.
+
+Working; -
+----------
+    Every login attempt is counted in a sliding window of LOGIN_THROTTLE_WINDOW seconds
+    of its email and of its client ip, before the password is checked or the database
+    is read. An email gets at most LOGIN_THROTTLE_EMAIL_LIMIT attempts and an ip at most
+    LOGIN_THROTTLE_IP_LIMIT attempts in any window, whether the password is right or
+    wrong; further attempts are rejected with the seconds after which one is allowed.
+
+    Admission control limits the rate of requests to login namespace with token buckets;
+    this limits attempts over minutes, which is what password guessing needs.
+
+    Windows are kept in memory of the gunicorn worker, at most LOGIN_THROTTLE_MAX_KEYS
+    per limiter with least recently used dropped first. With LOGIN_THROTTLE_REDIS_URL
+    windows are kept in redis and shared by all workers; when redis is unavailable the
+    windows of the worker are used instead.
+
+    Emails are kept as sha256 digest of lower cased email, never in clear.
+
+Uses; -
+-------
+    This module is used by login.
+
+Reference; -
+------------
+    https://cheatsheetseries.owasp.org/cheatsheets/Credential_Stuffing_Prevention_Cheat_Sheet.html
+"""
+
+import hashlib
+import threading
+from apps import configuration
+from utils.rate_limiter import SlidingWindowLimiter, RedisSlidingWindowLimiter
+from utils.insurance_logger import InsuranceLogger
+
+
+class LoginThrottle:
+    """Sliding windows of login attempts per email and per ip.
+
+    Args:
+        enabled (bool): When disabled every attempt is allowed
+        email_limit (int): Attempts allowed per email in a window
+        ip_limit (int): Attempts allowed per client ip in a window
+        window (int): Seconds of the window
+        max_keys (int): Maximum emails and ips kept in memory of the worker
+        redis_url (str, optional): Redis url to share windows by all workers. Defaults to None.
+    """
+    def __init__(self, enabled: bool, email_limit: int, ip_limit: int, window: int, max_keys: int,
+                 redis_url: str = None) -> None:
+        self._enabled = enabled
+
+        self._local_limiters = {
+            'email': SlidingWindowLimiter(limit=email_limit, window=window, max_keys=max_keys),
+            'ip': SlidingWindowLimiter(limit=ip_limit, window=window, max_keys=max_keys),
+        }
+        self._shared_limiters = None
+
+        if redis_url:
+            self._shared_limiters = {
+                'email': RedisSlidingWindowLimiter(url=redis_url, limit=email_limit, window=window, prefix='login:email:'),
+                'ip': RedisSlidingWindowLimiter(url=redis_url, limit=ip_limit, window=window, prefix='login:ip:'),
+            }
+
+        self._lock = threading.Lock()
+        self.counters = {
+            'allowed': 0,
+            'rejected_email': 0,
+            'rejected_ip': 0,
+            'shared_errors': 0,
+        }
+
+    def _acquire(self, kind: str, key: str) -> tuple:
+        if self._shared_limiters is not None:
+            try:
+                return self._shared_limiters[kind].acquire(key)
+            except Exception as err:
+                with self._lock:
+                    self.counters['shared_errors'] += 1
+
+                InsuranceLogger.log_warning(f"Failed to throttle login with redis. {str(err)}")
+
+        return self._local_limiters[kind].acquire(key)
+
+    def check(self, email_address: str, client_ip: str = None) -> tuple:
+        """Count a login attempt if windows of its email and ip allow it.
+
+        Args:
+            email_address (str): Email address of the attempt
+            client_ip (str, optional): Client ip of the attempt. Defaults to None.
+
+        Returns:
+            tuple: bool for allowed or not, seconds after which an attempt is allowed if not allowed
+        """
+        if not self._enabled:
+            return True, 0.0
+
+        if client_ip:
+            allowed, retry_after = self._acquire('ip', client_ip)
+
+            if not allowed:
+                with self._lock:
+                    self.counters['rejected_ip'] += 1
+
+                return False, retry_after
+
+        allowed, retry_after = self._acquire('email', hashlib.sha256(email_address.strip().lower().encode()).hexdigest())
+
+        with self._lock:
+            self.counters['allowed' if allowed else 'rejected_email'] += 1
+
+        return allowed, retry_after
+
+    def clear(self) -> None:
+        """Forget windows kept in memory of this worker."""
+        for limiter in self._local_limiters.values():
+            limiter.clear()
+
+    def stats(self) -> dict:
+        return {
+            **self.counters,
+            'enabled': self._enabled,
+            'shared_store': 'redis' if self._shared_limiters is not None else None,
+            'tracked_emails': len(self._local_limiters['email']),
+            'tracked_ips': len(self._local_limiters['ip']),
+        }
+
+
+login_throttle = LoginThrottle(
+                    enabled=configuration.LOGIN_THROTTLE_ENABLED,
+                    email_limit=configuration.LOGIN_THROTTLE_EMAIL_LIMIT,
+                    ip_limit=configuration.LOGIN_THROTTLE_IP_LIMIT,
+                    window=configuration.LOGIN_THROTTLE_WINDOW,
+                    max_keys=configuration.LOGIN_THROTTLE_MAX_KEYS,
+                    redis_url=configuration.LOGIN_THROTTLE_REDIS_URL
+                )
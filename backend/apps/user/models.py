@@ -24,6 +24,7 @@ Reference; -
     TBD
 """
 
+from datetime import datetime
 from apps import db
 
 
@@ -34,6 +35,8 @@ class User(db.Model):
     customer_name = db.Column(db.String(50), nullable=False)
     email_address = db.Column(db.String(50), index=True, unique=True, nullable=False)
     password = db.Column(db.String(200), unique=True, nullable=False)
+    # UTC, set for bulk inserts too; unactivated accounts are purged by its index
+    created_at = db.Column(db.DateTime, index=True, nullable=False, default=datetime.utcnow, server_default=db.func.now())
     insurances = db.relationship('Insurance', backref='user', lazy='dynamic') # One to Many
     userprofiles = db.relationship('UserProfile', backref='customerprofile', uselist=False) # One to One
 
@@ -53,6 +56,8 @@ class UserProfile(db.Model):
 
     id = db.Column(db.Integer, primary_key = True)
     activated = db.Column(db.Boolean, nullable=False, default=False)
+    # UTC, first activation; kept on deactivation, so only never activated accounts are purged
+    activated_at = db.Column(db.DateTime)
     customerprofile_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
 
     def __init__(self, customerprofile: User, activated: bool = False) -> None:
@@ -69,7 +74,7 @@ class InsurancePlan(db.Model):
     __tablename__ = 'insuranceplan'
 
     id = db.Column(db.Integer, primary_key = True)
-    insurance_plan_name = db.Column(db.String(200), nullable=False)
+    insurance_plan_name = db.Column(db.String(200), index=True, unique=True, nullable=False)
     insurances = db.relationship('Insurance', backref='insurance_plan', lazy='dynamic')
 
     def __init__(self, insurance_plan_name: str) -> None:
@@ -89,10 +94,15 @@ class Insurance(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     insurance_plan_id = db.Column(db.Integer, db.ForeignKey('insuranceplan.id'), nullable=False)
 
-    def __init__(self, insured_amount: int, user: User, insurance_plan: InsurancePlan) -> None:
+    def __init__(self, insured_amount: int, user: User, insurance_plan: InsurancePlan = None, insurance_plan_id: int = None) -> None:
         self.insured_amount = insured_amount
         self.user = user
-        self.insurance_plan = insurance_plan
+
+        # Plans come from the catalog, sign up only knows id of the plan
+        if insurance_plan is not None:
+            self.insurance_plan = insurance_plan
+        else:
+            self.insurance_plan_id = insurance_plan_id
 
     def __str__(self) -> None:
         return f"{self.insured_amount}"
@@ -116,3 +126,68 @@ class Blacklist(db.Model):
     
     def __repr__(self) -> None:
         return f"Blacklist Email({self.email_address})"
+
+class RegistrationJob(db.Model):
+    __tablename__ = 'registrationjob'
+
+    id = db.Column(db.String(36), primary_key = True)
+    email_address = db.Column(db.String(50), nullable=False)
+    status = db.Column(db.String(20), nullable=False)
+    http_status = db.Column(db.Integer)
+    response = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, nullable=False)
+    updated_at = db.Column(db.DateTime, nullable=False)
+
+    def __init__(self, id: str, email_address: str, status: str, created_at, updated_at) -> None:
+        self.id = id
+        self.email_address = email_address
+        self.status = status
+        self.created_at = created_at
+        self.updated_at = updated_at
+
+    def __str__(self) -> None:
+        return f"{self.id}"
+    
+    def __repr__(self) -> None:
+        return f"RegistrationJob({self.id}, {self.status})"
+
+class IdempotencyRecord(db.Model):
+    __tablename__ = 'idempotencyrecord'
+
+    key = db.Column(db.String(300), primary_key = True)
+    fingerprint = db.Column(db.String(64), nullable=False)
+    completed = db.Column(db.Boolean, nullable=False, default=False)
+    http_status = db.Column(db.Integer)
+    response = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, nullable=False)
+    expires_at = db.Column(db.DateTime, index=True, nullable=False)
+
+    def __init__(self, key: str, fingerprint: str, created_at, expires_at) -> None:
+        self.key = key
+        self.fingerprint = fingerprint
+        self.created_at = created_at
+        self.expires_at = expires_at
+
+    def __str__(self) -> None:
+        return f"{self.key}"
+    
+    def __repr__(self) -> None:
+        return f"IdempotencyRecord({self.key})"
+
+class RevokedToken(db.Model):
+    __tablename__ = 'revokedtoken'
+
+    jti = db.Column(db.String(32), primary_key = True)
+    revoked_at = db.Column(db.DateTime, index=True, nullable=False)
+    expires_at = db.Column(db.DateTime, index=True, nullable=False)
+
+    def __init__(self, jti: str, revoked_at, expires_at) -> None:
+        self.jti = jti
+        self.revoked_at = revoked_at
+        self.expires_at = expires_at
+
+    def __str__(self) -> None:
+        return f"{self.jti}"
+    
+    def __repr__(self) -> None:
+        return f"RevokedToken({self.jti})"
@@ -0,0 +1,392 @@
+"""Background sign up jobs.
+
+SENECA GLOBAL CONFIDENTIAL & PROPRIETARY
+
+@file registration_jobs.py
+@author Dilip Kumar Sharma
+@copyright Seneca Global
+@date 18th Oct 2026
+
+About; -
+--------
+    Runs sign up in background when client asks for it with 'Prefer: respond-async' header.
+
+Working; -
+----------
+    Request is accepted right after schema validation. A job is recorded in registrationjob
+    table and the rest of the sign up pipeline (data validation, registration status check,
+    password hashing, database inserts and verification email) runs in a bounded thread
+    pool of the gunicorn worker. Response is '202 Accepted' with a status url.
+
+    Job status and final response are kept in registrationjob table, so status url can be
+    polled on any gunicorn worker. Status events are streamed as server-sent events; when
+    the job runs in the same worker the stream is notified as soon as the job completes,
+    otherwise the table is polled every SIGN_UP_JOB_EVENTS_POLL_INTERVAL seconds.
+
+    At most SIGN_UP_JOB_MAX_PENDING jobs may be waiting or running in a worker, new sign
+    ups are rejected with '503 Service Unavailable' after that. Every event stream holds a
+    request thread of the worker, so at most SIGN_UP_JOB_MAX_EVENT_STREAMS of them are
+    open at once; clients beyond that get '503 Service Unavailable' and poll status url.
+
+    Jobs live in memory of the worker, a worker which is killed loses the jobs it has
+    accepted. A job which stays PENDING or RUNNING for SIGN_UP_JOB_STALE_AFTER seconds is
+    completed with '500 Internal Server Error', by every worker on start up and whenever
+    its status is read. A job completed that way is never started afterwards.
+
+Uses; -
+-------
+    This module is used by sign up endpoint.
+
+Reference; -
+------------
+    https://www.rfc-editor.org/rfc/rfc7240#section-4.1
+    https://html.spec.whatwg.org/multipage/server-sent-events.html
+"""
+
+import os
+import json
+import time
+import uuid
+import threading
+from functools import wraps
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app, request, url_for
+from apps import db, configuration
+from apps.user.dao import RegistrationJobDao
+from apps.user.request_payload import get_request_payload
+from utils.http_status import HttpStatus
+from utils.insurance_logger import InsuranceLogger
+
+
+class JobStatus:
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+
+
+# Response of a job lost with its worker
+INTERRUPTED_RESPONSE = {
+    "status": "INTERNAL-SERVER-ERROR",
+    "reason": "Registration was interrupted by a server restart. Please sign up again."
+}
+
+
+class RegistrationJobRunner:
+    """Runs sign up pipeline in a bounded thread pool.
+
+    Args:
+        workers (int): Number of threads running jobs
+        max_pending (int): Maximum number of jobs waiting or running
+        stale_after (float, optional): Seconds after which an unfinished job is taken as lost. Defaults to 600.
+        max_event_streams (int, optional): Maximum number of open event streams. Defaults to 2.
+    """
+    def __init__(self, workers: int, max_pending: int, stale_after: float = 600, max_event_streams: int = 2) -> None:
+        self._workers = workers
+        self._max_pending = max_pending
+        self._stale_after = stale_after
+        self._max_event_streams = max_event_streams
+
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+        self._events = dict()
+
+        self._pending = 0
+        self._accepted = 0
+        self._rejected = 0
+        self._completed = 0
+        self._failed = 0
+        self._stale = 0
+        self._event_streams = 0
+        self._rejected_event_streams = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Threads of the master process do not exist after gunicorn forks workers
+        if self._executor is None or self._pid != os.getpid():
+            self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix='sign-up-job')
+            self._pid = os.getpid()
+
+        return self._executor
+
+    def submit(self, pipeline, input_data: dict) -> tuple:
+        """Record a job and run sign up pipeline for it in background.
+
+        Args:
+            pipeline: Function taking registration and returning response and http status code
+            input_data (dict): Registration received in request
+
+        Returns:
+            tuple: status, message, result
+                    status is boolean value indicating success (True) or Failure(False),
+                    message is a string about the error occurred if any, otherwise None,
+                    result is the job id or None otherwise.
+        """
+        with self._lock:
+            if self._pending >= self._max_pending:
+                self._rejected += 1
+                return False, "Server is busy. Please try again later.", None
+
+            self._pending += 1
+
+        job_id = str(uuid.uuid4())
+
+        is_success, message, _ = RegistrationJobDao.add_job(
+                                        job_id=job_id,
+                                        email_address=input_data['email_address'],
+                                        status=JobStatus.PENDING
+                                    )
+
+        if not is_success:
+            with self._lock:
+                self._pending -= 1
+            return False, message, None
+
+        with self._lock:
+            self._events[job_id] = threading.Event()
+            self._accepted += 1
+            executor = self._get_executor()
+
+        # Url of verification email is built from url of this request
+        executor.submit(self._run, current_app._get_current_object(), request.url_root, job_id, pipeline, dict(input_data))
+
+        return True, None, job_id
+
+    def _run(self, app, base_url: str, job_id: str, pipeline, input_data: dict) -> None:
+        http_status = HttpStatus.HTTP_500_INTERNAL_SERVER_ERROR
+
+        try:
+            with app.test_request_context(base_url=base_url):
+                is_success, message, started = RegistrationJobDao.update_job(
+                                                    job_id=job_id,
+                                                    status=JobStatus.RUNNING,
+                                                    expected_status=JobStatus.PENDING
+                                                )
+
+                if is_success and started is None:
+                    InsuranceLogger.log_error(f"Sign up job {job_id} was completed as stale before it started.")
+                    return
+
+                try:
+                    response, http_status = pipeline(input_data)
+                except Exception as err:
+                    InsuranceLogger.log_error(f"Sign up job {job_id} failed. {str(err)}")
+                    response, http_status = {
+                                                "status": "INTERNAL-SERVER-ERROR",
+                                                "reason": "Registration failed due to server error."
+                                            }, HttpStatus.HTTP_500_INTERNAL_SERVER_ERROR
+
+                # Pipeline may leave a transaction begun by lazy loads, as a request would
+                db.session.remove()
+
+                RegistrationJobDao.update_job(
+                    job_id=job_id,
+                    status=JobStatus.COMPLETED,
+                    http_status=http_status,
+                    response=response
+                )
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._completed += 1
+                if http_status >= HttpStatus.HTTP_500_INTERNAL_SERVER_ERROR:
+                    self._failed += 1
+                event = self._events.pop(job_id, None)
+
+            if event is not None:
+                event.set()
+
+    def complete_stale_jobs(self, job_id: str = None) -> int:
+        """Complete jobs left PENDING or RUNNING by a killed worker.
+
+        Args:
+            job_id (str, optional): Only this job. Defaults to None for all jobs.
+
+        Returns:
+            int: Number of jobs completed
+        """
+        is_success, message, count = RegistrationJobDao.complete_stale_jobs(
+                                            statuses=[JobStatus.PENDING, JobStatus.RUNNING],
+                                            updated_before=datetime.utcnow() - timedelta(seconds=self._stale_after),
+                                            status=JobStatus.COMPLETED,
+                                            http_status=HttpStatus.HTTP_500_INTERNAL_SERVER_ERROR,
+                                            response=INTERRUPTED_RESPONSE,
+                                            job_id=job_id
+                                        )
+
+        if not is_success or not count:
+            return 0
+
+        InsuranceLogger.log_error(f"Completed {count} stale sign up jobs as interrupted.")
+
+        with self._lock:
+            self._stale += count
+
+        return count
+
+    def get_job(self, job_id: str) -> tuple:
+        """Job by id, completed first if it is stale.
+
+        Args:
+            job_id (str): Unique id of the job
+
+        Returns:
+            tuple: status, message, result as of RegistrationJobDao.get_job
+        """
+        is_success, message, job = RegistrationJobDao.get_job(job_id=job_id)
+
+        if (is_success and job is not None and job['status'] != JobStatus.COMPLETED
+                and job['updated_at'] < datetime.utcnow() - timedelta(seconds=self._stale_after)
+                and self.complete_stale_jobs(job_id=job_id)):
+            return RegistrationJobDao.get_job(job_id=job_id)
+
+        return is_success, message, job
+
+    def open_event_stream(self) -> bool:
+        """Take a slot for an event stream, False if all are taken."""
+        with self._lock:
+            if self._event_streams >= self._max_event_streams:
+                self._rejected_event_streams += 1
+                return False
+
+            self._event_streams += 1
+            return True
+
+    def close_event_stream(self) -> None:
+        with self._lock:
+            self._event_streams -= 1
+
+    def wait(self, job_id: str, timeout: float) -> None:
+        """Wait till job completes if it runs in this worker, otherwise just sleep.
+
+        Args:
+            job_id (str): Unique id of the job
+            timeout (float): Maximum seconds to wait
+        """
+        event = self._events.get(job_id)
+
+        if event is None:
+            time.sleep(timeout)
+        else:
+            event.wait(timeout)
+
+    def stats(self) -> dict:
+        """Counters of the runner.
+
+        Returns:
+            dict: Job statistics
+        """
+        return {
+            'workers': self._workers,
+            'pending': self._pending,
+            'max_pending': self._max_pending,
+            'accepted': self._accepted,
+            'rejected': self._rejected,
+            'completed': self._completed,
+            'failed': self._failed,
+            'stale': self._stale,
+            'event_streams': self._event_streams,
+            'rejected_event_streams': self._rejected_event_streams,
+        }
+
+
+registration_job_runner = RegistrationJobRunner(
+                                workers=configuration.SIGN_UP_JOB_WORKERS,
+                                max_pending=configuration.SIGN_UP_JOB_MAX_PENDING,
+                                stale_after=configuration.SIGN_UP_JOB_STALE_AFTER,
+                                max_event_streams=configuration.SIGN_UP_JOB_MAX_EVENT_STREAMS
+                            )
+
+
+def prefers_async() -> bool:
+    """Whether client asked for asynchronous processing with 'Prefer: respond-async' header."""
+    preferences = request.headers.get('Prefer', '')
+    return any(preference.strip().lower() == 'respond-async' for preference in preferences.split(','))
+
+def accept_async(pipeline):
+    """Run sign up pipeline in background when client prefers asynchronous processing.
+
+    Remaining decorators and the endpoint are skipped for such requests, the pipeline
+    runs them as part of the job instead.
+
+    Args:
+        pipeline: Function taking registration and returning response and http status code
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not configuration.SIGN_UP_ASYNC_ENABLED or not prefers_async():
+                return func(*args, **kwargs)
+
+            is_success, message, job_id = registration_job_runner.submit(pipeline, get_request_payload().data)
+
+            if not is_success:
+                return {
+                            "status": "SERVICE-UNAVAILABLE",
+                            "reason": message
+                        }, HttpStatus.HTTP_503_SERVICE_UNAVAILABLE
+
+            status_url = url_for('api.sign_up_status', job_id=job_id)
+
+            InsuranceLogger.log_info(f"Sign up is accepted as job {job_id}.")
+
+            return {
+                        "status": "ACCEPTED",
+                        "reason": "Registration is accepted and will be processed shortly.",
+                        "job_id": job_id,
+                        "status_url": status_url,
+                        "events_url": url_for('api.sign_up_events', job_id=job_id)
+                    }, HttpStatus.HTTP_202_ACCEPTED, {'Location': status_url, 'Preference-Applied': 'respond-async'}
+        return wrapper
+    return decorator
+
+def job_status_response(job: dict) -> dict:
+    """Public representation of a job.
+
+    Args:
+        job (dict): Job returned by RegistrationJobDao
+
+    Returns:
+        dict: Job status with response of sign up once completed
+    """
+    return {
+        "job_id": job['job_id'],
+        "status": job['status'],
+        "http_status": job['http_status'],
+        "result": job['response'],
+    }
+
+def job_events(job_id: str):
+    """Server-sent events with status of job, till it completes or SIGN_UP_JOB_EVENTS_TIMEOUT.
+
+    Args:
+        job_id (str): Unique id of the job
+
+    Yields:
+        str: Server-sent event
+    """
+    deadline = time.monotonic() + configuration.SIGN_UP_JOB_EVENTS_TIMEOUT
+    last_status = None
+
+    while True:
+        is_success, message, job = registration_job_runner.get_job(job_id=job_id)
+
+        if not is_success or job is None:
+            yield f"event: error\ndata: {json.dumps({'status': 'NOT-FOUND' if is_success else 'INTERNAL-SERVER-ERROR', 'reason': message})}\n\n"
+            return
+
+        if job['status'] != last_status:
+            last_status = job['status']
+            yield f"event: status\ndata: {json.dumps(job_status_response(job))}\n\n"
+
+        if job['status'] == JobStatus.COMPLETED:
+            return
+
+        remaining = deadline - time.monotonic()
+
+        if remaining <= 0:
+            # Client reconnects to continue
+            yield f"retry: {int(configuration.SIGN_UP_JOB_EVENTS_POLL_INTERVAL * 1000)}\n\n"
+            return
+
+        registration_job_runner.wait(job_id, min(remaining, configuration.SIGN_UP_JOB_EVENTS_POLL_INTERVAL))
@@ -0,0 +1,85 @@
+"""Request scoped json payload.
+
+SENECA GLOBAL CONFIDENTIAL & PROPRIETARY
+
+@file request_payload.py
+@author Dilip Kumar Sharma
+@copyright Seneca Global
+@date 18th Oct 2026
+
+About; -
+--------
+    Json payload of the current api request, decoded only once.
+
+Working; -
+----------
+    The request body is decoded on first access and kept in flask 'g' object
+    for rest of the request. Every decorator in the validation chain and the
+    endpoint itself read the same decoded payload.
+
+Uses; -
+-------
+    This module is used by schema validation, data validation and endpoints.
+
+Reference; -
+------------
+    https://flask.palletsprojects.com/en/2.3.x/appcontext/#storing-data
+"""
+
+import json
+from flask import g, request
+
+
+class RequestPayload:
+    """Decoded json body of an api request."""
+    __slots__ = ('data', 'validated')
+
+    def __init__(self, data: dict) -> None:
+        self.data = data
+        self.validated = False
+
+    def __getitem__(self, attribute: str):
+        return self.data[attribute]
+
+    def get(self, attribute: str, default=None):
+        return self.data.get(attribute, default)
+
+    def keys(self):
+        return self.data.keys()
+
+    def items(self):
+        return self.data.items()
+
+
+def load_request_payload() -> tuple:
+    """Decode json body of the current request once per request.
+
+    Returns:
+        tuple: status, message, result
+                status is boolean value indicating success (True) or Failure(False),
+                message is a string about the error occurred if any, otherwise None,
+                result is the decoded RequestPayload or None otherwise.
+    """
+    payload = g.get('request_payload')
+
+    if payload is not None:
+        return True, None, payload
+
+    try:
+        data = json.loads(request.get_data(cache=True).decode('utf-8'))
+    except ValueError:
+        return False, "Invalid Json Format", None
+
+    payload = RequestPayload(data)
+    g.request_payload = payload
+
+    return True, None, payload
+
+def get_request_payload() -> RequestPayload:
+    """Get decoded payload of the current request.
+
+    Returns:
+        RequestPayload: Payload decoded by schema validation, decoded now if not done yet.
+    """
+    _, _, payload = load_request_payload()
+    return payload
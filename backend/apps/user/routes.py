@@ -27,7 +27,12 @@ from flask.blueprints import Blueprint
 from flask_restx import Api
 from apps.user.apis.namespaces.blacklist_namespace import blacklist_ns
 from apps.user.apis.namespaces.sign_up_namespace import sign_up_ns
+from apps.user.apis.namespaces.bulk_sign_up_namespace import bulk_sign_up_ns
+from apps.user.apis.namespaces.bulk_activation_namespace import bulk_activation_ns
 from apps.user.apis.namespaces.verify_namespace import verify_ns
+from apps.user.apis.namespaces.login_namespace import login_ns
+from apps.user.apis.namespaces.metrics_namespace import metrics_ns
+from apps.user.admission import admission_controller
 
 user_blueprint = Blueprint(name='api', import_name=__name__, 
                            template_folder='templates/user',
@@ -42,5 +47,12 @@ api = Api(
         )
 
 api.add_namespace(sign_up_ns)
+api.add_namespace(bulk_sign_up_ns)
 api.add_namespace(blacklist_ns)
 api.add_namespace(verify_ns)
+api.add_namespace(login_ns)
+api.add_namespace(bulk_activation_ns)
+api.add_namespace(metrics_ns)
+
+# Sheds load before requests reach the namespaces
+admission_controller.init_blueprint(user_blueprint)
@@ -16,6 +16,8 @@ Working; -
     This module checks all parameter passed to post request and raises response and status
     code when payload is invalid.
 
+    Schema of the payload is checked by validator compiled from request model of the endpoint.
+
 Uses; -
 -------
     This module is used as decorator by POST request endpoint.
@@ -25,10 +27,10 @@ Reference; -
     TBD
 """
 
-import json
 from functools import wraps
 from flask import request
-from werkzeug.exceptions import BadRequest
+from apps.user.request_payload import load_request_payload
+from apps.user.validator_compiler import CompiledValidator
 from utils.http_status import HttpStatus
 
 
@@ -40,80 +42,40 @@ def is_content_type_json() -> tuple:
     """
     content_type = request.headers.get('Content-Type')
     return content_type == 'application/json', content_type
-
-def is_valid_json() -> bool:
-    """To check if json payload is valid or not
-
-    Returns:
-        bool: Success/failure
-    """
-    try:
-        request.json
-    except BadRequest:
-        return False
     
-    return True
-    
-def validate_data_type() -> tuple:
-    """Validate data types of all attributes passed in the api request.
+def validate_schema(validator: CompiledValidator):
+    """Validate content type, json format and schema of the api request.
 
-    Returns:
-        tuple: bool for success/failure and error message if any/None
+    Args:
+        validator (CompiledValidator): Validator compiled from request model of the endpoint
     """
-    input_data = json.loads(request.data.decode('utf-8'))
-
-    expected_attributes = {
-        'customer_name' : str, 'email_address': str, 'insurance_plan_name': str, 'insured_amount': int
-    }
-
-    for attribute, value in input_data.items():
-        if type(value) != expected_attributes[attribute]:
-            return False, "Data type of attribute '{}' should be {}.".format(attribute, expected_attributes[attribute])
-
-    return True, None
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            is_json, content_type = is_content_type_json()
+
+            if not is_json:
+                return { 
+                            "status": "VALIDATION-ERROR", 
+                            "reason": "content-type {} is not supported. Expected content type is 'application/json'".format(content_type)
+                        }, HttpStatus.HTTP_400_BAD_REQUEST
 
-def is_expected_schema() -> tuple:
-    """To check if given schems is in expected format
+            # Payload is decoded only here, rest of the chain reads it from request context
+            is_success, message, payload = load_request_payload()
 
-    Returns:
-        tuple: bool for success/failure and error message if any/None
-    """
-    expected_attributes = ['customer_name', 'email_address', 
-                           'insurance_plan_name', 'insured_amount']
-
-    actual_attributes = json.loads(request.data.decode('utf-8')).keys()
-
-    for attribute in expected_attributes:
-        if attribute not in actual_attributes:
-            return False, "'{}' is a required attribute.".format(attribute)
-
-    for attribute in actual_attributes:
-        if attribute not in expected_attributes:
-            return False, "Attribute '{}' is not expected.".format(attribute)
-
-    return validate_data_type()
-
-def validate_schema(func):
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        is_json, content_type = is_content_type_json()
-
-        if not is_json:
-            return { 
-                        "status": "VALIDATION-ERROR", 
-                        "reason": "content-type {} is not supported. Expected content type is 'application/json'".format(content_type)
-                    }, HttpStatus.HTTP_400_BAD_REQUEST
-        elif not is_valid_json():
-            return {
-                        "status": "VALIDATION-ERROR",
-                        "reason": "Invalid Json Format"
-                    }, HttpStatus.HTTP_400_BAD_REQUEST
-        else:
-            valid, message = is_expected_schema()
-            if not valid:
+            if not is_success:
                 return {
                             "status": "VALIDATION-ERROR",
-                            "reason": "Invalid Schema. {}".format(message)
+                            "reason": message
                         }, HttpStatus.HTTP_400_BAD_REQUEST
-        return func(*args, **kwargs)
-    return wrapper
\ No newline at end of file
+
+            errors = validator.validate(payload.data)
+
+            if errors is not None:
+                return errors, HttpStatus.HTTP_400_BAD_REQUEST
+
+            payload.validated = True
+
+            return func(*args, **kwargs)
+        return wrapper
+    return decorator
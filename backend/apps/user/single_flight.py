@@ -0,0 +1,195 @@
+"""Single flight of identical requests.
+
+SENECA GLOBAL CONFIDENTIAL & PROPRIETARY
+
+@file single_flight.py
+@author Dilip Kumar Sharma
+@copyright Seneca Global
+@date 18th Oct 2026
+
+About; -
+--------
+    Identical requests arriving at the same time are executed once and share the
+    response, e.g. customer and email link scanner opening the same confirmation link.
+
+Working; -
+----------
+    Requests are identified by scope and sha256 digest of a url argument. First request
+    of a key in a gunicorn worker is executed, identical requests arriving in the same
+    worker while it runs wait for it and get the same response.
+
+    SINGLE_FLIGHT_MODE selects how far requests are coalesced.
+
+    none   : Every request is executed.
+    worker : Identical requests are coalesced within a gunicorn worker.
+    shared : In addition, the executing request records the key in idempotencyrecord
+             table. Identical requests of other workers poll the record every
+             SINGLE_FLIGHT_POLL_INTERVAL seconds and get the stored response, which is
+             kept for SINGLE_FLIGHT_RESULT_TTL seconds. A request waiting longer than
+             SINGLE_FLIGHT_WAIT_TIMEOUT seconds is executed itself, so coalescing only
+             saves work and is never needed for correctness.
+
+    Responses with server errors are shared with waiting requests but never stored.
+
+Uses; -
+-------
+    This module is used by verify endpoint.
+
+Reference; -
+------------
+    https://pkg.go.dev/golang.org/x/sync/singleflight
+"""
+
+import time
+import hashlib
+import threading
+from functools import wraps
+from apps import configuration
+from apps.user.idempotency import SqlIdempotencyStore, IdempotencyState
+from utils.http_status import HttpStatus
+from utils.insurance_logger import InsuranceLogger
+
+
+SINGLE_FLIGHT_MODES = ('none', 'worker', 'shared')
+
+
+class Call:
+    """Execution shared by identical requests of a worker."""
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Executes function once for concurrent calls with the same key.
+
+    Args:
+        mode (str): One of SINGLE_FLIGHT_MODES
+        result_ttl (int): Seconds a response is kept for other workers in shared mode
+        wait_timeout (float): Seconds a request waits for another worker in shared mode
+        poll_interval (float): Seconds between reads of the record in shared mode
+    """
+    def __init__(self, mode: str, result_ttl: int, wait_timeout: float, poll_interval: float) -> None:
+        if mode not in SINGLE_FLIGHT_MODES:
+            raise ValueError(f"Invalid single flight mode '{mode}'. Available modes {SINGLE_FLIGHT_MODES}.")
+
+        self._mode = mode
+        self._wait_timeout = wait_timeout
+        self._poll_interval = poll_interval
+        self._store = SqlIdempotencyStore(ttl=result_ttl, lock_timeout=wait_timeout, purge_interval=600) \
+                        if mode == 'shared' else None
+
+        self._calls = dict()
+        self._lock = threading.Lock()
+
+        self._counters = dict(executed=0, shared=0, replayed=0, timeouts=0)
+
+    def do(self, key: str, func):
+        """Call func, or wait for the call of a concurrent request with the same key.
+
+        Args:
+            key (str): Key of identical requests
+            func: Function without arguments returning the response
+
+        Returns:
+            Response returned by func
+        """
+        if self._mode == 'none':
+            return func()
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+
+            if leader:
+                call = self._calls[key] = Call()
+
+        if not leader:
+            call.done.wait()
+            self._counters['shared'] += 1
+
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._execute_shared(key, func) if self._store is not None else self._execute(func)
+            return call.result
+        except BaseException as err:
+            call.error = err
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+            call.done.set()
+
+    def _execute(self, func):
+        self._counters['executed'] += 1
+        return func()
+
+    def _execute_shared(self, key: str, func):
+        deadline = time.monotonic() + self._wait_timeout
+
+        while True:
+            state, record = self._store.begin(key, key)
+
+            if state == IdempotencyState.NEW:
+                break
+            elif state == IdempotencyState.COMPLETED:
+                self._counters['replayed'] += 1
+                return record['response']['body'], record['http_status']
+            elif state == IdempotencyState.UNAVAILABLE:
+                return self._execute(func)
+            elif time.monotonic() > deadline:
+                InsuranceLogger.log_warning(f"Gave up waiting for identical request of {key}, executing it.")
+                self._counters['timeouts'] += 1
+                return self._execute(func)
+
+            time.sleep(self._poll_interval)
+
+        stored = False
+
+        try:
+            result = self._execute(func)
+
+            if isinstance(result, tuple) and len(result) >= 2 and isinstance(result[0], dict) \
+                    and result[1] < HttpStatus.HTTP_500_INTERNAL_SERVER_ERROR:
+                self._store.complete(key, result[1], {"body": result[0], "headers": {}})
+                stored = True
+
+            return result
+        finally:
+            if not stored:
+                self._store.release(key)
+
+    def stats(self) -> dict:
+        return {**self._counters, 'mode': self._mode, 'in_flight': len(self._calls)}
+
+
+single_flight_group = SingleFlight(
+                            mode=configuration.SINGLE_FLIGHT_MODE,
+                            result_ttl=configuration.SINGLE_FLIGHT_RESULT_TTL,
+                            wait_timeout=configuration.SINGLE_FLIGHT_WAIT_TIMEOUT,
+                            poll_interval=configuration.SINGLE_FLIGHT_POLL_INTERVAL
+                        )
+
+
+def single_flight(scope: str, key_arg: str):
+    """Execute identical concurrent requests once.
+
+    Args:
+        scope (str): Name of the endpoint, keys of different endpoints do not clash
+        key_arg (str): Url argument identifying identical requests, e.g. token
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = f"{scope}:{hashlib.sha256(str(kwargs[key_arg]).encode('utf-8')).hexdigest()}"
+
+            return single_flight_group.do(key, lambda: func(*args, **kwargs))
+        return wrapper
+    return decorator
@@ -0,0 +1,67 @@
+"""Strict loading of ORM objects.
+
+SENECA GLOBAL CONFIDENTIAL & PROPRIETARY
+
+@file strict_loading.py
+@author Dilip Kumar Sharma
+@copyright Seneca Global
+@date 18th Oct 2026
+
+About; -
+--------
+    Makes queries hidden behind attribute access fail loudly, so they are found by tests
+    instead of adding round trips to every request in production.
+
+Working; -
+----------
+    Dao methods return projections, named tuples of the columns their callers need, which
+    are read with one statement. ORM objects returned by older dao methods are expired once
+    their transaction commits; touching a relationship such as 'user.userprofiles' or a
+    column of an expired object then runs a query of its own.
+
+    When strict loading is enabled, every lazy load of a relationship and every refresh of
+    expired or deferred columns made by the session raises StrictLoadingError before the
+    query is sent. StrictLoadingError is not an SQLAlchemyError, so dao methods do not
+    turn it into "Failed to update database.".
+
+    Queries made explicitly, including those of 'dynamic' relationships, are allowed.
+
+    It is enabled by DAO_STRICT_LOADING and by tests.
+
+Uses; -
+-------
+    This module is used by app factory and tests.
+
+Reference; -
+------------
+    https://docs.sqlalchemy.org/en/20/orm/session_events.html#do-orm-execute-global
+    https://docs.sqlalchemy.org/en/20/orm/queryguide/relationships.html#preventing-unwanted-lazy-loads-using-raiseload
+"""
+
+from sqlalchemy import event
+from apps import db
+
+
+class StrictLoadingError(Exception):
+    """Raised for a query made by attribute access while strict loading is enabled."""
+
+
+def _raise_on_implicit_load(orm_execute_state) -> None:
+    if orm_execute_state.is_relationship_load:
+        raise StrictLoadingError(f"Lazy load of {orm_execute_state.loader_strategy_path[-1]} is not allowed, "
+                                 f"select the columns needed by the dao instead.")
+    elif orm_execute_state.is_column_load:
+        raise StrictLoadingError(f"Refresh of expired or deferred attributes of {orm_execute_state.bind_mapper.class_.__name__} "
+                                 f"is not allowed, select the columns needed by the dao instead.")
+
+def is_strict_loading() -> bool:
+    return event.contains(db.session, 'do_orm_execute', _raise_on_implicit_load)
+
+def enable_strict_loading() -> None:
+    """Raise StrictLoadingError on lazy loads and refreshes of every session."""
+    if not is_strict_loading():
+        event.listen(db.session, 'do_orm_execute', _raise_on_implicit_load)
+
+def disable_strict_loading() -> None:
+    if is_strict_loading():
+        event.remove(db.session, 'do_orm_execute', _raise_on_implicit_load)
@@ -0,0 +1,179 @@
+"""Unit of work
+
+SENECA GLOBAL CONFIDENTIAL & PROPRIETARY
+
+@file unit_of_work.py
+@author Dilip Kumar Sharma
+@copyright Seneca Global
+@date 18th Oct 2026
+
+About; -
+--------
+    One database transaction for a whole request or background job.
+
+Working; -
+----------
+    unit_of_work() is used as decorator of an endpoint or with 'with' statement. It
+    begins a transaction of the session, commits it once at the end, or rolls it back
+    if an exception is raised or a dao failed to update database. A unit of work
+    inside another one joins the outer one.
+
+    Dao methods open their transactions with transaction(). Without a unit of work it
+    begins and commits a transaction of its own as before, or commits the transaction
+    a lazy load has begun. Inside a unit of work it joins the ambient transaction and
+    flushes at the end, so errors like duplicate emails are still reported by the dao.
+    Dao methods catch database errors outside of transaction(), which marks the unit
+    of work rollback only as the error passes through it.
+
+    transaction(savepoint=True) is used where a failure should roll back only the dao's
+    own changes and the rest of the unit of work can go on, e.g. registration rejected
+    by unique index on email. Such a dao calls set_rollback_only() for any other failure.
+
+    after_commit() defers work like filling a cache or sending an email till the unit
+    of work is committed. A failing callback is logged and does not fail the request,
+    whose changes are committed already, nor skip the callbacks after it.
+
+Uses; -
+-------
+    This module is used by dao and api endpoints.
+
+Reference; -
+------------
+    https://martinfowler.com/eaaCatalog/unitOfWork.html
+    https://docs.sqlalchemy.org/en/20/orm/session_transaction.html#using-savepoint
+    https://docs.sqlalchemy.org/en/20/dialects/sqlite.html#serializable-isolation-savepoints-transactional-ddl
+"""
+
+import sqlite3
+from contextlib import contextmanager
+from flask import g, has_app_context
+from sqlalchemy.exc import SQLAlchemyError
+from apps import db
+from utils.insurance_logger import InsuranceLogger
+
+
+class UnitOfWorkState:
+    """State of the unit of work of current request."""
+    __slots__ = ('rollback_only', 'after_commit')
+
+    def __init__(self) -> None:
+        self.rollback_only = False
+        self.after_commit = []
+
+
+def _begin_sqlite_transaction() -> None:
+    """pysqlite begins a transaction only before DML, so a savepoint taken before any write
+    would begin the transaction itself and its release would commit the unit of work."""
+    connection = db.session().connection()
+    driver_connection = connection.connection.driver_connection
+
+    if isinstance(driver_connection, sqlite3.Connection) and not driver_connection.in_transaction:
+        connection.exec_driver_sql('BEGIN')
+
+def current_unit_of_work() -> UnitOfWorkState:
+    """Unit of work of current request, None if there is none."""
+    return g.get('unit_of_work') if has_app_context() else None
+
+@contextmanager
+def unit_of_work():
+    """Run the request or job in one database transaction."""
+    state = current_unit_of_work()
+
+    if state is not None:
+        # Joins the outer unit of work
+        yield state
+        return
+
+    state = g.unit_of_work = UnitOfWorkState()
+    session = db.session()
+
+    # A lazy load before the unit of work may have begun the transaction already
+    if not session.in_transaction():
+        session.begin()
+
+    try:
+        yield state
+    except BaseException:
+        session.rollback()
+        raise
+    else:
+        if state.rollback_only:
+            InsuranceLogger.log_error("Rolling back unit of work as database update failed.")
+            session.rollback()
+        else:
+            try:
+                session.commit()
+            except SQLAlchemyError as err:
+                InsuranceLogger.log_error(f"Failed to commit unit of work. {str(err)}.")
+                session.rollback()
+                raise
+
+            for callback in state.after_commit:
+                try:
+                    callback()
+                except Exception as err:
+                    InsuranceLogger.log_error(f"After commit callback of unit of work failed. {str(err)}.")
+    finally:
+        g.pop('unit_of_work', None)
+
+def after_commit(callback) -> None:
+    """Call back once changes of current unit of work are committed, at once if there is none.
+
+    Used for caches which must never see changes that are rolled back.
+
+    Args:
+        callback: Function without arguments
+    """
+    state = current_unit_of_work()
+
+    if state is None:
+        callback()
+    else:
+        state.after_commit.append(callback)
+
+def set_rollback_only() -> None:
+    """Roll back current unit of work at its end, as a dao failed to update database."""
+    state = current_unit_of_work()
+
+    if state is not None:
+        state.rollback_only = True
+
+@contextmanager
+def transaction(savepoint: bool = False):
+    """Transaction of a dao method.
+
+    Args:
+        savepoint (bool, optional): Inside a unit of work, roll back only changes of this
+                                    block if it fails. Defaults to False.
+    """
+    state = current_unit_of_work()
+
+    if state is None:
+        if not db.session().in_transaction():
+            with db.session.begin():
+                yield
+            return
+
+        # Transaction begun by a lazy load, e.g. of user profile being activated
+        try:
+            yield
+            db.session.commit()
+        except BaseException:
+            db.session.rollback()
+            raise
+        return
+
+    if savepoint:
+        _begin_sqlite_transaction()
+
+        # Savepoint is released or rolled back, the unit of work goes on
+        with db.session.begin_nested():
+            yield
+        return
+
+    try:
+        yield
+        db.session.flush()
+    except SQLAlchemyError:
+        state.rollback_only = True
+        raise
@@ -0,0 +1,219 @@
+"""Compiler for api request models.
+
+SENECA GLOBAL CONFIDENTIAL & PROPRIETARY
+
+@file validator_compiler.py
+@author Dilip Kumar Sharma
+@copyright Seneca Global
+@date 18th Oct 2026
+
+About; -
+--------
+    Turns a flask-restx model into a plain python validation function.
+
+Working; -
+----------
+    flask-restx validates the payload against the json schema of the model on every
+    request by creating a new jsonschema validator. Instead we read the json schema
+    of each model field once, generate python source code checking the same
+    constraints and compile it when the namespace module is imported.
+
+    The generated function returns None for a valid payload, otherwise the error
+    payload which used to be returned by flask-restx ('Input payload validation failed')
+    or by schema validation ('Invalid Schema. Attribute ... is not expected.').
+
+Uses; -
+-------
+    This module is used by namespaces to create validators for their request models.
+    Schema validation decorator runs these validators.
+
+Reference; -
+------------
+    https://json-schema.org/understanding-json-schema/reference/
+"""
+
+import re
+from flask_restx import Model
+
+
+# Python expressions checking json schema types of a value
+TYPE_CHECKS = {
+    'string': "type({value}) is str",
+    'integer': "type({value}) is int",
+    'number': "type({value}) in (int, float)",
+    'boolean': "type({value}) is bool",
+    'object': "type({value}) is dict",
+    'array': "type({value}) is list",
+    'null': "{value} is None",
+}
+
+# Keywords used only for swagger documentation
+DOCUMENTATION_KEYWORDS = ('description', 'example', 'default', 'title', 'readOnly', 'format')
+
+PAYLOAD_VALIDATION_FAILED = "Input payload validation failed"
+
+
+class CompiledValidator:
+    """Validator generated from a flask-restx model.
+
+    Args:
+        name (str): Name of the model
+        source (str): Generated python source code
+        function: Compiled validation function
+    """
+    __slots__ = ('name', 'source', 'validate')
+
+    def __init__(self, name: str, source: str, function) -> None:
+        self.name = name
+        self.source = source
+        self.validate = function
+
+    def __repr__(self) -> str:
+        return f"CompiledValidator({self.name})"
+
+
+def _error_line(field_name: str, message: str) -> str:
+    """Line of generated code reporting the value of given attribute followed by message."""
+    return f"    errors[{field_name!r}] = repr(value) + {message!r}"
+
+def _compile_type_check(field_name: str, types) -> list:
+    if isinstance(types, str):
+        types = [types]
+
+    for json_type in types:
+        if json_type not in TYPE_CHECKS:
+            raise ValueError(f"Type '{json_type}' of attribute '{field_name}' is not supported.")
+
+    condition = " or ".join(TYPE_CHECKS[json_type].format(value='value') for json_type in types)
+    expected = ", ".join(repr(json_type) for json_type in types)
+
+    return [
+        f"if not ({condition}):",
+        _error_line(field_name, " is not of type " + expected),
+    ]
+
+def _compile_constraints(field_name: str, schema: dict, constants: dict) -> list:
+    lines = []
+
+    for keyword, limit in schema.items():
+        if keyword == 'type' or keyword in DOCUMENTATION_KEYWORDS:
+            continue
+        elif keyword == 'minLength':
+            lines += [
+                f"if type(value) is str and len(value) < {limit!r}:",
+                _error_line(field_name, " is too short"),
+            ]
+        elif keyword == 'maxLength':
+            lines += [
+                f"if type(value) is str and len(value) > {limit!r}:",
+                _error_line(field_name, " is too long"),
+            ]
+        elif keyword == 'minimum':
+            lines += [
+                f"if type(value) in (int, float) and value < {limit!r}:",
+                _error_line(field_name, f" is less than the minimum of {limit!r}"),
+            ]
+        elif keyword == 'maximum':
+            lines += [
+                f"if type(value) in (int, float) and value > {limit!r}:",
+                _error_line(field_name, f" is greater than the maximum of {limit!r}"),
+            ]
+        elif keyword == 'enum':
+            lines += [
+                f"if value not in {tuple(limit)!r}:",
+                _error_line(field_name, f" is not one of {limit!r}"),
+            ]
+        elif keyword == 'pattern':
+            constant = f"pattern_{len(constants)}"
+            constants[constant] = re.compile(limit)
+            lines += [
+                f"if type(value) is str and {constant}.search(value) is None:",
+                _error_line(field_name, f" does not match {limit!r}"),
+            ]
+        else:
+            raise ValueError(f"Keyword '{keyword}' of attribute '{field_name}' is not supported.")
+
+    return lines
+
+def generate_source(model: Model, function_name: str, allow_unexpected: bool = False) -> tuple:
+    """Generate python source code of validation function for given model.
+
+    Args:
+        model (Model): flask-restx model used by namespace
+        function_name (str): Name of the generated function
+        allow_unexpected (bool, optional): Whether attributes not present in model are allowed. Defaults to False.
+
+    Returns:
+        tuple: generated source code and constants referred by the code
+    """
+    constants = {}
+
+    lines = [
+        f"def {function_name}(data):",
+        "    if type(data) is not dict:",
+        "        return {'errors': {'': repr(data) + \" is not of type 'object'\"}, 'message': PAYLOAD_VALIDATION_FAILED}",
+        "    errors = {}",
+    ]
+
+    for field_name, field in model.items():
+        if field.required:
+            lines += [
+                f"    if {field_name!r} not in data:",
+                f"        errors[{field_name!r}] = {repr(field_name) + ' is a required property'!r}",
+            ]
+
+    for field_name, field in model.items():
+        schema = field.__schema__
+
+        if 'type' not in schema:
+            raise ValueError(f"Attribute '{field_name}' of model '{model.name}' has no type.")
+
+        field_lines = _compile_type_check(field_name, schema['type'])
+        constraint_lines = _compile_constraints(field_name, schema, constants)
+
+        if constraint_lines:
+            field_lines += ["else:"] + ["    " + line for line in constraint_lines]
+
+        lines += [
+            f"    if {field_name!r} in data:",
+            f"        value = data[{field_name!r}]",
+        ] + ["        " + line for line in field_lines]
+
+    lines += [
+        "    if errors:",
+        "        return {'errors': errors, 'message': PAYLOAD_VALIDATION_FAILED}",
+    ]
+
+    if not allow_unexpected:
+        lines += [
+            "    for attribute in data:",
+            "        if attribute not in EXPECTED_ATTRIBUTES:",
+            "            return {'status': 'VALIDATION-ERROR', 'reason': \"Invalid Schema. Attribute '{}' is not expected.\".format(attribute)}",
+        ]
+
+    lines.append("    return None")
+
+    constants['EXPECTED_ATTRIBUTES'] = frozenset(model.keys())
+    constants['PAYLOAD_VALIDATION_FAILED'] = PAYLOAD_VALIDATION_FAILED
+
+    return "\n".join(lines) + "\n", constants
+
+def compile_model(model: Model, allow_unexpected: bool = False) -> CompiledValidator:
+    """Compile given flask-restx model into a validator.
+
+    Args:
+        model (Model): flask-restx model used by namespace
+        allow_unexpected (bool, optional): Whether attributes not present in model are allowed. Defaults to False.
+
+    Returns:
+        CompiledValidator: Validator whose 'validate' returns None for valid payload,
+                           otherwise the error payload.
+    """
+    function_name = "validate_" + re.sub(r'\W', '_', model.name).lower()
+
+    source, constants = generate_source(model, function_name, allow_unexpected)
+
+    namespace = dict(constants)
+    exec(compile(source, f"<compiled model {model.name}>", "exec"), namespace)
+
+    return CompiledValidator(model.name, source, namespace[function_name])
@@ -0,0 +1,87 @@
+"""Benchmark for access tokens.
+
+SENECA GLOBAL CONFIDENTIAL & PROPRIETARY
+
+@file bench_access_token.py
+@author Dilip Kumar Sharma
+@copyright Seneca Global
+@date 18th Oct 2026
+
+About; -
+--------
+    Compares authentications/s of one core checking a signed access token against
+    looking the customer up in database, as a session id would need.
+
+Working; -
+----------
+    Access token check is measured with an empty revocation list and with 10000
+    revoked tokens, the lookup reads the same columns login reads. Both run in one
+    thread, so numbers are per core; a gunicorn worker per core scales them.
+
+    Runs against a temporary SQLite database by default, which has no network round
+    trip, so the lookup numbers are its best case. A database URI taken from command
+    line is used instead, e.g. a MySQL database. Its tables are dropped and created
+    again, so use a database of its own.
+
+Uses; -
+-------
+    python -m benchmarks.bench_access_token [database uri]
+"""
+
+import os
+import sys
+import timeit
+import tempfile
+from datetime import datetime, timedelta
+from flask import Flask
+from apps import db
+from apps.user.dao import UserDao, UserInsuranceDao
+from apps.user.auth_tokens import issue_tokens, authenticate_access_token, revocation_list
+from apps.user.insurance_plan_catalog import insurance_plan_catalog
+
+
+ITERATIONS = 20000
+REVOKED_TOKENS = 10000
+EMAIL = "customer1@senecaglobal.com"
+
+
+def run(name: str, func, iterations: int = ITERATIONS) -> None:
+    seconds = timeit.timeit(func, number=iterations)
+    print(f"{name:<44} {iterations / seconds:12.0f} authentications/s  {seconds / iterations * 1e6:8.1f} us")
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as directory:
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = sys.argv[1] if len(sys.argv) > 1 else 'sqlite:///' + os.path.join(directory, 'bench.db')
+        db.init_app(app)
+
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            insurance_plan_catalog.get_plan_id("Family")
+
+            UserInsuranceDao.add_user_insurance(
+                customer_name="Customer 1",
+                email_address=EMAIL,
+                password="Password@123",
+                insurance_plan_name="Family",
+                insured_amount=300000
+            )
+
+            access_token = issue_tokens(user_id=1, email_address=EMAIL)[2]['access_token']
+            assert authenticate_access_token(access_token)[0]
+
+            print(f"{db.engine.dialect.name}, {ITERATIONS} authentications")
+
+            run("access token", lambda: authenticate_access_token(access_token))
+
+            expires_at = datetime.utcnow() + timedelta(hours=1)
+
+            with revocation_list._lock:
+                revocation_list._revoked.update((f"revoked{index}", expires_at) for index in range(REVOKED_TOKENS))
+
+            run(f"access token, {REVOKED_TOKENS} revoked", lambda: authenticate_access_token(access_token))
+            run("database lookup", lambda: UserDao.get_credentials(email_address=EMAIL))
+
+            db.session.remove()
@@ -0,0 +1,102 @@
+"""Benchmark for synchronous and asynchronous sign up.
+
+SENECA GLOBAL CONFIDENTIAL & PROPRIETARY
+
+@file bench_async_sign_up.py
+@author Dilip Kumar Sharma
+@copyright Seneca Global
+@date 18th Oct 2026
+
+About; -
+--------
+    Compares request latency and sustained registrations/s of sign up with and without
+    'Prefer: respond-async' header.
+
+Working; -
+----------
+    Sign ups are posted one after another by a single client against a temporary SQLite
+    database. Synchronous requests return when the customer is registered. Asynchronous
+    requests return after schema validation; sustained rate is measured until the last
+    job completes. Password hashing uses the configured method and worker pool, email
+    deliverability check is turned off and emails are kept in memory.
+
+    Number of sign ups is taken from command line, e.g. 100.
+
+Uses; -
+-------
+    python -m benchmarks.bench_async_sign_up [sign ups]
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import statistics
+import email_validator
+from flask import Flask
+from apps import db, configuration, register_blueprints
+from apps.user.email_renderer import email_renderer
+from apps.user.registration_jobs import registration_job_runner
+import utils.email_sink as email_sink
+
+
+DEFAULT_SIGN_UPS = 40
+
+
+def payload(prefix: str, i: int) -> str:
+    return json.dumps({
+                "customer_name": f"Customer {i}",
+                "email_address": f"{prefix}{i}@senecaglobal.com",
+                "insurance_plan_name": "Family",
+                "insured_amount": 300000
+            })
+
+def run(client, prefix: str, count: int, headers: dict) -> tuple:
+    latencies = []
+    start = time.perf_counter()
+
+    for i in range(count):
+        request_start = time.perf_counter()
+        response = client.post('/api/user/register/', data=payload(prefix, i), headers=headers)
+        latencies.append(time.perf_counter() - request_start)
+
+        assert response.status_code in (201, 202), response.data
+
+    while registration_job_runner.stats()['pending']:
+        time.sleep(0.01)
+
+    return latencies, time.perf_counter() - start
+
+def report(name: str, latencies: list, seconds: float) -> None:
+    latencies = sorted(latencies)
+    p50 = statistics.median(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+
+    print(f"{name:<8} p50 {p50 * 1e3:8.2f} ms  p99 {p99 * 1e3:8.2f} ms  {len(latencies) / seconds:8.2f} registrations/s")
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SIGN_UPS
+
+    email_validator.CHECK_DELIVERABILITY = False
+    email_sink._email_sink = email_sink.MemoryEmailSink(capacity=count)
+
+    with tempfile.TemporaryDirectory() as directory:
+        app = Flask(__name__)
+        app.config.from_object(configuration)
+        app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + os.path.join(directory, 'bench.db')
+        db.init_app(app)
+        register_blueprints(app)
+        email_renderer.precompile()
+
+        with app.app_context():
+            db.create_all()
+
+        client = app.test_client()
+        headers = {'Content-Type': 'application/json'}
+
+        report("sync", *run(client, "sync", count, headers))
+        report("async", *run(client, "async", count, {**headers, 'Prefer': 'respond-async'}))
+
+        print(f"jobs {registration_job_runner.stats()}")
@@ -0,0 +1,132 @@
+"""Benchmark for bulk registration.
+
+SENECA GLOBAL CONFIDENTIAL & PROPRIETARY
+
+@file bench_bulk_registration.py
+@author Dilip Kumar Sharma
+@copyright Seneca Global
+@date 18th Oct 2026
+
+About; -
+--------
+    Compares registering customers one sign up at a time against bulk registration
+    of the same rows, and measures rows/s of bulk registration for large inputs.
+
+Working; -
+----------
+    Both paths run against a temporary SQLite database. They are measured twice:
+    first with cheap password hashing ('pbkdf2:sha256:1'), so that database and
+    validation cost is measured, then with the hasher of the configuration, which is
+    what production pays. Hashing dominates the second run, so it uses fewer rows.
+    Email deliverability check and verification emails are turned off, as they depend
+    on network.
+
+    Row counts of the cheap bulk runs are taken from command line, e.g. 10000 1000000,
+    row count of the configured hasher runs from '--configured-rows'.
+
+Uses; -
+-------
+    python -m benchmarks.bench_bulk_registration [--configured-rows N] [rows ...]
+"""
+
+import os
+import argparse
+import json
+import time
+import tempfile
+import email_validator
+from flask import Flask
+from apps import db, configuration
+import utils.security as security
+from apps.user.dao import UserInsuranceDao, RegistrationDao
+from apps.user.bulk_registration import BulkRegistration, read_ndjson_rows, validate_row
+
+
+ROW_BY_ROW_COUNT = 2000
+DEFAULT_BULK_COUNTS = [10000, 1000000]
+DEFAULT_CONFIGURED_COUNT = 500
+CHUNK_SIZE = 500
+HASH_METHOD = 'pbkdf2:sha256:1'
+
+
+def ndjson_lines(prefix: str, count: int):
+    for i in range(count):
+        yield json.dumps({
+                    "customer_name": f"Customer {i}",
+                    "email_address": f"{prefix}{i}@senecaglobal.com",
+                    "insurance_plan_name": ("Family", "Single", "Senior")[i % 3],
+                    "insured_amount": 300000
+                }) + "\n"
+
+def row_by_row(prefix: str, count: int) -> float:
+    """Same steps as one sign up request per row."""
+    start = time.perf_counter()
+
+    for row_number, registration, error in read_ndjson_rows(ndjson_lines(prefix, count)):
+        validate_row(registration)
+        RegistrationDao.get_registration_status(email_address=registration['email_address'])
+        UserInsuranceDao.add_user_insurance(
+            customer_name = registration['customer_name'],
+            email_address = registration['email_address'],
+            password = f"Password@{row_number}",
+            insurance_plan_name = registration['insurance_plan_name'],
+            insured_amount = registration['insured_amount']
+        )
+
+    return time.perf_counter() - start
+
+def bulk(prefix: str, count: int) -> float:
+    bulk_registration = BulkRegistration(chunk_size=CHUNK_SIZE, send_emails=False)
+
+    start = time.perf_counter()
+
+    for result in bulk_registration.register(read_ndjson_rows(ndjson_lines(prefix, count))):
+        assert result['status'] == "Success", result
+
+    return time.perf_counter() - start
+
+def report(name: str, count: int, seconds: float) -> None:
+    print(f"{name:<28} {count:>9} rows {seconds:9.2f} s {count / seconds:10.0f} rows/s")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Rows/s of bulk registration.")
+    parser.add_argument('rows', type=int, nargs='*', default=DEFAULT_BULK_COUNTS, help="Rows of cheap hasher bulk runs")
+    parser.add_argument('--configured-rows', type=int, default=DEFAULT_CONFIGURED_COUNT, help="Rows of configured hasher runs, 0 to skip")
+    arguments = parser.parse_args()
+
+    email_validator.CHECK_DELIVERABILITY = False
+
+    with tempfile.TemporaryDirectory() as directory:
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + os.path.join(directory, 'bench.db')
+        db.init_app(app)
+
+        with app.app_context():
+            db.create_all()
+
+            # Shared by both paths, hashes on the calling thread
+            security._password_hasher = security.PasswordHasher(
+                                            algorithm=HASH_METHOD, cost=None, workers=0, max_pending=1, queue_timeout=1
+                                        )
+
+            print(f"Password hashing {HASH_METHOD}")
+            report("row by row", ROW_BY_ROW_COUNT, row_by_row("single", ROW_BY_ROW_COUNT))
+            report("bulk", ROW_BY_ROW_COUNT, bulk("small", ROW_BY_ROW_COUNT))
+
+            for index, count in enumerate(arguments.rows):
+                report("bulk", count, bulk(f"bulk{index}_", count))
+
+            if arguments.configured_rows:
+                # Created from configuration on first use, as in a gunicorn worker
+                security._password_hasher = None
+                count = arguments.configured_rows
+
+                print(f"Password hashing {configuration.PASSWORD_HASH_ALGORITHM}:{configuration.PASSWORD_HASH_COST}, "
+                      f"{configuration.PASSWORD_HASH_WORKERS} workers")
+                report("row by row", count, row_by_row("configured_single", count))
+                report("bulk", count, bulk("configured_bulk", count))
+
+                security.get_password_hasher().shutdown()
+
+            db.session.remove()
@@ -0,0 +1,70 @@
+"""Benchmark for email template rendering.
+
+SENECA GLOBAL CONFIDENTIAL & PROPRIETARY
+
+@file bench_email_rendering.py
+@author Dilip Kumar Sharma
+@copyright Seneca Global
+@date 18th Oct 2026
+
+About; -
+--------
+    Compares flask 'render_template' against precompiled email templates.
+
+Working; -
+----------
+    Verification and welcome emails are rendered with the same customer fields by both
+    paths. First render of flask includes compiling the template in a fresh process,
+    which is reported separately as cold render.
+
+Uses; -
+-------
+    python -m benchmarks.bench_email_rendering
+"""
+
+import time
+import timeit
+import tempfile
+from flask import render_template
+from apps import create_app
+from apps.user.email_renderer import EmailRenderer, TEMPLATE_DIRS, email_renderer
+
+
+ITERATIONS = 20000
+
+contexts = {
+    'verification.html': dict(
+                            customer_name="Customer 1",
+                            email_address="customer1@senecaglobal.com",
+                            password="Kx8#pLm2Qw9z",
+                            confirm_url="http://localhost:5000/api/user/verify/ImN1c3RvbWVyMUBzZW5lY2FnbG9iYWwuY29tIg.ZTAz"
+                        ),
+    'welcome.html': dict(customer_name="Customer 1"),
+}
+
+
+def run(name: str, func) -> None:
+    seconds = timeit.timeit(func, number=ITERATIONS)
+    print(f"{name:<40} {seconds / ITERATIONS * 1e6:8.2f} us/render")
+
+def cold(name: str, func) -> None:
+    start = time.perf_counter()
+    func()
+    print(f"{name:<40} {(time.perf_counter() - start) * 1e6:8.2f} us")
+
+
+if __name__ == '__main__':
+    app = create_app()
+
+    with app.test_request_context():
+        cold("render_template (cold, verification)", lambda: render_template('verification.html', **contexts['verification.html']))
+
+        with tempfile.TemporaryDirectory() as directory:
+            cold("precompile (empty bytecode cache)", EmailRenderer(TEMPLATE_DIRS, directory).precompile)
+            cold("precompile (warm bytecode cache)", EmailRenderer(TEMPLATE_DIRS, directory).precompile)
+
+        for template_name, context in contexts.items():
+            assert email_renderer.render(template_name, **context) == render_template(template_name, **context)
+
+            run(f"render_template ({template_name})", lambda: render_template(template_name, **context))
+            run(f"email_renderer ({template_name})", lambda: email_renderer.render(template_name, **context))
@@ -0,0 +1,84 @@
+"""Benchmark for sign up payload validation.
+
+SENECA GLOBAL CONFIDENTIAL & PROPRIETARY
+
+@file bench_payload_validation.py
+@author Dilip Kumar Sharma
+@copyright Seneca Global
+@date 18th Oct 2026
+
+About; -
+--------
+    Compares flask-restx runtime validation followed by hand written schema checks
+    against the validator compiled from the same request model.
+
+Working; -
+----------
+    Previous path runs 'Model.validate' (jsonschema validator created per call) and
+    then checks expected attributes and their data types. Compiled path runs the
+    generated function. Valid and invalid payloads are measured separately.
+
+Uses; -
+-------
+    python -m benchmarks.bench_payload_validation
+"""
+
+import timeit
+from flask import Flask
+from werkzeug.exceptions import HTTPException
+from apps.user.apis.namespaces.sign_up_namespace import sign_up_api_request_model, sign_up_payload_validator
+
+
+ITERATIONS = 20000
+
+EXPECTED_ATTRIBUTES = {
+    'customer_name' : str, 'email_address': str, 'insurance_plan_name': str, 'insured_amount': int
+}
+
+valid_payload = {
+    "customer_name": "Customer 1",
+    "email_address": "customer1@senecaglobal.com",
+    "insurance_plan_name": "Family",
+    "insured_amount": 300000
+}
+
+invalid_payload = {
+    "customer_name": "Cu",
+    "email_address": "customer1@senecaglobal.com",
+    "insured_amount": "300000"
+}
+
+app = Flask(__name__)
+
+
+def restx_and_hand_written_checks(data: dict):
+    try:
+        sign_up_api_request_model.validate(data)
+    except HTTPException as err:
+        return err.data
+
+    for attribute in EXPECTED_ATTRIBUTES:
+        if attribute not in data:
+            return "'{}' is a required attribute.".format(attribute)
+
+    for attribute, value in data.items():
+        if attribute not in EXPECTED_ATTRIBUTES:
+            return "Attribute '{}' is not expected.".format(attribute)
+        if type(value) != EXPECTED_ATTRIBUTES[attribute]:
+            return "Data type of attribute '{}' should be {}.".format(attribute, EXPECTED_ATTRIBUTES[attribute])
+
+    return None
+
+def run(name: str, func, data: dict) -> None:
+    seconds = timeit.timeit(lambda: func(data), number=ITERATIONS)
+    print(f"{name:<36} {seconds / ITERATIONS * 1e6:8.2f} us/payload  {ITERATIONS / seconds:10.0f} payloads/s")
+
+
+if __name__ == '__main__':
+    with app.app_context():
+        assert restx_and_hand_written_checks(invalid_payload) == sign_up_payload_validator.validate(invalid_payload)
+
+        run("restx + schema checks (valid)", restx_and_hand_written_checks, valid_payload)
+        run("compiled validator (valid)", sign_up_payload_validator.validate, valid_payload)
+        run("restx + schema checks (invalid)", restx_and_hand_written_checks, invalid_payload)
+        run("compiled validator (invalid)", sign_up_payload_validator.validate, invalid_payload)
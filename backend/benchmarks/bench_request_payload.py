@@ -0,0 +1,85 @@
+"""Benchmark for decoding sign up payload.
+
+SENECA GLOBAL CONFIDENTIAL & PROPRIETARY
+
+@file bench_request_payload.py
+@author Dilip Kumar Sharma
+@copyright Seneca Global
+@date 18th Oct 2026
+
+About; -
+--------
+    Compares decoding sign up payload in every decorator against decoding it once.
+
+Working; -
+----------
+    Sign up request passes through validate_schema (3 decodes), validate_data,
+    check_blacklisting, is_already_registered and the endpoint itself, that is
+    7 decodes of the same body. Both approaches are run inside a flask request
+    context and decode time and allocated memory per request are reported.
+
+Uses; -
+-------
+    python -m benchmarks.bench_request_payload
+"""
+
+import json
+import time
+import tracemalloc
+from flask import Flask, request
+from apps.user.request_payload import get_request_payload, load_request_payload
+
+
+DECODES_PER_REQUEST = 7
+ITERATIONS = 20000
+
+payload = json.dumps({
+    "customer_name": "Customer 1",
+    "email_address": "customer1@senecaglobal.com",
+    "insurance_plan_name": "Family",
+    "insured_amount": 300000
+})
+
+app = Flask(__name__)
+
+
+def decode_body() -> dict:
+    return json.loads(request.data.decode('utf-8'))
+
+
+# Steps run by the decorator chain and endpoint for a single sign up request
+decode_in_every_decorator = [decode_body] * DECODES_PER_REQUEST
+decode_once = [load_request_payload] + [get_request_payload] * (DECODES_PER_REQUEST - 1)
+
+
+def run(name: str, steps: list) -> None:
+    elapsed = 0.0
+
+    for _ in range(ITERATIONS):
+        with app.test_request_context(data=payload, content_type='application/json'):
+            start = time.perf_counter()
+            for step in steps:
+                step()
+            elapsed += time.perf_counter() - start
+
+    allocated = 0
+
+    with app.test_request_context(data=payload, content_type='application/json'):
+        request.get_data(cache=True)
+
+        tracemalloc.start()
+        for step in steps:
+            tracemalloc.reset_peak()
+            current, _ = tracemalloc.get_traced_memory()
+            step()
+            _, peak = tracemalloc.get_traced_memory()
+            allocated += peak - current
+        tracemalloc.stop()
+
+    print(f"{name:<28} {elapsed / ITERATIONS * 1e6:8.2f} us/request  "
+          f"{allocated:6d} bytes allocated/request")
+
+
+if __name__ == '__main__':
+    run("decode in every decorator", decode_in_every_decorator)
+    run("decode once", decode_once)
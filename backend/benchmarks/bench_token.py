@@ -0,0 +1,65 @@
+"""Benchmark for confirmation tokens.
+
+SENECA GLOBAL CONFIDENTIAL & PROPRIETARY
+
+@file bench_token.py
+@author Dilip Kumar Sharma
+@copyright Seneca Global
+@date 18th Oct 2026
+
+About; -
+--------
+    Compares generate/validate per second of a serializer created for every token,
+    as TokenHelper used to do, against the shared token service.
+
+Working; -
+----------
+    Both paths produce the same tokens. The token service is measured with one active
+    key and with three active keys validating tokens of the oldest key, which is the
+    worst case after two rotations. Batch validation is measured with validate_many.
+
+Uses; -
+-------
+    python -m benchmarks.bench_token
+"""
+
+import timeit
+from itsdangerous import URLSafeTimedSerializer
+from utils.token import TokenService
+
+
+ITERATIONS = 50000
+BATCH_SIZE = 1000
+SECRET_KEY = "b2c2a7f0e1d94c3f8a6e5d4c3b2a1908"
+SALT = "9f8e7d6c5b4a3928"
+EMAIL = "customer1@senecaglobal.com"
+
+
+def per_call_serializer_generate() -> str:
+    return URLSafeTimedSerializer(SECRET_KEY).dumps(EMAIL, salt=SALT)
+
+def per_call_serializer_validate(token: str) -> str:
+    return URLSafeTimedSerializer(SECRET_KEY).loads(token, salt=SALT, max_age=3600)
+
+def run(name: str, func, iterations: int = ITERATIONS, items: int = 1) -> None:
+    seconds = timeit.timeit(func, number=iterations)
+    print(f"{name:<44} {iterations * items / seconds:12.0f} tokens/s")
+
+
+if __name__ == '__main__':
+    service = TokenService(secret_keys=[SECRET_KEY], salt=SALT, max_age=3600)
+    token = service.generate(EMAIL)[2]
+
+    assert per_call_serializer_validate(token) == EMAIL
+    assert service.validate(per_call_serializer_generate()) == (True, None, EMAIL)
+
+    # Token of oldest key is checked against every active key
+    rotated = TokenService(secret_keys=["key3", "key2", SECRET_KEY], salt=SALT, max_age=3600)
+    batch = [token] * BATCH_SIZE
+
+    run("generate, serializer per call", per_call_serializer_generate)
+    run("generate, token service", lambda: service.generate(EMAIL))
+    run("validate, serializer per call", lambda: per_call_serializer_validate(token))
+    run("validate, token service", lambda: service.validate(token))
+    run("validate, token service, 3 keys", lambda: rotated.validate(token))
+    run(f"validate_many, token service ({BATCH_SIZE})", lambda: service.validate_many(batch), ITERATIONS // BATCH_SIZE, BATCH_SIZE)
@@ -2,6 +2,10 @@
 
 echo "Migrate the Database"
 
+# Apply revisions shipped with the code, e.g. data migrations
+echo "Run flask upgrade"
+flask db upgrade
+
 # Run flask migrate
 echo "Run flask migrate"
 flask db migrate
@@ -0,0 +1,61 @@
+"""Insurance plan catalog with unique plan names
+
+Revision ID: 3f2b9c1d7e4a
+Revises: 
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f2b9c1d7e4a'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+INDEX_NAME = 'ix_insuranceplan_insurance_plan_name'
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    # Fresh database, tables are created from models by 'flask db migrate'
+    if 'insuranceplan' not in inspector.get_table_names():
+        return
+
+    if 'insurance' in inspector.get_table_names():
+        # Every insurance points to the oldest plan of the same name
+        op.execute(
+            """
+            UPDATE insurance SET insurance_plan_id = (
+                SELECT MIN(duplicate.id)
+                FROM insuranceplan plan
+                JOIN insuranceplan duplicate ON LOWER(duplicate.insurance_plan_name) = LOWER(plan.insurance_plan_name)
+                WHERE plan.id = insurance.insurance_plan_id
+            )
+            """
+        )
+
+    # Derived table, MySQL does not allow a subquery on the table being deleted from
+    op.execute(
+        """
+        DELETE FROM insuranceplan WHERE id NOT IN (
+            SELECT id FROM (
+                SELECT MIN(id) AS id FROM insuranceplan GROUP BY LOWER(insurance_plan_name)
+            ) AS catalog
+        )
+        """
+    )
+
+    if INDEX_NAME not in {index['name'] for index in inspector.get_indexes('insuranceplan')}:
+        op.create_index(INDEX_NAME, 'insuranceplan', ['insurance_plan_name'], unique=True)
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    if 'insuranceplan' in inspector.get_table_names():
+        op.drop_index(INDEX_NAME, table_name='insuranceplan')
@@ -0,0 +1,39 @@
+"""Activation time of user profiles, so deactivated accounts are not purged as never activated
+
+Revision ID: 5e7a9b3c2d1f
+Revises: 8c4d2e6f1a3b
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e7a9b3c2d1f'
+down_revision = '8c4d2e6f1a3b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    # Fresh database, tables are created from models by 'flask db migrate'
+    if 'userprofile' not in inspector.get_table_names():
+        return
+
+    if 'activated_at' not in {column['name'] for column in inspector.get_columns('userprofile')}:
+        op.add_column('userprofile', sa.Column('activated_at', sa.DateTime(), nullable=True))
+
+        # Activated profiles get time of the migration; deactivated ones can not be told apart
+        # from never activated ones and stay eligible for purge
+        userprofile = sa.table('userprofile', sa.column('activated', sa.Boolean()), sa.column('activated_at', sa.DateTime()))
+        op.execute(userprofile.update().where(userprofile.c.activated == sa.true()).values(activated_at=sa.func.now()))
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    if 'userprofile' in inspector.get_table_names():
+        op.drop_column('userprofile', 'activated_at')
@@ -0,0 +1,42 @@
+"""Creation time of users, for purge of unactivated accounts
+
+Revision ID: 8c4d2e6f1a3b
+Revises: 3f2b9c1d7e4a
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c4d2e6f1a3b'
+down_revision = '3f2b9c1d7e4a'
+branch_labels = None
+depends_on = None
+
+
+INDEX_NAME = 'ix_user_created_at'
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    # Fresh database, tables are created from models by 'flask db migrate'
+    if 'user' not in inspector.get_table_names():
+        return
+
+    if 'created_at' not in {column['name'] for column in inspector.get_columns('user')}:
+        # Existing users get time of the migration, so none of them is purged before their link expires
+        op.add_column('user', sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()))
+
+    if INDEX_NAME not in {index['name'] for index in inspector.get_indexes('user')}:
+        op.create_index(INDEX_NAME, 'user', ['created_at'], unique=False)
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    if 'user' in inspector.get_table_names():
+        op.drop_index(INDEX_NAME, table_name='user')
+        op.drop_column('user', 'created_at')
@@ -1,10 +1,51 @@
 import pytest
-from apps import create_app, db as _db
+import email_validator
+from apps import create_app, configuration, db as _db
+from apps.user.dao import UserInsuranceDao
+from apps.user.admission import admission_controller
+from apps.user.login_throttle import login_throttle
+from apps.user.insurance_plan_catalog import insurance_plan_catalog
+from apps.user.activation_cache import activation_cache
+from apps.user.auth_tokens import revocation_list
+from apps.user.strict_loading import enable_strict_loading
 
 
 flask_app = create_app()
+# Queries hidden behind attribute access fail the test which makes them
+enable_strict_loading()
 
 
+@pytest.fixture(autouse=True)
+def admission():
+    # Tests post same emails from same ip, every test starts with full token buckets
+    admission_controller.clear()
+    login_throttle.clear()
+    yield admission_controller
+
+@pytest.fixture
+def admin_headers(monkeypatch):
+    # Admin endpoints are disabled unless ADMIN_API_KEY is configured
+    monkeypatch.setattr(configuration, 'ADMIN_API_KEY', 'admin-key')
+    return {'X-Admin-Key': 'admin-key'}
+
+@pytest.fixture
+def no_deliverability_check(monkeypatch):
+    # Sandboxed test runs have no DNS
+    monkeypatch.setattr(email_validator, 'CHECK_DELIVERABILITY', False)
+
+@pytest.fixture
+def add_user_insurance():
+    """Sign up a customer through the dao, as sign up endpoint does."""
+    def add_user_insurance(email_address, password="Password@123", insurance_plan_name="Family"):
+        return UserInsuranceDao.add_user_insurance(
+                    customer_name="Customer 1",
+                    email_address=email_address,
+                    password=password,
+                    insurance_plan_name=insurance_plan_name,
+                    insured_amount=300000
+                )
+    return add_user_insurance
+
 @pytest.fixture
 def app():
     yield flask_app
@@ -28,9 +69,15 @@ def client(app):
 def db(app, request):
     # Create the database and the database table
     def teardown():
+        _db.session.remove()
         _db.drop_all()
 
     _db.create_all()
+    # Ids of plans and accounts dropped by previous test
+    insurance_plan_catalog.clear()
+    activation_cache.clear()
+    revocation_list.clear()
+    request.addfinalizer(teardown)
 
     yield _db
 
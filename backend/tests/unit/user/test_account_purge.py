@@ -0,0 +1,81 @@
+import json
+import time
+import pytest
+from datetime import datetime, timedelta
+from apps.user.dao import UserDao
+from apps.user.models import User, Insurance
+from apps.user.account_purge import UnactivatedAccountPurge
+
+
+def make_old(db, email_addresses):
+    with db.engine.begin() as connection:
+        connection.execute(
+            db.update(User).where(User.email_address.in_(email_addresses)).values(created_at=datetime.utcnow() - timedelta(days=30))
+        )
+
+def count(db, model):
+    with db.engine.connect() as connection:
+        return connection.execute(db.select(db.func.count()).select_from(model)).scalar()
+
+
+@pytest.fixture
+def accounts(app, db, add_user_insurance):
+    with app.app_context():
+        for index in range(5):
+            add_user_insurance(f"user{index}@gmail.com")
+
+        # user4 is new, user3 is old but activated
+        make_old(db, [f"user{index}@gmail.com" for index in range(4)])
+        UserDao.activate_user(email_address="user3@gmail.com")
+        db.session.remove()
+
+
+@pytest.mark.database
+def test_dry_run_deletes_nothing(app, db, accounts):
+    purge = UnactivatedAccountPurge(batch_size=2, pause=0, grace=0)
+
+    with app.app_context():
+        assert purge.run(dry_run=True) == (True, None, 3)
+
+    assert count(db, User) == 5
+    assert purge.stats()['last_run']['batches'] == 2
+
+@pytest.mark.database
+def test_purge_deletes_old_unactivated_accounts_in_batches(app, db, accounts):
+    purge = UnactivatedAccountPurge(batch_size=2, pause=0, grace=0)
+
+    with app.app_context():
+        assert purge.run() == (True, None, 3)
+
+    with db.engine.connect() as connection:
+        assert sorted(connection.execute(db.select(User.email_address)).scalars()) == ["user3@gmail.com", "user4@gmail.com"]
+
+    assert count(db, Insurance) == 2
+    assert purge.stats()['runs'] == 1
+
+@pytest.mark.database
+def test_purge_endpoint(client, db, accounts, admin_headers):
+    response = client.post('/api/user/admin/accounts/purge?dry_run=true', headers=admin_headers)
+
+    assert response.status_code == 202
+
+    for _ in range(50):
+        stats = json.loads(client.get(response.headers['Location'], headers=admin_headers).data)
+
+        if not stats['running']:
+            break
+
+        time.sleep(0.05)
+
+    assert stats['last_run']['dry_run'] == True
+    assert stats['last_run']['accounts'] == 3
+
+@pytest.mark.database
+def test_deactivated_account_survives_purge(app, db, accounts):
+    with app.app_context():
+        UserDao.set_activations(email_addresses=["user3@gmail.com"], activated=False)
+
+        assert UnactivatedAccountPurge(batch_size=2, pause=0, grace=0).run() == (True, None, 3)
+
+    with db.engine.connect() as connection:
+        assert sorted(connection.execute(db.select(User.email_address)).scalars()) == ["user3@gmail.com", "user4@gmail.com"]
@@ -0,0 +1,72 @@
+import json
+import pytest
+from apps.user.dao import UserDao, UserInsuranceDao
+from apps.user.activation_cache import ActivationCache, MemoryActivationStore, activation_cache
+from utils.token import TokenHelper
+
+
+def verify(client, email_address):
+    is_success, message, token = TokenHelper().generate_confirmation_token(email_address)
+    response = client.get(f'/api/user/verify/{token}')
+
+    return response.status_code, json.loads(response.data)['status']
+
+
+def test_memory_store_expires_and_evicts():
+    store = MemoryActivationStore(capacity=2)
+
+    store.add("a", ttl=60)
+    store.add("b", ttl=-1)
+
+    assert store.contains("a")
+    assert not store.contains("b")
+
+    store.add("c", ttl=60)
+    store.add("d", ttl=60)
+
+    # Least recently used is evicted first
+    assert not store.contains("a")
+    assert store.contains("c") and store.contains("d")
+
+def test_hit_ratio():
+    cache = ActivationCache(enabled=True, capacity=10, ttl=60)
+
+    assert not cache.is_activated("User1@gmail.com")
+
+    cache.add("user1@gmail.com")
+
+    assert cache.is_activated("User1@gmail.com")
+    assert cache.is_activated("user1@gmail.com")
+
+    stats = cache.stats()
+
+    assert (stats['hits'], stats['misses'], stats['size']) == (2, 1, 1)
+    assert stats['hit_ratio'] == round(2 / 3, 4)
+
+def test_disabled_cache_never_hits():
+    cache = ActivationCache(enabled=False, capacity=10, ttl=60)
+    cache.add("user1@gmail.com")
+
+    assert not cache.is_activated("user1@gmail.com")
+
+@pytest.mark.database
+def test_repeated_click_does_not_use_dao(client, db, monkeypatch):
+    UserInsuranceDao.add_user_insurance(
+        customer_name="Customer 1",
+        email_address="user1@gmail.com",
+        password="Password@123",
+        insurance_plan_name="Family",
+        insured_amount=300000
+    )
+
+    before = activation_cache.stats()
+
+    assert verify(client, "user1@gmail.com") == (200, "Success")
+
+    def activate_user(email_address):
+        raise AssertionError("Repeated click should be answered by activation cache.")
+
+    monkeypatch.setattr(UserDao, 'activate_user', activate_user)
+
+    assert verify(client, "user1@gmail.com") == (200, "ALREADY-ACTIVATED")
+    assert activation_cache.stats()['hits'] - before['hits'] == 1
@@ -0,0 +1,144 @@
+import json
+import pytest
+import apps.user.admission as admission
+from apps.user.admission import AdmissionController
+
+
+def create_controller(limits: dict) -> AdmissionController:
+    controller = AdmissionController(
+                    enabled=True,
+                    limits=limits,
+                    max_tracked_keys=100,
+                    trusted_proxies=1,
+                    retry_after=2,
+                    hash_queue_saturation=0.5,
+                    db_pool_saturation=0.9
+                )
+    controller._url_prefix = '/api/user'
+    return controller
+
+def admit(app, controller, path, ip="10.0.0.1", data=None):
+    with app.test_request_context(
+                path,
+                method='POST',
+                data=json.dumps(data) if data is not None else None,
+                headers={'Content-Type': 'application/json', 'X-Forwarded-For': ip}
+            ):
+        try:
+            return controller.admit()
+        finally:
+            controller.release()
+
+
+def test_longest_namespace_is_matched(app):
+    controller = create_controller({'register': {'ip_rate': 0.001, 'ip_burst': 1}, 'register/bulk': {}})
+
+    assert admit(app, controller, '/api/user/register/') is None
+    assert admit(app, controller, '/api/user/register/') is not None
+
+    # Bulk and unknown namespaces are not limited by 'register'
+    assert admit(app, controller, '/api/user/register/bulk/') is None
+    assert admit(app, controller, '/api/user/registered/') is None
+
+    stats = controller.stats()['namespaces']
+
+    assert stats['register']['admitted'] == 1
+    assert stats['register']['rejected_ip'] == 1
+    assert stats['register/bulk']['admitted'] == 1
+
+def test_ip_and_email_buckets(app):
+    controller = create_controller({'register': {'ip_rate': 0.001, 'ip_burst': 2, 'email_rate': 0.001, 'email_burst': 1}})
+
+    assert admit(app, controller, '/api/user/register/', ip="10.0.0.1", data={'email_address': "a@gmail.com"}) is None
+
+    # Same email from another ip, case of email does not matter
+    response, http_status, headers = admit(app, controller, '/api/user/register/', ip="10.0.0.2", data={'email_address': "A@Gmail.com"})
+
+    assert http_status == 429
+    assert response['status'] == "TOO-MANY-REQUESTS"
+    assert int(headers['Retry-After']) >= 1
+
+    assert admit(app, controller, '/api/user/register/', ip="10.0.0.1", data={'email_address': "b@gmail.com"}) is None
+
+    _, http_status, _ = admit(app, controller, '/api/user/register/', ip="10.0.0.1", data={'email_address': "c@gmail.com"})
+
+    assert http_status == 429
+    assert controller.stats()['namespaces']['register']['rejected_email'] == 1
+    assert controller.stats()['namespaces']['register']['rejected_ip'] == 1
+
+def test_forged_forwarded_for_is_ignored(app):
+    controller = create_controller({'register': {'ip_rate': 0.001, 'ip_burst': 1}})
+
+    assert admit(app, controller, '/api/user/register/', ip="1.1.1.1, 10.0.0.1") is None
+
+    # Client prepends a new address to every request, proxy appends the real one
+    assert admit(app, controller, '/api/user/register/', ip="2.2.2.2, 10.0.0.1") is not None
+
+    with app.test_request_context('/api/user/register/', headers={'X-Forwarded-For': "1.1.1.1, 10.0.0.1, 192.168.0.5"},
+                                  environ_base={'REMOTE_ADDR': "192.168.0.9"}):
+        assert controller.client_ip() == "192.168.0.5"
+        controller._trusted_proxies = 2
+        assert controller.client_ip() == "10.0.0.1"
+        controller._trusted_proxies = 4
+        assert controller.client_ip() == "192.168.0.9"
+
+def test_in_flight_cap(app):
+    controller = create_controller({'register': {'max_in_flight': 1}})
+
+    with app.test_request_context('/api/user/register/', method='POST'):
+        assert controller.admit() is None
+
+        # Another request while the first is in flight
+        _, http_status, headers = admit(app, controller, '/api/user/register/')
+
+        assert http_status == 503
+        assert headers['Retry-After'] == '2'
+
+        controller.release()
+
+    assert admit(app, controller, '/api/user/register/') is None
+
+    stats = controller.stats()['namespaces']['register']
+
+    assert stats['rejected_in_flight'] == 1
+    assert stats['in_flight'] == 0
+    assert stats['peak_in_flight'] == 1
+
+def test_saturated_hash_queue(app, monkeypatch):
+    class PasswordHasher:
+        max_pending = 10
+        queue_depth = 5
+
+    monkeypatch.setattr(admission, 'get_password_hasher', lambda: PasswordHasher)
+    controller = create_controller({'register': {'shed_when_saturated': True, 'ip_rate': 0.001, 'ip_burst': 1}})
+
+    response, http_status, _ = admit(app, controller, '/api/user/register/')
+
+    assert http_status == 503
+    assert "password hashing queue" in response['reason']
+
+    # Request rejected for load does not take tokens of the client
+    PasswordHasher.queue_depth = 4
+
+    assert admit(app, controller, '/api/user/register/') is None
+
+def test_invalid_limits():
+    with pytest.raises(ValueError):
+        create_controller({'register': {'rate': 1}})
+
+@pytest.mark.schema_validation
+def test_email_limit_on_sign_up(client):
+    data = json.dumps({"email_address": "customer1@gmail.com"})
+    responses = [client.post('/api/user/register/', data=data, headers={'Content-Type': 'application/json'}) for _ in range(11)]
+
+    # Rejected before schema validation once email bucket is empty
+    assert [response.status_code for response in responses] == [400] * 10 + [429]
+    assert 'Retry-After' in responses[-1].headers
+
+def test_metrics(client):
+    response = client.get('/api/user/metrics/')
+    metrics = json.loads(response.data)
+
+    assert response.status_code == 200
+    assert set(metrics) == {'admission', 'database_pool', 'password_hasher', 'sign_up_jobs', 'group_commit', 'idempotency', 'blacklist_filter', 'insurance_plans', 'activation_cache', 'single_flight', 'login', 'login_throttle', 'auth_tokens', 'account_purge', 'email_sink', 'email_deliverability'}
+    assert 'register' in metrics['admission']['namespaces']
@@ -0,0 +1,127 @@
+import json
+import pytest
+from datetime import datetime, timedelta
+from apps.user.models import RegistrationJob
+from apps.user.dao import RegistrationJobDao
+from apps.user.registration_jobs import registration_job_runner, JobStatus
+
+
+payload = {
+        "customer_name":"Customer 1",
+        "email_address": "customer1@gmail.com",
+        "insurance_plan_name": "Family",
+        "insured_amount": 300000
+    }
+
+def sign_up(client, data, prefer=None):
+    headers = {'Content-Type': 'application/json'}
+
+    if prefer is not None:
+        headers['Prefer'] = prefer
+
+    return client.post('/api/user/register/', data=json.dumps(data), headers=headers)
+
+def wait_for_job(client, job_id):
+    response = client.get(f'/api/user/register/status/{job_id}/events')
+
+    assert response.mimetype == 'text/event-stream'
+
+    events = [json.loads(line[len('data: '):]) for line in response.data.decode('utf8').splitlines() if line.startswith('data: ')]
+    response.close()
+
+    assert events[-1]['status'] == JobStatus.COMPLETED
+    return events[-1]
+
+@pytest.mark.database
+def test_async_sign_up(client, db, no_deliverability_check):
+    response = sign_up(client, payload, prefer='respond-async')
+
+    assert response.status_code == 202
+    body = json.loads(response.data.decode('utf8'))
+    assert response.headers['Location'] == body['status_url']
+
+    job = wait_for_job(client, body['job_id'])
+
+    assert job['http_status'] == 201
+    assert job['result']['Email Address'] == payload['email_address']
+
+    response = client.get(body['status_url'])
+
+    assert response.status_code == 200
+    assert json.loads(response.data.decode('utf8')) == job
+
+    # Job runs same validations as synchronous sign up
+    response = sign_up(client, payload, prefer='respond-async')
+    job = wait_for_job(client, json.loads(response.data.decode('utf8'))['job_id'])
+
+    assert job['http_status'] == 400
+    assert job['result'] == json.loads(sign_up(client, payload).data.decode('utf8'))
+
+@pytest.mark.database
+def test_async_sign_up_validates_schema_inline(client, db):
+    response = sign_up(client, {**payload, "insured_amount": "x"}, prefer='respond-async')
+
+    assert response.status_code == 400
+
+@pytest.mark.database
+def test_unknown_job(client, db):
+    response = client.get('/api/user/register/status/unknown')
+
+    assert response.status_code == 404
+
+@pytest.mark.database
+def test_async_sign_up_is_rejected_when_busy(client, db, monkeypatch):
+    monkeypatch.setattr(registration_job_runner, '_max_pending', 0)
+
+    response = sign_up(client, payload, prefer='respond-async')
+
+    assert response.status_code == 503
+
+@pytest.mark.database
+def test_stale_jobs_are_completed_as_interrupted(client, db):
+    for job_id in ("lost-pending", "lost-running", "fresh"):
+        RegistrationJobDao.add_job(job_id=job_id, email_address="customer1@gmail.com", status=JobStatus.PENDING)
+
+    RegistrationJobDao.update_job(job_id="lost-running", status=JobStatus.RUNNING)
+
+    # Accepted by a worker which was killed long ago
+    with db.engine.begin() as connection:
+        connection.execute(db.update(RegistrationJob).where(RegistrationJob.id != "fresh").values(
+                                updated_at=datetime.utcnow() - timedelta(hours=1)
+                            ))
+
+    response = client.get('/api/user/register/status/lost-pending')
+
+    assert response.json['status'] == JobStatus.COMPLETED
+    assert response.json['http_status'] == 500
+
+    # As done by every worker on start up
+    assert registration_job_runner.complete_stale_jobs() == 1
+    assert RegistrationJobDao.get_job(job_id="lost-running")[2]['http_status'] == 500
+    assert RegistrationJobDao.get_job(job_id="fresh")[2]['status'] == JobStatus.PENDING
+
+    # A job completed as stale is never started afterwards
+    assert RegistrationJobDao.update_job(job_id="lost-pending", status=JobStatus.RUNNING,
+                                         expected_status=JobStatus.PENDING) == (True, None, None)
+
+@pytest.mark.database
+def test_event_streams_are_capped(client, db, monkeypatch):
+    RegistrationJobDao.add_job(job_id="job-1", email_address="customer1@gmail.com", status=JobStatus.PENDING)
+    RegistrationJobDao.update_job(job_id="job-1", status=JobStatus.COMPLETED, http_status=201, response={})
+
+    response = client.get('/api/user/register/status/job-1/events')
+
+    assert response.status_code == 200
+    assert registration_job_runner.stats()['event_streams'] == 1
+
+    # Closed by the server once the stream ends or the client goes away
+    response.close()
+
+    assert registration_job_runner.stats()['event_streams'] == 0
+
+    monkeypatch.setattr(registration_job_runner, '_max_event_streams', 0)
+
+    response = client.get('/api/user/register/status/job-1/events')
+
+    assert response.status_code == 503
+    assert response.headers['Location'].endswith('/register/status/job-1')
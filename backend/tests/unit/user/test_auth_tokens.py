@@ -0,0 +1,127 @@
+import json
+import pytest
+from apps.user.dao import UserDao, UserInsuranceDao
+from apps.user.auth_tokens import issue_tokens, authenticate_access_token, refresh_tokens, revocation_list, RevocationList
+from apps.user.activation_cache import activation_cache
+from apps.user.bulk_activation import BulkActivation
+from utils.token import get_token_service
+
+
+def post(client, path, payload, access_token=None):
+    headers = {'Content-Type': 'application/json'}
+
+    if access_token is not None:
+        headers['Authorization'] = f"Bearer {access_token}"
+
+    response = client.post(f'/api/user/login/{path}', data=json.dumps(payload), headers=headers)
+
+    return response.status_code, json.loads(response.data)
+
+def me(client, access_token):
+    response = client.get('/api/user/login/me', headers={'Authorization': f"Bearer {access_token}"})
+
+    return response.status_code, json.loads(response.data)
+
+def add_activated_user(email_address):
+    _, _, user_insurance = UserInsuranceDao.add_user_insurance(
+                                customer_name="Customer 1",
+                                email_address=email_address,
+                                password="Password@123",
+                                insurance_plan_name="Family",
+                                insured_amount=300000
+                            )
+    UserDao.activate_user(email_address=email_address)
+
+    return user_insurance.user_id
+
+@pytest.fixture
+def tokens(db, client):
+    add_activated_user("user1@gmail.com")
+
+    status_code, body = post(client, '', {"email_address": "user1@gmail.com", "password": "Password@123"})
+
+    assert status_code == 200
+    assert body['token_type'] == "Bearer"
+
+    return body
+
+
+@pytest.mark.database
+def test_access_token_identifies_customer(client, tokens):
+    status_code, body = me(client, tokens['access_token'])
+
+    assert status_code == 200
+    assert body['email_address'] == "user1@gmail.com"
+
+@pytest.mark.database
+def test_refresh_token_is_not_an_access_token(client, tokens):
+    assert me(client, tokens['refresh_token'])[0] == 401
+    assert me(client, get_token_service().sign("user1@gmail.com"))[0] == 401
+    assert client.get('/api/user/login/me').status_code == 401
+
+@pytest.mark.database
+def test_refresh_token_is_used_once(client, tokens):
+    status_code, body = post(client, 'refresh', {"refresh_token": tokens['refresh_token']})
+
+    assert status_code == 200
+    assert me(client, body['access_token'])[0] == 200
+
+    status_code, body = post(client, 'refresh', {"refresh_token": tokens['refresh_token']})
+
+    assert (status_code, body['status']) == (401, "INVALID-TOKEN")
+
+@pytest.mark.database
+def test_logout_revokes_tokens(client, tokens):
+    status_code, _ = post(client, 'logout', {"refresh_token": tokens['refresh_token']}, tokens['access_token'])
+
+    assert status_code == 200
+    assert me(client, tokens['access_token'])[0] == 401
+    assert post(client, 'refresh', {"refresh_token": tokens['refresh_token']})[0] == 401
+
+@pytest.mark.database
+def test_revocations_are_loaded_by_other_workers(app, db):
+    with app.app_context():
+        user_id = add_activated_user("user1@gmail.com")
+        _, _, tokens = issue_tokens(user_id=user_id, email_address="user1@gmail.com")
+        assert refresh_tokens(tokens['refresh_token'])[0]
+
+        # A new worker knows only what is in database
+        revocation_list.clear()
+
+        assert not refresh_tokens(tokens['refresh_token'])[0]
+        assert authenticate_access_token(tokens['access_token'])[0]
+        assert revocation_list.stats()['revoked'] == 1
+
+@pytest.mark.database
+def test_deactivation_revokes_tokens(client, tokens):
+    rows = [(1, "user1@gmail.com", None)]
+    assert [result['status'] for result in BulkActivation(activated=False, chunk_size=10).change(rows)] == ["DEACTIVATED"]
+
+    assert me(client, tokens['access_token'])[0] == 401
+    assert post(client, 'refresh', {"refresh_token": tokens['refresh_token']})[0] == 401
+
+@pytest.mark.database
+def test_deactivated_user_can_not_refresh_on_another_worker(app, db):
+    with app.app_context():
+        user_id = add_activated_user("user1@gmail.com")
+        _, _, tokens = issue_tokens(user_id=user_id, email_address="user1@gmail.com")
+
+        # Deactivated by a worker whose revocations this worker has not synced yet
+        UserDao.set_activations(email_addresses=["user1@gmail.com"], activated=False)
+
+        assert refresh_tokens(tokens['refresh_token']) == (False, "Refresh token is invalid or has expired.", None)
+
+@pytest.mark.database
+def test_sync_forgets_activations_of_users_deactivated_by_other_workers(app, db):
+    with app.app_context():
+        user_id = add_activated_user("user1@gmail.com")
+        revocation_list.ensure_loaded()
+        activation_cache.add("user1@gmail.com")
+
+        # Another worker deactivates the user
+        other_worker = RevocationList(sync_interval=0)
+        assert other_worker.revoke_users([user_id]) == (True, None, 1)
+
+        assert revocation_list.sync()
+        assert not activation_cache.is_activated("user1@gmail.com")
+        assert revocation_list.stats()['revoked_users'] == 1
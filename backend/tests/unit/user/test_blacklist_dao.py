@@ -1,6 +1,7 @@
 import pytest
 import csv
 import os
+import re
 from sqlalchemy import text
 from apps.user.dao import BlacklistDao
 
@@ -23,3 +24,17 @@ def read_test_data_from_csv(file_name):
 #     assert is_success == True
 #     assert blacklist.id > 0
 #     assert blacklist.email_address == email_addresses
+
+@pytest.mark.database
+def test_blacklist_endpoint_with_csrf_token(client, db):
+    payload = {"email_address": "user9@gmail.com", "reason": "Duplicate account of customer"}
+
+    # Without csrf token the form is rendered with one
+    response = client.post('/api/user/blacklist/', json=payload)
+    csrf_token = re.search(r'name="csrf_token" type="hidden" value="([^"]+)"', response.json).group(1)
+
+    response = client.post('/api/user/blacklist/', json={**payload, "csrf_token": csrf_token})
+
+    assert response.status_code == 200
+    assert response.json['reason'] == "Email 'user9@gmail.com' is blacklisted successfully."
+    assert BlacklistDao.get_blacklist_by_email(email_address="user9@gmail.com")[2] is not None
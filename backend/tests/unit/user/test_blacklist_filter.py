@@ -0,0 +1,74 @@
+import time
+import threading
+import pytest
+from apps.user.blacklist_filter import BlacklistFilter
+from apps.user.dao import BlacklistDao
+
+
+@pytest.fixture
+def blacklist_filter(monkeypatch):
+    blacklist_filter = BlacklistFilter(enabled=True, false_positive_rate=0.01, min_capacity=100, rebuild_interval=300)
+    monkeypatch.setattr('apps.user.dao.blacklist_filter', blacklist_filter)
+    return blacklist_filter
+
+@pytest.mark.database
+def test_filter_is_built_from_blacklist_table(db, blacklist_filter):
+    BlacklistDao.add_blacklist(email_address="user1@gmail.com")
+
+    assert blacklist_filter.might_be_blacklisted("user1@gmail.com") == True
+    assert blacklist_filter.might_be_blacklisted("USER1@gmail.com") == True
+    assert blacklist_filter.might_be_blacklisted("user2@gmail.com") == False
+
+    stats = blacklist_filter.stats()
+    assert stats['items'] == 1
+    assert stats['lookups'] == 3
+    assert stats['database_lookups_skipped'] == 1
+    assert stats['memory_bytes'] > 0
+
+@pytest.mark.database
+def test_filter_is_updated_when_email_is_blacklisted(db, blacklist_filter):
+    assert blacklist_filter.might_be_blacklisted("user3@gmail.com") == False
+
+    BlacklistDao.add_blacklist(email_address="user3@gmail.com")
+
+    assert blacklist_filter.might_be_blacklisted("user3@gmail.com") == True
+    assert blacklist_filter.stats()['rebuilds'] == 1
+
+def test_disabled_filter_sends_every_email_to_database():
+    blacklist_filter = BlacklistFilter(enabled=False, false_positive_rate=0.01, min_capacity=100, rebuild_interval=300)
+
+    assert blacklist_filter.might_be_blacklisted("user4@gmail.com") == True
+    assert blacklist_filter.stats()['built'] == False
+
+@pytest.mark.database
+def test_stale_filter_is_rebuilt_once(app, db, blacklist_filter, monkeypatch):
+    BlacklistDao.add_blacklist(email_address="user1@gmail.com")
+    blacklist_filter.rebuild()
+
+    get_blacklisted_emails = BlacklistDao.get_blacklisted_emails
+    reads = []
+
+    def slow_read():
+        reads.append(1)
+        time.sleep(0.2)
+        return get_blacklisted_emails()
+
+    monkeypatch.setattr(BlacklistDao, 'get_blacklisted_emails', slow_read)
+    blacklist_filter._built_at = None
+
+    def lookup(app_context):
+        with app_context:
+            results.append(blacklist_filter.might_be_blacklisted("user1@gmail.com"))
+
+    results = []
+    threads = [threading.Thread(target=lookup, args=(app.app_context(),)) for _ in range(8)]
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Others were served by the old filter while one thread read the table
+    assert reads == [1]
+    assert results == [True] * 8
+    assert blacklist_filter.stats()['rebuilds'] == 2
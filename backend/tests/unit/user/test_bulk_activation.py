@@ -0,0 +1,127 @@
+import json
+import pytest
+from apps import configuration
+from apps.user.dao import UserDao, ActivationStatus
+from apps.user.bulk_activation import BulkActivation, read_email_rows, read_json_rows
+from apps.user.activation_cache import activation_cache
+import utils.email_sink as email_sink
+
+
+@pytest.fixture
+def memory_sink(monkeypatch):
+    sink = email_sink.MemoryEmailSink(capacity=100)
+    monkeypatch.setattr(email_sink, '_email_sink', sink)
+    return sink
+
+def post(client, action, data, content_type, headers):
+    response = client.post(f'/api/user/admin/accounts/{action}', data=data, headers={'Content-Type': content_type, **headers})
+    lines = [json.loads(line) for line in response.data.decode().splitlines()]
+
+    return response.status_code, lines
+
+
+@pytest.mark.data_validation
+def test_read_email_rows():
+    assert list(read_email_rows("application/x-ndjson", ['"user1@gmail.com"\n', '{"email_address": "user2@gmail.com"}\n', '{bad\n'])[2]) == [
+                (1, "user1@gmail.com", None),
+                (2, "user2@gmail.com", None),
+                (3, None, "Invalid Json Format"),
+            ]
+    assert list(read_email_rows("text/csv", ["customer_name,email_address\n", "Customer 1,user1@gmail.com\n"])[2]) == [(1, "user1@gmail.com", None)]
+    assert list(read_email_rows("text/plain", ["user1@gmail.com\n", "\n"])[2]) == [(1, "user1@gmail.com", None)]
+    assert read_email_rows("text/csv", ["email\n"])[0] == False
+    assert read_json_rows({"email_address": "user1@gmail.com"})[0] == False
+
+@pytest.mark.database
+def test_set_activations(db, add_user_insurance):
+    add_user_insurance("user1@gmail.com")
+    add_user_insurance("user2@gmail.com")
+    UserDao.activate_user(email_address="user2@gmail.com")
+
+    is_success, message, activations = UserDao.set_activations(
+                                            email_addresses=["user1@gmail.com", "user2@gmail.com", "user3@gmail.com"],
+                                            activated=True
+                                        )
+
+    assert is_success
+    assert {email_address: activation.status for email_address, activation in activations.items()} == {
+                "user1@gmail.com": ActivationStatus.ACTIVATED,
+                "user2@gmail.com": ActivationStatus.ALREADY_ACTIVATED,
+                "user3@gmail.com": ActivationStatus.NOT_FOUND,
+            }
+
+    activations = UserDao.set_activations(email_addresses=["user1@gmail.com"], activated=False)[2]
+
+    assert activations["user1@gmail.com"].status == ActivationStatus.DEACTIVATED
+    assert UserDao.get_credentials(email_address="user1@gmail.com")[2].activated == False
+
+@pytest.mark.database
+def test_bulk_activation_outcomes(client, db, add_user_insurance, memory_sink, admin_headers):
+    add_user_insurance("user1@gmail.com")
+    add_user_insurance("user2@gmail.com")
+    UserDao.activate_user(email_address="user2@gmail.com")
+
+    payload = {"email_addresses": ["user1@gmail.com", "user2@gmail.com", "user3@gmail.com", "USER1@gmail.com", 7]}
+    status_code, lines = post(client, 'activate', json.dumps(payload), 'application/json', admin_headers)
+
+    assert status_code == 200
+    assert [line.get('status') for line in lines[:-1]] == [
+                "ACTIVATED", "ALREADY-ACTIVATED", "NOT-FOUND", "ALREADY-ACTIVATED", "VALIDATION-ERROR"
+            ]
+    assert lines[-1]['summary']['activated'] == 1
+    assert lines[-1]['summary']['failed'] == 1
+
+    # Welcome email only to the customer activated now
+    assert [message.recipient for message in memory_sink.messages()] == ["user1@gmail.com"]
+    assert activation_cache.is_activated("user1@gmail.com")
+
+@pytest.mark.database
+def test_bulk_deactivation_in_chunks(app, db, add_user_insurance):
+    with app.app_context():
+        for index in range(5):
+            add_user_insurance(f"user{index}@gmail.com")
+            UserDao.activate_user(email_address=f"user{index}@gmail.com")
+            activation_cache.add(f"user{index}@gmail.com")
+
+        rows = [(index + 1, f"user{index}@gmail.com", None) for index in range(5)]
+        results = list(BulkActivation(activated=False, chunk_size=2, send_emails=False).change(rows))
+
+        assert [result['status'] for result in results] == ["DEACTIVATED"] * 5
+        assert not activation_cache.is_activated("user0@gmail.com")
+        assert UserDao.get_credentials(email_address="user4@gmail.com")[2].activated == False
+
+def test_unsupported_content_type(client, admin_headers):
+    response = client.post('/api/user/admin/accounts/deactivate', data="<emails/>", headers={'Content-Type': 'application/xml', **admin_headers})
+
+    assert response.status_code == 400
+    assert json.loads(response.data)['status'] == "VALIDATION-ERROR"
+
+def test_admin_api_is_disabled_without_admin_key(client, monkeypatch):
+    monkeypatch.setattr(configuration, 'ADMIN_API_KEY', None)
+
+    for action in ('activate', 'deactivate', 'purge'):
+        response = client.post(f'/api/user/admin/accounts/{action}', data="user1@gmail.com", headers={'Content-Type': 'text/plain'})
+
+        assert response.status_code == 403
+
+def test_wrong_admin_key_is_rejected(client, admin_headers):
+    response = client.post('/api/user/admin/accounts/activate', data="user1@gmail.com",
+                           headers={'Content-Type': 'text/plain', 'X-Admin-Key': 'wrong'})
+
+    assert response.status_code == 403
+
+def test_invalid_rows_are_streamed_in_chunks(app):
+    read = []
+
+    def rows():
+        for row_number in range(1, 1000001):
+            read.append(row_number)
+            yield row_number, "", None
+
+    with app.app_context():
+        results = BulkActivation(activated=False, chunk_size=3, send_emails=False).change(rows())
+
+        assert next(results)['status'] == "VALIDATION-ERROR"
+
+    # Only the first chunk is read, not the whole stream of invalid rows
+    assert len(read) == 3
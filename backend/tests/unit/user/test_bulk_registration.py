@@ -0,0 +1,130 @@
+import json
+import pytest
+from apps.user.dao import UserInsuranceDao, RegistrationDao, RegistrationStatus, BlacklistDao, ALREADY_REGISTERED
+from apps.user.bulk_registration import BulkRegistration, read_ndjson_rows, read_csv_rows, read_rows
+from werkzeug.security import generate_password_hash
+
+
+def registration(email_address, insurance_plan_name="Family"):
+    return {
+                "customer_name": "Customer 1",
+                "email_address": email_address,
+                "insurance_plan_name": insurance_plan_name,
+                "insured_amount": 300000
+            }
+
+def cheap_hasher(passwords):
+    return True, None, [generate_password_hash(password, method='pbkdf2:sha256:1') for password in passwords]
+
+@pytest.mark.data_validation
+def test_read_ndjson_rows():
+    lines = [json.dumps(registration("user1@gmail.com")) + "\n", "\n", "{not json\n"]
+
+    assert list(read_ndjson_rows(lines)) == [
+                (1, registration("user1@gmail.com"), None),
+                (3, None, "Invalid Json Format"),
+            ]
+
+@pytest.mark.data_validation
+def test_read_csv_rows():
+    lines = [
+        "customer_name,email_address,insurance_plan_name,insured_amount\n",
+        "Customer 1,user1@gmail.com,Family,300000\n",
+        "Customer 2,user2@gmail.com\n",
+    ]
+
+    is_success, message, rows = read_csv_rows(lines)
+
+    assert is_success == True
+    assert list(rows) == [
+                (1, registration("user1@gmail.com"), None),
+                (2, None, "Expected 4 columns, found 2."),
+            ]
+
+@pytest.mark.data_validation
+def test_read_rows_rejects_bad_header_and_content_type():
+    assert read_csv_rows(["name,email\n"])[0] == False
+    assert read_rows("application/json", [])[0] == False
+
+@pytest.mark.database
+def test_add_user_insurances(db):
+    registrations = [
+        dict(registration(f"user{i}@gmail.com", "Family" if i % 2 else "Single"), password_hash=f"hash{i}")
+        for i in range(5)
+    ]
+
+    is_success, message, count = UserInsuranceDao.add_user_insurances(registrations=registrations)
+
+    assert is_success == True
+    assert count == 5
+
+    BlacklistDao.add_blacklist(email_address="user9@gmail.com")
+
+    is_success, message, statuses = RegistrationDao.get_registration_statuses(
+                                        email_addresses=["user1@gmail.com", "user8@gmail.com", "user9@gmail.com"]
+                                    )
+
+    assert is_success == True
+    assert statuses == {"user1@gmail.com": RegistrationStatus.REGISTERED, "user9@gmail.com": RegistrationStatus.BLACKLISTED}
+
+    is_success, message, count = UserInsuranceDao.add_user_insurances(registrations=registrations[:1])
+
+    assert is_success == False
+    assert message == ALREADY_REGISTERED
+
+@pytest.mark.database
+def test_bulk_registration(app, db, no_deliverability_check):
+    BlacklistDao.add_blacklist(email_address="user3@gmail.com")
+
+    rows = read_ndjson_rows([
+        json.dumps(registration("user1@gmail.com")),
+        json.dumps(registration("user2@gmail.com")),
+        json.dumps(registration("user1@gmail.com")),
+        json.dumps(registration("user3@gmail.com")),
+        json.dumps({**registration("user4@gmail.com"), "insured_amount": "x"}),
+        json.dumps(registration("user5@gmail.com")),
+    ])
+
+    bulk_registration = BulkRegistration(chunk_size=2, password_hasher=cheap_hasher, send_emails=False)
+
+    with app.app_context():
+        results = list(bulk_registration.register(rows))
+
+    assert [(result['row'], result['status']) for result in results] == [
+                (1, "Success"),
+                (2, "Success"),
+                (3, "VALIDATION-ERROR"),
+                (4, "VALIDATION-ERROR"),
+                (5, "VALIDATION-ERROR"),
+                (6, "Success"),
+            ]
+    assert results[4]['errors'] == {"insured_amount": "'x' is not of type 'integer'"}
+    assert bulk_registration.registered == 3
+
+def test_invalid_rows_are_streamed_in_chunks(app):
+    read = []
+
+    def rows():
+        for row_number in range(1, 1000001):
+            read.append(row_number)
+            yield row_number, None, "Invalid Json Format"
+
+    with app.app_context():
+        results = BulkRegistration(chunk_size=3, password_hasher=cheap_hasher, send_emails=False).register(rows())
+
+        assert next(results)['status'] == "VALIDATION-ERROR"
+
+    # Only the first chunk is read, not the whole stream of invalid rows
+    assert len(read) == 3
+
+def test_bulk_sign_up_requires_admin_key(client, admin_headers):
+    body = json.dumps(registration("user1@gmail.com"))
+
+    response = client.post('/api/user/register/bulk/', data=body, headers={'Content-Type': 'application/x-ndjson'})
+
+    assert response.status_code == 403
+
+    response = client.post('/api/user/register/bulk/', data=body, headers={'Content-Type': 'application/xml', **admin_headers})
+
+    assert response.status_code == 400
+    assert response.json['status'] == "VALIDATION-ERROR"
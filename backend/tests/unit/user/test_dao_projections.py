@@ -0,0 +1,55 @@
+import pytest
+from apps import db as _db
+from apps.user.models import User
+from apps.user.dao import UserDao, UserInsuranceDao, UserInsurance, InsuranceSummary
+from apps.user.strict_loading import StrictLoadingError, is_strict_loading
+
+
+def test_strict_loading_is_enabled_in_tests():
+    assert is_strict_loading()
+
+@pytest.mark.database
+def test_add_user_insurance_returns_projection(db, add_user_insurance):
+    is_success, message, user_insurance = add_user_insurance("user1@gmail.com")
+
+    assert is_success
+    assert isinstance(user_insurance, UserInsurance)
+    assert user_insurance.user_id is not None
+    assert user_insurance.insurance_plan_name == "Family"
+
+@pytest.mark.database
+def test_user_summary_and_insurances(db, add_user_insurance):
+    add_user_insurance("user1@gmail.com")
+    UserDao.activate_user(email_address="user1@gmail.com")
+
+    is_success, message, user = UserDao.get_user_summary(email_address="user1@gmail.com")
+
+    assert is_success
+    assert (user.customer_name, user.email_address, user.activated) == ("Customer 1", "user1@gmail.com", True)
+    assert user.created_at is not None
+    assert UserDao.get_user_summary(email_address="user2@gmail.com") == (True, None, None)
+
+    is_success, message, insurances = UserInsuranceDao.get_insurances(email_address="user1@gmail.com")
+
+    assert is_success
+    assert [(insurance.insurance_plan_name, insurance.insured_amount) for insurance in insurances] == [("Family", 300000)]
+    assert isinstance(insurances[0], InsuranceSummary)
+    assert UserInsuranceDao.get_insurances(email_address="user2@gmail.com") == (True, None, [])
+
+@pytest.mark.database
+def test_strict_loading_raises_on_lazy_loads(db, add_user_insurance):
+    add_user_insurance("user1@gmail.com")
+
+    is_success, message, user = UserDao.get_user_by_email(email_address="user1@gmail.com")
+
+    # User is expired once the dao transaction commits
+    with pytest.raises(StrictLoadingError, match="Refresh"):
+        user.customer_name
+
+    # Explicit queries are allowed
+    user = _db.session.execute(_db.select(User).where(User.email_address == "user1@gmail.com")).scalar_one()
+
+    assert user.customer_name == "Customer 1"
+
+    with pytest.raises(StrictLoadingError, match="User.userprofiles"):
+        user.userprofiles
@@ -0,0 +1,29 @@
+import pytest
+from flask import render_template
+from apps.user.email_renderer import EmailRenderer, TEMPLATE_DIRS, email_renderer
+
+
+verification = {
+    "customer_name": "Customer <1> & 'Co'",
+    "email_address": "user1@gmail.com",
+    "password": "Pa$$<word>&1",
+    "confirm_url": "http://localhost/api/user/verify/abc.def?x=1&y=2"
+}
+
+@pytest.mark.parametrize("template_name, context", [
+    ("verification.html", verification),
+    ("welcome.html", {"customer_name": "Customer <1>"}),
+])
+def test_render_matches_flask(app, template_name, context):
+    with app.test_request_context():
+        assert email_renderer.render(template_name, **context) == render_template(template_name, **context)
+
+def test_templates_are_rendered_from_fragments(tmp_path):
+    renderer = EmailRenderer(template_dirs=TEMPLATE_DIRS, cache_dir=str(tmp_path))
+    renderer.precompile()
+
+    compiled = renderer._templates["verification.html"]
+
+    assert compiled is not None
+    assert compiled.fields == ["customer_name", "email_address", "password", "confirm_url", "confirm_url"]
+    assert list(tmp_path.iterdir())
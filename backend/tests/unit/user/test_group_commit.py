@@ -0,0 +1,110 @@
+import os
+import threading
+import pytest
+from apps.user.dao import ALREADY_REGISTERED
+from apps.user.models import User
+from apps.user.group_commit import RegistrationWriter
+from apps.user.insurance_plan_catalog import insurance_plan_catalog
+
+
+def sign_up_concurrently(app, writer, email_addresses):
+    results = dict()
+    barrier = threading.Barrier(len(email_addresses))
+
+    def sign_up(index, email_address):
+        with app.app_context():
+            barrier.wait()
+            results[index] = writer.add_user_insurance(
+                                customer_name="Customer 1",
+                                email_address=email_address,
+                                password=f"Password@{index}",
+                                insurance_plan_name="Family",
+                                insured_amount=300000
+                            )
+
+    threads = [threading.Thread(target=sign_up, args=(index, email_address)) for index, email_address in enumerate(email_addresses)]
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return [results[index] for index in range(len(email_addresses))]
+
+def registered(db):
+    with db.engine.connect() as connection:
+        return sorted(connection.execute(db.select(User.email_address)).scalars().all())
+
+
+@pytest.mark.database
+def test_concurrent_sign_ups_are_written_together(app, db):
+    insurance_plan_catalog.get_plan_id("Family")
+    # Passwords are hashed before queueing, a busy hasher pool spreads arrivals apart
+    writer = RegistrationWriter(window=1.0, max_batch_size=10)
+
+    email_addresses = [f"user{index}@gmail.com" for index in range(5)]
+    results = sign_up_concurrently(app, writer, email_addresses)
+
+    assert all(is_success for is_success, message, result in results)
+    assert registered(db) == email_addresses
+
+    stats = writer.stats()
+
+    assert stats['registrations'] == 5
+    assert stats['batches'] < 5
+    assert stats['fallbacks'] == 0
+
+@pytest.mark.database
+def test_duplicate_email_fails_only_its_sign_up(app, db):
+    writer = RegistrationWriter(window=0.2, max_batch_size=10)
+
+    assert sign_up_concurrently(app, writer, ["user0@gmail.com"])[0][0]
+
+    results = sign_up_concurrently(app, writer, ["user1@gmail.com", "user0@gmail.com", "user2@gmail.com", "user2@gmail.com"])
+
+    assert [message for is_success, message, result in results].count(ALREADY_REGISTERED) == 2
+    assert sum(is_success for is_success, message, result in results) == 2
+    assert registered(db) == ["user0@gmail.com", "user1@gmail.com", "user2@gmail.com"]
+
+@pytest.mark.database
+def test_disabled_writer_adds_registration_itself(app, db):
+    writer = RegistrationWriter(window=0, max_batch_size=10)
+
+    is_success, message, user_insurance = sign_up_concurrently(app, writer, ["user0@gmail.com"])[0]
+
+    assert is_success
+    assert writer.stats()['batches'] == 0
+    assert registered(db) == ["user0@gmail.com"]
+
+@pytest.mark.database
+def test_sign_up_gives_up_on_stuck_writer(app, db, monkeypatch):
+    writer = RegistrationWriter(window=0.01, max_batch_size=10, timeout=0.2)
+    release = threading.Event()
+    write = writer._write
+
+    def stuck_write(batch):
+        release.wait(5)
+        write(batch)
+
+    monkeypatch.setattr(writer, '_write', stuck_write)
+
+    assert sign_up_concurrently(app, writer, ["user0@gmail.com"])[0] == (False, "Failed to update database.", None)
+    assert writer.stats()['timeouts'] == 1
+
+    release.set()
+
+    # Written after the stuck batch, which drops the registration its request gave up on
+    assert sign_up_concurrently(app, writer, ["user1@gmail.com"])[0][0]
+    assert registered(db) == ["user1@gmail.com"]
+
+@pytest.mark.database
+def test_dead_writer_is_started_again(app, db):
+    writer = RegistrationWriter(window=0.01, max_batch_size=10, timeout=5)
+    dead = threading.Thread(target=lambda: None)
+    dead.start()
+    dead.join()
+    writer._thread, writer._pid = dead, os.getpid()
+
+    assert sign_up_concurrently(app, writer, ["user0@gmail.com"])[0][0]
+    assert writer.stats()['restarts'] == 1
+    assert registered(db) == ["user0@gmail.com"]
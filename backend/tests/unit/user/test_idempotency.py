@@ -0,0 +1,95 @@
+import json
+import threading
+import pytest
+import apps.user.idempotency as idempotency
+from apps.user.idempotency import create_idempotency_store, IdempotencyState
+
+
+payload = {
+        "customer_name":"Customer 1",
+        "email_address": "customer1@gmail.com",
+        "insurance_plan_name": "Family",
+        "insured_amount": 300000
+    }
+
+@pytest.fixture(params=['memory', 'sql'])
+def store(request, db, monkeypatch, no_deliverability_check):
+    store = create_idempotency_store(backend=request.param, capacity=100, ttl=60, lock_timeout=60)
+    monkeypatch.setattr(idempotency, 'idempotency_store', store)
+    return store
+
+def sign_up(client, data, key):
+    return client.post(
+                '/api/user/register/',
+                data=json.dumps(data),
+                headers={'Content-Type': 'application/json', 'Idempotency-Key': key}
+            )
+
+@pytest.mark.database
+def test_retry_gets_first_response(client, store):
+    first = sign_up(client, payload, "key-1")
+    retry = sign_up(client, payload, "key-1")
+
+    assert first.status_code == 201
+    assert retry.status_code == 201
+    assert json.loads(retry.data) == json.loads(first.data)
+    assert retry.headers['Idempotent-Replayed'] == 'true'
+
+    # Without the key the request is executed again
+    assert sign_up(client, payload, "key-2").status_code == 400
+
+@pytest.mark.database
+def test_key_reused_with_different_request(client, store):
+    sign_up(client, payload, "key-1")
+
+    response = sign_up(client, {**payload, "email_address": "customer2@gmail.com"}, "key-1")
+
+    assert response.status_code == 422
+
+@pytest.mark.database
+def test_store_states(store):
+    assert store.begin("sign-up:key-1", "a") == (IdempotencyState.NEW, None)
+    assert store.begin("sign-up:key-1", "a") == (IdempotencyState.IN_PROGRESS, None)
+
+    store.complete("sign-up:key-1", 201, {"body": {"x": 1}, "headers": {}})
+
+    state, record = store.begin("sign-up:key-1", "a")
+    assert state == IdempotencyState.COMPLETED
+    assert record['http_status'] == 201
+    assert record['response'] == {"body": {"x": 1}, "headers": {}}
+
+    store.release("sign-up:key-1")
+    assert store.begin("sign-up:key-1", "b") == (IdempotencyState.NEW, None)
+
+@pytest.mark.database
+def test_concurrent_duplicate_waits_for_first_request(app, store, monkeypatch):
+    started = threading.Event()
+    proceed = threading.Event()
+    calls = []
+
+    @idempotency.idempotent('test')
+    def post():
+        calls.append(1)
+        started.set()
+        proceed.wait(5)
+        return {"status": "Success"}, 200
+
+    responses = []
+
+    def request():
+        with app.test_request_context('/', method='POST', data='{}', headers={'Idempotency-Key': 'key-1'}):
+            responses.append(post())
+
+    first = threading.Thread(target=request)
+    first.start()
+    started.wait(5)
+
+    second = threading.Thread(target=request)
+    second.start()
+    proceed.set()
+
+    first.join()
+    second.join()
+
+    assert len(calls) == 1
+    assert [response[1] for response in responses] == [200, 200]
@@ -0,0 +1,44 @@
+import pytest
+from apps.user.models import InsurancePlan, Insurance
+from apps.user.insurance_plan_catalog import insurance_plan_catalog
+
+
+def count_plans(db):
+    return db.session.execute(db.select(db.func.count()).select_from(InsurancePlan)).scalar()
+
+
+@pytest.mark.database
+def test_sign_ups_share_insurance_plan(db, add_user_insurance):
+    before = insurance_plan_catalog.stats()
+
+    add_user_insurance("user1@gmail.com", "Password@1")
+    add_user_insurance("user2@gmail.com", "Password@2")
+    add_user_insurance("user3@gmail.com", "Password@3", insurance_plan_name="family")
+
+    assert count_plans(db) == 1
+
+    plan_ids = db.session.execute(db.select(Insurance.insurance_plan_id)).scalars().all()
+    db.session.rollback()
+
+    assert len(plan_ids) == 3
+    assert len(set(plan_ids)) == 1
+
+    stats = insurance_plan_catalog.stats()
+
+    assert stats['plans'] == 1
+    assert stats['misses'] - before['misses'] == 1
+    assert stats['hits'] - before['hits'] == 2
+
+@pytest.mark.database
+def test_existing_plans_are_found(db):
+    with db.session.begin():
+        db.session.add(InsurancePlan(insurance_plan_name="Senior"))
+
+    is_success, message, plan_ids = insurance_plan_catalog.get_plan_ids(["Senior", "Single"])
+
+    assert is_success
+    assert len(set(plan_ids.values())) == 2
+    assert count_plans(db) == 2
+
+    # Second lookup is served from memory
+    assert insurance_plan_catalog.get_plan_id("SENIOR") == (True, None, plan_ids["Senior"])
@@ -0,0 +1,72 @@
+import json
+import pytest
+from apps.user.dao import UserDao, UserInsuranceDao
+from apps import configuration
+from apps.user.login import login_latencies, authenticate, LoginStatus
+from apps.user.login_throttle import login_throttle
+from utils.security import get_password_hasher
+
+
+def login(client, email_address, password):
+    response = client.post(
+                    '/api/user/login/',
+                    data=json.dumps({"email_address": email_address, "password": password}),
+                    headers={'Content-Type': 'application/json'}
+                )
+
+    return response.status_code, json.loads(response.data)['status']
+
+@pytest.fixture
+def customer(db):
+    UserInsuranceDao.add_user_insurance(
+        customer_name="Customer 1",
+        email_address="user1@gmail.com",
+        password="Password@123",
+        insurance_plan_name="Family",
+        insured_amount=300000
+    )
+
+
+@pytest.mark.database
+def test_login_after_activation(client, customer):
+    assert login(client, "user1@gmail.com", "Password@123") == (403, "NOT-ACTIVATED")
+
+    UserDao.activate_user(email_address="user1@gmail.com")
+
+    assert login(client, "user1@gmail.com", "Password@123") == (200, "Success")
+
+@pytest.mark.database
+def test_wrong_password_and_unknown_email_look_same(client, customer):
+    assert login(client, "user1@gmail.com", "Password@124") == (401, "INVALID-CREDENTIALS")
+    assert login(client, "user2@gmail.com", "Password@123") == (401, "INVALID-CREDENTIALS")
+
+@pytest.mark.database
+def test_stage_latencies(client, customer):
+    login(client, "user2@gmail.com", "Password@123")
+
+    stats = login_latencies.stats()
+
+    assert set(stats) == {'lookup', 'password_check', 'total'}
+    assert stats['total']['p50_ms'] >= stats['password_check']['p50_ms']
+
+def test_invalid_payload(client):
+    response = client.post('/api/user/login/', data=json.dumps({"email_address": "user1@gmail.com"}), headers={'Content-Type': 'application/json'})
+
+    assert response.status_code == 400
+
+@pytest.mark.database
+def test_attempts_are_throttled_before_password_check(app, customer):
+    limit = configuration.LOGIN_THROTTLE_EMAIL_LIMIT
+    verified = get_password_hasher().stats()['verified']
+    rejected = login_throttle.stats()['rejected_email']
+
+    with app.app_context():
+        for _ in range(limit):
+            assert authenticate("user1@gmail.com", "Password@124", "1.1.1.1")[2].status == LoginStatus.INVALID_CREDENTIALS
+
+        is_success, message, login = authenticate("user1@gmail.com", "Password@123", "1.1.1.1")
+
+    assert login.status == LoginStatus.THROTTLED
+    assert login.retry_after > 0
+    assert get_password_hasher().stats()['verified'] == verified + limit
+    assert login_throttle.stats()['rejected_email'] == rejected + 1
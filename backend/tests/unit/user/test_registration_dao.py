@@ -0,0 +1,39 @@
+import pytest
+from apps.user.dao import RegistrationDao, RegistrationStatus, BlacklistDao, ALREADY_REGISTERED
+
+
+@pytest.mark.database
+def test_registration_status_available(db):
+    is_success, message, status = RegistrationDao.get_registration_status(email_address="user1@gmail.com")
+
+    assert is_success == True
+    assert status == RegistrationStatus.AVAILABLE
+
+@pytest.mark.database
+def test_registration_status_registered(db, add_user_insurance):
+    add_user_insurance("user2@gmail.com")
+
+    is_success, message, status = RegistrationDao.get_registration_status(email_address="user2@gmail.com")
+
+    assert is_success == True
+    assert status == RegistrationStatus.REGISTERED
+
+@pytest.mark.database
+def test_registration_status_blacklisted(db):
+    BlacklistDao.add_blacklist(email_address="user3@gmail.com")
+
+    is_success, message, status = RegistrationDao.get_registration_status(email_address="user3@gmail.com")
+
+    assert is_success == True
+    assert status == RegistrationStatus.BLACKLISTED
+
+@pytest.mark.database
+def test_duplicate_registration_is_rejected_by_unique_index(db, add_user_insurance):
+    is_success, message, insurance = add_user_insurance("user4@gmail.com", password="Password@1")
+    assert is_success == True
+
+    is_success, message, insurance = add_user_insurance("user4@gmail.com", password="Password@2")
+
+    assert is_success == False
+    assert message == ALREADY_REGISTERED
+    assert insurance is None
@@ -0,0 +1,44 @@
+import json
+import pytest
+from apps.user import request_payload
+from apps.user.request_payload import load_request_payload, get_request_payload
+
+
+data = {
+        "customer_name":"Customer 1",
+        "email_address": "customer1@gmail.com",
+        "insurance_plan_name": "Family",
+        "insured_amount": 300000
+    }
+
+@pytest.mark.schema_validation
+def test_payload_is_decoded_once(app, monkeypatch):
+    decode_count = []
+    original_loads = json.loads
+
+    def counting_loads(*args, **kwargs):
+        decode_count.append(1)
+        return original_loads(*args, **kwargs)
+
+    monkeypatch.setattr(request_payload.json, 'loads', counting_loads)
+
+    with app.test_request_context(data=json.dumps(data), content_type='application/json'):
+        is_success, message, payload = load_request_payload()
+
+        assert is_success == True
+        assert message is None
+        assert payload['email_address'] == data['email_address']
+
+        for _ in range(5):
+            assert get_request_payload() is payload
+
+    assert len(decode_count) == 1
+
+@pytest.mark.schema_validation
+def test_invalid_json_payload_is_reported(app):
+    with app.test_request_context(data='{"customer_name": Customer 1"}', content_type='application/json'):
+        is_success, message, payload = load_request_payload()
+
+    assert is_success == False
+    assert message == "Invalid Json Format"
+    assert payload is None
@@ -0,0 +1,78 @@
+import time
+import threading
+import pytest
+from apps.user.single_flight import SingleFlight
+
+
+def call_concurrently(app, groups, key, func):
+    results = [None] * len(groups)
+    barrier = threading.Barrier(len(groups))
+
+    def call(index):
+        with app.app_context():
+            barrier.wait()
+            try:
+                results[index] = groups[index].do(key, func)
+            except ValueError as err:
+                results[index] = err
+
+    threads = [threading.Thread(target=call, args=(index,)) for index in range(len(groups))]
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return results
+
+def slow_response(calls, response=({"status": "Success"}, 200)):
+    def func():
+        calls.append(1)
+        # Long enough for every request to arrive
+        time.sleep(0.3)
+        return response
+    return func
+
+
+def test_concurrent_calls_share_one_execution(app):
+    group = SingleFlight(mode='worker', result_ttl=5, wait_timeout=5, poll_interval=0.01)
+    calls = []
+
+    results = call_concurrently(app, [group] * 4, "verify:a", slow_response(calls))
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert group.stats()['executed'] == 1
+    assert group.stats()['shared'] == 3
+
+def test_error_is_shared(app):
+    group = SingleFlight(mode='worker', result_ttl=5, wait_timeout=5, poll_interval=0.01)
+
+    def fail():
+        time.sleep(0.3)
+        raise ValueError("Failed")
+
+    results = call_concurrently(app, [group] * 3, "verify:a", fail)
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert group.stats()['executed'] == 1
+
+def test_none_mode_executes_every_call(app):
+    group = SingleFlight(mode='none', result_ttl=5, wait_timeout=5, poll_interval=0.01)
+    calls = []
+
+    call_concurrently(app, [group] * 3, "verify:a", slow_response(calls))
+
+    assert len(calls) == 3
+
+@pytest.mark.database
+def test_shared_mode_coalesces_workers(app, db):
+    # One group per gunicorn worker
+    workers = [SingleFlight(mode='shared', result_ttl=5, wait_timeout=5, poll_interval=0.01) for _ in range(2)]
+    calls = []
+
+    results = call_concurrently(app, workers, "verify:a", slow_response(calls))
+
+    assert len(calls) == 1
+    assert results[0] == results[1] == ({"status": "Success"}, 200)
+    assert sum(worker.stats()['replayed'] for worker in workers) == 1
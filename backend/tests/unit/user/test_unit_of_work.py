@@ -0,0 +1,159 @@
+import json
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from apps.user.dao import BlacklistDao, RegistrationDao, ALREADY_REGISTERED, ALREADY_BLACKLISTED
+from apps.user.models import Blacklist, User
+from apps.user.insurance_plan_catalog import insurance_plan_catalog
+from apps.user.unit_of_work import unit_of_work, after_commit
+from apps.user.emails import send_verification_email
+import utils.email_sink as email_sink
+
+
+@pytest.fixture
+def commits(db):
+    # Plan is added on a connection of its own
+    insurance_plan_catalog.get_plan_id("Family")
+
+    counter = []
+    listener = lambda connection: counter.append(connection)
+
+    event.listen(Engine, 'commit', listener)
+    yield counter
+    event.remove(Engine, 'commit', listener)
+
+def blacklisted(db):
+    # Read on a connection of its own, sees only committed rows
+    with db.engine.connect() as connection:
+        return connection.execute(db.select(Blacklist.email_address).order_by(Blacklist.email_address)).scalars().all()
+
+@pytest.mark.database
+def test_daos_share_one_transaction(app, db, commits):
+    with app.test_request_context():
+        with unit_of_work():
+            BlacklistDao.add_blacklist(email_address="user1@gmail.com")
+            BlacklistDao.add_blacklist(email_address="user2@gmail.com")
+
+            # Nested unit of work joins the outer one
+            with unit_of_work():
+                is_success, message, result = BlacklistDao.get_blacklist_by_email(email_address="user1@gmail.com")
+
+            assert is_success and result is not None
+            assert blacklisted(db) == []
+
+        assert blacklisted(db) == ["user1@gmail.com", "user2@gmail.com"]
+        assert len(commits) == 1
+
+@pytest.mark.database
+def test_exception_rolls_back(app, db):
+    with app.test_request_context():
+        with pytest.raises(ValueError):
+            with unit_of_work():
+                BlacklistDao.add_blacklist(email_address="user1@gmail.com")
+                raise ValueError()
+
+        assert blacklisted(db) == []
+
+@pytest.mark.database
+def test_savepoint_keeps_rest_of_unit_of_work(app, db, add_user_insurance):
+    with app.test_request_context():
+        with unit_of_work():
+            assert add_user_insurance("user1@gmail.com", "Password@1")[0]
+
+            is_success, message, result = add_user_insurance("user1@gmail.com", "Password@2")
+
+            assert not is_success
+            assert message == ALREADY_REGISTERED
+
+            BlacklistDao.add_blacklist(email_address="user2@gmail.com")
+
+        with db.engine.connect() as connection:
+            assert connection.execute(db.select(User.email_address)).scalars().all() == ["user1@gmail.com"]
+
+        assert blacklisted(db) == ["user2@gmail.com"]
+
+@pytest.mark.database
+def test_sign_up_commits_once(client, db, commits, no_deliverability_check):
+    response = client.post(
+                    '/api/user/register/',
+                    data=json.dumps({
+                        "customer_name": "Customer 1",
+                        "email_address": "customer1@gmail.com",
+                        "insurance_plan_name": "Family",
+                        "insured_amount": 300000
+                    }),
+                    headers={'Content-Type': 'application/json'}
+                )
+
+    assert response.status_code == 201
+    assert len(commits) == 1
+
+@pytest.mark.database
+def test_verification_email_is_sent_only_after_commit(app, db, add_user_insurance, monkeypatch):
+    sink = email_sink.MemoryEmailSink(capacity=10)
+    monkeypatch.setattr(email_sink, '_email_sink', sink)
+
+    with app.test_request_context():
+        with pytest.raises(ValueError):
+            with unit_of_work():
+                add_user_insurance("user1@gmail.com", "Password@1")
+                assert send_verification_email("Customer 1", "user1@gmail.com", "Password@1")[0]
+                raise ValueError()
+
+        assert sink.messages() == []
+
+        with unit_of_work():
+            add_user_insurance("user1@gmail.com", "Password@1")
+            send_verification_email("Customer 1", "user1@gmail.com", "Password@1")
+
+            assert sink.messages() == []
+
+        assert [message.recipient for message in sink.messages()] == ["user1@gmail.com"]
+
+@pytest.mark.database
+def test_duplicate_blacklist_keeps_rest_of_unit_of_work(app, db):
+    with app.test_request_context():
+        with unit_of_work():
+            assert BlacklistDao.add_blacklist(email_address="user1@gmail.com")[0]
+            assert BlacklistDao.add_blacklist(email_address="user1@gmail.com") == (False, ALREADY_BLACKLISTED, None)
+
+            BlacklistDao.add_blacklist(email_address="user2@gmail.com")
+
+        assert blacklisted(db) == ["user1@gmail.com", "user2@gmail.com"]
+
+    assert BlacklistDao.add_blacklist(email_address="user2@gmail.com") == (False, ALREADY_BLACKLISTED, None)
+
+@pytest.mark.database
+def test_failed_dao_rolls_back_unit_of_work(app, db, monkeypatch):
+    def lost_connection(*args, **kwargs):
+        raise OperationalError("SELECT", {}, Exception("Lost connection"))
+
+    with app.test_request_context():
+        with unit_of_work():
+            assert BlacklistDao.add_blacklist(email_address="user1@gmail.com")[0]
+
+            # Dao catches the error and reports failure instead of raising it
+            monkeypatch.setattr(db.session, 'execute', lost_connection)
+
+            assert RegistrationDao.get_registration_status(email_address="user2@gmail.com") == (False, "Failed to update database.", None)
+
+            monkeypatch.undo()
+
+        assert blacklisted(db) == []
+
+@pytest.mark.database
+def test_failing_after_commit_callback_does_not_fail_request(app, db):
+    called = []
+
+    def broker_down():
+        raise ConnectionError("Broker is down")
+
+    with app.test_request_context():
+        with unit_of_work():
+            BlacklistDao.add_blacklist(email_address="user1@gmail.com")
+            after_commit(broker_down)
+            after_commit(lambda: called.append(True))
+
+        assert called == [True]
+        assert blacklisted(db) == ["user1@gmail.com"]
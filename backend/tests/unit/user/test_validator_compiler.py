@@ -0,0 +1,75 @@
+import json
+import pytest
+from werkzeug.exceptions import HTTPException
+from apps.user.apis.namespaces.sign_up_namespace import sign_up_api_request_model, sign_up_payload_validator
+from apps.user.apis.namespaces.blacklist_namespace import blacklist_api_request_model, blacklist_payload_validator
+
+
+valid_sign_up = {
+        "customer_name":"Customer 1",
+        "email_address": "customer1@gmail.com",
+        "insurance_plan_name": "Family",
+        "insured_amount": 300000
+    }
+
+sign_up_payloads = [
+    valid_sign_up,
+    {},
+    [valid_sign_up],
+    {**valid_sign_up, "customer_name": "Cu"},
+    {**valid_sign_up, "customer_name": "C" * 41},
+    {**valid_sign_up, "insured_amount": 5000001},
+    {**valid_sign_up, "insured_amount": "300000"},
+    {**valid_sign_up, "insured_amount": True},
+    {**valid_sign_up, "email_address": None},
+    {"customer_name": 1, "insured_amount": "x"},
+]
+
+def restx_errors(app, model, data):
+    with app.app_context():
+        try:
+            model.validate(data)
+        except HTTPException as err:
+            return err.data
+
+    return None
+
+@pytest.mark.schema_validation
+@pytest.mark.parametrize("data", sign_up_payloads)
+def test_sign_up_validator_matches_restx(app, data):
+    assert sign_up_payload_validator.validate(data) == restx_errors(app, sign_up_api_request_model, data)
+
+@pytest.mark.schema_validation
+@pytest.mark.parametrize("data", [
+    {"email_address": "user1@gmail.com"},
+    {"email_address": "user1@gmail.com", "reason": "short"},
+    {"reason": "Duplicate account with same attributes"},
+])
+def test_blacklist_validator_matches_restx(app, data):
+    assert blacklist_payload_validator.validate(data) == restx_errors(app, blacklist_api_request_model, data)
+
+@pytest.mark.schema_validation
+def test_unexpected_attribute(app):
+    assert sign_up_payload_validator.validate({**valid_sign_up, "age": 30}) == {
+                "status": "VALIDATION-ERROR",
+                "reason": "Invalid Schema. Attribute 'age' is not expected."
+            }
+
+@pytest.mark.schema_validation
+def test_sign_up_payload_validation_error(client):
+    response = client.post(
+                    '/api/user/register/',
+                    data=json.dumps({"customer_name": "Cu"}),
+                    headers={'Content-Type': 'application/json'}
+                )
+
+    assert response.status_code == 400
+    assert json.loads(response.data.decode('utf8')) == {
+                "errors": {
+                    "customer_name": "'Cu' is too short",
+                    "email_address": "'email_address' is a required property",
+                    "insurance_plan_name": "'insurance_plan_name' is a required property",
+                    "insured_amount": "'insured_amount' is a required property",
+                },
+                "message": "Input payload validation failed"
+            }
@@ -0,0 +1,63 @@
+import json
+import threading
+import pytest
+from apps.user.dao import UserDao, ActivationStatus
+from apps.user.bulk_activation import BulkActivation
+from utils.token import TokenHelper
+
+
+def verify(client, email_address):
+    is_success, message, token = TokenHelper().generate_confirmation_token(email_address)
+    response = client.get(f'/api/user/verify/{token}')
+
+    return response.status_code, json.loads(response.data)['status']
+
+
+@pytest.mark.database
+def test_activation_is_reported_once(db, add_user_insurance):
+    add_user_insurance("user1@gmail.com")
+
+    assert UserDao.activate_user(email_address="user1@gmail.com")[2][:2] == (ActivationStatus.ACTIVATED, "Customer 1")
+    assert UserDao.activate_user(email_address="user1@gmail.com")[2][:2] == (ActivationStatus.ALREADY_ACTIVATED, "Customer 1")
+    assert UserDao.activate_user(email_address="user2@gmail.com") == (True, None, (ActivationStatus.NOT_FOUND, None, None))
+
+@pytest.mark.database
+def test_concurrent_clicks_activate_once(app, db, add_user_insurance):
+    add_user_insurance("user1@gmail.com")
+
+    statuses = []
+    barrier = threading.Barrier(4)
+
+    def click():
+        with app.app_context():
+            barrier.wait()
+            statuses.append(UserDao.activate_user(email_address="user1@gmail.com")[2].status)
+            db.session.remove()
+
+    threads = [threading.Thread(target=click) for _ in range(4)]
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(statuses) == [ActivationStatus.ACTIVATED] + [ActivationStatus.ALREADY_ACTIVATED] * 3
+
+@pytest.mark.database
+def test_verify_endpoint(client, db, add_user_insurance):
+    add_user_insurance("user1@gmail.com")
+
+    assert verify(client, "user1@gmail.com") == (200, "Success")
+    assert verify(client, "user1@gmail.com") == (200, "ALREADY-ACTIVATED")
+    assert verify(client, "user2@gmail.com") == (404, "INVALID-USER")
+
+@pytest.mark.database
+def test_old_link_does_not_activate_deactivated_user(client, db, add_user_insurance):
+    add_user_insurance("user1@gmail.com")
+
+    assert verify(client, "user1@gmail.com") == (200, "Success")
+
+    list(BulkActivation(activated=False, chunk_size=10).change([(1, "user1@gmail.com", None)]))
+
+    assert verify(client, "user1@gmail.com") == (403, "DEACTIVATED")
+    assert UserDao.get_credentials(email_address="user1@gmail.com")[2].activated == False
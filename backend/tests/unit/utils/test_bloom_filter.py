@@ -0,0 +1,36 @@
+import pytest
+from utils.bloom_filter import BloomFilter
+
+
+def test_added_items_are_always_found():
+    bloom_filter = BloomFilter(capacity=1000, false_positive_rate=0.01)
+
+    emails = [f"user{i}@gmail.com" for i in range(1000)]
+    for email in emails:
+        bloom_filter.add(email)
+
+    assert len(bloom_filter) == 1000
+    assert all(email in bloom_filter for email in emails)
+
+def test_false_positive_rate_is_bounded():
+    bloom_filter = BloomFilter(capacity=1000, false_positive_rate=0.01)
+
+    for i in range(1000):
+        bloom_filter.add(f"user{i}@gmail.com")
+
+    false_positives = sum(f"customer{i}@gmail.com" in bloom_filter for i in range(10000))
+
+    assert false_positives / 10000 < 0.03
+
+def test_size_follows_false_positive_rate():
+    loose = BloomFilter(capacity=10000, false_positive_rate=0.1)
+    strict = BloomFilter(capacity=10000, false_positive_rate=0.001)
+
+    assert strict.bit_count > loose.bit_count
+    assert strict.hash_count > loose.hash_count
+    assert strict.memory_bytes > loose.memory_bytes
+
+@pytest.mark.parametrize("capacity, false_positive_rate", [(0, 0.01), (10, 0), (10, 1)])
+def test_invalid_arguments(capacity, false_positive_rate):
+    with pytest.raises(ValueError):
+        BloomFilter(capacity=capacity, false_positive_rate=false_positive_rate)
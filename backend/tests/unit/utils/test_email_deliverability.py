@@ -0,0 +1,144 @@
+import time
+import threading
+import pytest
+import email_validator
+from utils.email_deliverability import EmailDeliverabilityChecker, LocalResolver
+
+
+MX_RECORDS = {
+    'senecaglobal.com': ['mx1.senecaglobal.com', 'mx2.senecaglobal.com'],
+    'nomail.com': [],
+}
+
+@pytest.fixture(autouse=True)
+def check_deliverability(monkeypatch):
+    monkeypatch.setattr(email_validator, 'CHECK_DELIVERABILITY', True)
+
+def create_checker(mode='cached', latency=0, positive_ttl=60, negative_ttl=60, refresh_interval=0):
+    resolver = LocalResolver(mx_records=MX_RECORDS, latency=latency)
+    checker = EmailDeliverabilityChecker(
+                    mode=mode,
+                    resolver=resolver,
+                    capacity=2,
+                    positive_ttl=positive_ttl,
+                    negative_ttl=negative_ttl,
+                    refresh_interval=refresh_interval
+                )
+    return checker, resolver
+
+
+def test_deliverable_domain_is_cached():
+    checker, resolver = create_checker()
+
+    assert checker.check("user1@SenecaGlobal.com") == (True, "user1@senecaglobal.com")
+    queries = resolver.queries
+
+    assert checker.check("user2@senecaglobal.com") == (True, "user2@senecaglobal.com")
+    assert resolver.queries == queries
+
+    stats = checker.stats()
+
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+    assert stats['latency_p50_ms'] is not None
+    assert stats['latency_p99_ms'] >= stats['latency_p50_ms']
+
+def test_undeliverable_domains():
+    checker, resolver = create_checker()
+
+    valid, message = checker.check("user@nomail.com")
+
+    assert not valid
+    assert "does not accept email" in message
+
+    valid, message = checker.check("user@unknown-domain.com")
+
+    assert not valid
+    assert "does not exist" in message
+
+    queries = resolver.queries
+
+    # Negative result is cached as well
+    assert not checker.check("other@unknown-domain.com")[0]
+    assert resolver.queries == queries
+
+def test_ttl():
+    checker, resolver = create_checker(positive_ttl=0.05, negative_ttl=0.05)
+
+    checker.check("user@senecaglobal.com")
+    queries = resolver.queries
+
+    time.sleep(0.06)
+    checker.check("user@senecaglobal.com")
+
+    assert resolver.queries > queries
+
+def test_syntax_mode_does_not_resolve():
+    checker, resolver = create_checker(mode='syntax')
+
+    assert checker.check("user@unknown-domain.com") == (True, "user@unknown-domain.com")
+    assert not checker.check("user.unknown-domain.com")[0]
+    assert resolver.queries == 0
+
+def test_dns_mode_resolves_every_email():
+    checker, resolver = create_checker(mode='dns')
+
+    checker.check("user1@senecaglobal.com")
+    queries = resolver.queries
+    checker.check("user2@senecaglobal.com")
+
+    assert resolver.queries == 2 * queries
+
+def test_global_switch(monkeypatch):
+    checker, resolver = create_checker()
+    monkeypatch.setattr(email_validator, 'CHECK_DELIVERABILITY', False)
+
+    assert checker.check("user@unknown-domain.com")[0]
+    assert resolver.queries == 0
+
+def test_concurrent_misses_look_up_once():
+    checker, resolver = create_checker(latency=0.05)
+    results = []
+
+    threads = [threading.Thread(target=lambda: results.append(checker.check("user@senecaglobal.com"))) for _ in range(5)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert results == [(True, "user@senecaglobal.com")] * 5
+    assert checker.stats()['lookups'] == 1
+
+def test_refresh_used_domains():
+    checker, resolver = create_checker(positive_ttl=0.5, refresh_interval=1)
+
+    checker.check("user@senecaglobal.com")
+
+    # Not used since it was looked up
+    assert checker.refresh() == 0
+
+    checker.check("user@senecaglobal.com")
+
+    assert checker.refresh() == 1
+    assert checker.stats()['refreshes'] == 1
+
+def test_refresher_survives_failing_refresh(monkeypatch):
+    checker, resolver = create_checker(refresh_interval=0.05)
+
+    def broken_refresh():
+        raise RuntimeError("Resolver crashed")
+
+    monkeypatch.setattr(checker, 'refresh', broken_refresh)
+
+    # Starts the refresher thread
+    checker.check("user@senecaglobal.com")
+    time.sleep(0.3)
+
+    assert checker._thread.is_alive()
+    assert checker.stats()['refresh_failures'] >= 2
+
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        create_checker(mode='smtp')
@@ -0,0 +1,53 @@
+import pytest
+from utils.email_sink import create_email_sink, MemoryEmailSink, FileEmailSink
+
+
+def test_memory_sink_keeps_last_emails():
+    email_sink = MemoryEmailSink(capacity=2)
+
+    for i in range(3):
+        email_sink.send(recipient=f"user{i}@gmail.com", subject="Please verify your email", body=f"Body {i}")
+
+    assert [message.body for message in email_sink.messages()] == ["Body 1", "Body 2"]
+    assert [message.body for message in email_sink.messages(recipient="user2@gmail.com")] == ["Body 2"]
+    assert email_sink.stats() == {'mode': 'memory', 'sent': 3, 'kept': 2}
+
+def test_file_sink_writes_batches_and_rotates(tmp_path):
+    email_sink = FileEmailSink(
+                    directory=str(tmp_path), max_bytes=1000, backup_count=2,
+                    batch_size=10, flush_interval=0.01, queue_size=100
+                )
+
+    for i in range(30):
+        email_sink.send(recipient=f"user{i}@gmail.com", subject="Welcome to Indian Insurance", body="x" * 100)
+
+    email_sink.flush()
+    stats = email_sink.stats()
+    email_sink.close()
+
+    assert stats['written'] == 30
+    assert stats['dropped'] == 0
+    assert stats['batches'] < 30
+    assert stats['rotations'] > 0
+    # Current file and at most two rotated files
+    suffixes = {path.name.rsplit('.', 1)[-1] for path in tmp_path.iterdir()}
+    assert '1' in suffixes and suffixes <= {'1', '2', 'txt'}
+
+def test_file_sink_drops_when_queue_is_full(tmp_path):
+    email_sink = FileEmailSink(
+                    directory=str(tmp_path), max_bytes=10000, backup_count=1,
+                    batch_size=1, flush_interval=0.01, queue_size=1
+                )
+
+    for i in range(100):
+        email_sink.send(recipient="user1@gmail.com", subject="Subject", body="Body")
+
+    email_sink.close()
+    stats = email_sink.stats()
+
+    assert stats['written'] + stats['dropped'] == 100
+    assert stats['sent'] == stats['written']
+
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        create_email_sink(mode='smtp', directory='', capacity=1, max_bytes=1, backup_count=1, batch_size=1, flush_interval=1)
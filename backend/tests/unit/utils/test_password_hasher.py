@@ -0,0 +1,93 @@
+import time
+import pytest
+from utils.security import PasswordHasher, validate_password_hash
+
+
+@pytest.fixture
+def password_hasher():
+    password_hasher = PasswordHasher(algorithm='pbkdf2:sha256', cost='1000', workers=2, max_pending=4, queue_timeout=5)
+    yield password_hasher
+    password_hasher.shutdown()
+
+def test_hash_password_in_worker_process(password_hasher):
+    is_success, message, password_hash = password_hasher.hash_password("Password@123")
+
+    assert is_success == True
+    assert password_hash.startswith("pbkdf2:sha256:1000$")
+    assert validate_password_hash("Password@123", password_hash)
+
+def test_hash_passwords_keeps_order(password_hasher):
+    passwords = [f"Password@{i}" for i in range(7)]
+
+    is_success, message, password_hashes = password_hasher.hash_passwords(passwords)
+
+    assert is_success == True
+    assert all(validate_password_hash(password, password_hash) for password, password_hash in zip(passwords, password_hashes))
+
+    stats = password_hasher.stats()
+    assert stats['hashed'] == 7
+    assert stats['queue_depth'] == 0
+
+def test_hash_on_calling_thread():
+    password_hasher = PasswordHasher(algorithm='pbkdf2:sha256:1000', cost=None, workers=0, max_pending=1, queue_timeout=1)
+
+    is_success, message, password_hashes = password_hasher.hash_passwords(["a", "b"])
+
+    assert is_success == True
+    assert len(password_hashes) == 2
+    assert password_hasher.queue_depth == 0
+
+def test_rejects_when_queue_is_full():
+    password_hasher = PasswordHasher(algorithm='pbkdf2:sha256', cost='1000', workers=0, max_pending=1, queue_timeout=0.01)
+
+    # Occupy the only slot
+    password_hasher._acquire()
+
+    is_success, message, password_hash = password_hasher.hash_password("Password@123")
+
+    assert is_success == False
+    assert message == "Server is busy. Please try again later."
+    assert password_hasher.stats()['rejected'] == 1
+
+    password_hasher._release()
+    assert password_hasher.hash_password("Password@123")[0] == True
+
+def test_verify_password_in_worker_process(password_hasher):
+    is_success, message, password_hash = password_hasher.hash_password("Password@123")
+
+    assert password_hasher.verify_password("Password@123", password_hash) == (True, None, True)
+    assert password_hasher.verify_password("Password@124", password_hash) == (True, None, False)
+    assert password_hasher.stats()['verified'] == 2
+
+def test_unknown_email_is_checked_against_dummy_hash():
+    password_hasher = PasswordHasher(algorithm='pbkdf2:sha256', cost='1000', workers=0, max_pending=1, queue_timeout=1)
+
+    assert password_hasher.verify_password("Password@123", None) == (True, None, False)
+
+    is_success, message, dummy_hash = password_hasher.get_dummy_hash()
+
+    # Same method and cost as real hashes, so unknown emails take as long
+    assert dummy_hash.startswith("pbkdf2:sha256:1000$")
+    assert password_hasher.stats()['verified'] == 1
+
+def test_pool_is_started_again_after_worker_process_dies(password_hasher):
+    assert password_hasher.hash_password("Password@123")[0] == True
+
+    executor = password_hasher._get_executor()
+    process = next(iter(executor._processes.values()))
+    process.kill()
+    process.join()
+
+    # Pool notices the dead process and refuses new tasks
+    deadline = time.monotonic() + 5
+    while not executor._broken and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    for index in range(password_hasher.max_pending + 1):
+        is_success, message, password_hash = password_hasher.hash_password(f"Password@{index}")
+
+        assert is_success == True
+        assert validate_password_hash(f"Password@{index}", password_hash)
+
+    assert password_hasher.queue_depth == 0
+    assert password_hasher.stats()['restarts'] == 1
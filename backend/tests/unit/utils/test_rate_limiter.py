@@ -0,0 +1,84 @@
+import time
+import pytest
+from utils.rate_limiter import TokenBucketLimiter, SlidingWindowLimiter
+
+
+def test_burst_then_reject():
+    limiter = TokenBucketLimiter(rate=1, burst=3, max_keys=10)
+
+    assert [limiter.acquire("1.1.1.1")[0] for _ in range(4)] == [True, True, True, False]
+
+    allowed, retry_after = limiter.acquire("1.1.1.1")
+
+    assert not allowed
+    assert 0 < retry_after <= 1
+
+    # Other keys have their own bucket
+    assert limiter.acquire("2.2.2.2")[0]
+
+def test_refill():
+    limiter = TokenBucketLimiter(rate=50, burst=1, max_keys=10)
+
+    assert limiter.acquire("key")[0]
+    assert not limiter.acquire("key")[0]
+
+    time.sleep(0.05)
+
+    assert limiter.acquire("key")[0]
+
+def test_least_recently_used_keys_are_dropped():
+    limiter = TokenBucketLimiter(rate=0.001, burst=1, max_keys=2)
+
+    limiter.acquire("a")
+    limiter.acquire("b")
+    limiter.acquire("a")
+    limiter.acquire("c")
+
+    assert len(limiter) == 2
+
+    # 'b' was dropped and starts with a full bucket, 'c' was kept
+    assert limiter.acquire("b")[0]
+    assert not limiter.acquire("c")[0]
+
+def test_invalid_limits():
+    with pytest.raises(ValueError):
+        TokenBucketLimiter(rate=0, burst=1, max_keys=10)
+
+    with pytest.raises(ValueError):
+        TokenBucketLimiter(rate=1, burst=0, max_keys=10)
+
+
+def test_sliding_window_limit():
+    limiter = SlidingWindowLimiter(limit=3, window=60, max_keys=10)
+
+    assert [limiter.acquire("user1@gmail.com")[0] for _ in range(4)] == [True, True, True, False]
+
+    allowed, retry_after = limiter.acquire("user1@gmail.com")
+
+    assert not allowed
+    assert 0 < retry_after <= 120
+
+    assert limiter.acquire("user2@gmail.com")[0]
+
+def test_sliding_window_slides():
+    limiter = SlidingWindowLimiter(limit=2, window=0.05, max_keys=10)
+
+    assert limiter.acquire("key")[0]
+    assert limiter.acquire("key")[0]
+    assert not limiter.acquire("key")[0]
+
+    # Both windows have slid out
+    time.sleep(0.11)
+
+    assert limiter.acquire("key")[0]
+
+def test_sliding_window_memory_is_bounded():
+    limiter = SlidingWindowLimiter(limit=1, window=60, max_keys=2)
+
+    for key in ("a", "b", "c", "a"):
+        limiter.acquire(key)
+
+    assert len(limiter) == 2
+
+    with pytest.raises(ValueError):
+        SlidingWindowLimiter(limit=0, window=60, max_keys=10)
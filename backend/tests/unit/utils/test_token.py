@@ -0,0 +1,60 @@
+import time
+from itsdangerous import URLSafeTimedSerializer
+from utils.token import TokenService, TokenStatus
+
+
+SALT = "salt"
+
+
+def test_tokens_are_compatible_with_itsdangerous():
+    service = TokenService(secret_keys=["secret"], salt=SALT, max_age=60)
+    serializer = URLSafeTimedSerializer("secret")
+
+    # Links sent before the token service are still valid and the other way round
+    assert service.validate(serializer.dumps("user1@gmail.com", salt=SALT)) == (True, None, "user1@gmail.com")
+    assert serializer.loads(service.generate("user2@gmail.com")[2], salt=SALT, max_age=60) == "user2@gmail.com"
+
+def test_invalid_and_expired_tokens(monkeypatch):
+    service = TokenService(secret_keys=["secret"], salt=SALT, max_age=60)
+    token = service.generate("user1@gmail.com")[2]
+
+    assert not service.validate(token[:-2])[0]
+    assert not service.validate("abc")[0]
+    assert not TokenService(secret_keys=["other"], salt=SALT, max_age=60).validate(token)[0]
+
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 61)
+
+    assert service.validate(token) == (False, "Email confirmation link is invalid or has expired.", None)
+
+def test_rotation_keeps_recent_keys():
+    service = TokenService(secret_keys=["key1"], salt=SALT, max_age=60, max_active_keys=2)
+    old_token = service.generate("user1@gmail.com")[2]
+
+    service.rotate("key2")
+    new_token = service.generate("user2@gmail.com")[2]
+
+    assert service.validate(old_token)[0]
+    assert TokenService(secret_keys=["key2"], salt=SALT, max_age=60).validate(new_token)[0]
+
+    # Third key retires the first one
+    service.rotate("key3")
+
+    assert not service.validate(old_token)[0]
+    assert service.validate(new_token)[0]
+    assert service.stats()['active_keys'] == 2
+
+def test_validate_many():
+    service = TokenService(secret_keys=["secret"], salt=SALT, max_age=60)
+    expired = TokenService(secret_keys=["secret"], salt=SALT, max_age=-1)
+
+    tokens = [service.generate("user1@gmail.com")[2], "abc", service.generate("user2@gmail.com")[2]]
+
+    is_success, message, result = service.validate_many(tokens)
+
+    assert is_success
+    assert [item['status'] for item in result] == [TokenStatus.VALID, TokenStatus.INVALID, TokenStatus.VALID]
+    assert [item['email'] for item in result] == ["user1@gmail.com", None, "user2@gmail.com"]
+    assert result[0]['issued_at'] is not None
+
+    assert expired.validate_many(tokens[:1])[2][0]['status'] == TokenStatus.EXPIRED
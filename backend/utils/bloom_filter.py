@@ -0,0 +1,110 @@
+"""Bloom filter
+
+SENECA GLOBAL CONFIDENTIAL & PROPRIETARY
+
+@file bloom_filter.py
+@author Dilip Kumar Sharma
+@copyright Seneca Global
+@date 18th Oct 2026
+
+About; -
+--------
+    Compact probabilistic set of strings.
+
+Working; -
+----------
+    Every item sets 'k' bits of a fixed size bit array. An item is possibly present
+    when all of its bits are set and definitely absent otherwise. Size of bit array
+    and number of bits per item are derived from expected capacity and accepted
+    false positive rate. Bit positions are derived from one blake2b digest using
+    double hashing.
+
+Uses; -
+-------
+    This module is used as negative cache for blacklisted emails.
+
+Reference; -
+------------
+    https://en.wikipedia.org/wiki/Bloom_filter
+"""
+
+import sys
+import math
+import hashlib
+
+
+class BloomFilter:
+    """Bloom filter for strings.
+
+    Args:
+        capacity (int): Expected number of items
+        false_positive_rate (float): Accepted false positive rate when capacity is reached
+    """
+    def __init__(self, capacity: int, false_positive_rate: float) -> None:
+        if capacity < 1:
+            raise ValueError("Capacity should be at least 1.")
+
+        if not 0 < false_positive_rate < 1:
+            raise ValueError("False positive rate should be between 0 and 1.")
+
+        self._capacity = capacity
+        self._false_positive_rate = false_positive_rate
+
+        self._bit_count = max(8, math.ceil(-capacity * math.log(false_positive_rate) / (math.log(2) ** 2)))
+        self._hash_count = max(1, round(self._bit_count / capacity * math.log(2)))
+        self._bits = bytearray((self._bit_count + 7) // 8)
+        self._item_count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+
+        for i in range(self._hash_count):
+            yield (first + i * second) % self._bit_count
+
+    def add(self, item: str) -> None:
+        """Add item to the filter.
+
+        Args:
+            item (str): Item to be added
+        """
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+        self._item_count += 1
+
+    def __contains__(self, item: str) -> bool:
+        for position in self._positions(item):
+            if not self._bits[position >> 3] & (1 << (position & 7)):
+                return False
+
+        return True
+
+    def __len__(self) -> int:
+        return self._item_count
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def false_positive_rate(self) -> float:
+        return self._false_positive_rate
+
+    @property
+    def bit_count(self) -> int:
+        return self._bit_count
+
+    @property
+    def hash_count(self) -> int:
+        return self._hash_count
+
+    @property
+    def memory_bytes(self) -> int:
+        """Memory used by the bit array."""
+        return sys.getsizeof(self._bits)
+
+    def estimated_false_positive_rate(self) -> float:
+        """False positive rate expected for number of items added so far."""
+        return (1 - math.exp(-self._hash_count * self._item_count / self._bit_count)) ** self._hash_count
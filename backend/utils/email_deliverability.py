@@ -0,0 +1,378 @@
+"""Email deliverability
+
+SENECA GLOBAL CONFIDENTIAL & PROPRIETARY
+
+@file email_deliverability.py
+@author Dilip Kumar Sharma
+@copyright Seneca Global
+@date 18th Oct 2026
+
+About; -
+--------
+    Validates email format and checks that domain of the email accepts emails, without
+    a dns lookup on every sign up.
+
+Working; -
+----------
+    EMAIL_DELIVERABILITY_MODE selects how much is checked.
+
+    syntax : Only format of the email is validated, no network call is made.
+    cached : Domain is looked up once, result is kept in an LRU cache of
+             EMAIL_DOMAIN_CACHE_CAPACITY domains. Deliverable domains are kept for
+             EMAIL_DOMAIN_CACHE_POSITIVE_TTL seconds, undeliverable domains and domains
+             which could not be looked up (timeout, no nameservers) are kept for
+             EMAIL_DOMAIN_CACHE_NEGATIVE_TTL seconds. Concurrent lookups of a domain are
+             done only once.
+    dns    : Domain is looked up for every email, as email-validator does by default.
+
+    Deliverability is checked only when email_validator.CHECK_DELIVERABILITY is set, so
+    the global switch of email-validator keeps working.
+
+    When EMAIL_DOMAIN_REFRESH_INTERVAL is positive, a background thread looks up again
+    domains used since last refresh which expire before next refresh, so popular
+    domains never miss the cache. A failed refresh is logged and counted, the thread
+    goes on with the next one.
+
+    EMAIL_DELIVERABILITY_RESOLVER selects the resolver. 'dns' queries nameservers with
+    EMAIL_DELIVERABILITY_TIMEOUT seconds timeout. 'local' answers from
+    EMAIL_DELIVERABILITY_LOCAL_MX, a dict of domain and its mail servers, and is used
+    to run offline.
+
+Uses; -
+-------
+    This module is used by validation module.
+
+Reference; -
+------------
+    https://pypi.org/project/email-validator/
+    https://www.rfc-editor.org/rfc/rfc5321#section-5
+"""
+
+import os
+import time
+import threading
+import statistics
+from collections import OrderedDict, deque
+import dns.resolver
+import email_validator
+from email_validator import validate_email, EmailNotValidError
+from email_validator.deliverability import validate_email_deliverability
+from utils.insurance_logger import InsuranceLogger
+
+
+DELIVERABILITY_MODES = ('syntax', 'cached', 'dns')
+RESOLVERS = ('dns', 'local')
+
+# Number of latest validations whose latency is reported
+LATENCY_SAMPLES = 1000
+
+
+class MxRecord:
+    __slots__ = ('preference', 'exchange')
+
+    def __init__(self, preference: int, exchange: str) -> None:
+        self.preference = preference
+        self.exchange = exchange
+
+
+class LocalResolver:
+    """Answers MX queries from a dict instead of nameservers.
+
+    Args:
+        mx_records (dict): Domain and list of its mail servers, empty list for a domain
+                           which does not accept emails
+        latency (float, optional): Seconds every query takes. Defaults to 0.
+    """
+    def __init__(self, mx_records: dict, latency: float = 0) -> None:
+        self._mx_records = {domain.lower(): list(servers) for domain, servers in mx_records.items()}
+        self._latency = latency
+        self.queries = 0
+
+    def resolve(self, domain: str, rdtype: str) -> list:
+        self.queries += 1
+
+        if self._latency:
+            time.sleep(self._latency)
+
+        servers = self._mx_records.get(domain.lower().rstrip('.'))
+
+        if servers is None:
+            raise dns.resolver.NXDOMAIN()
+
+        if rdtype != 'MX' or not servers:
+            raise dns.resolver.NoAnswer()
+
+        return [MxRecord(preference=10 * (index + 1), exchange=server) for index, server in enumerate(servers)]
+
+
+class DomainResult:
+    __slots__ = ('deliverable', 'message', 'expires_at', 'used')
+
+    def __init__(self, deliverable: bool, message: str, expires_at: float) -> None:
+        self.deliverable = deliverable
+        self.message = message
+        self.expires_at = expires_at
+        self.used = False
+
+
+class EmailDeliverabilityChecker:
+    """Validates emails with deliverability check of their domain.
+
+    Args:
+        mode (str): One of DELIVERABILITY_MODES
+        resolver: Resolver with resolve(domain, rdtype) method, created by resolver_factory if None
+        capacity (int): Maximum domains kept in cache
+        positive_ttl (float): Seconds a deliverable domain is kept
+        negative_ttl (float): Seconds an undeliverable or unknown domain is kept
+        refresh_interval (float): Seconds between refreshes of popular domains, 0 to disable
+        resolver_factory (optional): Function creating resolver on first lookup
+    """
+    def __init__(self, mode: str, resolver, capacity: int, positive_ttl: float, negative_ttl: float,
+                 refresh_interval: float, resolver_factory=None) -> None:
+        if mode not in DELIVERABILITY_MODES:
+            raise ValueError(f"Invalid email deliverability mode '{mode}'. Available modes {DELIVERABILITY_MODES}.")
+
+        self._mode = mode
+        self._resolver = resolver
+        self._resolver_factory = resolver_factory
+        self._capacity = capacity
+        self._positive_ttl = positive_ttl
+        self._negative_ttl = negative_ttl
+        self._refresh_interval = refresh_interval
+
+        self._cache = OrderedDict()
+        self._lookups_in_flight = dict()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+        self._hits = 0
+        self._misses = 0
+        self._lookups = 0
+        self._refreshes = 0
+        self._refresh_failures = 0
+        self._unknown = 0
+
+    @property
+    def mode(self) -> str:
+        return self._mode
+
+    def _get_resolver(self):
+        if self._resolver is None:
+            self._resolver = self._resolver_factory()
+
+        return self._resolver
+
+    def _lookup(self, domain: str, domain_i18n: str) -> DomainResult:
+        """Look up the domain and keep the result in cache."""
+        self._lookups += 1
+
+        try:
+            info = validate_email_deliverability(domain, domain_i18n, dns_resolver=self._get_resolver())
+            deliverable, message = True, None
+        except EmailNotValidError as err:
+            info, deliverable, message = None, False, str(err)
+        except dns.resolver.NoResolverConfiguration:
+            info, deliverable, message = {'unknown-deliverability': 'no_resolver'}, True, None
+
+        # Timeout and failing nameservers do not reject the email, but are retried soon
+        unknown = info is not None and 'unknown-deliverability' in info
+
+        if unknown:
+            self._unknown += 1
+
+        result = DomainResult(
+                    deliverable=deliverable,
+                    message=message,
+                    expires_at=time.monotonic() + (self._positive_ttl if deliverable and not unknown else self._negative_ttl)
+                )
+
+        with self._lock:
+            self._cache[domain] = result
+            self._cache.move_to_end(domain)
+
+            while len(self._cache) > self._capacity:
+                self._cache.popitem(last=False)
+
+        return result
+
+    def _cached_lookup(self, domain: str, domain_i18n: str) -> DomainResult:
+        while True:
+            with self._lock:
+                result = self._cache.get(domain)
+
+                if result is not None and result.expires_at > time.monotonic():
+                    self._cache.move_to_end(domain)
+                    result.used = True
+                    self._hits += 1
+                    return result
+
+                lookup = self._lookups_in_flight.get(domain)
+
+                if lookup is None:
+                    lookup = self._lookups_in_flight[domain] = threading.Event()
+                    self._misses += 1
+                    break
+
+            # Another request is looking up the same domain
+            lookup.wait()
+
+        try:
+            return self._lookup(domain, domain_i18n)
+        finally:
+            with self._lock:
+                self._lookups_in_flight.pop(domain, None)
+            lookup.set()
+
+    def check(self, email: str) -> tuple:
+        """Validate email.
+
+        Args:
+            email (str): Email to be validated
+
+        Returns:
+            tuple: bool for valid or not, normalized email if valid otherwise the reason
+        """
+        start = time.perf_counter()
+
+        try:
+            try:
+                validated_email = validate_email(email, check_deliverability=False)
+            except EmailNotValidError as err:
+                return False, str(err)
+
+            if self._mode == 'syntax' or not email_validator.CHECK_DELIVERABILITY:
+                return True, validated_email.email
+
+            if self._refresh_interval > 0 and (self._thread is None or self._pid != os.getpid()):
+                self._start_refresher()
+
+            if self._mode == 'dns':
+                result = self._lookup(validated_email.ascii_domain, validated_email.domain)
+            else:
+                result = self._cached_lookup(validated_email.ascii_domain, validated_email.domain)
+
+            if not result.deliverable:
+                return False, result.message
+
+            return True, validated_email.email
+        finally:
+            self._latencies.append(time.perf_counter() - start)
+
+    def _start_refresher(self) -> None:
+        with self._lock:
+            # Thread of the master process does not exist after gunicorn forks workers
+            if self._thread is None or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run_refresher, name='email-domain-refresher', daemon=True)
+                self._thread.start()
+
+    def _run_refresher(self) -> None:
+        while True:
+            time.sleep(self._refresh_interval)
+
+            try:
+                self.refresh()
+            except Exception as err:
+                # Domains not refreshed are looked up again on their next miss
+                self._refresh_failures += 1
+                InsuranceLogger.log_error(f"Failed to refresh email domains. {str(err)}")
+
+    def refresh(self) -> int:
+        """Look up again domains used since last refresh which expire before next refresh.
+
+        Returns:
+            int: Number of domains looked up
+        """
+        deadline = time.monotonic() + self._refresh_interval
+
+        with self._lock:
+            domains = [domain for domain, result in self._cache.items() if result.used and result.expires_at <= deadline]
+
+        for domain in domains:
+            # Only ascii domain is cached, reason of an undeliverable domain shows it
+            self._lookup(domain, domain)
+            self._refreshes += 1
+
+        return len(domains)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> dict:
+        """Cache counters and validation latency.
+
+        Returns:
+            dict: Deliverability statistics
+        """
+        latencies = sorted(self._latencies)
+
+        return {
+            'mode': self._mode,
+            'domains': len(self._cache),
+            'hits': self._hits,
+            'misses': self._misses,
+            'lookups': self._lookups,
+            'unknown': self._unknown,
+            'refreshes': self._refreshes,
+            'refresh_failures': self._refresh_failures,
+            'latency_p50_ms': round(statistics.median(latencies) * 1e3, 3) if latencies else None,
+            'latency_p99_ms': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1e3, 3) if latencies else None,
+        }
+
+
+def create_resolver(resolver: str, timeout: float, local_mx: dict):
+    """Create resolver of given type.
+
+    Args:
+        resolver (str): One of RESOLVERS
+        timeout (float): Seconds a dns lookup may take
+        local_mx (dict): Domain and list of its mail servers, used by local resolver
+
+    Returns:
+        Resolver with resolve(domain, rdtype) method
+    """
+    if resolver == 'local':
+        return LocalResolver(mx_records=local_mx)
+    elif resolver == 'dns':
+        dns_resolver = dns.resolver.Resolver()
+        dns_resolver.lifetime = timeout
+        return dns_resolver
+
+    raise ValueError(f"Invalid email deliverability resolver '{resolver}'. Available resolvers {RESOLVERS}.")
+
+
+_email_deliverability_checker = None
+
+def get_email_deliverability_checker() -> EmailDeliverabilityChecker:
+    """Email deliverability checker of this gunicorn worker, created from configuration on first use.
+
+    Returns:
+        EmailDeliverabilityChecker: Shared checker
+    """
+    global _email_deliverability_checker
+
+    if _email_deliverability_checker is None:
+        from apps import configuration
+
+        if configuration.EMAIL_DELIVERABILITY_RESOLVER not in RESOLVERS:
+            raise ValueError(f"Invalid email deliverability resolver '{configuration.EMAIL_DELIVERABILITY_RESOLVER}'. Available resolvers {RESOLVERS}.")
+
+        _email_deliverability_checker = EmailDeliverabilityChecker(
+                                            mode=configuration.EMAIL_DELIVERABILITY_MODE,
+                                            resolver=None,
+                                            capacity=configuration.EMAIL_DOMAIN_CACHE_CAPACITY,
+                                            positive_ttl=configuration.EMAIL_DOMAIN_CACHE_POSITIVE_TTL,
+                                            negative_ttl=configuration.EMAIL_DOMAIN_CACHE_NEGATIVE_TTL,
+                                            refresh_interval=configuration.EMAIL_DOMAIN_REFRESH_INTERVAL,
+                                            # Reading resolv.conf is left to first lookup, syntax mode never does
+                                            resolver_factory=lambda: create_resolver(
+                                                                        resolver=configuration.EMAIL_DELIVERABILITY_RESOLVER,
+                                                                        timeout=configuration.EMAIL_DELIVERABILITY_TIMEOUT,
+                                                                        local_mx=configuration.EMAIL_DELIVERABILITY_LOCAL_MX
+                                                                    )
+                                        )
+
+    return _email_deliverability_checker
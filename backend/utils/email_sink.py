@@ -0,0 +1,334 @@
+"""Email sink
+
+SENECA GLOBAL CONFIDENTIAL & PROPRIETARY
+
+@file email_sink.py
+@author Dilip Kumar Sharma
+@copyright Seneca Global
+@date 18th Oct 2026
+
+About; -
+--------
+    Keeps a copy of every email handed over to celery, for debugging and tests.
+
+Working; -
+----------
+    EMAIL_SINK_MODE selects the sink.
+
+    none   : Emails are not kept.
+    memory : Last EMAIL_SINK_CAPACITY emails are kept in a ring buffer. Used by tests.
+    file   : Emails are appended to a file in EMAIL_SINK_DIR by a background thread.
+             Request threads only put the email on a bounded queue; when the queue is
+             full the email is dropped and counted, the request never waits for disk.
+             The thread writes up to EMAIL_SINK_BATCH_SIZE emails with one write and
+             flush, at least every EMAIL_SINK_FLUSH_INTERVAL seconds. File is rotated
+             once it grows beyond EMAIL_SINK_MAX_BYTES, keeping EMAIL_SINK_BACKUP_COUNT
+             old files. Every gunicorn worker writes its own file, so workers never
+             clobber each other.
+
+Uses; -
+-------
+    This module is used by emails module.
+
+Reference; -
+------------
+    TBD
+"""
+
+import os
+import time
+import queue
+import atexit
+import threading
+from datetime import datetime, timezone
+from collections import deque
+
+
+SINK_MODES = ('none', 'memory', 'file')
+
+
+class EmailMessage:
+    """Email kept by a sink.
+
+    Args:
+        recipient (str): Email address of the recipient
+        subject (str): Subject of the email
+        body (str): Rendered email
+    """
+    __slots__ = ('recipient', 'subject', 'body', 'created_at')
+
+    def __init__(self, recipient: str, subject: str, body: str) -> None:
+        self.recipient = recipient
+        self.subject = subject
+        self.body = body
+        self.created_at = datetime.now(timezone.utc)
+
+    def format(self) -> str:
+        return f"Date: {self.created_at.isoformat()}\nTo: {self.recipient}\nSubject: {self.subject}\n\n{self.body}\n\n"
+
+
+class NullEmailSink:
+    """Does not keep emails."""
+    mode = 'none'
+
+    def send(self, recipient: str, subject: str, body: str) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def stats(self) -> dict:
+        return {'mode': self.mode}
+
+
+class MemoryEmailSink(NullEmailSink):
+    """Keeps last emails in memory.
+
+    Args:
+        capacity (int): Number of emails kept
+    """
+    mode = 'memory'
+
+    def __init__(self, capacity: int) -> None:
+        self._messages = deque(maxlen=capacity)
+        self._sent = 0
+
+    def send(self, recipient: str, subject: str, body: str) -> None:
+        self._messages.append(EmailMessage(recipient=recipient, subject=subject, body=body))
+        self._sent += 1
+
+    def messages(self, recipient: str = None) -> list:
+        """Emails kept so far, oldest first.
+
+        Args:
+            recipient (str, optional): Only emails of this recipient. Defaults to all.
+
+        Returns:
+            list: EmailMessage objects
+        """
+        return [message for message in list(self._messages) if recipient is None or message.recipient == recipient]
+
+    def clear(self) -> None:
+        self._messages.clear()
+
+    def stats(self) -> dict:
+        return {'mode': self.mode, 'sent': self._sent, 'kept': len(self._messages)}
+
+
+class FileEmailSink(NullEmailSink):
+    """Appends emails to a rotated file from a background thread.
+
+    Args:
+        directory (str): Directory of email files
+        max_bytes (int): Size after which file is rotated
+        backup_count (int): Number of rotated files kept
+        batch_size (int): Maximum emails written together
+        flush_interval (float): Maximum seconds an email waits before it is written
+        queue_size (int): Maximum emails waiting to be written
+    """
+    mode = 'file'
+
+    def __init__(self, directory: str, max_bytes: int, backup_count: int, batch_size: int,
+                 flush_interval: float, queue_size: int) -> None:
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._backup_count = backup_count
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._file = None
+
+        self._sent = 0
+        self._written = 0
+        self._dropped = 0
+        self._batches = 0
+        self._rotations = 0
+
+        atexit.register(self.close)
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self._directory, f"emails.{os.getpid()}.txt")
+
+    def _start(self) -> None:
+        with self._lock:
+            # Thread of the master process does not exist after gunicorn forks workers
+            if self._thread is None or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._file = None
+                self._thread = threading.Thread(target=self._run, name='email-sink', daemon=True)
+                self._thread.start()
+
+    def send(self, recipient: str, subject: str, body: str) -> None:
+        if self._thread is None or self._pid != os.getpid():
+            self._start()
+
+        try:
+            self._queue.put_nowait(EmailMessage(recipient=recipient, subject=subject, body=body))
+            self._sent += 1
+        except queue.Full:
+            self._dropped += 1
+
+    def _run(self) -> None:
+        stop = False
+
+        while not stop:
+            message = self._queue.get()
+
+            if message is None:
+                self._queue.task_done()
+                return
+
+            batch = [message]
+            deadline = time.monotonic() + self._flush_interval
+
+            while len(batch) < self._batch_size:
+                timeout = deadline - time.monotonic()
+
+                try:
+                    message = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+                if message is None:
+                    # Stop after writing what we have
+                    self._queue.task_done()
+                    stop = True
+                    break
+
+                batch.append(message)
+
+            self._write(batch)
+
+            for _ in batch:
+                self._queue.task_done()
+
+    def _write(self, batch: list) -> None:
+        try:
+            if self._file is None:
+                os.makedirs(self._directory, exist_ok=True)
+                self._file = open(self.path, mode='a', encoding='utf-8')
+
+            self._file.write(''.join(message.format() for message in batch))
+            self._file.flush()
+
+            self._written += len(batch)
+            self._batches += 1
+
+            if self._file.tell() > self._max_bytes:
+                self._rotate()
+        except OSError:
+            self._dropped += len(batch)
+
+    def _rotate(self) -> None:
+        self._file.close()
+        self._file = None
+
+        path = self.path
+
+        for index in range(self._backup_count - 1, 0, -1):
+            if os.path.exists(f"{path}.{index}"):
+                os.replace(f"{path}.{index}", f"{path}.{index + 1}")
+
+        if self._backup_count > 0:
+            os.replace(path, f"{path}.1")
+        else:
+            os.remove(path)
+
+        self._rotations += 1
+
+    def flush(self) -> None:
+        """Wait till all emails sent so far are written."""
+        if self._thread is not None and self._pid == os.getpid():
+            self._queue.join()
+
+    def close(self) -> None:
+        """Write pending emails and stop the thread."""
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid():
+                return
+
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def stats(self) -> dict:
+        return {
+            'mode': self.mode,
+            'sent': self._sent,
+            'written': self._written,
+            'dropped': self._dropped,
+            'queued': self._queue.qsize(),
+            'batches': self._batches,
+            'rotations': self._rotations,
+        }
+
+
+def create_email_sink(mode: str, directory: str, capacity: int, max_bytes: int, backup_count: int,
+                      batch_size: int, flush_interval: float) -> NullEmailSink:
+    """Create email sink of given mode.
+
+    Args:
+        mode (str): One of SINK_MODES
+        directory (str): Directory of email files, used by file sink
+        capacity (int): Emails kept by memory sink, emails waiting to be written by file sink
+        max_bytes (int): Size after which file is rotated
+        backup_count (int): Number of rotated files kept
+        batch_size (int): Maximum emails written together
+        flush_interval (float): Maximum seconds an email waits before it is written
+
+    Returns:
+        NullEmailSink: Email sink
+    """
+    if mode == 'none':
+        return NullEmailSink()
+    elif mode == 'memory':
+        return MemoryEmailSink(capacity=capacity)
+    elif mode == 'file':
+        return FileEmailSink(
+                    directory=directory,
+                    max_bytes=max_bytes,
+                    backup_count=backup_count,
+                    batch_size=batch_size,
+                    flush_interval=flush_interval,
+                    queue_size=capacity
+                )
+
+    raise ValueError(f"Invalid email sink mode '{mode}'. Available modes {SINK_MODES}.")
+
+
+_email_sink = None
+
+def get_email_sink() -> NullEmailSink:
+    """Email sink of this gunicorn worker, created from configuration on first use.
+
+    Returns:
+        NullEmailSink: Shared email sink
+    """
+    global _email_sink
+
+    if _email_sink is None:
+        from apps import configuration
+
+        _email_sink = create_email_sink(
+                            mode=configuration.EMAIL_SINK_MODE,
+                            directory=configuration.EMAIL_SINK_DIR,
+                            capacity=configuration.EMAIL_SINK_CAPACITY,
+                            max_bytes=configuration.EMAIL_SINK_MAX_BYTES,
+                            backup_count=configuration.EMAIL_SINK_BACKUP_COUNT,
+                            batch_size=configuration.EMAIL_SINK_BATCH_SIZE,
+                            flush_interval=configuration.EMAIL_SINK_FLUSH_INTERVAL
+                        )
+
+    return _email_sink
@@ -29,6 +29,11 @@ class HttpStatus:
     HTTP_202_ACCEPTED =202
     HTTP_204_NO_CONTENT =204
     HTTP_400_BAD_REQUEST = 400
+    HTTP_401_UNAUTHORIZED = 401
+    HTTP_403_FORBIDDEN = 403
     HTTP_404_NOT_FOUND = 404
+    HTTP_409_CONFLICT = 409
     HTTP_422_UNPROCESSABLE_ENTITY = 422
-    HTTP_500_INTERNAL_SERVER_ERROR = 500
\ No newline at end of file
+    HTTP_429_TOO_MANY_REQUESTS = 429
+    HTTP_500_INTERNAL_SERVER_ERROR = 500
+    HTTP_503_SERVICE_UNAVAILABLE = 503
\ No newline at end of file
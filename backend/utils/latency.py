@@ -0,0 +1,82 @@
+"""Latency of request stages
+
+SENECA GLOBAL CONFIDENTIAL & PROPRIETARY
+
+@file latency.py
+@author Dilip Kumar Sharma
+@copyright Seneca Global
+@date 18th Oct 2026
+
+About; -
+--------
+    Keeps latest latencies of every stage of a request and reports their percentiles.
+
+Working; -
+----------
+    Every stage keeps its last SAMPLES latencies in a ring buffer, so percentiles
+    follow current load and memory stays bounded. Percentiles are computed only when
+    statistics are asked for.
+
+Uses; -
+-------
+    This module is used by login.
+
+Reference; -
+------------
+    TBD
+"""
+
+import time
+import statistics
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+
+class StageLatencies:
+    """Latest latencies of named stages.
+
+    Args:
+        samples (int, optional): Number of latest latencies kept per stage. Defaults to 1000.
+    """
+    def __init__(self, samples: int = 1000) -> None:
+        self._samples = samples
+        self._latencies = dict()
+        self._counts = dict()
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            if stage not in self._latencies:
+                self._latencies[stage] = deque(maxlen=self._samples)
+                self._counts[stage] = 0
+
+            self._latencies[stage].append(seconds)
+            self._counts[stage] += 1
+
+    @contextmanager
+    def measure(self, stage: str):
+        """Record time taken by the block as latency of the stage."""
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def stats(self) -> dict:
+        """Count, p50 and p99 of every stage in milliseconds.
+
+        Returns:
+            dict: Statistics by stage
+        """
+        with self._lock:
+            latencies = {stage: sorted(values) for stage, values in self._latencies.items()}
+
+        return {
+            stage: {
+                'count': self._counts[stage],
+                'p50_ms': round(statistics.median(values) * 1e3, 3),
+                'p99_ms': round(values[min(len(values) - 1, int(len(values) * 0.99))] * 1e3, 3),
+            } for stage, values in latencies.items()
+        }
@@ -0,0 +1,229 @@
+"""Rate limiter
+
+SENECA GLOBAL CONFIDENTIAL & PROPRIETARY
+
+@file rate_limiter.py
+@author Dilip Kumar Sharma
+@copyright Seneca Global
+@date 18th Oct 2026
+
+About; -
+--------
+    Token buckets and sliding windows keyed by client ip, email or any other string.
+
+Working; -
+----------
+    Every key has a bucket of 'burst' tokens refilled at 'rate' tokens per second. A
+    request takes one token and is allowed only if a token is available; otherwise
+    the limiter tells after how many seconds next token is available.
+
+    Buckets are refilled lazily when used, so idle keys cost nothing but memory. At most
+    'max_keys' buckets are kept; least recently used buckets are dropped first, which
+    only makes the dropped key start again with a full bucket.
+
+    A sliding window allows at most 'limit' requests of a key in any 'window' seconds.
+    It keeps only counts of current and previous fixed window per key, and weighs the
+    previous count by the part of it still inside the sliding window, so memory per key
+    is constant however many requests are made. Rejected requests are not counted.
+    Keys are dropped least recently used first, like buckets.
+
+    RedisSlidingWindowLimiter keeps the same counts in redis, shared by all workers.
+    Counts are read and incremented in two round trips, so concurrent requests of a key
+    may exceed the limit by a few.
+
+Uses; -
+-------
+    This module is used by admission control of api requests.
+
+Reference; -
+------------
+    https://en.wikipedia.org/wiki/Token_bucket
+    https://blog.cloudflare.com/counting-things-a-lot-of-different-things/
+"""
+
+import time
+import threading
+from collections import OrderedDict
+
+
+class TokenBucketLimiter:
+    """Token bucket per key.
+
+    Args:
+        rate (float): Tokens added per second
+        burst (int): Maximum tokens in a bucket
+        max_keys (int): Maximum number of buckets kept
+    """
+    def __init__(self, rate: float, burst: int, max_keys: int) -> None:
+        if rate <= 0 or burst < 1:
+            raise ValueError("Rate should be positive and burst should be at least 1.")
+
+        self._rate = rate
+        self._burst = burst
+        self._max_keys = max_keys
+
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str) -> tuple:
+        """Take a token from bucket of the key.
+
+        Args:
+            key (str): Key of the bucket
+
+        Returns:
+            tuple: bool for allowed or not, seconds after which a token is available if not allowed
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            bucket = self._buckets.get(key)
+
+            if bucket is None:
+                tokens = self._burst
+            else:
+                tokens = min(self._burst, bucket[0] + (now - bucket[1]) * self._rate)
+                self._buckets.move_to_end(key)
+
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now)
+                allowed, retry_after = True, 0.0
+            else:
+                self._buckets[key] = (tokens, now)
+                allowed, retry_after = False, (1 - tokens) / self._rate
+
+            if len(self._buckets) > self._max_keys:
+                self._buckets.popitem(last=False)
+
+        return allowed, retry_after
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+def _sliding_window_acquire(limit: int, window: float, now: float, window_index: int, current: int, previous: int) -> tuple:
+    """Whether one more request fits in the sliding window, seconds to wait otherwise."""
+    elapsed = now / window - window_index
+
+    if previous * (1 - elapsed) + current < limit:
+        return True, 0.0
+
+    if current < limit:
+        # Enough of previous window has slid out
+        return False, ((1 - (limit - current) / previous) - elapsed) * window
+
+    # Requests of this window slide out during next window
+    return False, (1 - elapsed + 1 - limit / current) * window
+
+
+class SlidingWindowLimiter:
+    """Sliding window per key, with constant memory per key.
+
+    Args:
+        limit (int): Requests allowed in any window
+        window (float): Seconds of the window
+        max_keys (int): Maximum number of keys kept
+    """
+    def __init__(self, limit: int, window: float, max_keys: int) -> None:
+        if limit < 1 or window <= 0:
+            raise ValueError("Limit should be at least 1 and window should be positive.")
+
+        self._limit = limit
+        self._window = window
+        self._max_keys = max_keys
+
+        # key -> [window index, count of that window, count of window before it]
+        self._counts = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str) -> tuple:
+        """Count a request of the key if the window allows it.
+
+        Args:
+            key (str): Key of the window
+
+        Returns:
+            tuple: bool for allowed or not, seconds after which a request is allowed if not allowed
+        """
+        now = time.monotonic()
+        window_index = int(now // self._window)
+
+        with self._lock:
+            counts = self._counts.get(key)
+
+            if counts is None:
+                counts = self._counts[key] = [window_index, 0, 0]
+            else:
+                self._counts.move_to_end(key)
+
+                if counts[0] != window_index:
+                    counts[2] = counts[1] if counts[0] == window_index - 1 else 0
+                    counts[0], counts[1] = window_index, 0
+
+            allowed, retry_after = _sliding_window_acquire(self._limit, self._window, now, window_index, counts[1], counts[2])
+
+            if allowed:
+                counts[1] += 1
+
+            if len(self._counts) > self._max_keys:
+                self._counts.popitem(last=False)
+
+        return allowed, retry_after
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+
+class RedisSlidingWindowLimiter:
+    """Sliding window per key in redis, shared by all workers.
+
+    Args:
+        url (str): Redis url, e.g. redis://redis:6379/1
+        limit (int): Requests allowed in any window
+        window (float): Seconds of the window
+        prefix (str, optional): Prefix of redis keys. Defaults to 'ratelimit:'.
+    """
+    mode = 'redis'
+
+    def __init__(self, url: str, limit: int, window: float, prefix: str = 'ratelimit:') -> None:
+        import redis
+
+        if limit < 1 or window <= 0:
+            raise ValueError("Limit should be at least 1 and window should be positive.")
+
+        self._client = redis.Redis.from_url(url, socket_timeout=0.1, socket_connect_timeout=0.1)
+        self._limit = limit
+        self._window = window
+        self._prefix = prefix
+
+    def acquire(self, key: str) -> tuple:
+        """Count a request of the key if the window allows it, same as SlidingWindowLimiter.
+
+        Raises:
+            redis.RedisError: When redis is unavailable
+        """
+        # Wall clock, shared by all hosts
+        now = time.time()
+        window_index = int(now // self._window)
+        current_key = f"{self._prefix}{key}:{window_index}"
+
+        current, previous = self._client.mget(current_key, f"{self._prefix}{key}:{window_index - 1}")
+
+        allowed, retry_after = _sliding_window_acquire(self._limit, self._window, now, window_index,
+                                                       int(current or 0), int(previous or 0))
+
+        if allowed:
+            pipeline = self._client.pipeline(transaction=False)
+            pipeline.incr(current_key)
+            pipeline.expire(current_key, int(self._window * 2) + 1)
+            pipeline.execute()
+
+        return allowed, retry_after
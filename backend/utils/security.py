@@ -15,16 +15,44 @@ Working; -
 ----------
     This modules generates and validates password
 
+    Password hashes are deliberately expensive, so they are generated by a bounded
+    pool of worker processes instead of the request thread. The request thread only
+    waits for the result, so other threads of the gunicorn worker keep serving
+    requests meanwhile. At most PASSWORD_HASH_MAX_PENDING hashes are queued or running
+    at a time; callers wait up to PASSWORD_HASH_QUEUE_TIMEOUT seconds for a free slot
+    and are rejected after that.
+
+    Hashing method is PASSWORD_HASH_ALGORITHM with PASSWORD_HASH_COST, e.g. 'pbkdf2:sha256'
+    with '600000' iterations or 'scrypt' with '32768:8:1'. When PASSWORD_HASH_WORKERS is 0
+    passwords are hashed on the calling thread.
+
+    Passwords given at login are checked against their hashes by the same pool, within
+    the same PASSWORD_HASH_MAX_PENDING limit. For unknown emails the password is checked
+    against a dummy hash of the configured method, so login takes as long as for a
+    registered email and does not tell which emails are registered.
+
+    Worker processes are started on first use in every gunicorn worker. This module does
+    not import the app at module level, so worker processes stay light. When a worker
+    process dies, e.g. killed by the OOM killer, the pool is broken; hashes running on it
+    fail and the pool is started again for the next ones.
+
 Uses; -
 -------
     This module is used by dao module to generate password hash during user registration.
-    This module could also be used to verify password hash during user login.
+    This module is also used to verify password hash during user login.
 
 Reference; -
 ------------
-    TBD
+    https://docs.python.org/3/library/concurrent.futures.html#processpoolexecutor
 """
 
+import os
+import time
+import secrets
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from werkzeug.security import generate_password_hash, check_password_hash
 
 
@@ -49,4 +77,304 @@ def validate_password_hash(password: str, hashed_password: str) -> str:
     Returns:
         str: _description_
     """
-    return check_password_hash(hashed_password, password=password)
\ No newline at end of file
+    return check_password_hash(hashed_password, password=password)
+
+# Message returned when no hashing slot gets free in time
+HASHER_BUSY = "Server is busy. Please try again later."
+
+
+def _hash_passwords(passwords: list, method: str) -> list:
+    # Runs in worker process
+    return [generate_password_hash(password=password, method=method) for password in passwords]
+
+def _check_password(password: str, password_hash: str) -> bool:
+    # Runs in worker process
+    return check_password_hash(password_hash, password=password)
+
+
+class PasswordHasher:
+    """Hashes passwords in a bounded pool of worker processes.
+
+    Args:
+        algorithm (str): Werkzeug hashing method, e.g. 'pbkdf2:sha256' or 'scrypt'
+        cost (str): Cost of the algorithm, e.g. '600000' iterations for pbkdf2. None for default cost.
+        workers (int): Number of worker processes. 0 hashes on the calling thread.
+        max_pending (int): Maximum number of hashing tasks queued or running
+        queue_timeout (float): Seconds to wait for a free slot before rejecting
+    """
+    def __init__(self, algorithm: str, cost: str, workers: int, max_pending: int, queue_timeout: float) -> None:
+        self._method = f"{algorithm}:{cost}" if cost else algorithm
+        self._workers = workers
+        self._max_pending = max_pending
+        self._queue_timeout = queue_timeout
+
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+
+        self._dummy_hash = None
+
+        self._pending = 0
+        self._hashed = 0
+        self._verified = 0
+        self._rejected = 0
+        self._restarts = 0
+        self._seconds = 0.0
+
+    @property
+    def method(self) -> str:
+        return self._method
+
+    @property
+    def max_pending(self) -> int:
+        return self._max_pending
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of hashing tasks queued or running."""
+        return self._pending
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            # Pool of the master process is not usable after gunicorn forks workers
+            if self._executor is None or self._pid != os.getpid():
+                context = multiprocessing.get_context(
+                                'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+                            )
+                self._executor = ProcessPoolExecutor(max_workers=self._workers, mp_context=context)
+                self._pid = os.getpid()
+
+            return self._executor
+
+    def _discard_executor(self, executor: ProcessPoolExecutor) -> None:
+        """Forget a broken pool, so next hash starts a new one."""
+        with self._lock:
+            if self._executor is not executor:
+                # Already started again by another thread
+                return
+
+            self._executor = None
+            self._restarts += 1
+
+        executor.shutdown(wait=False)
+
+    def _acquire(self) -> bool:
+        if not self._slots.acquire(timeout=self._queue_timeout):
+            with self._lock:
+                self._rejected += 1
+            return False
+
+        with self._lock:
+            self._pending += 1
+
+        return True
+
+    def _release(self, *args) -> None:
+        with self._lock:
+            self._pending -= 1
+
+        self._slots.release()
+
+    def _submit(self, func, *args):
+        if self._workers == 0:
+            try:
+                return func(*args)
+            finally:
+                self._release()
+
+        for attempt in range(2):
+            executor = self._get_executor()
+
+            try:
+                future = executor.submit(func, *args)
+                break
+            except BrokenProcessPool:
+                self._discard_executor(executor)
+
+                if attempt == 1:
+                    self._release()
+                    raise
+            except BaseException:
+                self._release()
+                raise
+
+        def done(future) -> None:
+            self._release()
+
+            # Worker process died while hashing
+            if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+                self._discard_executor(executor)
+
+        future.add_done_callback(done)
+
+        return future
+
+    def _record(self, count: int, start: float) -> None:
+        with self._lock:
+            self._hashed += count
+            self._seconds += time.perf_counter() - start
+
+    def hash_password(self, password: str) -> tuple:
+        """Generate password hash without using CPU of the calling thread.
+
+        Args:
+            password (str): Password to be hashed
+
+        Returns:
+            tuple: status, message, result
+                    status is boolean value indicating success (True) or Failure(False),
+                    message is a string about the error occurred if any, otherwise None,
+                    result is the password hash or None otherwise.
+        """
+        is_success, message, password_hashes = self.hash_passwords([password])
+
+        if not is_success:
+            return False, message, None
+
+        return True, None, password_hashes[0]
+
+    def hash_passwords(self, passwords: list) -> tuple:
+        """Generate hashes of many passwords, spread across all worker processes.
+
+        Args:
+            passwords (list): Passwords to be hashed
+
+        Returns:
+            tuple: status, message, result
+                    status is boolean value indicating success (True) or Failure(False),
+                    message is a string about the error occurred if any, otherwise None,
+                    result is list of password hashes in same order or None otherwise.
+        """
+        start = time.perf_counter()
+
+        batch_size = max(1, -(-len(passwords) // max(1, self._workers)))
+        batches = [passwords[i:i + batch_size] for i in range(0, len(passwords), batch_size)]
+        results = []
+
+        try:
+            for batch in batches:
+                if not self._acquire():
+                    for result in results:
+                        if self._workers != 0:
+                            # Batches submitted so far are not needed anymore
+                            result.cancel()
+
+                    return False, HASHER_BUSY, None
+
+                results.append(self._submit(_hash_passwords, batch, self._method))
+
+            password_hashes = []
+
+            for result in results:
+                password_hashes.extend(result if self._workers == 0 else result.result())
+        except Exception as err:
+            return False, f"Failed to generate password hash. {str(err)}", None
+
+        self._record(len(passwords), start)
+
+        return True, None, password_hashes
+
+    def verify_password(self, password: str, password_hash: str) -> tuple:
+        """Check password against its hash without using CPU of the calling thread.
+
+        Args:
+            password (str): Password given by customer
+            password_hash (str): Stored password hash, None to check against dummy hash
+
+        Returns:
+            tuple: status, message, result
+                    status is boolean value indicating success (True) or Failure(False),
+                    message is HASHER_BUSY or a string about the error occurred if any, otherwise None,
+                    result is True if password matches, False otherwise, None on failure.
+        """
+        unknown = password_hash is None
+
+        if unknown:
+            is_success, message, password_hash = self.get_dummy_hash()
+
+            if not is_success:
+                return False, message, None
+
+        if not self._acquire():
+            return False, HASHER_BUSY, None
+
+        try:
+            result = self._submit(_check_password, password, password_hash)
+            matches = result if self._workers == 0 else result.result()
+        except Exception as err:
+            return False, f"Failed to verify password hash. {str(err)}", None
+
+        with self._lock:
+            self._verified += 1
+
+        # Unknown emails never match, even if the password matches the dummy hash
+        return True, None, matches and not unknown
+
+    def get_dummy_hash(self) -> tuple:
+        """Hash of a random password with configured method, created on first use.
+
+        Returns:
+            tuple: status, message, result
+                    status is boolean value indicating success (True) or Failure(False),
+                    message is a string about the error occurred if any, otherwise None,
+                    result is the dummy hash or None otherwise.
+        """
+        if self._dummy_hash is None:
+            is_success, message, dummy_hash = self.hash_password(secrets.token_urlsafe(16))
+
+            if not is_success:
+                return False, message, None
+
+            self._dummy_hash = dummy_hash
+
+        return True, None, self._dummy_hash
+
+    def stats(self) -> dict:
+        """Queue depth and throughput of the pool.
+
+        Returns:
+            dict: Hashing statistics
+        """
+        return {
+            'method': self._method,
+            'workers': self._workers,
+            'queue_depth': self._pending,
+            'max_pending': self._max_pending,
+            'hashed': self._hashed,
+            'verified': self._verified,
+            'rejected': self._rejected,
+            'restarts': self._restarts,
+            'average_seconds': self._seconds / self._hashed if self._hashed else None,
+        }
+
+    def shutdown(self) -> None:
+        """Stop worker processes."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+_password_hasher = None
+
+def get_password_hasher() -> PasswordHasher:
+    """Password hasher of this gunicorn worker, created from configuration on first use.
+
+    Returns:
+        PasswordHasher: Shared password hasher
+    """
+    global _password_hasher
+
+    if _password_hasher is None:
+        from apps import configuration
+
+        _password_hasher = PasswordHasher(
+                                algorithm=configuration.PASSWORD_HASH_ALGORITHM,
+                                cost=configuration.PASSWORD_HASH_COST,
+                                workers=configuration.PASSWORD_HASH_WORKERS,
+                                max_pending=configuration.PASSWORD_HASH_MAX_PENDING,
+                                queue_timeout=configuration.PASSWORD_HASH_QUEUE_TIMEOUT
+                            )
+
+    return _password_hasher
@@ -15,6 +15,20 @@ Working; -
 ----------
     This modules generates random token
 
+    Tokens are signed by one token service per process. Signing keys are derived from
+    secret keys and SECURITY_PASSWORD_SALT once, when the service is created, instead
+    of on every token. Tokens are same as those of itsdangerous URLSafeTimedSerializer,
+    so links sent before are still valid.
+
+    SECRET_KEY signs new tokens. Keys of SECRET_KEY_FALLBACKS, newest first, are only
+    used to validate tokens signed before the key was rotated. At most
+    TOKEN_MAX_ACTIVE_KEYS keys are active, tokens of older keys are invalid.
+
+    validate_many() validates a batch of tokens, e.g. for auditing outstanding links.
+
+    Access and refresh tokens of logged in customers are signed the same way by token
+    services of their own purpose, each with its own salt and expiry.
+
 Uses; -
 -------
     This module is used by routes generate token during user registration.
@@ -22,26 +36,93 @@ Uses; -
 
 Reference; -
 ------------
-    TBD
+    https://itsdangerous.palletsprojects.com/en/2.1.x/serializer/#key-rotation
 """
 
+import hmac
+import time
+import hashlib
+import threading
+from datetime import datetime
 from itsdangerous import URLSafeTimedSerializer
+from itsdangerous.encoding import base64_encode, base64_decode, int_to_bytes, bytes_to_int
 from itsdangerous.exc import BadData
 from apps import configuration
+from utils.insurance_logger import InsuranceLogger
 
 
-class TokenHelper:
-    def __init__(self) -> None:
-        self._serializer = URLSafeTimedSerializer(configuration.SECRET_KEY)
+INVALID_TOKEN = "Email confirmation link is invalid or has expired."
 
-    def generate_confirmation_token(self, email: str) -> tuple:
+
+class TokenStatus:
+    VALID = "VALID"
+    EXPIRED = "EXPIRED"
+    INVALID = "INVALID"
+
+
+class TokenService:
+    """Signs and validates tokens with keys derived once.
+
+    Args:
+        secret_keys (list): Active secret keys, first one signs new tokens
+        salt (str): Salt of the tokens, different for every purpose
+        max_age (int): Seconds for which a token is valid
+        max_active_keys (int, optional): Maximum number of active keys. Defaults to 3.
+    """
+    separator = b"."
+
+    def __init__(self, secret_keys: list, salt: str, max_age: int, max_active_keys: int = 3) -> None:
+        self._salt = salt.encode('utf-8') if isinstance(salt, str) else salt
+        self._max_age = max_age
+        self._max_active_keys = max_active_keys
+        self._lock = threading.Lock()
+
+        # Only payload encoding is used, it does not depend on the key
+        self._payload_serializer = URLSafeTimedSerializer(secret_keys[0])
+
+        self._signers = tuple(self._signer(secret_key) for secret_key in secret_keys[:max_active_keys])
+
+    def _signer(self, secret_key) -> hmac.HMAC:
+        secret_key = secret_key.encode('utf-8') if isinstance(secret_key, str) else secret_key
+
+        # Same key derivation as itsdangerous TimestampSigner, 'django-concat' with sha1
+        key = hashlib.sha1(self._salt + b"signer" + secret_key).digest()
+
+        return hmac.new(key, digestmod=hashlib.sha1)
+
+    def rotate(self, secret_key: str) -> None:
+        """Sign new tokens with given key, previous keys only validate tokens.
+
+        Args:
+            secret_key (str): New secret key
         """
-        Generate Email Token.
+        signer = self._signer(secret_key)
 
-        We use the URLSafeTimedSerializer to generate a token 
-        using the email address obtained during user sign up.
+        with self._lock:
+            self._signers = (signer,) + self._signers[:self._max_active_keys - 1]
 
-        User email is encoded in the generated token.
+        InsuranceLogger.log_info(f"Token signing key is rotated, {len(self._signers)} keys are active.")
+
+    def sign(self, payload) -> str:
+        """Signed token of any json serializable payload, with current time.
+
+        Args:
+            payload: Payload of the token
+
+        Returns:
+            str: Token
+        """
+        value = self._payload_serializer.dump_payload(payload) + self.separator + \
+                    base64_encode(int_to_bytes(int(time.time())))
+
+        signer = self._signers[0].copy()
+        signer.update(value)
+
+        return (value + self.separator + base64_encode(signer.digest())).decode('utf-8')
+
+    def generate(self, email: str) -> tuple:
+        """
+        Generate confirmation token of an email.
 
         Args:
             email (str): Email of customer
@@ -50,18 +131,176 @@ class TokenHelper:
             tuple: status, message, result
                     status is boolean value indicating success (True) or Failure(False),
                     message is a string about the error occurred if any, otherwise None,
-                    result is the actual response or None otherwise.
+                    result is the token or None otherwise.
         """
-        result = None
-
         try:
-            result = self._serializer.dumps(email, salt=configuration.SECURITY_PASSWORD_SALT)
-        except (BadData, Exception) as err:
-            print("Failed to generate confirmation token.")
+            token = self.sign(email)
+        except Exception as err:
+            InsuranceLogger.log_error(f"Failed to generate confirmation token. {str(err)}")
             return False, "Failed to generate confirmation token.", None
-        
+
+        return True, None, token
+
+    def unsign(self, token, now: float = None) -> tuple:
+        """Check signature and age of a token, with CPU only.
+
+        Args:
+            token: Token to be checked
+            now (float, optional): Current time, same for a batch of tokens. Defaults to time.time().
+
+        Returns:
+            tuple: TokenStatus value, payload and issue time (unix seconds), payload and issue
+                   time are None for invalid tokens
+        """
+        now = time.time() if now is None else now
+
+        try:
+            token = token.encode('utf-8') if isinstance(token, str) else token
+            value, signature = token.rsplit(self.separator, 1)
+            signature = base64_decode(signature)
+        except (ValueError, BadData):
+            return TokenStatus.INVALID, None, None
+
+        for signer in self._signers:
+            signer = signer.copy()
+            signer.update(value)
+
+            if hmac.compare_digest(signer.digest(), signature):
+                break
+        else:
+            return TokenStatus.INVALID, None, None
+
+        try:
+            encoded_payload, timestamp = value.rsplit(self.separator, 1)
+            timestamp = bytes_to_int(base64_decode(timestamp))
+            payload = self._payload_serializer.load_payload(encoded_payload)
+        except (ValueError, BadData):
+            return TokenStatus.INVALID, None, None
+
+        age = now - timestamp
+
+        if age > self._max_age or age < 0:
+            return TokenStatus.EXPIRED, payload, timestamp
+
+        return TokenStatus.VALID, payload, timestamp
+
+    def validate(self, token) -> tuple:
+        """
+        Validate the given token.
+
+        If the token has not expired, then it will return an email.
+
+        Returns:
+            tuple: status, message, result
+                    status is boolean value indicating success (True) or Failure(False),
+                    message is a string about the error occurred if any, otherwise None,
+                    result is the email or None otherwise.
+        """
+        status, email, _ = self.unsign(token)
+
+        if status != TokenStatus.VALID:
+            InsuranceLogger.log_info(f"Email confirmation link is {status.lower()}.")
+            return False, INVALID_TOKEN, None
+
+        return True, None, email
+
+    def validate_many(self, tokens) -> tuple:
+        """
+        Validate a batch of tokens.
+
+        Args:
+            tokens: Iterable of tokens
+
+        Returns:
+            tuple: status, message, result
+                    status is boolean value indicating success (True) or Failure(False),
+                    message is a string about the error occurred if any, otherwise None,
+                    result is list of dict with status (TokenStatus value), email and issued_at
+                    for every token in given order, email and issued_at are None for invalid tokens.
+        """
+        now = time.time()
+        result = []
+
+        for token in tokens:
+            status, email, timestamp = self.unsign(token, now)
+
+            result.append(dict(
+                status = status,
+                email = email,
+                issued_at = datetime.utcfromtimestamp(timestamp) if timestamp is not None else None
+            ))
+
         return True, None, result
 
+    def stats(self) -> dict:
+        return {'active_keys': len(self._signers), 'max_age': self._max_age}
+
+
+TOKEN_PURPOSES = ('email-confirmation', 'access', 'refresh')
+
+_token_services = dict()
+_token_services_lock = threading.Lock()
+
+def get_token_service(purpose: str = 'email-confirmation') -> TokenService:
+    """Token service of this process for given purpose, created from configuration on first use.
+
+    Every purpose has its own salt, so a token of one purpose is invalid for the others.
+
+    Args:
+        purpose (str, optional): One of TOKEN_PURPOSES. Defaults to 'email-confirmation'.
+
+    Returns:
+        TokenService: Shared token service
+    """
+    token_service = _token_services.get(purpose)
+
+    if token_service is None:
+        max_ages = {
+            'email-confirmation': configuration.EMAIL_TOKEN_EXPIRATION,
+            'access': configuration.ACCESS_TOKEN_EXPIRATION,
+            'refresh': configuration.REFRESH_TOKEN_EXPIRATION,
+        }
+
+        if purpose not in max_ages:
+            raise ValueError(f"Invalid token purpose '{purpose}'. Available purposes {TOKEN_PURPOSES}.")
+
+        with _token_services_lock:
+            token_service = _token_services.get(purpose)
+
+            if token_service is None:
+                # Confirmation links sent before purposes were added keep the plain salt
+                salt = configuration.SECURITY_PASSWORD_SALT if purpose == 'email-confirmation' \
+                            else f"{configuration.SECURITY_PASSWORD_SALT}:{purpose}"
+
+                token_service = _token_services[purpose] = TokenService(
+                                    secret_keys=[configuration.SECRET_KEY] + list(configuration.SECRET_KEY_FALLBACKS),
+                                    salt=salt,
+                                    max_age=max_ages[purpose],
+                                    max_active_keys=configuration.TOKEN_MAX_ACTIVE_KEYS
+                                )
+
+    return token_service
+
+
+class TokenHelper:
+    """Kept for existing callers, tokens are handled by the shared token service."""
+    def generate_confirmation_token(self, email: str) -> tuple:
+        """
+        Generate Email Token.
+
+        User email is encoded in the generated token.
+
+        Args:
+            email (str): Email of customer
+
+        Returns:
+            tuple: status, message, result
+                    status is boolean value indicating success (True) or Failure(False),
+                    message is a string about the error occurred if any, otherwise None,
+                    result is the actual response or None otherwise.
+        """
+        return get_token_service().generate(email)
+
     def validate_token(self, token) -> tuple:
         """
         Validate the given token.
@@ -74,14 +313,4 @@ class TokenHelper:
                     message is a string about the error occurred if any, otherwise None,
                     result is the actual response or None otherwise.
         """
-        try:
-            email = self._serializer.loads(
-                token,
-                salt=configuration.SECURITY_PASSWORD_SALT,
-                max_age=configuration.EMAIL_TOKEN_EXPIRATION
-            )
-        except BadData as err:
-            print("Email confirmation link is invalid or has expired")
-            return False, "Email confirmation link is invalid or has expired.", None
-
-        return True, None, email
\ No newline at end of file
+        return get_token_service().validate(token)
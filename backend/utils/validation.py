@@ -13,7 +13,8 @@ About; -
 
 Working; -
 ----------
-    This module uses email-validator package to validate email format
+    This module uses email-validator package to validate email format, deliverability
+    of the domain is checked as configured in email_deliverability module.
 
 Uses; -
 -------
@@ -24,7 +25,7 @@ Reference; -
     https://pypi.org/project/email-validator/
 """
 
-from email_validator import validate_email, EmailNotValidError
+from utils.email_deliverability import get_email_deliverability_checker
 
 
 def check_valid_email(email: str) -> bool:
@@ -39,16 +40,5 @@ def check_valid_email(email: str) -> bool:
     if len(email) > 50:
         return False, "Email too long with '{}' characters. Max '{}' characters are allowed.".format(len(email), 50)
 
-    try:
-        # Validating the `email`
-        emailObject = validate_email(email)
-
-        # If the `email` is valid
-        # it is updated with its normalized form
-        email = emailObject.email
-    except EmailNotValidError as errorMsg:
-        # If `email` is not valid
-        # we print a human readable error messages
-        return False, str(errorMsg)
-    
-    return True, email
+    # Normalized form of a valid `email`, otherwise a human readable error message
+    return get_email_deliverability_checker().check(email)